@@ -175,6 +175,18 @@ def load_agent_prompt_from_md(agent_name: str, force_reload: bool = False) -> Op
 
 
 
+# Shared analyzer so its description memo persists across delegations
+_complexity_analyzer: Optional[TaskComplexityAnalyzer] = None
+
+
+def _get_complexity_analyzer() -> TaskComplexityAnalyzer:
+    """Get the shared TaskComplexityAnalyzer instance."""
+    global _complexity_analyzer
+    if _complexity_analyzer is None:
+        _complexity_analyzer = TaskComplexityAnalyzer()
+    return _complexity_analyzer
+
+
 def _analyze_task_complexity(task_description: str, context_size: int = 0, **kwargs: Any) -> Dict[str, Any]:
     """
     Analyze task complexity using TaskComplexityAnalyzer.
@@ -188,7 +200,7 @@ def _analyze_task_complexity(task_description: str, context_size: int = 0, **kwa
         Dictionary containing complexity analysis results
     """
     try:
-        analyzer = TaskComplexityAnalyzer()
+        analyzer = _get_complexity_analyzer()
         
         # Extract additional parameters from kwargs
         file_count = kwargs.get('file_count', 0)
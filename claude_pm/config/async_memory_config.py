@@ -21,6 +21,17 @@ DEFAULT_CONFIG: Dict[str, Any] = {
         "enabled": True,
         "max_size": 1000,
         "ttl_seconds": 300
+    },
+    "storage": {
+        "sqlite_path": "~/.claude-pm/memory/memory.db",
+        "project_id": None
+    },
+    "adaptive_batching": {
+        "enabled": True,
+        "min_batch_size": 1,
+        "max_batch_size": 500,
+        "target_flush_latency": 0.05,
+        "linger_seconds": 0.05
     }
 }
 
@@ -162,4 +173,19 @@ def validate_config(config: Dict[str, Any]) -> bool:
         except (AssertionError, TypeError):
             return False
     
+    # Validate adaptive batching configuration if present
+    if "adaptive_batching" in config:
+        batching = config["adaptive_batching"]
+        if not isinstance(batching, dict):
+            return False
+        
+        try:
+            minimum = batching.get("min_batch_size", 1)
+            maximum = batching.get("max_batch_size", minimum)
+            assert 0 < minimum <= maximum
+            assert batching.get("target_flush_latency", 1) > 0
+            assert batching.get("linger_seconds", 0) >= 0
+        except (AssertionError, TypeError):
+            return False
+    
     return True
\ No newline at end of file
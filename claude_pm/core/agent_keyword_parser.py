@@ -6,12 +6,147 @@ Translates natural language task descriptions into appropriate agent types
 using semantic keyword matching. Supports fuzzy matching and explicit
 @agent_name syntax.
 
+Fuzzy matching goes through a prebuilt index over the keyword vocabulary:
+keywords are bucketed by length and posted under each of their characters,
+so a token is only compared (with difflib's SequenceMatcher) against the
+keywords that can still reach the similarity cutoff. Results are identical
+to difflib.get_close_matches and are memoized per token.
+
 Part of ISS-0123: Fix agent selection bug
 """
 
 import re
-from typing import Optional, Dict, List, Tuple
-from difflib import get_close_matches
+import threading
+from collections import Counter, OrderedDict
+from difflib import SequenceMatcher
+from typing import Optional, Dict, Iterable, List, Tuple
+
+_WORD_RE = re.compile(r'\b\w+\b')
+_EXPLICIT_AGENT_RE = re.compile(r'@(\w+)\s+')
+
+
+class FuzzyKeywordIndex:
+    """
+    Similarity-cutoff index over a fixed keyword vocabulary.
+    
+    ``close_matches(word, n)`` returns exactly what
+    ``difflib.get_close_matches(word, keywords, n, cutoff)`` would. The
+    SequenceMatcher ratio is 2*M/T, where M (matched characters) is at most
+    the size of the character multiset intersection, so keywords whose
+    length or shared characters cannot reach the cutoff are skipped without
+    running the matcher.
+    """
+    
+    def __init__(self, keywords: Iterable[str], cutoff: float = 0.6, cache_size: int = 4096):
+        """
+        Args:
+            keywords: Keyword vocabulary (duplicates are ignored)
+            cutoff: Minimum SequenceMatcher ratio for a match (0-1)
+            cache_size: Number of tokens whose matches are memoized
+        """
+        if not 0.0 <= cutoff <= 1.0:
+            raise ValueError(f"cutoff must be in [0.0, 1.0]: {cutoff!r}")
+        self.keywords: List[str] = list(dict.fromkeys(keywords))
+        self.cutoff = cutoff
+        self.cache_size = cache_size
+        
+        # char -> keyword length -> [(keyword index, occurrences of char)]
+        self._lengths = [len(keyword) for keyword in self.keywords]
+        self._postings: Dict[str, Dict[int, List[Tuple[int, int]]]] = {}
+        for index, keyword in enumerate(self.keywords):
+            for char, count in Counter(keyword).items():
+                self._postings.setdefault(char, {}).setdefault(len(keyword), []).append((index, count))
+        self._distinct_lengths = sorted(set(self._lengths))
+        
+        self._cache: "OrderedDict[str, Tuple[str, ...]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._cache_hits = 0
+        self._cache_misses = 0
+    
+    def close_matches(self, word: str, n: int = 3) -> List[str]:
+        """
+        Best keywords for a token, most similar first.
+        
+        Args:
+            word: Token to match
+            n: Maximum number of matches to return
+            
+        Returns:
+            Up to n keywords with similarity >= cutoff
+        """
+        if n <= 0:
+            raise ValueError(f"n must be > 0: {n!r}")
+        with self._cache_lock:
+            matches = self._cache.get(word)
+            if matches is not None:
+                self._cache.move_to_end(word)
+                self._cache_hits += 1
+                return list(matches[:n])
+            self._cache_misses += 1
+        
+        matches = self._rank(word)
+        with self._cache_lock:
+            self._cache[word] = matches
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return list(matches[:n])
+    
+    def _candidates(self, word: str) -> List[int]:
+        """Keywords whose length and shared characters allow a ratio >= cutoff."""
+        word_length = len(word)
+        cutoff = self.cutoff
+        
+        # Length bound (difflib's real_quick_ratio): 2*min(la, lb)/(la + lb)
+        lengths = [
+            length for length in self._distinct_lengths
+            if 2.0 * min(word_length, length) / (word_length + length) >= cutoff
+        ]
+        if cutoff <= 0.0:
+            return [index for index, length in enumerate(self._lengths) if length in lengths]
+        
+        # Character bound (difflib's quick_ratio): 2*|multiset intersection|/(la + lb)
+        shared: Dict[int, int] = {}
+        for char, count in Counter(word).items():
+            postings = self._postings.get(char)
+            if not postings:
+                continue
+            for length in lengths:
+                for index, keyword_count in postings.get(length, ()):
+                    shared[index] = shared.get(index, 0) + (count if count < keyword_count else keyword_count)
+        return sorted(
+            index for index, matches in shared.items()
+            if 2.0 * matches / (word_length + self._lengths[index]) >= cutoff
+        )
+    
+    def _rank(self, word: str) -> Tuple[str, ...]:
+        """All keywords with ratio >= cutoff, ordered like get_close_matches."""
+        matcher = SequenceMatcher()
+        matcher.set_seq2(word)
+        scored = []
+        for index in self._candidates(word):
+            keyword = self.keywords[index]
+            matcher.set_seq1(keyword)
+            score = matcher.ratio()
+            if score >= self.cutoff:
+                scored.append((score, keyword))
+        scored.sort(reverse=True)
+        return tuple(keyword for _, keyword in scored)
+    
+    def cache_info(self) -> Dict[str, int]:
+        """Token memo statistics."""
+        with self._cache_lock:
+            return {
+                "hits": self._cache_hits,
+                "misses": self._cache_misses,
+                "size": len(self._cache),
+                "max_size": self.cache_size
+            }
+    
+    def clear_cache(self) -> None:
+        """Drop all memoized tokens."""
+        with self._cache_lock:
+            self._cache.clear()
+            self._cache_hits = self._cache_misses = 0
 
 
 class AgentKeywordParser:
@@ -110,11 +245,43 @@ class AgentKeywordParser:
         self._build_reverse_mappings()
     
     def _build_reverse_mappings(self):
-        """Build reverse keyword mappings for efficient lookup."""
+        """Build reverse keyword mappings, phrase list and fuzzy index for efficient lookup."""
         self.keyword_to_agent = {}
+        self._phrases: List[Tuple[str, str]] = []
         for agent_type, keywords in self.KEYWORD_MAPPINGS.items():
             for keyword in keywords:
                 self.keyword_to_agent[keyword.lower()] = agent_type
+                if ' ' in keyword:
+                    self._phrases.append((keyword, agent_type))
+        self.fuzzy_index = FuzzyKeywordIndex(self.keyword_to_agent, cutoff=self.fuzzy_threshold)
+    
+    def _score_agents(self, task_lower: str, fuzzy_matches: int) -> Dict[str, int]:
+        """
+        Score agent types for a lowercased task description.
+        
+        Multi-word phrases score 5, exact keyword matches 2 and each of up
+        to ``fuzzy_matches`` fuzzy keyword matches 1. Repeated words are
+        looked up once.
+        """
+        agent_scores: Dict[str, int] = {}
+        
+        for keyword, agent_type in self._phrases:
+            if keyword in task_lower:
+                agent_scores[agent_type] = agent_scores.get(agent_type, 0) + 5
+        
+        for word, occurrences in Counter(_WORD_RE.findall(task_lower)).items():
+            # Exact match
+            agent_type = self.keyword_to_agent.get(word)
+            if agent_type is not None:
+                agent_scores[agent_type] = agent_scores.get(agent_type, 0) + 2 * occurrences
+                continue
+            
+            # Fuzzy match
+            for match in self.fuzzy_index.close_matches(word, n=fuzzy_matches):
+                agent_type = self.keyword_to_agent[match]
+                agent_scores[agent_type] = agent_scores.get(agent_type, 0) + occurrences
+        
+        return agent_scores
     
     def parse_task_description(self, task_description: str) -> Optional[str]:
         """
@@ -141,7 +308,7 @@ class AgentKeywordParser:
         task_lower = task_description.lower().strip()
         
         # 1. Check for explicit @agent_name syntax
-        explicit_match = re.match(r'@(\w+)\s+', task_lower)
+        explicit_match = _EXPLICIT_AGENT_RE.match(task_lower)
         if explicit_match:
             agent_name = explicit_match.group(1)
             # Check if it's a valid agent type or alias
@@ -150,37 +317,8 @@ class AgentKeywordParser:
             if agent_name in self.AGENT_ALIASES:
                 return self.AGENT_ALIASES[agent_name]
         
-        # 2. First check for multi-word phrases (higher priority)
-        agent_scores: Dict[str, int] = {}
-        
-        for agent_type, keywords in self.KEYWORD_MAPPINGS.items():
-            for keyword in keywords:
-                if ' ' in keyword and keyword in task_lower:
-                    # Multi-word phrases get highest priority
-                    agent_scores[agent_type] = agent_scores.get(agent_type, 0) + 5
-        
-        # 3. Extract keywords from task description
-        # Remove common words and split
-        words = re.findall(r'\b\w+\b', task_lower)
-        
-        # 4. Score each agent type based on keyword matches
-        for word in words:
-            # Exact match
-            if word in self.keyword_to_agent:
-                agent_type = self.keyword_to_agent[word]
-                agent_scores[agent_type] = agent_scores.get(agent_type, 0) + 2
-            
-            # Fuzzy match
-            else:
-                close_matches = get_close_matches(
-                    word, 
-                    self.keyword_to_agent.keys(), 
-                    n=1, 
-                    cutoff=self.fuzzy_threshold
-                )
-                if close_matches:
-                    agent_type = self.keyword_to_agent[close_matches[0]]
-                    agent_scores[agent_type] = agent_scores.get(agent_type, 0) + 1
+        # 2-4. Score multi-word phrases (highest priority), exact and fuzzy keyword matches
+        agent_scores = self._score_agents(task_lower, fuzzy_matches=1)
         
         # 5. Special cases handling
         # If "research" appears at the beginning and has a reasonable score, prioritize it
@@ -236,34 +374,7 @@ class AgentKeywordParser:
         task_lower = task_description.lower().strip()
         
         # Score each agent type
-        agent_scores: Dict[str, int] = {}
-        
-        # First check for multi-word phrases (higher priority)
-        for agent_type, keywords in self.KEYWORD_MAPPINGS.items():
-            for keyword in keywords:
-                if ' ' in keyword and keyword in task_lower:
-                    agent_scores[agent_type] = agent_scores.get(agent_type, 0) + 5
-        
-        # Extract words
-        words = re.findall(r'\b\w+\b', task_lower)
-        
-        for word in words:
-            # Exact match
-            if word in self.keyword_to_agent:
-                agent_type = self.keyword_to_agent[word]
-                agent_scores[agent_type] = agent_scores.get(agent_type, 0) + 2
-            
-            # Fuzzy match
-            else:
-                close_matches = get_close_matches(
-                    word, 
-                    self.keyword_to_agent.keys(), 
-                    n=3, 
-                    cutoff=self.fuzzy_threshold
-                )
-                for match in close_matches:
-                    agent_type = self.keyword_to_agent[match]
-                    agent_scores[agent_type] = agent_scores.get(agent_type, 0) + 1
+        agent_scores = self._score_agents(task_lower, fuzzy_matches=3)
         
         # Sort by score
         return sorted(agent_scores.items(), key=lambda x: x[1], reverse=True)
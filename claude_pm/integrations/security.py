@@ -3,15 +3,25 @@ Security module for Claude PM Framework mem0AI Integration.
 
 Provides secure authentication, credential management, and security
 validation for mem0AI service communication.
+
+Security events are kept in a bounded ring buffer, counted in per-principal
+and per-event-type sliding windows (time wheels) so failure and rate checks
+cost the same at any event rate, and written to a JSONL log through a
+buffered writer.
 """
 
 import os
 import ssl
 import time
+import json
+import math
+import atexit
 import hashlib
 import logging
 import secrets
-from typing import Dict, Any, Optional, Tuple, List
+import weakref
+from collections import OrderedDict, deque
+from typing import Deque, Dict, Any, Optional, Tuple, List
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -27,6 +37,22 @@ MAX_AUTH_FAILURES = 5
 AUTH_FAILURE_LOCKOUT_MINUTES = 15
 REQUEST_SIGNATURE_ALGO = "sha256"
 
+# Security event tracking
+SECURITY_EVENT_BUFFER_SIZE = 10_000
+SECURITY_EVENT_WINDOW_MINUTES = 60
+SECURITY_EVENT_BUCKET_SECONDS = 15
+MAX_TRACKED_PRINCIPALS = 10_000
+IMMEDIATE_FLUSH_EVENTS = frozenset({"auth_lockout", "key_rotation"})
+
+_open_event_loggers: "weakref.WeakSet[SecurityEventLogger]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_event_loggers_at_exit():
+    """Write buffered security events on interpreter shutdown."""
+    for event_logger in list(_open_event_loggers):
+        event_logger.flush()
+
 
 @dataclass
 class SecurityConfig:
@@ -61,22 +87,132 @@ class AuthenticationEvent:
     user_agent: Optional[str] = None
 
 
+class SlidingWindowCounter:
+    """
+    Event counts over a sliding time window, kept in a wheel of fixed-width buckets.
+
+    Each slot remembers which absolute bucket it holds, so stale slots are
+    reset lazily instead of by a timer. Recording an event touches one slot
+    and counting touches at most one slot per bucket in the window; neither
+    depends on how many events arrived. Window edges are accurate to one
+    bucket width.
+    """
+
+    def __init__(
+        self,
+        horizon_seconds: float = SECURITY_EVENT_WINDOW_MINUTES * 60,
+        bucket_seconds: float = SECURITY_EVENT_BUCKET_SECONDS,
+    ):
+        self.bucket_seconds = bucket_seconds
+        self.num_buckets = max(1, math.ceil(horizon_seconds / bucket_seconds))
+        self._counts = [0] * self.num_buckets
+        self._epochs = [-1] * self.num_buckets
+        self.total = 0
+
+    @property
+    def horizon_seconds(self) -> float:
+        """Longest window this counter can answer."""
+        return self.num_buckets * self.bucket_seconds
+
+    def add(self, timestamp: float, count: int = 1) -> None:
+        """Record ``count`` events at ``timestamp`` (epoch seconds)."""
+        epoch = int(timestamp // self.bucket_seconds)
+        slot = epoch % self.num_buckets
+        if self._epochs[slot] != epoch:
+            if self._epochs[slot] > epoch:
+                # Older than the horizon: the slot already holds a newer bucket
+                return
+            self._epochs[slot] = epoch
+            self._counts[slot] = 0
+        self._counts[slot] += count
+        self.total += count
+
+    def count(self, now: float, window_seconds: Optional[float] = None) -> int:
+        """Events in the last ``window_seconds`` (the full horizon by default)."""
+        buckets = self.num_buckets
+        if window_seconds is not None:
+            buckets = min(buckets, max(1, math.ceil(window_seconds / self.bucket_seconds)))
+        current = int(now // self.bucket_seconds)
+        total = 0
+        for epoch in range(current - buckets + 1, current + 1):
+            slot = epoch % self.num_buckets
+            if self._epochs[slot] == epoch:
+                total += self._counts[slot]
+        return total
+
+
 class SecurityEventLogger:
     """Logger for security events and authentication activities."""
 
-    def __init__(self, log_file_path: Optional[Path] = None):
-        """Initialize security event logger."""
+    def __init__(
+        self,
+        log_file_path: Optional[Path] = None,
+        max_events: int = SECURITY_EVENT_BUFFER_SIZE,
+        window_minutes: int = SECURITY_EVENT_WINDOW_MINUTES,
+        bucket_seconds: float = SECURITY_EVENT_BUCKET_SECONDS,
+        max_principals: int = MAX_TRACKED_PRINCIPALS,
+        flush_every: int = 64,
+        flush_interval: float = 1.0,
+    ):
+        """
+        Initialize security event logger.
+
+        Args:
+            log_file_path: JSONL file security events are appended to
+            max_events: Recent events kept in memory
+            window_minutes: Longest window answered by the sliding-window counters
+            bucket_seconds: Counter bucket width (window edge resolution)
+            max_principals: Principals tracked before the least recently active is dropped
+            flush_every: Buffered log lines written per batch
+            flush_interval: Maximum seconds a buffered log line waits
+        """
         self.logger = get_logger(f"{__name__}.security")
-        self.events: List[AuthenticationEvent] = []
-        self.log_file_path = log_file_path or Path("logs/security_events.log")
+        self.events: Deque[AuthenticationEvent] = deque(maxlen=max_events)
+        self.log_file_path = log_file_path or Path("logs/security_events.jsonl")
+        self.window_seconds = window_minutes * 60
+        self.bucket_seconds = bucket_seconds
+        self.max_principals = max_principals
+        self.flush_every = max(1, flush_every)
+        self.flush_interval = flush_interval
+
+        # (principal, event_type) -> counter; principals are service hosts and client IPs
+        self._principal_counters: "OrderedDict[Tuple[str, str], SlidingWindowCounter]" = (
+            OrderedDict()
+        )
+        self._event_type_counters: Dict[str, SlidingWindowCounter] = {}
+        self._pending_lines: List[str] = []
+        self._last_flush = time.monotonic()
 
         # Ensure log directory exists
         self.log_file_path.parent.mkdir(parents=True, exist_ok=True)
+        _open_event_loggers.add(self)
+
+    def _new_counter(self) -> SlidingWindowCounter:
+        return SlidingWindowCounter(self.window_seconds, self.bucket_seconds)
+
+    def _count_event(self, principal: str, event_type: str, timestamp: float) -> None:
+        key = (principal, event_type)
+        counter = self._principal_counters.get(key)
+        if counter is None:
+            counter = self._principal_counters[key] = self._new_counter()
+            if len(self._principal_counters) > self.max_principals:
+                self._principal_counters.popitem(last=False)
+        else:
+            self._principal_counters.move_to_end(key)
+        counter.add(timestamp)
 
     def log_event(self, event: AuthenticationEvent):
         """Log a security event."""
         self.events.append(event)
 
+        timestamp = event.timestamp.timestamp()
+        self._count_event(event.service_host, event.event_type, timestamp)
+        if event.ip_address:
+            self._count_event(event.ip_address, event.event_type, timestamp)
+        if event.event_type not in self._event_type_counters:
+            self._event_type_counters[event.event_type] = self._new_counter()
+        self._event_type_counters[event.event_type].add(timestamp)
+
         # Log to structured logger
         self.logger.info(
             f"Security Event: {event.event_type}",
@@ -91,34 +227,76 @@ class SecurityEventLogger:
             },
         )
 
-        # Write to security log file
+        # Buffer a JSONL record for the security log file
+        log_entry = {
+            "timestamp": event.timestamp.isoformat(),
+            "event_type": event.event_type,
+            "service_host": event.service_host,
+            "details": event.details,
+            "ip_address": event.ip_address,
+            "user_agent": event.user_agent,
+        }
+        self._pending_lines.append(json.dumps(log_entry, default=str) + "\n")
+        if (
+            len(self._pending_lines) >= self.flush_every
+            or event.event_type in IMMEDIATE_FLUSH_EVENTS
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        ):
+            self.flush()
+
+    def flush(self):
+        """Write buffered security events to the log file."""
+        self._last_flush = time.monotonic()
+        if not self._pending_lines:
+            return
+        lines, self._pending_lines = self._pending_lines, []
         try:
             with open(self.log_file_path, "a") as f:
-                log_entry = {
-                    "timestamp": event.timestamp.isoformat(),
-                    "event_type": event.event_type,
-                    "service_host": event.service_host,
-                    "details": event.details,
-                    "ip_address": event.ip_address,
-                    "user_agent": event.user_agent,
-                }
-                f.write(f"{log_entry}\n")
+                f.writelines(lines)
         except Exception as e:
-            self.logger.error(f"Failed to write security event to file: {e}")
+            self.logger.error(f"Failed to write security events to file: {e}")
+
+    def get_event_count(
+        self, event_type: str, minutes: float = 60, principal: Optional[str] = None
+    ) -> int:
+        """
+        Count events of a type in the last ``minutes``.
+
+        Args:
+            event_type: Event type to count
+            minutes: Window length
+            principal: Service host or client IP to restrict to (all principals if omitted)
+
+        Returns:
+            Number of matching events
+        """
+        window_seconds = minutes * 60
+        if window_seconds > self.window_seconds:
+            # Longer than the counters cover: fall back to the bounded event buffer
+            cutoff = datetime.now() - timedelta(minutes=minutes)
+            return sum(
+                1
+                for event in self.events
+                if event.event_type == event_type
+                and event.timestamp > cutoff
+                and principal in (None, event.service_host, event.ip_address)
+            )
+
+        if principal is None:
+            counter = self._event_type_counters.get(event_type)
+        else:
+            counter = self._principal_counters.get((principal, event_type))
+        return counter.count(time.time(), window_seconds) if counter else 0
+
+    def get_event_rate(
+        self, event_type: str, seconds: int = 60, principal: Optional[str] = None
+    ) -> float:
+        """Events per second of a type over the last ``seconds``."""
+        return self.get_event_count(event_type, seconds / 60, principal) / seconds
 
     def get_recent_failures(self, host: str, minutes: int = 60) -> int:
         """Get count of recent authentication failures for a host."""
-        cutoff = datetime.now() - timedelta(minutes=minutes)
-        failures = [
-            event
-            for event in self.events
-            if (
-                event.service_host == host
-                and event.event_type == "auth_failure"
-                and event.timestamp > cutoff
-            )
-        ]
-        return len(failures)
+        return self.get_event_count("auth_failure", minutes, principal=host)
 
     def is_host_locked_out(self, host: str) -> bool:
         """Check if host is currently locked out due to failures."""
@@ -69,6 +69,9 @@ class AgentModificationTracker(BaseService):
         self.max_history_days = self.get_config("max_history_days", 30)
         self.validation_enabled = self.get_config("validation_enabled", True)
         self.persistence_interval = self.get_config("persistence_interval", 300)  # 5 minutes
+        self.journal_fsync_batch = self.get_config("journal_fsync_batch", 32)
+        self.journal_fsync_interval = self.get_config("journal_fsync_interval", 1.0)
+        self.journal_compact_after = self.get_config("journal_compact_after", 1000)
         
         # Core components
         self.shared_cache: Optional[SharedPromptCache] = None
@@ -88,7 +91,12 @@ class AgentModificationTracker(BaseService):
         # Persistence paths
         self.persistence_root = Path.home() / '.claude-pm' / 'agent_tracking'
         self.backup_manager = BackupManager(self.persistence_root / 'backups')
-        self.persistence_manager = PersistenceManager(self.persistence_root)
+        self.persistence_manager = PersistenceManager(
+            self.persistence_root,
+            fsync_batch_size=self.journal_fsync_batch,
+            fsync_interval=self.journal_fsync_interval,
+            compact_after=self.journal_compact_after
+        )
         
         # Background tasks
         self._persistence_task: Optional[asyncio.Task] = None
@@ -136,10 +144,11 @@ class AgentModificationTracker(BaseService):
         if self._cleanup_task:
             self._cleanup_task.cancel()
         
-        # Save final state
+        # Save final state: compact the journal into a snapshot
         await self.persistence_manager.save_modification_history(
             self.modification_history, self.active_modifications
         )
+        self.persistence_manager.close()
         
         self.logger.info("AgentModificationTracker service cleaned up")
     
@@ -259,6 +268,9 @@ class AgentModificationTracker(BaseService):
         
         self.modification_history[agent_name].add_modification(modification)
         
+        # Append to the modification journal
+        await self.persistence_manager.record_modification(modification)
+        
         # Invalidate cache
         if self.cache_integration:
             await self.cache_integration.invalidate_agent_cache(agent_name)
@@ -325,18 +337,29 @@ class AgentModificationTracker(BaseService):
                 self.logger.error(f"Modification callback failed: {e}")
     
     async def _persistence_loop(self) -> None:
-        """Background task to persist modification history."""
+        """Background task to sync the modification journal and compact it when due.
+        
+        Ticks every ``journal_fsync_interval`` (when shorter than
+        ``persistence_interval``) so a record appended during a quiet period is
+        fsynced on time instead of waiting for the next append.
+        """
+        tick = min(self.persistence_interval, self.journal_fsync_interval)
+        next_compaction_check = time.monotonic()
         while not self._stop_event.is_set():
             try:
-                await self.persistence_manager.save_modification_history(
-                    self.modification_history, self.active_modifications
-                )
-                await asyncio.sleep(self.persistence_interval)
+                if time.monotonic() >= next_compaction_check:
+                    next_compaction_check = time.monotonic() + self.persistence_interval
+                    await self.persistence_manager.compact_if_needed(
+                        self.modification_history, self.active_modifications
+                    )
+                else:
+                    self.persistence_manager.sync_if_due()
+                await asyncio.sleep(tick)
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 self.logger.error(f"Persistence loop error: {e}")
-                await asyncio.sleep(self.persistence_interval)
+                await asyncio.sleep(tick)
     
     async def _cleanup_loop(self) -> None:
         """Background task to cleanup old modifications and backups."""
@@ -364,6 +387,7 @@ class AgentModificationTracker(BaseService):
             
             for mod_id in old_active:
                 del self.active_modifications[mod_id]
+            await self.persistence_manager.record_expired(old_active)
             
             # Clean up old backups
             backup_count = await self.backup_manager.cleanup_old_backups(self.max_history_days)
@@ -4,24 +4,65 @@ Persistence layer for modification history.
 
 This module handles saving and loading modification history to/from disk,
 maintaining persistent state across sessions.
+
+History is kept as a snapshot plus an append-only journal: each tracked
+modification is appended as one JSON line (fsynced in batches), and the
+journal is periodically compacted into a new snapshot. Loading reads the
+snapshot and replays the journal tail.
 """
 
+import atexit
 import json
 import logging
+import os
+import time
+import weakref
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, IO, List, Optional
 
 from .models import AgentModification, ModificationHistory
 
+SNAPSHOT_VERSION = 1
+
+_open_managers: "weakref.WeakSet[PersistenceManager]" = weakref.WeakSet()
+
+
+@atexit.register
+def _close_journals_at_exit():
+    """Flush and fsync open journals on interpreter shutdown."""
+    for manager in list(_open_managers):
+        manager.close()
+
 
 class PersistenceManager:
     """Manager for persisting modification history and state."""
     
-    def __init__(self, persistence_root: Path):
+    def __init__(self, persistence_root: Path,
+                 fsync_batch_size: int = 32,
+                 fsync_interval: float = 1.0,
+                 compact_after: int = 1000):
+        """
+        Args:
+            persistence_root: Root directory for tracker state
+            fsync_batch_size: Journal records written before an fsync is forced
+            fsync_interval: Maximum seconds an unsynced journal record may wait
+            compact_after: Journal records after which compaction is due
+        """
         self.logger = logging.getLogger(__name__)
         self.persistence_root = persistence_root
         self.history_root = persistence_root / 'history'
+        self.fsync_batch_size = max(1, fsync_batch_size)
+        self.fsync_interval = fsync_interval
+        self.compact_after = max(1, compact_after)
+        
+        self.snapshot_file = self.history_root / 'snapshot.json'
+        self.generation = 0
+        self.journal_records = 0
+        self._journal: Optional[IO[str]] = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
         self._ensure_directories()
+        _open_managers.add(self)
     
     def _ensure_directories(self) -> None:
         """Ensure persistence directories exist."""
@@ -37,13 +78,87 @@ class PersistenceManager:
         
         self.logger.debug(f"Created persistence directories at {self.persistence_root}")
     
-    async def save_modification_history(self, 
+    # Journal
+    
+    def journal_path(self, generation: Optional[int] = None) -> Path:
+        """Journal file for a snapshot generation (the current one by default)."""
+        generation = self.generation if generation is None else generation
+        return self.history_root / f'modifications-{generation:06d}.journal'
+    
+    @property
+    def compaction_due(self) -> bool:
+        """Whether the journal has grown past the compaction threshold."""
+        return self.journal_records >= self.compact_after
+    
+    def _open_journal(self) -> IO[str]:
+        if self._journal is None:
+            self._journal = open(self.journal_path(), 'a', encoding='utf-8')
+        return self._journal
+    
+    def _append(self, record: Dict[str, Any]) -> None:
+        journal = self._open_journal()
+        journal.write(json.dumps(record, default=str) + '\n')
+        # Hand every record to the OS so only a machine crash can lose an unsynced one
+        journal.flush()
+        self.journal_records += 1
+        self._unsynced += 1
+        if (self._unsynced >= self.fsync_batch_size
+                or time.monotonic() - self._last_sync >= self.fsync_interval):
+            self.sync()
+    
+    def sync_if_due(self) -> None:
+        """Fsync pending journal records once they have waited ``fsync_interval``."""
+        if time.monotonic() - self._last_sync >= self.fsync_interval:
+            self.sync()
+    
+    def sync(self) -> None:
+        """Flush and fsync journal records written since the last sync."""
+        if self._journal is None or self._unsynced == 0:
+            return
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+    
+    async def record_modification(self, modification: AgentModification) -> None:
+        """Append a tracked modification to the journal (O(1) per record)."""
+        try:
+            self._append({'op': 'add', 'modification': modification.to_dict()})
+        except Exception as e:
+            self.logger.error(f"Failed to journal modification {modification.modification_id}: {e}")
+    
+    async def record_expired(self, modification_ids: List[str]) -> None:
+        """Journal the removal of modifications from the active set."""
+        if not modification_ids:
+            return
+        try:
+            self._append({'op': 'expire', 'modification_ids': list(modification_ids)})
+        except Exception as e:
+            self.logger.error(f"Failed to journal expired modifications: {e}")
+    
+    # Snapshots
+    
+    @staticmethod
+    def _write_atomic(path: Path, data: Dict[str, Any]) -> None:
+        """Write JSON via a temp file, fsync and rename so readers never see a partial file."""
+        temp_path = path.with_suffix(path.suffix + '.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, default=str)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    
+    async def save_modification_history(self,
                                       modification_history: Dict[str, ModificationHistory],
                                       active_modifications: Dict[str, AgentModification]) -> None:
-        """Persist modification history to disk."""
+        """
+        Compact the journal into a new snapshot of the full state.
+        
+        The snapshot names the next journal generation, so a crash at any
+        point leaves either the old snapshot with its journal or the new
+        snapshot with an empty journal.
+        """
         try:
-            # Save modification history
-            history_file = self.history_root / 'modification_history.json'
             history_data = {}
             
             for agent_name, history in modification_history.items():
@@ -56,71 +171,161 @@ class PersistenceManager:
                     'modifications': [mod.to_dict() for mod in history.modifications]
                 }
             
-            with open(history_file, 'w') as f:
-                json.dump(history_data, f, indent=2, default=str)
-            
-            # Save active modifications
-            active_file = self.persistence_root / 'active_modifications.json'
             active_data = {
-                mod_id: mod.to_dict() 
+                mod_id: mod.to_dict()
                 for mod_id, mod in active_modifications.items()
             }
             
-            with open(active_file, 'w') as f:
-                json.dump(active_data, f, indent=2, default=str)
+            self.sync()
+            next_generation = self.generation + 1
+            self._write_atomic(self.snapshot_file, {
+                'version': SNAPSHOT_VERSION,
+                'generation': next_generation,
+                'created_at': time.time(),
+                'history': history_data,
+                'active_modifications': active_data
+            })
             
-            self.logger.debug(f"Persisted {len(modification_history)} agent histories")
+            old_journal = self.journal_path()
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+            self.generation = next_generation
+            self.journal_records = 0
+            old_journal.unlink(missing_ok=True)
             
+            self.logger.debug(f"Compacted {len(modification_history)} agent histories into snapshot "
+                              f"generation {self.generation}")
+        
         except Exception as e:
             self.logger.error(f"Failed to persist modification history: {e}")
     
+    async def compact_if_needed(self,
+                                modification_history: Dict[str, ModificationHistory],
+                                active_modifications: Dict[str, AgentModification]) -> bool:
+        """Sync the journal and compact it once it passes the threshold."""
+        self.sync()
+        if not self.compaction_due:
+            return False
+        await self.save_modification_history(modification_history, active_modifications)
+        return True
+    
+    @staticmethod
+    def _history_from_dict(data: Dict[str, Any]) -> ModificationHistory:
+        history = ModificationHistory(
+            agent_name=data['agent_name'],
+            total_modifications=data['total_modifications'],
+            first_seen=data.get('first_seen'),
+            last_modified=data.get('last_modified'),
+            current_version=data.get('current_version')
+        )
+        for mod_data in data.get('modifications', []):
+            history.modifications.append(AgentModification.from_dict(mod_data))
+        return history
+    
+    def _replay_journal(self,
+                        modification_history: Dict[str, ModificationHistory],
+                        active_modifications: Dict[str, AgentModification]) -> int:
+        """Apply journal records on top of the snapshot; a torn final line is truncated."""
+        journal_file = self.journal_path()
+        if not journal_file.exists():
+            return 0
+        
+        replayed = 0
+        valid_bytes = 0
+        with open(journal_file, 'rb') as f:
+            for line in f:
+                try:
+                    if not line.endswith(b'\n'):
+                        raise ValueError("incomplete record")
+                    record = json.loads(line)
+                except ValueError:
+                    self.logger.warning(f"Discarding torn journal tail in {journal_file}")
+                    break
+                valid_bytes += len(line)
+                replayed += 1
+                
+                if record.get('op') == 'add':
+                    modification = AgentModification.from_dict(record['modification'])
+                    active_modifications[modification.modification_id] = modification
+                    history = modification_history.setdefault(
+                        modification.agent_name, ModificationHistory(agent_name=modification.agent_name)
+                    )
+                    history.add_modification(modification)
+                elif record.get('op') == 'expire':
+                    for mod_id in record.get('modification_ids', []):
+                        active_modifications.pop(mod_id, None)
+        
+        if valid_bytes < journal_file.stat().st_size:
+            with open(journal_file, 'r+b') as f:
+                f.truncate(valid_bytes)
+        return replayed
+    
+    def _load_legacy_files(self,
+                           modification_history: Dict[str, ModificationHistory],
+                           active_modifications: Dict[str, AgentModification]) -> bool:
+        """Read the pre-journal ``modification_history.json`` layout, if present."""
+        history_file = self.history_root / 'modification_history.json'
+        active_file = self.persistence_root / 'active_modifications.json'
+        if not history_file.exists() and not active_file.exists():
+            return False
+        
+        if history_file.exists():
+            with open(history_file, 'r') as f:
+                for agent_name, data in json.load(f).items():
+                    modification_history[agent_name] = self._history_from_dict(data)
+        if active_file.exists():
+            with open(active_file, 'r') as f:
+                for mod_id, mod_data in json.load(f).items():
+                    active_modifications[mod_id] = AgentModification.from_dict(mod_data)
+        return True
+    
     async def load_modification_history(self) -> tuple[Dict[str, ModificationHistory], Dict[str, AgentModification]]:
-        """Load existing modification history from disk."""
+        """Load modification history: the latest snapshot plus the journal tail."""
         modification_history = {}
         active_modifications = {}
         
         try:
-            # Load modification history
-            history_file = self.history_root / 'modification_history.json'
-            if history_file.exists():
-                with open(history_file, 'r') as f:
-                    history_data = json.load(f)
-                
-                for agent_name, data in history_data.items():
-                    history = ModificationHistory(
-                        agent_name=data['agent_name'],
-                        total_modifications=data['total_modifications'],
-                        first_seen=data.get('first_seen'),
-                        last_modified=data.get('last_modified'),
-                        current_version=data.get('current_version')
-                    )
-                    
-                    # Load modifications
-                    for mod_data in data.get('modifications', []):
-                        modification = AgentModification.from_dict(mod_data)
-                        history.modifications.append(modification)
-                    
-                    modification_history[agent_name] = history
-                
-                self.logger.info(f"Loaded {len(modification_history)} agent histories from disk")
+            if self.snapshot_file.exists():
+                with open(self.snapshot_file, 'r') as f:
+                    snapshot = json.load(f)
+                self.generation = snapshot.get('generation', 0)
+                for agent_name, data in snapshot.get('history', {}).items():
+                    modification_history[agent_name] = self._history_from_dict(data)
+                for mod_id, mod_data in snapshot.get('active_modifications', {}).items():
+                    active_modifications[mod_id] = AgentModification.from_dict(mod_data)
+            elif self._load_legacy_files(modification_history, active_modifications):
+                # Fold the legacy files into the first snapshot; they are not read again
+                await self.save_modification_history(modification_history, active_modifications)
+                self.logger.info("Migrated legacy modification history into a snapshot")
             
-            # Load active modifications
-            active_file = self.persistence_root / 'active_modifications.json'
-            if active_file.exists():
-                with open(active_file, 'r') as f:
-                    active_data = json.load(f)
-                
-                for mod_id, mod_data in active_data.items():
-                    modification = AgentModification.from_dict(mod_data)
-                    active_modifications[mod_id] = modification
-                
-                self.logger.info(f"Loaded {len(active_modifications)} active modifications")
+            self.journal_records = self._replay_journal(modification_history, active_modifications)
             
+            # Journals from older generations are leftovers of an interrupted compaction
+            for stale in self.history_root.glob('modifications-*.journal'):
+                if stale != self.journal_path():
+                    stale.unlink(missing_ok=True)
+            
+            self.logger.info(f"Loaded {len(modification_history)} agent histories and "
+                             f"{len(active_modifications)} active modifications "
+                             f"({self.journal_records} journal records replayed)")
+        
         except Exception as e:
             self.logger.error(f"Failed to load modification history: {e}")
         
         return modification_history, active_modifications
     
+    def close(self) -> None:
+        """Fsync and close the journal."""
+        if self._journal is None:
+            return
+        try:
+            self.sync()
+        except OSError as e:
+            self.logger.error(f"Failed to sync modification journal: {e}")
+        self._journal.close()
+        self._journal = None
+    
     async def save_agent_state(self, agent_name: str, state_data: Dict[str, Any]) -> None:
         """Save agent-specific state data."""
         try:
@@ -129,7 +334,7 @@ class PersistenceManager:
                 json.dump(state_data, f, indent=2, default=str)
             
             self.logger.debug(f"Saved state for agent '{agent_name}'")
-            
+        
         except Exception as e:
             self.logger.error(f"Failed to save agent state for '{agent_name}': {e}")
     
@@ -140,7 +345,7 @@ class PersistenceManager:
             if agent_file.exists():
                 with open(agent_file, 'r') as f:
                     return json.load(f)
-            
+        
         except Exception as e:
             self.logger.error(f"Failed to load agent state for '{agent_name}': {e}")
         
@@ -150,4 +355,4 @@ class PersistenceManager:
         """Clean up old persisted modification data."""
         # This is handled by the main cleanup process
         # Just log the cleanup request
-        self.logger.debug(f"Cleanup requested for {len(modifications_to_remove)} modifications")
\ No newline at end of file
+        self.logger.debug(f"Cleanup requested for {len(modifications_to_remove)} modifications")
@@ -11,6 +11,8 @@ This service provides:
 - Retry logic and error handling
 - Performance monitoring integration
 - Service lifecycle management
+- Transactional batch persistence to the local SQLite memory store
+- Adaptive batch sizing driven by queue depth and flush latency
 
 Performance targets:
 - Collection operations: <100ms
@@ -23,6 +25,8 @@ import asyncio
 import logging
 import time
 import json
+import uuid
+from collections import deque
 from typing import Dict, Any, Optional, List, Callable
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
@@ -33,6 +37,8 @@ import os
 
 from ..core.base_service import BaseService
 from ..core.config import Config
+from .memory import DEFAULT_MEMORY_DB_PATH, FlexibleMemoryService
+from .memory import MemoryCategory as StoreCategory
 
 
 class MemoryPriority(Enum):
@@ -55,6 +61,20 @@ class MemoryCategory(Enum):
     OPERATION = "operation"
 
 
+# Collector categories mapped onto memory store categories; the original
+# category is kept as a tag and in metadata
+STORE_CATEGORY_MAP = {
+    MemoryCategory.BUG: StoreCategory.ERROR,
+    MemoryCategory.ERROR: StoreCategory.ERROR,
+    MemoryCategory.FEEDBACK: StoreCategory.KNOWLEDGE,
+    MemoryCategory.ARCHITECTURE: StoreCategory.DECISION,
+    MemoryCategory.PERFORMANCE: StoreCategory.KNOWLEDGE,
+    MemoryCategory.INTEGRATION: StoreCategory.WORKFLOW,
+    MemoryCategory.QA: StoreCategory.WORKFLOW,
+    MemoryCategory.OPERATION: StoreCategory.WORKFLOW,
+}
+
+
 @dataclass
 class MemoryOperation:
     """Represents a queued memory operation."""
@@ -87,6 +107,9 @@ class CollectionStats:
     batch_operations: int = 0
     cache_hits: int = 0
     cache_misses: int = 0
+    batches_committed: int = 0
+    average_flush_latency: float = 0.0
+    current_batch_size: int = 0
     
     def success_rate(self) -> float:
         """Calculate success rate percentage."""
@@ -95,6 +118,33 @@ class CollectionStats:
         return (self.successful_operations / self.total_operations) * 100.0
 
 
+class AdaptiveBatchSizer:
+    """
+    Picks the next batch size from queue depth and flush latency.
+    
+    Grows multiplicatively while a backlog builds up and flushes stay well
+    under the latency target; halves when a flush exceeds the target; and
+    decays back toward the configured size when the queue drains.
+    """
+    
+    def __init__(self, initial: int, minimum: int, maximum: int, target_latency: float):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.baseline = min(max(initial, self.minimum), self.maximum)
+        self.size = self.baseline
+        self.target_latency = target_latency
+    
+    def update(self, batch_len: int, flush_latency: float, queue_depth: int) -> int:
+        """Record a completed flush and return the next batch size."""
+        if flush_latency > self.target_latency:
+            self.size = max(self.minimum, self.size // 2)
+        elif queue_depth >= self.size and flush_latency < self.target_latency / 2:
+            self.size = min(self.maximum, self.size * 2)
+        elif queue_depth == 0 and self.size > self.baseline:
+            self.size = max(self.baseline, self.size - max(1, (self.size - self.baseline) // 2))
+        return self.size
+
+
 class AsyncMemoryCollector(BaseService):
     """
     Fire-and-forget memory collection service.
@@ -117,6 +167,23 @@ class AsyncMemoryCollector(BaseService):
         self.max_concurrent_ops = self.get_config("max_concurrent_ops", 20)
         self.health_check_interval = self.get_config("health_check_interval", 60)
         
+        # Persistence: memories go to the local memory store in one transaction per batch
+        self.storage_path = self.get_config("storage.sqlite_path", DEFAULT_MEMORY_DB_PATH)
+        self.project_id = self.get_config("storage.project_id") or Path.cwd().name
+        self.memory_service: Optional[FlexibleMemoryService] = None
+        
+        # Adaptive batching: batch size follows queue depth and flush latency
+        self.adaptive_batching = self.get_config("adaptive_batching.enabled", True)
+        self.batch_linger = min(self.get_config("adaptive_batching.linger_seconds", 0.05), self.batch_timeout)
+        self.batch_sizer = AdaptiveBatchSizer(
+            initial=self.batch_size,
+            minimum=self.get_config("adaptive_batching.min_batch_size", 1),
+            maximum=self.get_config("adaptive_batching.max_batch_size", 500),
+            target_latency=self.get_config("adaptive_batching.target_flush_latency", 0.05)
+        )
+        self.flush_history: deque = deque(maxlen=self.get_config("adaptive_batching.history_size", 1000))
+        self._inflight_batch: Optional[asyncio.Task] = None
+        
         # Internal state
         self.operation_queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_queue_size)
         self.retry_queue: asyncio.Queue = asyncio.Queue()
@@ -151,6 +218,14 @@ class AsyncMemoryCollector(BaseService):
         if self.max_retries < 0:
             raise ValueError("max_retries must be non-negative")
         
+        # Open the local memory store
+        self.memory_service = FlexibleMemoryService({
+            "fallback_chain": ["sqlite"],
+            "sqlite_path": self.storage_path
+        })
+        if not await self.memory_service.initialize():
+            raise RuntimeError(f"Could not open memory store at {self.storage_path}")
+        
         # Initialize cache if enabled
         if self.cache_enabled:
             await self._initialize_cache()
@@ -164,6 +239,11 @@ class AsyncMemoryCollector(BaseService):
         # Process remaining operations
         await self._flush_queue()
         
+        # Close the memory store
+        if self.memory_service:
+            await self.memory_service.cleanup()
+            self.memory_service = None
+        
         # Clear cache
         if self.cache_enabled:
             self.cache.clear()
@@ -253,7 +333,8 @@ class AsyncMemoryCollector(BaseService):
                 raise ValueError(f"Invalid priority: {priority}")
             
             # Create operation
-            operation_id = f"op_{self.operation_counter}_{int(time.time() * 1000)}"
+            # Globally unique: the ID doubles as the stored memory_id
+            operation_id = f"op_{self.operation_counter}_{int(time.time() * 1000)}_{uuid.uuid4().hex[:12]}"
             self.operation_counter += 1
             
             operation = MemoryOperation(
@@ -336,49 +417,55 @@ class AsyncMemoryCollector(BaseService):
         self.performance_callbacks.append(callback)
     
     async def _queue_processor(self) -> None:
-        """Background task for processing queued operations."""
-        batch = []
-        last_batch_time = time.time()
-        
+        """Background task that drains the queue into batches and persists them."""
         while not self._stop_event.is_set():
             try:
-                # Get operation from queue with timeout
+                # Wait for the first operation of the next batch
                 try:
                     operation = await asyncio.wait_for(
                         self.operation_queue.get(), 
                         timeout=1.0
                     )
-                    batch.append(operation)
-                    
                 except asyncio.TimeoutError:
-                    # Check if we should process partial batch
-                    if batch and (time.time() - last_batch_time) > self.batch_timeout:
-                        await self._process_batch(batch)
-                        batch = []
-                        last_batch_time = time.time()
                     continue
                 
-                # Process batch when full or timeout reached
-                should_process = (
-                    len(batch) >= self.batch_size or
-                    (time.time() - last_batch_time) > self.batch_timeout
-                )
+                batch = [operation]
+                await self._fill_batch(batch)
                 
-                if should_process:
-                    await self._process_batch(batch)
-                    batch = []
-                    last_batch_time = time.time()
+                # Shield the write so a shutdown cancel cannot drop a dequeued batch;
+                # _flush_queue waits for it instead
+                self._inflight_batch = asyncio.ensure_future(self._process_batch(batch))
+                await asyncio.shield(self._inflight_batch)
+                self._inflight_batch = None
                 
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
                 self.logger.error(f"Error in queue processor: {e}")
                 await asyncio.sleep(1.0)
+    
+    async def _fill_batch(self, batch: List[MemoryOperation]) -> None:
+        """Top up a batch from the queue, lingering briefly when it runs dry."""
+        target = self.batch_sizer.size if self.adaptive_batching else self.batch_size
+        linger = self.batch_linger if self.adaptive_batching else self.batch_timeout
+        deadline = time.monotonic() + linger
         
-        # Process remaining batch on shutdown
-        if batch:
-            await self._process_batch(batch)
+        while len(batch) < target:
+            try:
+                batch.append(self.operation_queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.operation_queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
     
     async def _process_batch(self, batch: List[MemoryOperation]) -> None:
-        """Process a batch of memory operations."""
+        """Persist a batch of memory operations in a single transaction."""
         if not batch:
             return
         
@@ -393,75 +480,88 @@ class AsyncMemoryCollector(BaseService):
         }
         batch.sort(key=lambda op: priority_order[op.priority])
         
-        # Process operations concurrently with semaphore
-        tasks = []
         for operation in batch:
-            task = asyncio.create_task(self._process_operation(operation))
-            tasks.append(task)
+            self.active_operations[operation.id] = operation
         
-        # Wait for all operations to complete
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        flush_start = time.time()
+        try:
+            await self._store_batch(batch)
+        except Exception as e:
+            self.logger.error(f"Failed to persist batch of {len(batch)} operations: {e}")
+            for operation in batch:
+                await self._handle_operation_failure(operation, e)
+            return
+        finally:
+            for operation in batch:
+                self.active_operations.pop(operation.id, None)
+            flush_latency = time.time() - flush_start
+            self._record_flush(len(batch), flush_latency)
         
         # Update batch stats
         self.stats.batch_operations += len(batch)
+        self.stats.successful_operations += len(batch)
+        self.stats.batches_committed += 1
         
-        # Handle failed operations
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                operation = batch[i]
-                await self._handle_operation_failure(operation, result)
+        self._update_average_latency(flush_latency)
+        for operation in batch:
+            if self.cache_enabled:
+                await self._update_cache(operation)
+            if operation.priority == MemoryPriority.CRITICAL:
+                self.logger.info(f"Processed critical operation: {operation.id}")
     
-    async def _process_operation(self, operation: MemoryOperation) -> None:
-        """Process a single memory operation."""
-        async with self.semaphore:
-            operation_start = time.time()
-            
-            try:
-                # Add to active operations
-                self.active_operations[operation.id] = operation
-                
-                # Simulate memory storage (replace with actual implementation)
-                await self._store_memory(operation)
-                
-                # Update cache
-                if self.cache_enabled:
-                    await self._update_cache(operation)
-                
-                # Success
-                self.stats.successful_operations += 1
-                
-                # Log critical operations
-                if operation.priority == MemoryPriority.CRITICAL:
-                    self.logger.info(f"Processed critical operation: {operation.id}")
-                
-            except Exception as e:
-                self.logger.error(f"Failed to process operation {operation.id}: {e}")
-                self.stats.failed_operations += 1
-                raise
-            
-            finally:
-                # Remove from active operations
-                self.active_operations.pop(operation.id, None)
-                
-                # Update latency
-                operation_latency = time.time() - operation_start
-                self._update_average_latency(operation_latency)
-    
-    async def _store_memory(self, operation: MemoryOperation) -> None:
-        """Store memory operation (placeholder for actual implementation)."""
-        # This would integrate with the actual memory backend
-        # For now, simulate storage with delay
-        await asyncio.sleep(0.01)  # Simulate storage latency
-        
-        # In actual implementation, this would:
-        # 1. Choose appropriate backend (SQLite, mem0AI)
-        # 2. Format data according to backend schema
-        # 3. Store with appropriate metadata
-        # 4. Handle backend-specific errors
-        
-        self.logger.debug(f"Stored memory operation: {operation.id} "
-                         f"(category: {operation.category.value}, "
-                         f"priority: {operation.priority.value})")
+    def _record_flush(self, batch_len: int, flush_latency: float) -> None:
+        """Feed a flush into the batch sizer and the queue-depth history."""
+        queue_depth = self.operation_queue.qsize()
+        next_size = self.batch_sizer.update(batch_len, flush_latency, queue_depth)
+        
+        alpha = 0.2
+        if self.stats.average_flush_latency == 0:
+            self.stats.average_flush_latency = flush_latency
+        else:
+            self.stats.average_flush_latency = alpha * flush_latency + (1 - alpha) * self.stats.average_flush_latency
+        self.stats.current_batch_size = next_size
+        
+        self.flush_history.append({
+            "timestamp": time.time(),
+            "batch_size": batch_len,
+            "flush_latency": flush_latency,
+            "queue_depth": queue_depth,
+            "next_batch_size": next_size
+        })
+    
+    def _to_memory_record(self, operation: MemoryOperation) -> Dict[str, Any]:
+        """Convert a queued operation into a memory store record."""
+        return {
+            "memory_id": operation.id,
+            "content": operation.content,
+            "category": STORE_CATEGORY_MAP[operation.category],
+            "metadata": {
+                **operation.metadata,
+                "operation_id": operation.id,
+                "collector_category": operation.category.value,
+                "priority": operation.priority.value
+            },
+            "tags": [operation.category.value, operation.priority.value],
+            "created_at": operation.created_at.timestamp()
+        }
+    
+    async def _store_batch(self, batch: List[MemoryOperation]) -> None:
+        """
+        Write a batch to the memory store in one transaction (off the event loop).
+        
+        A timeout stops waiting but cannot cancel the worker thread, which may
+        still commit. Records are keyed by operation ID and inserted with
+        INSERT OR IGNORE, so the retry that follows never duplicates them.
+        """
+        if self.memory_service is None or self.memory_service.backend is None:
+            raise RuntimeError("Memory store is not initialized")
+        
+        records = [self._to_memory_record(operation) for operation in batch]
+        backend = self.memory_service.backend
+        await asyncio.wait_for(
+            asyncio.to_thread(backend.insert_batch, self.project_id, records),
+            timeout=self.operation_timeout
+        )
     
     async def _handle_operation_failure(self, operation: MemoryOperation, error: Exception) -> None:
         """Handle failed memory operation."""
@@ -652,6 +752,11 @@ class AsyncMemoryCollector(BaseService):
         """Flush remaining operations during shutdown."""
         self.logger.info("Flushing remaining operations...")
         
+        # Let a batch interrupted by shutdown finish its write
+        if self._inflight_batch is not None and not self._inflight_batch.done():
+            await asyncio.gather(self._inflight_batch, return_exceptions=True)
+        self._inflight_batch = None
+        
         # Process remaining operations in main queue
         remaining_ops = []
         while not self.operation_queue.empty():
@@ -671,6 +776,8 @@ class AsyncMemoryCollector(BaseService):
         
         if remaining_ops:
             self.logger.info(f"Processing {len(remaining_ops)} remaining operations...")
-            await self._process_batch(remaining_ops)
+            max_batch = self.batch_sizer.maximum
+            for offset in range(0, len(remaining_ops), max_batch):
+                await self._process_batch(remaining_ops[offset:offset + max_batch])
         
         self.logger.info("Queue flush completed")
\ No newline at end of file
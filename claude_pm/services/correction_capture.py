@@ -8,7 +8,9 @@ to improve agent behavior over time.
 
 Key Features:
 - Automatic correction capture from Task Tool subprocess responses
-- JSON-based storage with proper file naming and rotation
+- SQLite (WAL) storage with indexed queries (default), or the legacy
+  one-JSON-file-per-correction layout via correction_storage_backend="json"
+- One-time migration of legacy correction files into SQLite
 - Data integrity validation and error handling
 - Integration with existing framework configuration
 - Seamless workflow integration without disrupting existing functionality
@@ -91,6 +93,8 @@ class CorrectionStorageConfig:
     max_file_size_mb: int = 10
     backup_enabled: bool = True
     compression_enabled: bool = True
+    backend: str = "sqlite"  # sqlite or json
+    batch_size: int = 1
     
     def __post_init__(self):
         """Ensure storage path is a Path object."""
@@ -118,6 +122,7 @@ class CorrectionCapture:
         self.storage_config = self._create_storage_config()
         self.corrections_cache: List[CorrectionData] = []
         self.session_id = str(uuid.uuid4())
+        self.store = None
         
         if self.enabled:
             self._initialize_storage()
@@ -134,7 +139,9 @@ class CorrectionCapture:
             rotation_days=self.config.get("correction_storage_rotation_days", 30),
             max_file_size_mb=self.config.get("correction_max_file_size_mb", 10),
             backup_enabled=self.config.get("correction_backup_enabled", True),
-            compression_enabled=self.config.get("correction_compression_enabled", True)
+            compression_enabled=self.config.get("correction_compression_enabled", True),
+            backend=self.config.get("correction_storage_backend", "sqlite"),
+            batch_size=self.config.get("correction_batch_size", 1)
         )
     
     def _initialize_storage(self) -> None:
@@ -169,10 +176,25 @@ class CorrectionCapture:
             # Update session count
             self._update_session_count()
             
+            if self.storage_config.backend == "sqlite":
+                self._initialize_sqlite_store(corrections_dir)
+            
         except Exception as e:
             logger.error(f"Failed to initialize storage: {e}")
             raise
     
+    def _initialize_sqlite_store(self, corrections_dir: Path) -> None:
+        """Open the SQLite store and import any legacy correction files once."""
+        from claude_pm.services.correction_store import SQLiteCorrectionStore
+        
+        self.store = SQLiteCorrectionStore(
+            self.storage_config.storage_path / "corrections.db",
+            batch_size=self.storage_config.batch_size
+        )
+        migration = self.store.migrate_from_files(corrections_dir)
+        if migration["migrated"]:
+            logger.info(f"Imported {migration['migrated']} legacy correction files into SQLite")
+    
     def _update_session_count(self) -> None:
         """Update session count in metadata."""
         try:
@@ -246,11 +268,14 @@ class CorrectionCapture:
                 metadata=metadata or {}
             )
             
-            # Add to cache
-            self.corrections_cache.append(correction_data)
-            
-            # Store to file
-            self._store_correction(correction_data)
+            if self.store is not None:
+                self.store.add(correction_data, session_id=self.session_id[:8])
+            else:
+                # Add to cache
+                self.corrections_cache.append(correction_data)
+                
+                # Store to file
+                self._store_correction(correction_data)
             
             logger.info(f"Captured correction {correction_id} for {agent_type}")
             
@@ -303,11 +328,19 @@ class CorrectionCapture:
         if not self.enabled:
             return []
         
+        if self.store is not None:
+            try:
+                return self.store.query(agent_type=agent_type, since=since, severity=severity, limit=limit)
+            except Exception as e:
+                logger.error(f"Failed to retrieve corrections: {e}")
+                return []
+        
         try:
             corrections = []
             
             # Load from cache first
             corrections.extend(self.corrections_cache)
+            cached_ids = {c.correction_id for c in self.corrections_cache}
             
             # Load from files
             corrections_dir = self.storage_config.storage_path / "corrections"
@@ -321,7 +354,7 @@ class CorrectionCapture:
                                     correction = CorrectionData.from_dict(data)
                                     
                                     # Skip if already in cache
-                                    if correction.correction_id not in [c.correction_id for c in self.corrections_cache]:
+                                    if correction.correction_id not in cached_ids:
                                         corrections.append(correction)
                                         
                             except Exception as e:
@@ -353,6 +386,9 @@ class CorrectionCapture:
     def get_correction_stats(self) -> Dict[str, Any]:
         """Get statistics about captured corrections."""
         try:
+            if self.store is not None:
+                return self._summarize_store_stats(self.store.get_stats())
+            
             corrections = self.get_corrections()
             
             if not corrections:
@@ -403,6 +439,30 @@ class CorrectionCapture:
                 performance_metrics={"total_corrections": 0}
             ).__dict__
     
+    @staticmethod
+    def _summarize_store_stats(stats: Dict[str, Any]) -> Dict[str, Any]:
+        """Shape SQLite aggregate counts like the file-based statistics."""
+        agent_counts = stats["agent_correction_counts"]
+        type_counts = stats["correction_types"]
+        if not stats["total_corrections"]:
+            return {
+                "total_corrections": 0,
+                "agents_with_corrections": [],
+                "correction_types": {},
+                "severity_distribution": {},
+                "sessions_with_corrections": 0
+            }
+        return {
+            "total_corrections": stats["total_corrections"],
+            "agents_with_corrections": list(agent_counts.keys()),
+            "agent_correction_counts": agent_counts,
+            "correction_types": type_counts,
+            "severity_distribution": stats["severity_distribution"],
+            "sessions_with_corrections": stats["sessions_with_corrections"],
+            "most_corrected_agent": max(agent_counts.items(), key=lambda x: x[1])[0] if agent_counts else None,
+            "most_common_correction_type": max(type_counts.items(), key=lambda x: x[1])[0] if type_counts else None
+        }
+    
     def cleanup_old_corrections(self, days_to_keep: Optional[int] = None) -> Dict[str, Any]:
         """
         Clean up old correction files.
@@ -423,6 +483,12 @@ class CorrectionCapture:
             removed_files = []
             removed_dirs = []
             total_size_removed = 0
+            removed_corrections = 0
+            
+            if self.store is not None:
+                removed_corrections = self.store.delete_older_than(cutoff_date)
+            
+            # Legacy per-correction files (the JSON backend, or leftovers after migration)
             
             corrections_dir = self.storage_config.storage_path / "corrections"
             if corrections_dir.exists():
@@ -456,6 +522,7 @@ class CorrectionCapture:
             logger.info(f"Cleanup completed: removed {len(removed_files)} files, {len(removed_dirs)} directories, {total_size_removed} bytes")
             
             return {
+                "removed_corrections": removed_corrections,
                 "removed_files": len(removed_files),
                 "removed_directories": len(removed_dirs),
                 "total_size_removed": total_size_removed,
@@ -501,7 +568,10 @@ class CorrectionCapture:
             corrections_dir = self.storage_config.storage_path / "corrections"
             corrupted_files = []
             
-            if corrections_dir.exists():
+            if self.store is not None:
+                for problem in self.store.check_integrity():
+                    issues.append(f"Correction database: {problem}")
+            elif corrections_dir.exists():
                 for session_dir in corrections_dir.iterdir():
                     if session_dir.is_dir():
                         for correction_file in session_dir.glob("*.json"):
@@ -0,0 +1,337 @@
+"""
+SQLite Correction Store
+=======================
+
+SQLite (WAL) storage backend for CorrectionCapture. Replaces the one-JSON-file-
+per-correction layout, whose queries had to load and parse every file.
+
+Key Features:
+- Single database file in WAL mode (readers never block the writer)
+- Indexes on agent_type, timestamp, severity and correction_id
+- Filtering, ordering and limits evaluated in SQL
+- Batched inserts (write-through by default, optional buffering for bulk capture)
+- One-time migration from the legacy ``corrections/session_*/*.json`` layout
+- Aggregate statistics computed with GROUP BY queries
+
+Usage:
+    from claude_pm.services.correction_store import SQLiteCorrectionStore
+    
+    store = SQLiteCorrectionStore(Path("~/.claude-pm/training/corrections.db").expanduser())
+    store.add(correction)
+    recent = store.query(agent_type="engineer", limit=10)
+"""
+
+import atexit
+import json
+import logging
+import sqlite3
+import threading
+import weakref
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from claude_pm.services.correction_capture import CorrectionData
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS corrections (
+    correction_id TEXT PRIMARY KEY,
+    agent_type TEXT NOT NULL,
+    correction_type TEXT NOT NULL,
+    severity TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    subprocess_id TEXT,
+    session_id TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_corrections_agent_time ON corrections (agent_type, timestamp);
+CREATE INDEX IF NOT EXISTS idx_corrections_time ON corrections (timestamp);
+CREATE INDEX IF NOT EXISTS idx_corrections_severity_time ON corrections (severity, timestamp);
+CREATE TABLE IF NOT EXISTS store_metadata (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+_INSERT = (
+    "INSERT OR REPLACE INTO corrections "
+    "(correction_id, agent_type, correction_type, severity, timestamp, subprocess_id, session_id, data) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+_open_stores: "weakref.WeakSet[SQLiteCorrectionStore]" = weakref.WeakSet()
+
+
+@atexit.register
+def _close_stores_at_exit():
+    """Flush buffered inserts on interpreter shutdown."""
+    for store in list(_open_stores):
+        store.close()
+
+
+class SQLiteCorrectionStore:
+    """
+    SQLite-backed correction storage.
+    
+    Thread-safe: a single connection is shared behind a lock. Buffered
+    inserts are flushed when the batch fills, before every read and on close.
+    """
+    
+    def __init__(self, db_path: Path, batch_size: int = 1):
+        """
+        Open (and create if needed) the correction database.
+        
+        Args:
+            db_path: Path of the SQLite database file
+            batch_size: Number of corrections buffered before an insert batch is written
+        """
+        self.db_path = Path(db_path)
+        self.batch_size = max(1, batch_size)
+        self._lock = threading.RLock()
+        self._pending: List[Tuple] = []
+        
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn: Optional[sqlite3.Connection] = sqlite3.connect(
+            str(self.db_path), check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._set_metadata("schema_version", str(SCHEMA_VERSION))
+        _open_stores.add(self)
+    
+    @staticmethod
+    def _row_for(correction: CorrectionData, session_id: Optional[str]) -> Tuple:
+        return (
+            correction.correction_id,
+            correction.agent_type,
+            correction.correction_type.value,
+            correction.severity,
+            correction.timestamp,
+            correction.subprocess_id,
+            session_id,
+            json.dumps(correction.to_dict())
+        )
+    
+    def add(self, correction: CorrectionData, session_id: Optional[str] = None) -> None:
+        """Store a correction (buffered until the batch fills)."""
+        with self._lock:
+            self._pending.append(self._row_for(correction, session_id))
+            if len(self._pending) >= self.batch_size:
+                self._flush_locked()
+    
+    def add_many(self, corrections: Iterable[CorrectionData], session_id: Optional[str] = None) -> int:
+        """Store many corrections in a single transaction.
+        
+        Returns:
+            Number of corrections written
+        """
+        rows = [self._row_for(correction, session_id) for correction in corrections]
+        with self._lock:
+            self._pending.extend(rows)
+            self._flush_locked()
+        return len(rows)
+    
+    def flush(self) -> None:
+        """Write buffered corrections."""
+        with self._lock:
+            self._flush_locked()
+    
+    def _flush_locked(self) -> None:
+        if not self._pending or self._conn is None:
+            return
+        rows, self._pending = self._pending, []
+        try:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(_INSERT, rows)
+            self._conn.execute("COMMIT")
+        except sqlite3.Error:
+            self._conn.execute("ROLLBACK")
+            self._pending = rows + self._pending
+            raise
+    
+    def query(
+        self,
+        agent_type: Optional[str] = None,
+        since: Optional[datetime] = None,
+        severity: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[CorrectionData]:
+        """
+        Return corrections matching the filters, newest first.
+        
+        Args:
+            agent_type: Filter by agent type
+            since: Only corrections at or after this time
+            severity: Filter by severity level
+            limit: Maximum number of corrections to return
+        
+        Returns:
+            List of correction data
+        """
+        clauses, params = [], []
+        if agent_type:
+            clauses.append("agent_type = ?")
+            params.append(agent_type)
+        if since:
+            clauses.append("timestamp >= ?")
+            params.append(since.isoformat())
+        if severity:
+            clauses.append("severity = ?")
+            params.append(severity)
+        
+        sql = "SELECT data FROM corrections"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY timestamp DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        
+        with self._lock:
+            self._flush_locked()
+            rows = self._conn.execute(sql, params).fetchall()
+        
+        corrections = []
+        for (data,) in rows:
+            try:
+                corrections.append(CorrectionData.from_dict(json.loads(data)))
+            except (ValueError, TypeError, KeyError) as e:
+                logger.error(f"Skipping unreadable correction row: {e}")
+        return corrections
+    
+    def get(self, correction_id: str) -> Optional[CorrectionData]:
+        """Look up a single correction by ID."""
+        with self._lock:
+            self._flush_locked()
+            row = self._conn.execute(
+                "SELECT data FROM corrections WHERE correction_id = ?", (correction_id,)
+            ).fetchone()
+        return CorrectionData.from_dict(json.loads(row[0])) if row else None
+    
+    def count(self) -> int:
+        """Total number of stored corrections."""
+        with self._lock:
+            self._flush_locked()
+            return self._conn.execute("SELECT COUNT(*) FROM corrections").fetchone()[0]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Counts by agent type, correction type, severity and session."""
+        with self._lock:
+            self._flush_locked()
+            conn = self._conn
+            
+            def grouped(column: str) -> Dict[str, int]:
+                return dict(conn.execute(
+                    f"SELECT {column}, COUNT(*) FROM corrections GROUP BY {column}"
+                ).fetchall())
+            
+            return {
+                "total_corrections": conn.execute("SELECT COUNT(*) FROM corrections").fetchone()[0],
+                "agent_correction_counts": grouped("agent_type"),
+                "correction_types": grouped("correction_type"),
+                "severity_distribution": grouped("severity"),
+                "sessions_with_corrections": conn.execute(
+                    "SELECT COUNT(DISTINCT session_id) FROM corrections"
+                ).fetchone()[0]
+            }
+    
+    def delete_older_than(self, cutoff: datetime) -> int:
+        """Delete corrections older than ``cutoff``.
+        
+        Returns:
+            Number of corrections removed
+        """
+        with self._lock:
+            self._flush_locked()
+            cursor = self._conn.execute("DELETE FROM corrections WHERE timestamp < ?", (cutoff.isoformat(),))
+            return cursor.rowcount
+    
+    def check_integrity(self) -> List[str]:
+        """Run SQLite's quick integrity check; returns a list of problems (empty if OK)."""
+        with self._lock:
+            rows = self._conn.execute("PRAGMA quick_check").fetchall()
+        problems = [row[0] for row in rows]
+        return [] if problems == ["ok"] else problems
+    
+    def _get_metadata(self, key: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM store_metadata WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+    
+    def _set_metadata(self, key: str, value: str) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO store_metadata (key, value) VALUES (?, ?)", (key, value)
+        )
+    
+    def migrate_from_files(self, corrections_dir: Path, batch_size: int = 500, force: bool = False) -> Dict[str, Any]:
+        """
+        Import corrections from the legacy one-file-per-correction layout.
+        
+        Runs once per database unless ``force`` is set; existing rows win on
+        duplicate IDs. Legacy files are left in place.
+        
+        Args:
+            corrections_dir: The ``corrections`` directory holding ``session_*`` folders
+            batch_size: Rows per insert transaction
+            force: Re-scan even if a migration was already recorded
+        
+        Returns:
+            Migration summary
+        """
+        with self._lock:
+            if not force and self._get_metadata("files_migrated_at"):
+                return {"migrated": 0, "failed": 0, "skipped": True}
+        
+        migrated = failed = 0
+        batch: List[Tuple] = []
+        
+        def write(rows: List[Tuple]) -> None:
+            with self._lock:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(_INSERT.replace("OR REPLACE", "OR IGNORE"), rows)
+                self._conn.execute("COMMIT")
+        
+        if corrections_dir.exists():
+            for session_dir in corrections_dir.iterdir():
+                if not session_dir.is_dir():
+                    continue
+                session_id = session_dir.name[len("session_"):] if session_dir.name.startswith("session_") else None
+                for correction_file in session_dir.glob("*.json"):
+                    if correction_file.name.startswith("hook_"):
+                        continue
+                    try:
+                        with open(correction_file, 'r') as f:
+                            correction = CorrectionData.from_dict(json.load(f))
+                    except Exception as e:
+                        logger.error(f"Failed to migrate correction from {correction_file}: {e}")
+                        failed += 1
+                        continue
+                    batch.append(self._row_for(correction, session_id))
+                    if len(batch) >= batch_size:
+                        write(batch)
+                        migrated += len(batch)
+                        batch = []
+        if batch:
+            write(batch)
+            migrated += len(batch)
+        
+        with self._lock:
+            self._set_metadata("files_migrated_at", datetime.now().isoformat())
+        logger.info(f"Migrated {migrated} legacy correction files into {self.db_path} ({failed} failed)")
+        return {"migrated": migrated, "failed": failed, "skipped": False}
+    
+    def close(self) -> None:
+        """Flush buffered corrections and close the connection."""
+        with self._lock:
+            if self._conn is None:
+                return
+            try:
+                self._flush_locked()
+            except sqlite3.Error as e:
+                logger.error(f"Failed to flush corrections on close: {e}")
+            self._conn.close()
+            self._conn = None
@@ -11,6 +11,7 @@ Key Features:
 - Performance monitoring and optimization
 - Batch processing for efficiency
 - Integration with existing Task Tool subprocess system
+- Append-only segmented history storage (queries read only matching segments)
 
 Integration Points:
 - CorrectionCapture: Automatic evaluation on correction capture
@@ -31,6 +32,7 @@ import uuid
 from claude_pm.core.config import Config
 from claude_pm.services.correction_capture import CorrectionCapture, CorrectionData, CorrectionType
 from claude_pm.services.mirascope_evaluator import MirascopeEvaluator, EvaluationResult, EvaluationCriteria
+from claude_pm.services.segment_store import DEFAULT_SEGMENT_BYTES, SegmentedRecordStore
 
 logger = logging.getLogger(__name__)
 
@@ -91,6 +93,13 @@ class EvaluationIntegrationService:
         self.storage_path = Path(self.config.get("evaluation_storage_path", "~/.claude-pm/training")).expanduser()
         self.integration_dir = self.storage_path / "integration"
         self.integration_dir.mkdir(parents=True, exist_ok=True)
+        self.history_store = SegmentedRecordStore(
+            self.integration_dir,
+            "integration",
+            lookup_field="correction_id",
+            max_segment_bytes=self.config.get("evaluation_segment_bytes", DEFAULT_SEGMENT_BYTES)
+        )
+        self.history_store.import_legacy_files("integration_*.json")
         
         if self.enabled:
             logger.info("Evaluation integration service initialized")
@@ -181,16 +190,12 @@ class EvaluationIntegrationService:
     
     async def _has_evaluation(self, correction_id: str) -> bool:
         """Check if correction already has an evaluation."""
-        # Check if evaluation file exists
-        evaluation_files = list(self.evaluator.evaluations_dir.glob(f"*_{correction_id}.json"))
-        return len(evaluation_files) > 0
+        # Answered from the in-memory segment indexes; no directory scan
+        return self.history_store.contains(correction_id) or self.evaluator.has_evaluation(correction_id)
     
     async def _store_integration_result(self, result: EvaluationResult) -> None:
         """Store integration result linking evaluation to correction."""
         try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"integration_{timestamp}_{result.evaluation_id}.json"
-            
             integration_data = {
                 "evaluation_id": result.evaluation_id,
                 "correction_id": result.correction_id,
@@ -201,11 +206,9 @@ class EvaluationIntegrationService:
                 "integration_type": "automatic" if result.correction_id else "manual"
             }
             
-            integration_file = self.integration_dir / filename
-            with open(integration_file, 'w') as f:
-                json.dump(integration_data, f, indent=2)
+            self.history_store.append(integration_data)
             
-            logger.debug(f"Stored integration result: {integration_file}")
+            logger.debug(f"Stored integration result: {result.evaluation_id}")
             
         except Exception as e:
             logger.error(f"Failed to store integration result: {e}")
@@ -390,37 +393,7 @@ class EvaluationIntegrationService:
             List of evaluation history entries
         """
         try:
-            history = []
-            
-            # Load integration results
-            if self.integration_dir.exists():
-                for integration_file in self.integration_dir.glob("integration_*.json"):
-                    try:
-                        with open(integration_file, 'r') as f:
-                            data = json.load(f)
-                        
-                        # Apply filters
-                        if agent_type and data.get("agent_type") != agent_type:
-                            continue
-                        
-                        if since:
-                            result_time = datetime.fromisoformat(data.get("timestamp", ""))
-                            if result_time < since:
-                                continue
-                        
-                        history.append(data)
-                        
-                    except Exception as e:
-                        logger.error(f"Failed to load integration result {integration_file}: {e}")
-            
-            # Sort by timestamp (newest first)
-            history.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
-            
-            # Apply limit
-            if limit:
-                history = history[:limit]
-            
-            return history
+            return self.history_store.query(key=agent_type, since=since, limit=limit)
             
         except Exception as e:
             logger.error(f"Failed to get evaluation history: {e}")
@@ -519,6 +492,8 @@ class EvaluationIntegrationService:
             
             removed_files = []
             total_size_removed = 0
+            segment_cleanup = self.history_store.drop_before(cutoff_date)
+            total_size_removed += segment_cleanup["bytes_removed"]
             
             if self.integration_dir.exists():
                 for integration_file in self.integration_dir.glob("integration_*.json"):
@@ -544,6 +519,8 @@ class EvaluationIntegrationService:
             return {
                 "integration_cleanup": {
                     "removed_files": len(removed_files),
+                    "removed_segments": segment_cleanup["removed_segments"],
+                    "removed_records": segment_cleanup["removed_records"],
                     "total_size_removed": total_size_removed,
                     "files_removed": removed_files if len(removed_files) < 10 else removed_files[:10] + ["..."]
                 },
@@ -651,6 +628,7 @@ async def shutdown_integration_service() -> None:
     
     if _integration_service:
         await _integration_service.stop_background_tasks()
+        _integration_service.history_store.close()
         _integration_service = None
 
 
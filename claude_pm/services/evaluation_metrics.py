@@ -9,6 +9,7 @@ Key Features:
 - Real-time performance metrics
 - Agent-specific performance analysis
 - Trend analysis and improvement tracking
+- Streaming anomaly detection and fleet-wide vectorized trend analysis
 - Performance benchmarking
 - Automated recommendations
 - Export capabilities for reporting
@@ -24,6 +25,9 @@ Metrics Categories:
 import asyncio
 import json
 import logging
+import math
+from array import array
+from bisect import bisect_left
 from collections import defaultdict, deque
 from dataclasses import dataclass, field, asdict
 from datetime import datetime, timedelta
@@ -36,6 +40,7 @@ import uuid
 from claude_pm.core.config import Config
 from claude_pm.services.mirascope_evaluator import EvaluationResult, EvaluationCriteria
 from claude_pm.services.correction_capture import CorrectionData, CorrectionType
+from claude_pm.services.series_analytics import StreamingAnomalyDetector, ewma, latest_zscores, linear_trends
 
 logger = logging.getLogger(__name__)
 
@@ -75,49 +80,191 @@ class MetricPoint:
 
 @dataclass
 class MetricSeries:
-    """Time series of metric points."""
+    """
+    Time series of metric points.
+    
+    Points live in a fixed-capacity ring buffer of parallel arrays
+    (timestamps, values, running prefix sums). Adding a point is O(1);
+    window queries binary-search the timestamps and read count, mean and
+    standard deviation from the prefix sums, so a poll costs O(log n)
+    plus whatever order statistics (median, min, max) it asks for.
+    """
     metric_name: str
     metric_type: MetricType
     agent_type: Optional[str] = None
-    points: List[MetricPoint] = field(default_factory=list)
     max_points: int = 1000
     
-    def add_point(self, value: float, metadata: Optional[Dict[str, Any]] = None) -> None:
-        """Add a new metric point."""
-        point = MetricPoint(
-            timestamp=datetime.now(),
-            value=value,
-            metadata=metadata or {}
-        )
-        
-        self.points.append(point)
+    def __post_init__(self):
+        self.max_points = max(1, self.max_points)
+        self._clear()
+    
+    def _clear(self) -> None:
+        capacity = self.max_points
+        self._timestamps = array('d', bytes(8 * capacity))
+        self._values = array('d', bytes(8 * capacity))
+        self._prefix_sums = array('d', bytes(8 * capacity))
+        self._prefix_squares = array('d', bytes(8 * capacity))
+        self._metadata: List[Optional[Dict[str, Any]]] = [None] * capacity
+        self._start = 0
+        self._size = 0
+        self._writes = 0
+        # Prefix sums of the point just before the oldest one (evicted or discarded)
+        self._base_sum = 0.0
+        self._base_square = 0.0
+        # Values are accumulated relative to the first value to keep the variance numerically stable
+        self._shift: Optional[float] = None
+        self._stats_cache: Dict[Tuple[int, int], Dict[str, Any]] = {}
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    @property
+    def points(self) -> List[MetricPoint]:
+        """All points, oldest first."""
+        return self._materialize(0, self._size)
+    
+    @points.setter
+    def points(self, points: List[MetricPoint]) -> None:
+        self._clear()
+        for point in points:
+            self.add_point(point.value, point.metadata, timestamp=point.timestamp)
+    
+    def add_point(self, value: float, metadata: Optional[Dict[str, Any]] = None,
+                  timestamp: Optional[datetime] = None) -> None:
+        """
+        Add a new metric point, evicting the oldest one when full.
         
-        # Maintain max points limit
-        if len(self.points) > self.max_points:
-            self.points.pop(0)
+        Timestamps are kept in order: a point older than the newest one
+        (clock adjustment, late backfill) is stored at the newest timestamp.
+        """
+        capacity = self.max_points
+        ts = (timestamp or datetime.now()).timestamp()
+        value = float(value)
+        if self._shift is None:
+            self._shift = value
+        
+        if self._size:
+            last = (self._start + self._size - 1) % capacity
+            ts = max(ts, self._timestamps[last])
+            previous_sum, previous_square = self._prefix_sums[last], self._prefix_squares[last]
+        else:
+            previous_sum, previous_square = self._base_sum, self._base_square
+        
+        if self._size == capacity:
+            # Evict the oldest point; its prefix becomes the new base
+            self._base_sum = self._prefix_sums[self._start]
+            self._base_square = self._prefix_squares[self._start]
+            self._start = (self._start + 1) % capacity
+            self._size -= 1
+        
+        index = (self._start + self._size) % capacity
+        shifted = value - self._shift
+        self._timestamps[index] = ts
+        self._values[index] = value
+        self._prefix_sums[index] = previous_sum + shifted
+        self._prefix_squares[index] = previous_square + shifted * shifted
+        self._metadata[index] = metadata or {}
+        self._size += 1
+        self._writes += 1
+        self._stats_cache.clear()
+        
+        if self._writes % capacity == 0:
+            self._rebase()
+    
+    def _rebase(self) -> None:
+        """Re-zero the prefix sums at the current base (amortized O(1) per insert)."""
+        for offset in range(self._size):
+            index = (self._start + offset) % self.max_points
+            self._prefix_sums[index] -= self._base_sum
+            self._prefix_squares[index] -= self._base_square
+        self._base_sum = self._base_square = 0.0
+    
+    def _physical(self, offset: int) -> int:
+        return (self._start + offset) % self.max_points
+    
+    def _first_at_or_after(self, ts: float) -> int:
+        """Offset (from the oldest point) of the first point with timestamp >= ts."""
+        capacity = self.max_points
+        end = self._start + self._size
+        if end <= capacity:
+            return bisect_left(self._timestamps, ts, self._start, end) - self._start
+        # Wrapped: [start, capacity) holds the older points, [0, end - capacity) the newer ones
+        if ts <= self._timestamps[capacity - 1]:
+            return bisect_left(self._timestamps, ts, self._start, capacity) - self._start
+        return capacity - self._start + bisect_left(self._timestamps, ts, 0, end - capacity)
+    
+    def _window(self, hours: float) -> Tuple[int, int]:
+        cutoff = (datetime.now() - timedelta(hours=hours)).timestamp()
+        return self._first_at_or_after(cutoff), self._size
+    
+    def _sums(self, begin: int, end: int) -> Tuple[float, float]:
+        """Shifted sum and sum of squares over offsets [begin, end)."""
+        if begin >= end:
+            return 0.0, 0.0
+        last = self._physical(end - 1)
+        if begin == 0:
+            base_sum, base_square = self._base_sum, self._base_square
+        else:
+            before = self._physical(begin - 1)
+            base_sum, base_square = self._prefix_sums[before], self._prefix_squares[before]
+        return self._prefix_sums[last] - base_sum, self._prefix_squares[last] - base_square
+    
+    def _mean(self, begin: int, end: int) -> float:
+        return self._sums(begin, end)[0] / (end - begin) + self._shift
+    
+    def _window_values(self, begin: int, end: int, buffer: Optional[array] = None) -> array:
+        buffer = self._values if buffer is None else buffer
+        begin, end = self._physical(begin), self._physical(begin) + (end - begin)
+        if end <= self.max_points:
+            return buffer[begin:end]
+        return buffer[begin:] + buffer[:end - self.max_points]
+    
+    def _materialize(self, begin: int, end: int) -> List[MetricPoint]:
+        points = []
+        for offset in range(begin, end):
+            index = self._physical(offset)
+            points.append(MetricPoint(
+                timestamp=datetime.fromtimestamp(self._timestamps[index]),
+                value=self._values[index],
+                metadata=self._metadata[index]
+            ))
+        return points
     
     def get_recent_points(self, hours: int = 24) -> List[MetricPoint]:
         """Get points from the last N hours."""
-        cutoff = datetime.now() - timedelta(hours=hours)
-        return [p for p in self.points if p.timestamp >= cutoff]
+        return self._materialize(*self._window(hours))
     
-    def get_trend(self, hours: int = 24) -> TrendDirection:
-        """Calculate trend direction."""
-        recent_points = self.get_recent_points(hours)
-        
-        if len(recent_points) < 5:
+    def get_recent_values(self, hours: float = 24) -> Tuple[array, array]:
+        """Timestamps (epoch seconds) and values from the last N hours, as arrays."""
+        begin, end = self._window(hours)
+        return self._window_values(begin, end, self._timestamps), self._window_values(begin, end)
+    
+    def discard_before(self, cutoff: datetime) -> int:
+        """Drop points older than ``cutoff``; returns the number removed."""
+        removed = self._first_at_or_after(cutoff.timestamp())
+        if removed:
+            last_removed = self._physical(removed - 1)
+            self._base_sum = self._prefix_sums[last_removed]
+            self._base_square = self._prefix_squares[last_removed]
+            for offset in range(removed):
+                self._metadata[self._physical(offset)] = None
+            self._start = self._physical(removed)
+            self._size -= removed
+            self._stats_cache.clear()
+        return removed
+    
+    def _trend(self, begin: int, end: int) -> TrendDirection:
+        count = end - begin
+        if count < 5:
             return TrendDirection.UNKNOWN
         
         # Split into two halves and compare averages
-        midpoint = len(recent_points) // 2
-        first_half = recent_points[:midpoint]
-        second_half = recent_points[midpoint:]
-        
-        first_avg = statistics.mean(p.value for p in first_half)
-        second_avg = statistics.mean(p.value for p in second_half)
+        midpoint = begin + count // 2
+        first_avg = self._mean(begin, midpoint)
+        second_avg = self._mean(midpoint, end)
         
         # Calculate threshold as 5% of the average value
-        avg_value = statistics.mean(p.value for p in recent_points)
+        avg_value = self._mean(begin, end)
         threshold = max(0.05 * avg_value, 1.0)  # At least 1.0 difference
         
         if second_avg - first_avg > threshold:
@@ -127,11 +274,16 @@ class MetricSeries:
         else:
             return TrendDirection.STABLE
     
+    def get_trend(self, hours: int = 24) -> TrendDirection:
+        """Calculate trend direction."""
+        return self._trend(*self._window(hours))
+    
     def get_statistics(self, hours: int = 24) -> Dict[str, Any]:
-        """Get statistical summary."""
-        recent_points = self.get_recent_points(hours)
+        """Get statistical summary (cached until the window or the data changes)."""
+        begin, end = self._window(hours)
+        count = end - begin
         
-        if not recent_points:
+        if not count:
             return {
                 "count": 0,
                 "mean": 0,
@@ -142,17 +294,26 @@ class MetricSeries:
                 "trend": TrendDirection.UNKNOWN.value
             }
         
-        values = [p.value for p in recent_points]
+        key = (begin, end)
+        cached = self._stats_cache.get(key)
+        if cached is not None:
+            return dict(cached)
         
-        return {
-            "count": len(values),
-            "mean": statistics.mean(values),
+        shifted_sum, shifted_square = self._sums(begin, end)
+        variance = (shifted_square - shifted_sum * shifted_sum / count) / (count - 1) if count > 1 else 0.0
+        values = self._window_values(begin, end)
+        
+        stats = {
+            "count": count,
+            "mean": shifted_sum / count + self._shift,
             "median": statistics.median(values),
-            "std_dev": statistics.stdev(values) if len(values) > 1 else 0,
+            "std_dev": math.sqrt(max(0.0, variance)),
             "min": min(values),
             "max": max(values),
-            "trend": self.get_trend(hours).value
+            "trend": self._trend(begin, end).value
         }
+        self._stats_cache[key] = stats
+        return dict(stats)
 
 
 @dataclass
@@ -223,6 +384,14 @@ class EvaluationMetricsSystem:
         self.recent_evaluations: Deque[EvaluationResult] = deque(maxlen=1000)
         self.recent_corrections: Deque[CorrectionData] = deque(maxlen=1000)
         
+        # Streaming anomaly detection (one EWMA baseline per metric series)
+        self.anomaly_detector = StreamingAnomalyDetector(
+            alpha=self.config.get("metrics_anomaly_alpha", 0.1),
+            threshold=self.config.get("metrics_anomaly_threshold", 3.0),
+            warmup=self.config.get("metrics_anomaly_warmup", 10)
+        )
+        self.recent_anomalies: Deque[Dict[str, Any]] = deque(maxlen=1000)
+        
         # Storage
         self.storage_path = Path(self.config.get("evaluation_storage_path", "~/.claude-pm/training")).expanduser()
         self.metrics_dir = self.storage_path / "metrics"
@@ -409,6 +578,7 @@ class EvaluationMetricsSystem:
             )
         
         self.metrics[global_key].add_point(value, metadata)
+        self._check_anomaly(global_key, metric_name, value, None)
         
         # Agent-specific metric
         if agent_type:
@@ -421,6 +591,68 @@ class EvaluationMetricsSystem:
                 )
             
             self.agent_metrics[agent_type][agent_key].add_point(value, metadata)
+            self._check_anomaly(agent_key, metric_name, value, agent_type)
+    
+    def _check_anomaly(self, series_key: str, metric_name: str, value: float, agent_type: Optional[str]) -> None:
+        """Score a new point against its series' EWMA baseline."""
+        zscore = self.anomaly_detector.update(series_key, value)
+        if self.anomaly_detector.is_anomaly(zscore):
+            self.recent_anomalies.append({
+                "series": series_key,
+                "metric_name": metric_name,
+                "agent_type": agent_type,
+                "value": value,
+                "zscore": zscore,
+                "timestamp": datetime.now().isoformat()
+            })
+            logger.debug(f"Anomalous {series_key} value {value} (z={zscore:.2f})")
+    
+    def get_recent_anomalies(self, hours: int = 24) -> List[Dict[str, Any]]:
+        """Anomalies flagged while recording metrics in the last N hours."""
+        cutoff = (datetime.now() - timedelta(hours=hours)).isoformat()
+        return [anomaly for anomaly in self.recent_anomalies if anomaly["timestamp"] >= cutoff]
+    
+    def analyze_metric_trends(self, hours: int = 24, window: int = 20) -> Dict[str, Dict[str, Any]]:
+        """
+        Trend and anomaly statistics for every metric series in one vectorized pass.
+        
+        Args:
+            hours: Time window to analyze
+            window: Trailing points the latest value is scored against
+            
+        Returns:
+            Per series key: point count, slope per hour, R-squared, EWMA mean
+            and spread, and the latest point's rolling z-score
+        """
+        all_series = dict(self.metrics)
+        for agent_series in self.agent_metrics.values():
+            all_series.update(agent_series)
+        
+        keys, times, values = [], [], []
+        for key, series in all_series.items():
+            timestamps, series_values = series.get_recent_values(hours)
+            if series_values:
+                keys.append(key)
+                times.append(timestamps)
+                values.append(series_values)
+        
+        trends = linear_trends(values, times)
+        baselines = ewma(values, self.anomaly_detector.alpha)
+        latest = latest_zscores(values, window)
+        
+        return {
+            key: {
+                "count": len(series_values),
+                "slope_per_hour": slope * 3600.0,
+                "r_squared": r_squared,
+                "ewma": baseline,
+                "ewma_std": spread,
+                "latest_zscore": zscore,
+                "anomalous": self.anomaly_detector.is_anomaly(zscore)
+            }
+            for key, series_values, (slope, r_squared), (baseline, spread), zscore
+            in zip(keys, values, trends, baselines, latest)
+        }
     
     def _calculate_evaluations_per_hour(self) -> float:
         """Calculate evaluations per hour."""
@@ -725,22 +957,12 @@ class EvaluationMetricsSystem:
             # Clean up metric series
             cleaned_metrics = 0
             for metric_series in self.metrics.values():
-                original_count = len(metric_series.points)
-                metric_series.points = [
-                    p for p in metric_series.points
-                    if p.timestamp >= cutoff_date
-                ]
-                cleaned_metrics += original_count - len(metric_series.points)
+                cleaned_metrics += metric_series.discard_before(cutoff_date)
             
             # Clean up agent metrics
             for agent_metrics in self.agent_metrics.values():
                 for metric_series in agent_metrics.values():
-                    original_count = len(metric_series.points)
-                    metric_series.points = [
-                        p for p in metric_series.points
-                        if p.timestamp >= cutoff_date
-                    ]
-                    cleaned_metrics += original_count - len(metric_series.points)
+                    cleaned_metrics += metric_series.discard_before(cutoff_date)
             
             # Clean up report files
             removed_files = []
@@ -6,7 +6,7 @@ Main facade class for the hook processing service.
 """
 
 import logging as standard_logging
-from datetime import datetime
+from datetime import date, datetime
 from typing import Dict, List, Optional, Any
 
 from .models import HookConfiguration, HookType, HookExecutionResult
@@ -40,7 +40,9 @@ class HookProcessingService:
         self.project_logger = ProjectBasedHookLogger(
             project_root=self.config.get('project_root'),
             max_log_files=self.config.get('max_log_files', 10),
-            max_log_size_mb=self.config.get('max_log_size_mb', 10)
+            max_log_size_mb=self.config.get('max_log_size_mb', 10),
+            buffered=self.config.get('buffered_logging', True),
+            flush_interval=self.config.get('log_flush_interval', 0.5)
         )
         
         # Service state
@@ -183,23 +185,19 @@ class HookProcessingService:
             self.logger.warning("Hook processing service is not running")
             return []
         
-        # Get hooks for this type
-        hooks = self.configuration_system.get_hooks_by_type(hook_type)
-        if not hooks:
+        # Get the precompiled dispatch plan for this type
+        plan = self.configuration_system.get_dispatch_plan(hook_type)
+        if not plan:
             return []
         
         # Execute hooks
-        results = await self.execution_engine.execute_hooks_batch(hooks, context)
+        results = await self.execution_engine.execute_plan(plan, context)
         
         # Record results for monitoring and project logging
+        hooks_by_id = {hook.hook_id: hook for hook, _ in plan.entries}
         for result in results:
             self.monitoring_system.record_execution(result)
-            # Find the corresponding hook configuration for project logging
-            hook_config = None
-            for hook in hooks:
-                if hook.hook_id == result.hook_id:
-                    hook_config = hook
-                    break
+            hook_config = hooks_by_id.get(result.hook_id)
             if hook_config:
                 self.project_logger.log_hook_execution(hook_config, result, context)
         
@@ -275,6 +273,7 @@ class HookProcessingService:
         # Cleanup resources
         self.execution_engine.cleanup()
         self.configuration_system.cleanup_dead_references()
+        self.project_logger.close()
         
         self.logger.info("Hook processing service stopped")
     
@@ -355,9 +354,15 @@ class HookProcessingService:
             'project_logging': self.project_logger.get_project_hook_summary()
         }
     
-    def get_hook_logs(self, hook_type: HookType, hook_id: str, limit: int = 100) -> List[Dict[str, Any]]:
-        """Get project-based hook logs for a specific hook."""
-        return self.project_logger.get_hook_logs(hook_type, hook_id, limit)
+    def get_hook_logs(self, hook_type: HookType, hook_id: str, limit: int = 100,
+                      start_time: Optional[datetime] = None,
+                      end_time: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Get project-based hook logs for a specific hook, optionally within a time range."""
+        return self.project_logger.get_hook_logs(hook_type, hook_id, limit, start_time, end_time)
+    
+    def get_hook_log_summary(self, day: Optional[date] = None) -> Dict[str, Any]:
+        """Get the incrementally maintained hook activity summary for a day (default today)."""
+        return self.project_logger.get_log_summary(day)
     
     def get_project_hook_summary(self) -> Dict[str, Any]:
         """Get summary of all project-based hook activity."""
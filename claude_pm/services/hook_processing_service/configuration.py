@@ -6,6 +6,7 @@ import logging
 import weakref
 from typing import Dict, List, Optional, Any
 
+from .execution import HookDispatchPlan, compile_dispatch_plan
 from .models import HookConfiguration, HookType
 
 
@@ -17,6 +18,23 @@ class HookConfigurationSystem:
         self.hooks: Dict[str, HookConfiguration] = {}
         self.hook_groups: Dict[HookType, List[str]] = {hook_type: [] for hook_type in HookType}
         self.weak_refs: Dict[str, weakref.ref] = {}
+        # Dispatch plans are compiled lazily and invalidated on registration changes
+        self._dispatch_plans: Dict[HookType, HookDispatchPlan] = {}
+        self._plan_version = 0
+    
+    def _invalidate_plans(self) -> None:
+        """Drop compiled dispatch plans after a registration change."""
+        self._plan_version += 1
+        self._dispatch_plans.clear()
+    
+    def get_dispatch_plan(self, hook_type: HookType) -> HookDispatchPlan:
+        """Get the compiled dispatch plan for a hook type."""
+        plan = self._dispatch_plans.get(hook_type)
+        if plan is None:
+            hooks = (self.hooks[hook_id] for hook_id in self.hook_groups[hook_type] if hook_id in self.hooks)
+            plan = compile_dispatch_plan(hooks, version=self._plan_version)
+            self._dispatch_plans[hook_type] = plan
+        return plan
     
     def register_hook(self, hook_config: HookConfiguration) -> bool:
         """Register a new hook configuration."""
@@ -39,6 +57,7 @@ class HookConfigurationSystem:
             if hasattr(hook_config.handler, '__self__'):
                 self.weak_refs[hook_config.hook_id] = weakref.ref(hook_config.handler.__self__)
             
+            self._invalidate_plans()
             self.logger.info(f"Registered hook: {hook_config.hook_id} ({hook_config.hook_type.value})")
             return True
             
@@ -65,6 +84,7 @@ class HookConfigurationSystem:
             
             # Remove configuration
             del self.hooks[hook_id]
+            self._invalidate_plans()
             
             self.logger.info(f"Unregistered hook: {hook_id}")
             return True
@@ -75,12 +95,7 @@ class HookConfigurationSystem:
     
     def get_hooks_by_type(self, hook_type: HookType) -> List[HookConfiguration]:
         """Get all enabled hooks of a specific type, sorted by priority."""
-        hook_ids = self.hook_groups[hook_type]
-        hooks = [self.hooks[hook_id] for hook_id in hook_ids if hook_id in self.hooks]
-        
-        # Filter enabled hooks and sort by priority
-        enabled_hooks = [hook for hook in hooks if hook.enabled]
-        return sorted(enabled_hooks, key=lambda h: h.priority, reverse=True)
+        return self.get_dispatch_plan(hook_type).hooks
     
     def get_hook(self, hook_id: str) -> Optional[HookConfiguration]:
         """Get a specific hook configuration."""
@@ -92,6 +107,7 @@ class HookConfigurationSystem:
             return False
         
         self.hooks[hook_id].enabled = enabled
+        self._invalidate_plans()
         self.logger.info(f"Hook {hook_id} {'enabled' if enabled else 'disabled'}")
         return True
     
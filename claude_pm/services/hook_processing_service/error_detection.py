@@ -1,21 +1,81 @@
 """
 System for detecting errors in subprocess transcripts and agent outputs.
+
+Transcripts are scanned in a single pass: every pattern is compiled once into
+a combined alternation that locates candidate regions, and only those regions
+are confirmed against the individual patterns. Results are identical to
+running each pattern with ``re.finditer`` over the whole transcript.
+Incremental scanners extend this to transcript deltas so that only newly
+appended text (plus a small look-back window) is scanned. They confirm
+matches line by line, so streamed results equal a full scan (as long as no
+line is longer than the look-back window).
 """
 
 import logging
 import re
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Set, Tuple
+
+try:
+    import re._parser as _sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover - older interpreters
+    import sre_parse as _sre_parse
 
 from .models import ErrorDetectionResult, ErrorSeverity
 
+# Characters kept around each match for the error context
+CONTEXT_CHARS = 100
+_ESCAPE_RE = re.compile(r'\\.')
+
+
+def _first_chars(parsed) -> Optional[Set[str]]:
+    """Characters a parsed pattern can start with, or None if unrestricted."""
+    if not parsed:
+        return None
+    op, av = parsed[0]
+    if op is _sre_parse.LITERAL:
+        return {chr(av)}
+    if op is _sre_parse.SUBPATTERN:
+        return _first_chars(av[-1])
+    if op is _sre_parse.BRANCH:
+        chars = set()
+        for branch in av[1]:
+            branch_chars = _first_chars(branch)
+            if branch_chars is None:
+                return None
+            chars |= branch_chars
+        return chars
+    if op is _sre_parse.IN and all(item_op is _sre_parse.LITERAL for item_op, _ in av):
+        return {chr(value) for _, value in av}
+    return None
+
+
+def _pattern_first_chars(pattern: str) -> Optional[Set[str]]:
+    """Possible first characters of a pattern (best effort)."""
+    try:
+        return _first_chars(_sre_parse.parse(pattern))
+    except Exception:
+        return None
+
+
+def _is_lowercase_pattern(pattern: str) -> bool:
+    """Whether a pattern only matches lowercase text (ignoring escapes like \\S)."""
+    stripped = _ESCAPE_RE.sub('', pattern)
+    return stripped == stripped.lower()
+
 
 class ErrorDetectionSystem:
     """System for detecting errors in subprocess transcripts and agent outputs."""
     
+    # Incremental transcript streams kept at once; the least recently fed is dropped
+    MAX_TRANSCRIPT_STREAMS = 256
+    
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         self.error_patterns = self._initialize_error_patterns()
+        self._compile_patterns()
+        self._incremental_scanners: 'OrderedDict[str, IncrementalTranscriptScanner]' = OrderedDict()
         self.detection_stats = {
             'total_analyses': 0,
             'errors_detected': 0,
@@ -96,44 +156,173 @@ class ErrorDetectionSystem:
             }
         }
     
+    def _compile_patterns(self):
+        """Compile all patterns once, plus the combined single-pass prefilter.
+        
+        Call again after modifying ``error_patterns``.
+        """
+        self._pattern_table: List[Tuple[str, Dict[str, Any], str]] = [
+            (error_type, config, pattern)
+            for error_type, config in self.error_patterns.items()
+            for pattern in config['patterns']
+        ]
+        sources = [pattern for _, _, pattern in self._pattern_table]
+        
+        # Lowercasing the transcript once lets every pattern run case-sensitively,
+        # which is much faster than IGNORECASE matching
+        self._lowercase_scan = all(_is_lowercase_pattern(pattern) for pattern in sources)
+        flags = re.MULTILINE if self._lowercase_scan else re.IGNORECASE | re.MULTILINE
+        self._compiled_patterns = [re.compile(pattern, flags) for pattern in sources]
+        self._ci_patterns = [re.compile(pattern, re.IGNORECASE | re.MULTILINE) for pattern in sources]
+        self._combined_pattern = re.compile('|'.join(f'(?:{pattern})' for pattern in sources), flags)
+        self._ci_combined_pattern = re.compile(
+            '|'.join(f'(?:{pattern})' for pattern in sources), re.IGNORECASE | re.MULTILINE
+        )
+        
+        # Index patterns by possible first character so region confirmation
+        # only tries patterns that can start at a given position
+        self._patterns_by_first_char: Dict[str, List[int]] = {}
+        self._unanchored_patterns: List[int] = []
+        for index, pattern in enumerate(sources):
+            chars = _pattern_first_chars(pattern)
+            if chars is None:
+                self._unanchored_patterns.append(index)
+                continue
+            for char in chars:
+                for variant in {char, char.lower(), char.upper()}:
+                    self._patterns_by_first_char.setdefault(variant, []).append(index)
+    
+    def _prepare_scan_text(self, text: str) -> Tuple[str, Any, List[Any]]:
+        """Pick the text and compiled patterns to scan with."""
+        if self._lowercase_scan:
+            lowered = text.lower()
+            # Some characters change length when lowercased; positions must line up
+            if len(lowered) == len(text):
+                return lowered, self._combined_pattern, self._compiled_patterns
+        return text, self._ci_combined_pattern, self._ci_patterns
+    
+    def _scan(self, text: str, start: int, last_ends: List[int], min_end: int = 0,
+              hold_from: Optional[int] = None) -> List[List[Any]]:
+        """Find per-pattern matches in ``text[start:]`` with one combined pass.
+        
+        Every finditer match of a single pattern begins inside some match of
+        the combined alternation, so only those regions are confirmed
+        per pattern. ``last_ends`` carries each pattern's non-overlap boundary
+        and is updated in place; matches ending at or before ``min_end`` are
+        skipped. A match ending at or after ``hold_from`` could still grow with
+        more text: it is not reported, and its pattern reports nothing further
+        in this scan.
+        """
+        scan_text, combined, compiled = self._prepare_scan_text(text)
+        matches: List[List[Any]] = [[] for _ in compiled]
+        
+        by_first_char = self._patterns_by_first_char
+        unanchored = self._unanchored_patterns
+        
+        held: Dict[int, int] = {}
+        for region in combined.finditer(scan_text, start):
+            for position in range(region.start(), region.end()):
+                candidates = by_first_char.get(scan_text[position], ())
+                if unanchored:
+                    candidates = sorted(set(candidates).union(unanchored))
+                for index in candidates:
+                    if position < last_ends[index]:
+                        continue
+                    match = compiled[index].match(scan_text, position)
+                    if match is None:
+                        continue
+                    if hold_from is not None and match.end() >= hold_from:
+                        held[index] = last_ends[index]
+                        last_ends[index] = len(scan_text) + 1
+                        continue
+                    last_ends[index] = max(match.end(), position + 1)
+                    if match.end() > min_end:
+                        matches[index].append(match)
+        
+        # Held matches are found again once the text after them is complete
+        for index, end in held.items():
+            last_ends[index] = end
+        return matches
+    
+    def _build_results(self, text: str, matches: List[List[Any]], context: Dict[str, Any],
+                       base_offset: int = 0) -> List[ErrorDetectionResult]:
+        """Turn per-pattern matches into results, in pattern declaration order."""
+        results = []
+        
+        for (error_type, config, pattern), pattern_matches in zip(self._pattern_table, matches):
+            for match in pattern_matches:
+                matched_text = text[match.start():match.end()]
+                
+                # Extract context around the error
+                start = max(0, match.start() - CONTEXT_CHARS)
+                end = min(len(text), match.end() + CONTEXT_CHARS)
+                error_context = text[start:end]
+                
+                # Create error detection result
+                result = ErrorDetectionResult(
+                    error_detected=True,
+                    error_type=error_type,
+                    severity=config['severity'],
+                    details={
+                        'matched_pattern': pattern,
+                        'matched_text': matched_text,
+                        'context': error_context,
+                        'position': base_offset + match.start(),
+                        'analysis_context': context
+                    },
+                    suggested_action=config['action']
+                )
+                
+                results.append(result)
+                self.detection_stats['errors_detected'] += 1
+                
+                self.logger.warning(f"Error detected: {error_type} - {matched_text}")
+        
+        return results
+    
     async def analyze_transcript(self, transcript: str, context: Dict[str, Any] = None) -> List[ErrorDetectionResult]:
         """Analyze subprocess transcript for error patterns."""
         self.detection_stats['total_analyses'] += 1
-        results = []
-        
         context = context or {}
         
-        for error_type, config in self.error_patterns.items():
-            for pattern in config['patterns']:
-                matches = re.finditer(pattern, transcript, re.IGNORECASE | re.MULTILINE)
-                
-                for match in matches:
-                    # Extract context around the error
-                    start = max(0, match.start() - 100)
-                    end = min(len(transcript), match.end() + 100)
-                    error_context = transcript[start:end]
-                    
-                    # Create error detection result
-                    result = ErrorDetectionResult(
-                        error_detected=True,
-                        error_type=error_type,
-                        severity=config['severity'],
-                        details={
-                            'matched_pattern': pattern,
-                            'matched_text': match.group(),
-                            'context': error_context,
-                            'position': match.start(),
-                            'analysis_context': context
-                        },
-                        suggested_action=config['action']
-                    )
-                    
-                    results.append(result)
-                    self.detection_stats['errors_detected'] += 1
-                    
-                    self.logger.warning(f"Error detected: {error_type} - {match.group()}")
+        matches = self._scan(transcript, 0, [0] * len(self._pattern_table))
+        return self._build_results(transcript, matches, context)
+    
+    def create_incremental_scanner(self, max_lookback: int = 4096) -> 'IncrementalTranscriptScanner':
+        """Create a scanner that analyzes a transcript as it grows."""
+        return IncrementalTranscriptScanner(self, max_lookback=max_lookback)
+    
+    async def analyze_transcript_delta(self, stream_id: str, delta: str,
+                                       context: Dict[str, Any] = None) -> List[ErrorDetectionResult]:
+        """Analyze text appended to a transcript, scanning only the new part.
         
-        return results
+        Args:
+            stream_id: Identifies the transcript (e.g. subprocess ID)
+            delta: Newly appended text
+            context: Analysis context attached to results
+        
+        Returns:
+            Errors completed by this delta; positions are absolute offsets
+        """
+        scanner = self._incremental_scanners.get(stream_id)
+        if scanner is None:
+            scanner = self._incremental_scanners[stream_id] = self.create_incremental_scanner()
+            while len(self._incremental_scanners) > self.MAX_TRANSCRIPT_STREAMS:
+                evicted, _ = self._incremental_scanners.popitem(last=False)
+                self.logger.debug(f"Dropped idle transcript stream {evicted}")
+        else:
+            self._incremental_scanners.move_to_end(stream_id)
+        return scanner.feed(delta, context)
+    
+    async def end_transcript_stream(self, stream_id: str,
+                                    context: Dict[str, Any] = None) -> List[ErrorDetectionResult]:
+        """Scan a finished transcript's unterminated final line and forget the stream."""
+        scanner = self._incremental_scanners.pop(stream_id, None)
+        return scanner.finish(context) if scanner is not None else []
+    
+    def reset_transcript_stream(self, stream_id: str) -> bool:
+        """Forget incremental state for a transcript without scanning what is pending."""
+        return self._incremental_scanners.pop(stream_id, None) is not None
     
     async def analyze_agent_output(self, output: str, agent_type: str) -> List[ErrorDetectionResult]:
         """Analyze agent output for specific error patterns."""
@@ -195,4 +384,72 @@ class ErrorDetectionSystem:
                 max(1, self.detection_stats['total_analyses'])
             ),
             'patterns_count': sum(len(config['patterns']) for config in self.error_patterns.values())
-        }
\ No newline at end of file
+        }
+
+
+class IncrementalTranscriptScanner:
+    """Scans a growing transcript, looking only at newly appended text.
+    
+    Text is confirmed a line at a time: a match is reported once the line it
+    ends on is complete, because until then a greedy pattern (``.*agent``)
+    could still grow. A bounded tail of the transcript is kept so that matches
+    spanning a delta boundary (up to ``max_lookback`` characters back) are
+    found. Results equal a full scan as long as no line is longer than
+    ``max_lookback``; longer lines are confirmed early. Call ``finish`` at the
+    end of the transcript for a final line without a newline.
+    """
+    
+    def __init__(self, detector: ErrorDetectionSystem, max_lookback: int = 4096):
+        self.detector = detector
+        self.max_lookback = max(max_lookback, CONTEXT_CHARS)
+        self.total_length = 0
+        self._buffer = ''
+        self._offset = 0
+        self._committed = 0
+        self._last_ends = [0] * len(detector._pattern_table)
+    
+    def feed(self, delta: str, context: Optional[Dict[str, Any]] = None) -> List[ErrorDetectionResult]:
+        """Scan newly appended text and return errors it completes."""
+        if not delta:
+            return []
+        self._buffer += delta
+        self.total_length += len(delta)
+        
+        commit = self._buffer.rfind('\n') + 1 + self._offset
+        if self.total_length - commit > self.max_lookback:
+            # Line too long to wait for; confirm what is there
+            commit = self.total_length
+        if commit <= self._committed:
+            return []
+        return self._scan_to(commit, context, hold=True)
+    
+    def finish(self, context: Optional[Dict[str, Any]] = None) -> List[ErrorDetectionResult]:
+        """Report errors in text not yet confirmed (the final, unterminated line)."""
+        if not self._buffer:
+            return []
+        return self._scan_to(self.total_length, context, hold=False)
+    
+    def _scan_to(self, commit: int, context: Optional[Dict[str, Any]], hold: bool) -> List[ErrorDetectionResult]:
+        self.detector.detection_stats['total_analyses'] += 1
+        local_commit = commit - self._offset
+        
+        # Re-scan a bounded window before the new text so boundary-spanning matches are found
+        scan_start = max(0, self._committed - self._offset - self.max_lookback)
+        local_last_ends = [max(0, end - self._offset) for end in self._last_ends]
+        matches = self.detector._scan(
+            self._buffer[:local_commit], scan_start, local_last_ends,
+            min_end=self._committed - self._offset - 1,
+            hold_from=local_commit if hold else None
+        )
+        self._last_ends = [end + self._offset for end in local_last_ends]
+        self._committed = commit
+        
+        results = self.detector._build_results(self._buffer, matches, context or {}, base_offset=self._offset)
+        
+        # Keep the look-back window before the confirmed point plus unconfirmed text
+        excess = local_commit - self.max_lookback
+        if excess > 0:
+            self._buffer = self._buffer[excess:]
+            self._offset += excess
+        
+        return results
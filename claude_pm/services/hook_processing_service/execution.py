@@ -1,5 +1,10 @@
 """
 Engine for executing hooks with support for sync/async operations.
+
+Hooks are dispatched through precompiled per-event-type plans: the hooks that
+apply to an event are resolved, ordered by priority and classified (native
+async, inline sync, or offloaded to the executor) when registrations change,
+not on every event.
 """
 
 import asyncio
@@ -7,11 +12,54 @@ import logging
 import time
 import traceback
 from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, Iterable, List, Any, Optional, Tuple
 
 from .models import HookConfiguration, HookExecutionResult
 
+# Dispatch modes
+DISPATCH_ASYNC = 'async'        # Coroutine handler awaited on the event loop
+DISPATCH_INLINE = 'inline'      # Cheap sync handler called directly on the event loop
+DISPATCH_EXECUTOR = 'executor'  # Sync handler offloaded to the thread pool
+
+
+def classify_hook(hook_config: HookConfiguration) -> str:
+    """Determine how a hook is dispatched."""
+    if asyncio.iscoroutinefunction(hook_config.handler):
+        return DISPATCH_ASYNC
+    if hook_config.inline:
+        return DISPATCH_INLINE
+    return DISPATCH_EXECUTOR
+
+
+@dataclass(frozen=True)
+class HookDispatchPlan:
+    """Precompiled, priority-ordered hooks for one event type."""
+    entries: Tuple[Tuple[HookConfiguration, str], ...] = ()
+    version: int = 0
+    
+    @property
+    def hooks(self) -> List[HookConfiguration]:
+        """Hooks in dispatch order."""
+        return [hook_config for hook_config, _ in self.entries]
+    
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+def compile_dispatch_plan(hook_configs: Iterable[HookConfiguration], version: int = 0) -> HookDispatchPlan:
+    """Compile enabled hooks into a priority-ordered, pre-classified plan."""
+    ordered = sorted(
+        (hook_config for hook_config in hook_configs if hook_config.enabled),
+        key=lambda h: h.priority,
+        reverse=True
+    )
+    return HookDispatchPlan(
+        entries=tuple((hook_config, classify_hook(hook_config)) for hook_config in ordered),
+        version=version
+    )
+
 
 class HookExecutionEngine:
     """Engine for executing hooks with support for sync/async operations."""
@@ -24,44 +72,39 @@ class HookExecutionEngine:
             'total_executions': 0,
             'successful_executions': 0,
             'failed_executions': 0,
+            'inline_executions': 0,
             'average_execution_time': 0.0,
             'last_updated': datetime.now()
         }
     
-    async def execute_hook(self, hook_config: HookConfiguration, context: Dict[str, Any]) -> HookExecutionResult:
+    async def execute_hook(
+        self,
+        hook_config: HookConfiguration,
+        context: Dict[str, Any],
+        dispatch_mode: Optional[str] = None
+    ) -> HookExecutionResult:
         """Execute a single hook with proper error handling and timeout.
         
-        Now defaults to async execution unless force_sync is True.
+        Now defaults to async execution unless force_sync is True. Callers
+        dispatching from a compiled plan pass the precomputed dispatch mode.
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
         self.execution_stats['total_executions'] += 1
+        dispatch_mode = dispatch_mode or classify_hook(hook_config)
         
         try:
-            # Determine execution mode - async by default unless forced sync
-            is_async_handler = asyncio.iscoroutinefunction(hook_config.handler)
-            should_run_async = hook_config.prefer_async and not hook_config.force_sync
-            
-            # Execute hook with timeout based on execution mode
-            if is_async_handler:
+            if dispatch_mode == DISPATCH_ASYNC:
                 # Handler is already async
                 result = await asyncio.wait_for(
                     hook_config.handler(context),
                     timeout=hook_config.timeout
                 )
-            elif should_run_async and not hook_config.force_sync:
-                # Run sync function in executor (async mode)
-                result = await asyncio.wait_for(
-                    asyncio.get_event_loop().run_in_executor(
-                        self.executor,
-                        hook_config.handler,
-                        context
-                    ),
-                    timeout=hook_config.timeout
-                )
+            elif dispatch_mode == DISPATCH_INLINE:
+                return self._execute_inline(hook_config, context, start_time)
             else:
-                # Force sync execution - run in executor but don't make it async
+                # Run sync function in executor
                 result = await asyncio.wait_for(
-                    asyncio.get_event_loop().run_in_executor(
+                    asyncio.get_running_loop().run_in_executor(
                         self.executor,
                         hook_config.handler,
                         context
@@ -69,27 +112,10 @@ class HookExecutionEngine:
                     timeout=hook_config.timeout
                 )
             
-            execution_time = time.time() - start_time
-            self.execution_stats['successful_executions'] += 1
-            
-            # Update average execution time
-            self._update_average_execution_time(execution_time)
-            
-            return HookExecutionResult(
-                hook_id=hook_config.hook_id,
-                success=True,
-                execution_time=execution_time,
-                result=result,
-                metadata={
-                    'execution_mode': 'async' if (is_async_handler or should_run_async) else 'sync',
-                    'prefer_async': hook_config.prefer_async,
-                    'force_sync': hook_config.force_sync,
-                    'is_async_handler': is_async_handler
-                }
-            )
-            
+            return self._success_result(hook_config, dispatch_mode, result, start_time)
+        
         except asyncio.TimeoutError:
-            execution_time = time.time() - start_time
+            execution_time = time.perf_counter() - start_time
             self.execution_stats['failed_executions'] += 1
             
             error_msg = f"Hook {hook_config.hook_id} timed out after {hook_config.timeout}s"
@@ -102,57 +128,109 @@ class HookExecutionEngine:
                 error=error_msg,
                 metadata={
                     'execution_mode': 'timeout',
+                    'dispatch_mode': dispatch_mode,
                     'prefer_async': hook_config.prefer_async,
                     'force_sync': hook_config.force_sync
                 }
             )
-            
+        
         except Exception as e:
-            execution_time = time.time() - start_time
-            self.execution_stats['failed_executions'] += 1
-            
-            error_msg = f"Hook {hook_config.hook_id} failed: {str(e)}"
-            self.logger.error(error_msg, exc_info=True)
-            
-            return HookExecutionResult(
-                hook_id=hook_config.hook_id,
-                success=False,
-                execution_time=execution_time,
-                error=error_msg,
-                metadata={
-                    'execution_mode': 'error',
-                    'prefer_async': hook_config.prefer_async,
-                    'force_sync': hook_config.force_sync,
-                    'exception_type': type(e).__name__, 
-                    'traceback': traceback.format_exc()
-                }
-            )
+            return self._failure_result(hook_config, dispatch_mode, e, start_time)
     
-    async def execute_hooks_batch(self, hook_configs: List[HookConfiguration], context: Dict[str, Any]) -> List[HookExecutionResult]:
-        """Execute multiple hooks concurrently."""
-        tasks = [
-            self.execute_hook(hook_config, context)
-            for hook_config in sorted(hook_configs, key=lambda h: h.priority, reverse=True)
-            if hook_config.enabled
-        ]
+    def _execute_inline(self, hook_config: HookConfiguration, context: Dict[str, Any],
+                        start_time: float) -> HookExecutionResult:
+        """Run a cheap sync hook directly on the event loop."""
+        self.execution_stats['inline_executions'] += 1
+        try:
+            result = hook_config.handler(context)
+        except Exception as e:
+            return self._failure_result(hook_config, DISPATCH_INLINE, e, start_time)
+        return self._success_result(hook_config, DISPATCH_INLINE, result, start_time)
+    
+    def _success_result(self, hook_config: HookConfiguration, dispatch_mode: str,
+                        result: Any, start_time: float) -> HookExecutionResult:
+        execution_time = time.perf_counter() - start_time
+        self.execution_stats['successful_executions'] += 1
+        
+        # Update average execution time
+        self._update_average_execution_time(execution_time)
+        
+        is_async_handler = dispatch_mode == DISPATCH_ASYNC
+        should_run_async = hook_config.prefer_async and not hook_config.force_sync
+        return HookExecutionResult(
+            hook_id=hook_config.hook_id,
+            success=True,
+            execution_time=execution_time,
+            result=result,
+            metadata={
+                'execution_mode': 'async' if (is_async_handler or should_run_async) else 'sync',
+                'dispatch_mode': dispatch_mode,
+                'prefer_async': hook_config.prefer_async,
+                'force_sync': hook_config.force_sync,
+                'is_async_handler': is_async_handler
+            }
+        )
+    
+    def _failure_result(self, hook_config: HookConfiguration, dispatch_mode: str,
+                        error: Exception, start_time: float) -> HookExecutionResult:
+        execution_time = time.perf_counter() - start_time
+        self.execution_stats['failed_executions'] += 1
+        
+        error_msg = f"Hook {hook_config.hook_id} failed: {str(error)}"
+        self.logger.error(error_msg, exc_info=True)
         
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        return HookExecutionResult(
+            hook_id=hook_config.hook_id,
+            success=False,
+            execution_time=execution_time,
+            error=error_msg,
+            metadata={
+                'execution_mode': 'error',
+                'dispatch_mode': dispatch_mode,
+                'prefer_async': hook_config.prefer_async,
+                'force_sync': hook_config.force_sync,
+                'exception_type': type(error).__name__,
+                'traceback': traceback.format_exc()
+            }
+        )
+    
+    async def execute_plan(self, plan: HookDispatchPlan, context: Dict[str, Any]) -> List[HookExecutionResult]:
+        """Execute a compiled dispatch plan, returning results in priority order.
+        
+        Inline hooks run immediately without creating tasks; async and
+        offloaded hooks run concurrently.
+        """
+        results: List[Optional[HookExecutionResult]] = [None] * len(plan.entries)
+        pending = []
+        pending_indexes = []
         
-        # Handle any exceptions from gather
-        processed_results = []
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                hook_config = hook_configs[i]
-                processed_results.append(HookExecutionResult(
-                    hook_id=hook_config.hook_id,
-                    success=False,
-                    execution_time=0.0,
-                    error=f"Batch execution error: {str(result)}"
-                ))
+        for index, (hook_config, dispatch_mode) in enumerate(plan.entries):
+            if not hook_config.enabled:
+                continue
+            if dispatch_mode == DISPATCH_INLINE:
+                self.execution_stats['total_executions'] += 1
+                results[index] = self._execute_inline(hook_config, context, time.perf_counter())
             else:
-                processed_results.append(result)
+                pending.append(self.execute_hook(hook_config, context, dispatch_mode))
+                pending_indexes.append(index)
+        
+        if pending:
+            outcomes = await asyncio.gather(*pending, return_exceptions=True)
+            for index, outcome in zip(pending_indexes, outcomes):
+                if isinstance(outcome, BaseException):
+                    outcome = HookExecutionResult(
+                        hook_id=plan.entries[index][0].hook_id,
+                        success=False,
+                        execution_time=0.0,
+                        error=f"Batch execution error: {str(outcome)}"
+                    )
+                results[index] = outcome
         
-        return processed_results
+        return [result for result in results if result is not None]
+    
+    async def execute_hooks_batch(self, hook_configs: List[HookConfiguration], context: Dict[str, Any]) -> List[HookExecutionResult]:
+        """Execute multiple hooks concurrently."""
+        return await self.execute_plan(compile_dispatch_plan(hook_configs), context)
     
     def _update_average_execution_time(self, execution_time: float):
         """Update running average of execution time."""
@@ -179,4 +257,4 @@ class HookExecutionEngine:
     
     def cleanup(self):
         """Clean up executor resources."""
-        self.executor.shutdown(wait=True)
\ No newline at end of file
+        self.executor.shutdown(wait=True)
@@ -0,0 +1,291 @@
+"""
+Sparse offset index and reverse tail reads for JSONL hook logs.
+
+"Most recent N" queries read the log backwards from EOF in blocks, and time
+range queries consult a sparse index written alongside each log, so query
+cost scales with the result size rather than the file size. A limited range
+query reads the candidate blocks backwards and stops once it has enough.
+
+Index files live in a hidden ``.index`` directory next to the logs (so log
+globs and summaries ignore them) and hold one JSON line per indexed block:
+``{"offset", "length", "lines", "min_ts", "max_ts"}`` with epoch-second
+timestamps. Because each block records its own min/max timestamp, entries
+written slightly out of order are still found. Any byte range not covered by
+the index (the live tail, or a gap left by a crash) is scanned directly.
+"""
+
+import json
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+INDEX_DIR_NAME = ".index"
+DEFAULT_INDEX_INTERVAL_BYTES = 64 * 1024
+TAIL_BLOCK_SIZE = 64 * 1024
+
+
+def index_path_for(log_file: Path) -> Path:
+    """Path of the sparse index for a log file."""
+    return log_file.parent / INDEX_DIR_NAME / f"{log_file.name}.idx"
+
+
+def entry_timestamp(entry: Dict[str, Any]) -> Optional[float]:
+    """Epoch seconds of a log entry's ``timestamp`` field, if parseable."""
+    try:
+        return datetime.fromisoformat(entry["timestamp"]).timestamp()
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+@dataclass
+class _OpenBlock:
+    """Block of a log file that has not been written to the index yet."""
+    offset: int
+    length: int = 0
+    lines: int = 0
+    min_ts: float = float("inf")
+    max_ts: float = float("-inf")
+
+
+class SparseIndexWriter:
+    """Tracks appended lines per log file and emits one index entry per block."""
+    
+    def __init__(self, interval_bytes: int = DEFAULT_INDEX_INTERVAL_BYTES):
+        self.interval_bytes = interval_bytes
+        self._blocks: Dict[Path, _OpenBlock] = {}
+    
+    def observe(self, log_file: Path, offset: int, length: int, timestamp: Optional[float]):
+        """Record a line of ``length`` bytes appended at ``offset``."""
+        block = self._blocks.get(log_file)
+        if block is not None and block.offset + block.length != offset:
+            # File changed underneath us (rotation, external write); restart
+            self.finish(log_file)
+            block = None
+        if block is None:
+            block = self._blocks[log_file] = _OpenBlock(offset=offset)
+        
+        block.length += length
+        block.lines += 1
+        if timestamp is not None:
+            block.min_ts = min(block.min_ts, timestamp)
+            block.max_ts = max(block.max_ts, timestamp)
+        
+        if block.length >= self.interval_bytes:
+            self.finish(log_file)
+    
+    def finish(self, log_file: Path):
+        """Write the open block for a log file to its index."""
+        block = self._blocks.pop(log_file, None)
+        if block is None or block.lines == 0 or block.min_ts > block.max_ts:
+            return
+        if not log_file.exists():
+            # Log was removed; an index for it is useless
+            return
+        index_file = index_path_for(log_file)
+        try:
+            index_file.parent.mkdir(exist_ok=True)
+            with index_file.open("a", encoding="utf-8") as f:
+                f.write(json.dumps({
+                    "offset": block.offset,
+                    "length": block.length,
+                    "lines": block.lines,
+                    "min_ts": block.min_ts,
+                    "max_ts": block.max_ts
+                }) + "\n")
+        except OSError as e:
+            logger.error(f"Failed to update log index {index_file}: {e}")
+    
+    def discard(self, log_file: Path):
+        """Drop the open block for a log file without writing it."""
+        self._blocks.pop(log_file, None)
+    
+    def finish_all(self):
+        """Write every open block."""
+        for log_file in list(self._blocks):
+            self.finish(log_file)
+
+
+def read_index(log_file: Path) -> List[Dict[str, Any]]:
+    """Load the index entries for a log file, ordered by offset."""
+    index_file = index_path_for(log_file)
+    if not index_file.exists():
+        return []
+    entries = []
+    with index_file.open("r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    entries.sort(key=lambda e: e["offset"])
+    return entries
+
+
+def _parse_lines(data: bytes) -> Iterator[Dict[str, Any]]:
+    for raw in data.splitlines():
+        try:
+            yield json.loads(raw)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            continue
+
+
+def read_tail(log_file: Path, limit: int, block_size: int = TAIL_BLOCK_SIZE) -> List[Dict[str, Any]]:
+    """Return the last ``limit`` parseable entries, oldest first, reading backwards from EOF.
+    
+    Args:
+        log_file: JSONL log file
+        limit: Maximum number of entries to return
+        block_size: Bytes read per backwards step
+    
+    Returns:
+        Up to ``limit`` entries in file order
+    """
+    if limit <= 0 or not log_file.exists():
+        return []
+    
+    collected: List[Dict[str, Any]] = []
+    with log_file.open("rb") as f:
+        f.seek(0, 2)
+        position = f.tell()
+        remainder = b""
+        at_eof = True
+        
+        while position > 0 and len(collected) < limit:
+            start = max(0, position - block_size)
+            f.seek(start)
+            chunk = f.read(position - start) + remainder
+            position = start
+            remainder = b""
+            
+            if at_eof:
+                # An unterminated final line is a write in progress; skip it
+                chunk = chunk[:chunk.rfind(b"\n") + 1]
+                if not chunk:
+                    continue
+                at_eof = False
+            
+            if start > 0:
+                # The first line of the chunk may be incomplete; keep it for the next step
+                newline = chunk.find(b"\n")
+                if newline == -1:
+                    remainder = chunk
+                    continue
+                remainder, chunk = chunk[:newline + 1], chunk[newline + 1:]
+            
+            collected.extend(reversed(list(_parse_lines(chunk))))
+    
+    collected = collected[:limit]
+    collected.reverse()
+    return collected
+
+
+def _candidate_ranges(log_file: Path, size: int, start_ts: float, end_ts: float) -> List[Tuple[int, int]]:
+    """Byte ranges of the first ``size`` bytes that may contain entries in [start_ts, end_ts]."""
+    ranges: List[Tuple[int, int]] = []
+    covered = 0
+    
+    for entry in read_index(log_file):
+        offset, length = entry["offset"], entry["length"]
+        if offset + length > size:
+            break
+        if offset > covered:
+            # Unindexed gap, e.g. from a crash before the block was written
+            ranges.append((covered, offset))
+        if entry["max_ts"] >= start_ts and entry["min_ts"] <= end_ts:
+            ranges.append((offset, offset + length))
+        covered = max(covered, offset + length)
+    
+    if covered < size:
+        # Live tail that has not been indexed yet
+        ranges.append((covered, size))
+    
+    merged: List[Tuple[int, int]] = []
+    for begin, finish in ranges:
+        if merged and begin <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], finish))
+        else:
+            merged.append((begin, finish))
+    return merged
+
+
+def _reverse_lines(f: BinaryIO, begin: int, finish: int, at_eof: bool,
+                   block_size: int = TAIL_BLOCK_SIZE) -> Iterator[bytes]:
+    """Yield the lines of a line-aligned byte range, last first, reading backwards in blocks."""
+    position = finish
+    remainder = b""
+    while position > begin:
+        start = max(begin, position - block_size)
+        f.seek(start)
+        chunk = f.read(position - start) + remainder
+        position = start
+        remainder = b""
+        
+        if at_eof:
+            # An unterminated final line is a write in progress; skip it
+            chunk = chunk[:chunk.rfind(b"\n") + 1]
+            if not chunk:
+                continue
+            at_eof = False
+        
+        if start > begin:
+            # The first line of the chunk may be incomplete; keep it for the next step
+            newline = chunk.find(b"\n")
+            if newline == -1:
+                remainder = chunk
+                continue
+            remainder, chunk = chunk[:newline + 1], chunk[newline + 1:]
+        
+        yield from reversed(chunk.splitlines())
+
+
+def read_range(log_file: Path, start_time: Optional[datetime] = None,
+               end_time: Optional[datetime] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Return entries whose timestamp falls within [start_time, end_time], in file order.
+    
+    Args:
+        log_file: JSONL log file
+        start_time: Inclusive lower bound (None for unbounded)
+        end_time: Inclusive upper bound (None for unbounded)
+        limit: Return only the last ``limit`` matches; candidate blocks are then
+            read backwards from the newest and reading stops once enough are found
+    
+    Returns:
+        Matching entries
+    """
+    if not log_file.exists() or (limit is not None and limit <= 0):
+        return []
+    start_ts = start_time.timestamp() if start_time else float("-inf")
+    end_ts = end_time.timestamp() if end_time else float("inf")
+    
+    results = []
+    with log_file.open("rb") as f:
+        size = f.seek(0, 2)
+        ranges = _candidate_ranges(log_file, size, start_ts, end_ts)
+        if limit is not None:
+            for begin, finish in reversed(ranges):
+                for raw in _reverse_lines(f, begin, finish, at_eof=finish == size):
+                    for entry in _parse_lines(raw):
+                        timestamp = entry_timestamp(entry)
+                        if timestamp is not None and start_ts <= timestamp <= end_ts:
+                            results.append(entry)
+                    if len(results) >= limit:
+                        results.reverse()
+                        return results
+            results.reverse()
+            return results
+        
+        for begin, finish in ranges:
+            f.seek(begin)
+            data = f.read(finish - begin)
+            if finish == size:
+                # Skip an unterminated line still being written
+                data = data[:data.rfind(b"\n") + 1]
+            for entry in _parse_lines(data):
+                timestamp = entry_timestamp(entry)
+                if timestamp is not None and start_ts <= timestamp <= end_ts:
+                    results.append(entry)
+    return results
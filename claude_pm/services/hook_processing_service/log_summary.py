@@ -0,0 +1,376 @@
+"""
+Incrementally maintained daily summaries of hook log activity.
+
+Counts by hook, hook type and status, error counts and latency sketches are
+updated as events are logged and persisted per day to
+``.claude-pm/hooks/summaries/<YYYYMMDD>.json``, so summary views read one
+small file instead of re-parsing every log.
+
+Latencies are kept in a log-bucketed sketch (relative error ~1%) that is
+mergeable across hooks and days and has a bounded number of buckets.
+
+A store owns its summary files: persisting rewrites a day from the in-memory
+copy, so two processes logging the same day into one project keep only the
+last writer's counts (``rebuild_log_summary`` recovers them from the logs).
+"""
+
+import atexit
+import json
+import logging
+import math
+import os
+import tempfile
+import threading
+import time
+import weakref
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+_live_stores: "weakref.WeakSet[HookLogSummaryStore]" = weakref.WeakSet()
+
+
+@atexit.register
+def _persist_stores_at_exit():
+    """Write summaries still inside the persist interval on interpreter shutdown."""
+    for store in list(_live_stores):
+        store.persist(force=True)
+
+
+class LatencySketch:
+    """Log-bucketed quantile sketch with bounded relative error."""
+    
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.buckets: Dict[int, int] = defaultdict(int)
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+    
+    def add(self, value: float):
+        """Record one latency in seconds."""
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if value <= 1e-9:
+            self.zero_count += 1
+        else:
+            self.buckets[math.ceil(math.log(value) / self._log_gamma)] += 1
+    
+    def merge(self, other: "LatencySketch"):
+        """Fold another sketch (same accuracy) into this one."""
+        for key, count in other.buckets.items():
+            self.buckets[key] += count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+    
+    def quantile(self, q: float) -> Optional[float]:
+        """Approximate q-quantile (0 <= q <= 1), or None when empty."""
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if rank < seen:
+                value = 2 * self._gamma ** key / (self._gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable form."""
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "buckets": {str(key): count for key, count in self.buckets.items()},
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "total": self.total,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LatencySketch":
+        """Restore a sketch from to_dict output."""
+        sketch = cls(data.get("relative_accuracy", 0.01))
+        for key, count in data.get("buckets", {}).items():
+            sketch.buckets[int(key)] = count
+        sketch.zero_count = data.get("zero_count", 0)
+        sketch.count = data.get("count", 0)
+        sketch.total = data.get("total", 0.0)
+        if sketch.count:
+            sketch.min = data["min"]
+            sketch.max = data["max"]
+        return sketch
+    
+    def describe(self) -> Dict[str, Any]:
+        """Count, mean and percentiles for reporting."""
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99)
+        }
+
+
+def _status_counts() -> Dict[str, int]:
+    return {"count": 0, "success": 0, "failure": 0}
+
+
+class DailySummary:
+    """Rolling aggregates for one day of hook activity."""
+    
+    def __init__(self, day: str):
+        self.day = day
+        self.by_hook: Dict[str, Dict[str, int]] = defaultdict(_status_counts)
+        self.by_type: Dict[str, Dict[str, int]] = defaultdict(_status_counts)
+        self.hook_latency: Dict[str, LatencySketch] = defaultdict(LatencySketch)
+        self.latency = LatencySketch()
+        self.errors_by_type: Dict[str, int] = defaultdict(int)
+        self.errors_by_severity: Dict[str, int] = defaultdict(int)
+        self.first_event: Optional[str] = None
+        self.last_event: Optional[str] = None
+    
+    def _touch(self, timestamp: datetime):
+        stamp = timestamp.isoformat()
+        if self.first_event is None or stamp < self.first_event:
+            self.first_event = stamp
+        if self.last_event is None or stamp > self.last_event:
+            self.last_event = stamp
+    
+    def record_execution(self, hook_id: str, hook_type: str, success: bool,
+                         execution_time: float, timestamp: datetime):
+        status = "success" if success else "failure"
+        for counts in (self.by_hook[hook_id], self.by_type[hook_type]):
+            counts["count"] += 1
+            counts[status] += 1
+        self.hook_latency[hook_id].add(execution_time)
+        self.latency.add(execution_time)
+        self._touch(timestamp)
+    
+    def record_error(self, error_type: str, severity: str, timestamp: datetime):
+        self.errors_by_type[error_type] += 1
+        self.errors_by_severity[severity] += 1
+        self._touch(timestamp)
+    
+    def merge(self, other: "DailySummary"):
+        """Fold another summary into this one (used for multi-day views)."""
+        for target, source in ((self.by_hook, other.by_hook), (self.by_type, other.by_type)):
+            for key, counts in source.items():
+                for field, value in counts.items():
+                    target[key][field] += value
+        for hook_id, sketch in other.hook_latency.items():
+            self.hook_latency[hook_id].merge(sketch)
+        self.latency.merge(other.latency)
+        for key, value in other.errors_by_type.items():
+            self.errors_by_type[key] += value
+        for key, value in other.errors_by_severity.items():
+            self.errors_by_severity[key] += value
+        for stamp in (other.first_event, other.last_event):
+            if stamp:
+                self._touch(datetime.fromisoformat(stamp))
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Persistable form (sketches kept raw so they stay mergeable)."""
+        return {
+            "day": self.day,
+            "by_hook": dict(self.by_hook),
+            "by_type": dict(self.by_type),
+            "hook_latency": {hook_id: sketch.to_dict() for hook_id, sketch in self.hook_latency.items()},
+            "latency": self.latency.to_dict(),
+            "errors_by_type": dict(self.errors_by_type),
+            "errors_by_severity": dict(self.errors_by_severity),
+            "first_event": self.first_event,
+            "last_event": self.last_event
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DailySummary":
+        summary = cls(data["day"])
+        for target, key in ((summary.by_hook, "by_hook"), (summary.by_type, "by_type")):
+            for name, counts in data.get(key, {}).items():
+                target[name].update(counts)
+        for hook_id, sketch in data.get("hook_latency", {}).items():
+            summary.hook_latency[hook_id] = LatencySketch.from_dict(sketch)
+        if "latency" in data:
+            summary.latency = LatencySketch.from_dict(data["latency"])
+        summary.errors_by_type.update(data.get("errors_by_type", {}))
+        summary.errors_by_severity.update(data.get("errors_by_severity", {}))
+        summary.first_event = data.get("first_event")
+        summary.last_event = data.get("last_event")
+        return summary
+    
+    def report(self) -> Dict[str, Any]:
+        """Dashboard view: counts, error totals and latency percentiles."""
+        total = sum(counts["count"] for counts in self.by_type.values())
+        failures = sum(counts["failure"] for counts in self.by_type.values())
+        return {
+            "day": self.day,
+            "total_events": total,
+            "total_failures": failures,
+            "success_rate": (total - failures) / total if total else None,
+            "by_type": dict(self.by_type),
+            "by_hook": {
+                hook_id: {**counts, "latency": self.hook_latency[hook_id].describe()}
+                for hook_id, counts in self.by_hook.items()
+            },
+            "latency": self.latency.describe(),
+            "errors": {
+                "total": sum(self.errors_by_type.values()),
+                "by_type": dict(self.errors_by_type),
+                "by_severity": dict(self.errors_by_severity)
+            },
+            "first_event": self.first_event,
+            "last_event": self.last_event
+        }
+
+
+class HookLogSummaryStore:
+    """Maintains and persists per-day summaries as hook events are logged."""
+    
+    def __init__(self, summaries_dir: Path, persist_interval: float = 1.0):
+        """Initialize the store.
+        
+        Args:
+            summaries_dir: Directory holding one ``<YYYYMMDD>.json`` file per day
+            persist_interval: Minimum seconds between non-forced writes
+        """
+        self.summaries_dir = summaries_dir
+        self.persist_interval = persist_interval
+        self._days: Dict[str, DailySummary] = {}
+        self._dirty: set = set()
+        self._last_persist = 0.0
+        self._lock = threading.Lock()
+        # Serializes persists so an older snapshot never replaces a newer one
+        self._persist_lock = threading.Lock()
+        _live_stores.add(self)
+    
+    def _path(self, day: str) -> Path:
+        return self.summaries_dir / f"{day}.json"
+    
+    def _load(self, day: str) -> Optional[DailySummary]:
+        path = self._path(day)
+        if not path.exists():
+            return None
+        try:
+            return DailySummary.from_dict(json.loads(path.read_text(encoding="utf-8")))
+        except (OSError, ValueError, KeyError) as e:
+            logger.error(f"Failed to load hook summary {path}: {e}")
+            return None
+    
+    def _day(self, day: str) -> DailySummary:
+        """In-memory summary for a day, resumed from disk on first use. Caller holds the lock."""
+        summary = self._days.get(day)
+        if summary is None:
+            summary = self._load(day) or DailySummary(day)
+            self._days[day] = summary
+            # Keep only recent days resident; older ones live on disk
+            for stale in sorted(self._days)[:-2]:
+                if stale != day and stale not in self._dirty:
+                    del self._days[stale]
+        return summary
+    
+    def record_execution(self, hook_id: str, hook_type: str, success: bool,
+                         execution_time: float, timestamp: datetime):
+        """Fold a hook execution into its day's summary."""
+        day = timestamp.strftime("%Y%m%d")
+        with self._lock:
+            self._day(day).record_execution(hook_id, hook_type, success, execution_time, timestamp)
+            self._dirty.add(day)
+    
+    def record_error(self, error_type: str, severity: str, timestamp: datetime):
+        """Fold an error detection into its day's summary."""
+        day = timestamp.strftime("%Y%m%d")
+        with self._lock:
+            self._day(day).record_error(error_type, severity, timestamp)
+            self._dirty.add(day)
+    
+    def persist(self, force: bool = False):
+        """Write dirty day summaries atomically (rate limited unless forced)."""
+        now = time.monotonic()
+        with self._persist_lock:
+            with self._lock:
+                if not self._dirty or (not force and now - self._last_persist < self.persist_interval):
+                    return
+                pending = {day: json.dumps(self._days[day].to_dict()) for day in self._dirty}
+                self._dirty.clear()
+                self._last_persist = now
+            
+            try:
+                self.summaries_dir.mkdir(parents=True, exist_ok=True)
+                for day, payload in pending.items():
+                    self._write_atomic(self._path(day), payload)
+            except OSError as e:
+                logger.error(f"Failed to persist hook summaries: {e}")
+                with self._lock:
+                    self._dirty.update(pending)
+    
+    def _write_atomic(self, path: Path, payload: str):
+        """Replace ``path`` via a uniquely named temporary file in the same directory."""
+        fd, tmp_name = tempfile.mkstemp(prefix=f".{path.stem}.", suffix=".tmp", dir=self.summaries_dir)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(payload)
+            os.replace(tmp_name, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
+    
+    def get_day(self, day: Optional[date] = None) -> DailySummary:
+        """Summary for a day (today by default) without touching the logs."""
+        key = (day or date.today()).strftime("%Y%m%d")
+        with self._lock:
+            summary = self._days.get(key)
+            if summary is not None:
+                return DailySummary.from_dict(summary.to_dict())
+        return self._load(key) or DailySummary(key)
+    
+    def get_range(self, start_day: date, end_day: date) -> DailySummary:
+        """Merged summary over an inclusive range of days."""
+        merged = DailySummary(f"{start_day:%Y%m%d}-{end_day:%Y%m%d}")
+        day = start_day
+        while day <= end_day:
+            merged.merge(self.get_day(day))
+            day += timedelta(days=1)
+        return merged
+    
+    def rebuild_day(self, day: date, entries: Iterable[Dict[str, Any]]) -> DailySummary:
+        """Replace a day's summary from raw log entries (one-off backfill for older logs)."""
+        key = day.strftime("%Y%m%d")
+        summary = DailySummary(key)
+        for entry in entries:
+            try:
+                timestamp = datetime.fromisoformat(entry["timestamp"])
+                if "error_type" in entry:
+                    summary.record_error(entry["error_type"], entry.get("severity", "unknown"), timestamp)
+                else:
+                    summary.record_execution(
+                        entry["hook_id"], entry["hook_type"], bool(entry.get("success")),
+                        float(entry.get("execution_time") or 0.0), timestamp
+                    )
+            except (KeyError, TypeError, ValueError):
+                continue
+        with self._lock:
+            self._days[key] = summary
+            self._dirty.add(key)
+        self.persist(force=True)
+        return summary
@@ -1,26 +1,271 @@
 """
 Project-based hook logging system with automatic directory management and log rotation.
+
+Log lines are handed to a background writer thread that batches them, keeps
+file handles open across writes and flushes on size or interval, so hook
+execution never waits on disk I/O. Pending lines are flushed on close() and
+at interpreter exit.
+
+Reads never parse whole files: recent-entry queries read backwards from EOF
+and time-range queries seek through a sparse index kept next to each log
+(see log_index). Per-day counts, error totals and latency sketches are
+maintained as events are logged (see log_summary), so summary views never
+rescan logs.
 """
 
+import atexit
 import json
 import logging
-from datetime import datetime, timedelta
+import os
+import queue
+import re
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import BinaryIO, Callable, Dict, List, Any, Optional, Tuple
 
+from .log_index import SparseIndexWriter, index_path_for, read_range, read_tail
+from .log_summary import HookLogSummaryStore
 from .models import HookConfiguration, HookExecutionResult, ErrorDetectionResult, HookType
 
+_live_writers: "weakref.WeakSet[HookLogWriter]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_writers_at_exit():
+    """Make buffered hook logs durable on interpreter shutdown."""
+    for writer in list(_live_writers):
+        writer.close()
+
+
+class _FlushRequest:
+    """Queue marker asking the writer to flush (and optionally stop)."""
+    
+    def __init__(self, fsync: bool = False, stop: bool = False):
+        self.fsync = fsync
+        self.stop = stop
+        self.done = threading.Event()
+
+
+class HookLogWriter:
+    """Background writer that batches JSON lines and keeps log files open."""
+    
+    def __init__(self, max_file_bytes: float, rotate: Callable[[Path], None],
+                 flush_interval: float = 0.5, flush_bytes: int = 64 * 1024,
+                 max_open_files: int = 64, idle_timeout: float = 30.0,
+                 after_batch: Optional[Callable[[], None]] = None):
+        """Initialize the writer.
+        
+        Args:
+            max_file_bytes: Size above which a log file is rotated before the next write
+            rotate: Callback that rotates (renames and cleans up) a closed log file
+            flush_interval: Maximum seconds a line waits in the buffer
+            flush_bytes: Buffered bytes that trigger an immediate flush
+            max_open_files: Maximum number of file handles kept open
+            idle_timeout: Seconds without traffic before the thread exits
+            after_batch: Called on the writer thread after each written batch
+        """
+        self.max_file_bytes = max_file_bytes
+        self.rotate = rotate
+        self.flush_interval = flush_interval
+        self.flush_bytes = flush_bytes
+        self.max_open_files = max_open_files
+        self.idle_timeout = idle_timeout
+        self.after_batch = after_batch
+        self.logger = logging.getLogger(f"{__name__}.HookLogWriter")
+        
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._handles: "OrderedDict[Path, BinaryIO]" = OrderedDict()
+        self._sizes: Dict[Path, int] = {}
+        self.index = SparseIndexWriter()
+        self._handle_day: Optional[str] = None
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+        self.stats = {'lines_written': 0, 'batches_written': 0, 'rotations': 0, 'write_errors': 0}
+        _live_writers.add(self)
+    
+    def write(self, log_file: Path, line: str, timestamp: Optional[float] = None):
+        """Queue a line for the given log file; never touches the disk."""
+        self._queue.put((log_file, line, timestamp))
+        self._ensure_thread()
+    
+    def flush(self, fsync: bool = False, timeout: Optional[float] = 10.0) -> bool:
+        """Block until every line queued so far is written.
+        
+        Args:
+            fsync: Also fsync the open files
+            timeout: Maximum seconds to wait
+        
+        Returns:
+            True if the flush completed within the timeout
+        """
+        request = _FlushRequest(fsync=fsync)
+        self._queue.put(request)
+        self._ensure_thread()
+        return request.done.wait(timeout)
+    
+    def close(self, timeout: Optional[float] = 10.0):
+        """Flush, fsync and close all files and stop the writer thread."""
+        with self._thread_lock:
+            if self._thread is None and self._queue.empty():
+                return
+        request = _FlushRequest(fsync=True, stop=True)
+        self._queue.put(request)
+        thread = self._ensure_thread()
+        request.done.wait(timeout)
+        thread.join(timeout)
+    
+    def _ensure_thread(self) -> threading.Thread:
+        with self._thread_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="hook-log-writer", daemon=True
+                )
+                self._thread.start()
+            return self._thread
+    
+    def _exit_if_idle(self) -> bool:
+        """Let the thread exit when nothing is queued; write() restarts it."""
+        with self._thread_lock:
+            if not self._queue.empty():
+                return False
+            self._thread = None
+            return True
+    
+    def _run(self):
+        """Writer loop: batch lines until the size or interval threshold."""
+        pending: Dict[Path, List[Tuple[str, Optional[float]]]] = {}
+        pending_bytes = 0
+        deadline = 0.0
+        
+        while True:
+            timeout = max(0.0, deadline - time.monotonic()) if pending else self.idle_timeout
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                if not pending:
+                    # Idle: release file handles and the thread
+                    self._close_handles()
+                    if self._exit_if_idle():
+                        return
+                    continue
+                item = None
+            
+            if isinstance(item, tuple):
+                log_file, line, timestamp = item
+                if not pending:
+                    deadline = time.monotonic() + self.flush_interval
+                pending.setdefault(log_file, []).append((line, timestamp))
+                pending_bytes += len(line)
+                if pending_bytes < self.flush_bytes and time.monotonic() < deadline:
+                    continue
+            
+            # Interval elapsed, size threshold reached or flush requested
+            if pending:
+                self._write_batch(pending)
+                pending = {}
+                pending_bytes = 0
+            
+            if isinstance(item, _FlushRequest):
+                if item.fsync:
+                    self._fsync_handles()
+                if item.stop:
+                    self._close_handles()
+                    item.done.set()
+                    if self._exit_if_idle():
+                        return
+                    continue
+                item.done.set()
+    
+    def _write_batch(self, pending: Dict[Path, List[Tuple[str, Optional[float]]]]):
+        today = datetime.now().strftime("%Y%m%d")
+        if self._handle_day != today:
+            # Daily rotation: log paths are dated, so yesterday's files are done
+            self._close_handles()
+            self._handle_day = today
+        
+        for log_file, lines in pending.items():
+            try:
+                handle = self._handle_for(log_file)
+                for line, timestamp in lines:
+                    if self._sizes[log_file] > self.max_file_bytes:
+                        handle = self._rotate(log_file)
+                    data = line.encode("utf-8")
+                    handle.write(data)
+                    self.index.observe(log_file, self._sizes[log_file], len(data), timestamp)
+                    self._sizes[log_file] += len(data)
+                handle.flush()
+                self.stats['lines_written'] += len(lines)
+            except Exception as e:
+                self.stats['write_errors'] += 1
+                self.logger.error(f"Failed to write {len(lines)} hook log lines to {log_file}: {e}")
+                self._close_handle(log_file)
+        self.stats['batches_written'] += 1
+        
+        if self.after_batch is not None:
+            try:
+                self.after_batch()
+            except Exception as e:
+                self.logger.error(f"Hook log after-batch callback failed: {e}")
+    
+    def _handle_for(self, log_file: Path) -> BinaryIO:
+        handle = self._handles.get(log_file)
+        if handle is not None:
+            self._handles.move_to_end(log_file)
+            return handle
+        handle = log_file.open("ab")
+        self._handles[log_file] = handle
+        self._sizes[log_file] = handle.seek(0, os.SEEK_END)
+        while len(self._handles) > self.max_open_files:
+            self._close_handle(next(iter(self._handles)))
+        return handle
+    
+    def _rotate(self, log_file: Path) -> BinaryIO:
+        self._close_handle(log_file)
+        self.rotate(log_file)
+        self.stats['rotations'] += 1
+        return self._handle_for(log_file)
+    
+    def _close_handle(self, log_file: Path):
+        self.index.finish(log_file)
+        self._sizes.pop(log_file, None)
+        handle = self._handles.pop(log_file, None)
+        if handle is not None:
+            try:
+                handle.close()
+            except Exception:
+                pass
+    
+    def _fsync_handles(self):
+        for log_file, handle in list(self._handles.items()):
+            try:
+                handle.flush()
+                os.fsync(handle.fileno())
+            except Exception as e:
+                self.logger.error(f"Failed to fsync hook log {log_file}: {e}")
+    
+    def _close_handles(self):
+        for log_file in list(self._handles):
+            self._close_handle(log_file)
+
 
 class ProjectBasedHookLogger:
     """Project-based hook logging system with automatic directory management and log rotation."""
     
-    def __init__(self, project_root: Optional[str] = None, max_log_files: int = 10, max_log_size_mb: int = 10):
+    def __init__(self, project_root: Optional[str] = None, max_log_files: int = 10, max_log_size_mb: int = 10,
+                 buffered: bool = True, flush_interval: float = 0.5, flush_bytes: int = 64 * 1024):
         """Initialize project-based hook logger.
         
         Args:
             project_root: Project root directory (defaults to current working directory)
             max_log_files: Maximum number of log files to retain per hook type
             max_log_size_mb: Maximum size of individual log files in MB
+            buffered: Write through a background writer instead of on the caller's thread
+            flush_interval: Maximum seconds a buffered line waits before being written
+            flush_bytes: Buffered bytes that trigger an immediate write
         """
         self.project_root = Path(project_root) if project_root else Path.cwd()
         self.max_log_files = max_log_files
@@ -35,6 +280,58 @@ class ProjectBasedHookLogger:
         # Track log files per hook type
         self.log_files: Dict[str, Path] = {}
         
+        # Rolling per-day summaries, persisted alongside the logs
+        self.summaries = HookLogSummaryStore(self.hooks_dir / "summaries")
+        
+        # Sparse offset index for synchronous (unbuffered) writes
+        self.index = SparseIndexWriter()
+        
+        # Background writer keeps disk I/O off the hook execution path
+        self.writer: Optional[HookLogWriter] = None
+        if buffered:
+            self.writer = HookLogWriter(
+                max_file_bytes=self.max_log_size_mb * 1024 * 1024,
+                rotate=self._rotate_log_file,
+                flush_interval=flush_interval,
+                flush_bytes=flush_bytes,
+                after_batch=self.summaries.persist
+            )
+    
+    def _write_line(self, log_file: Path, entry: Dict[str, Any], timestamp: datetime):
+        """Write one JSON log line, via the background writer when buffered."""
+        line = json.dumps(entry) + "\n"
+        if self.writer is not None:
+            self.writer.write(log_file, line, timestamp.timestamp())
+            return
+        
+        # Rotate if necessary
+        self._rotate_log_file(log_file)
+        data = line.encode("utf-8")
+        with log_file.open("ab") as f:
+            offset = f.seek(0, os.SEEK_END)
+            f.write(data)
+        self.index.observe(log_file, offset, len(data), timestamp.timestamp())
+    
+    def flush(self, fsync: bool = False) -> bool:
+        """Write all buffered log lines to disk.
+        
+        Args:
+            fsync: Also fsync the log files
+        
+        Returns:
+            True if everything queued so far has been written
+        """
+        flushed = self.writer.flush(fsync=fsync) if self.writer is not None else True
+        self.summaries.persist(force=True)
+        return flushed
+    
+    def close(self):
+        """Flush and fsync buffered logs and release file handles."""
+        if self.writer is not None:
+            self.writer.close()
+        self.index.finish_all()
+        self.summaries.persist(force=True)
+        
     def _ensure_directories(self):
         """Ensure hook logging directories exist."""
         try:
@@ -61,7 +358,11 @@ class ProjectBasedHookLogger:
             if log_file.exists() and log_file.stat().st_size > (self.max_log_size_mb * 1024 * 1024):
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 rotated_file = log_file.with_suffix(f".{timestamp}.log")
+                self.index.finish(log_file)
                 log_file.rename(rotated_file)
+                index_file = index_path_for(log_file)
+                if index_file.exists():
+                    index_file.rename(index_path_for(rotated_file))
                 self.logger.info(f"Rotated log file: {log_file} -> {rotated_file}")
                 
                 # Clean up old log files
@@ -82,6 +383,7 @@ class ProjectBasedHookLogger:
             # Remove excess files
             for old_file in log_files[self.max_log_files:]:
                 old_file.unlink()
+                index_path_for(old_file).unlink(missing_ok=True)
                 self.logger.info(f"Cleaned up old log file: {old_file}")
                 
         except Exception as e:
@@ -92,9 +394,6 @@ class ProjectBasedHookLogger:
         try:
             log_file = self._get_log_file_path(hook_config.hook_type, hook_config.hook_id)
             
-            # Rotate if necessary
-            self._rotate_log_file(log_file)
-            
             # Prepare log entry
             log_entry = {
                 "timestamp": result.timestamp.isoformat(),
@@ -112,9 +411,13 @@ class ProjectBasedHookLogger:
                 "metadata": result.metadata
             }
             
-            # Write to log file
-            with log_file.open("a", encoding="utf-8") as f:
-                f.write(json.dumps(log_entry) + "\n")
+            self._write_line(log_file, log_entry, result.timestamp)
+            self.summaries.record_execution(
+                hook_config.hook_id, hook_config.hook_type.value, result.success,
+                result.execution_time, result.timestamp
+            )
+            if self.writer is None:
+                self.summaries.persist()
                 
         except Exception as e:
             self.logger.error(f"Failed to log hook execution for {hook_config.hook_id}: {e}")
@@ -125,9 +428,6 @@ class ProjectBasedHookLogger:
             # Use ERROR_DETECTION hook type for error logging
             log_file = self._get_log_file_path(HookType.ERROR_DETECTION, "error_detection")
             
-            # Rotate if necessary
-            self._rotate_log_file(log_file)
-            
             # Prepare error log entry
             error_entry = {
                 "timestamp": error_result.timestamp.isoformat(),
@@ -139,47 +439,133 @@ class ProjectBasedHookLogger:
                 "context": context
             }
             
-            # Write to log file
-            with log_file.open("a", encoding="utf-8") as f:
-                f.write(json.dumps(error_entry) + "\n")
+            self._write_line(log_file, error_entry, error_result.timestamp)
+            self.summaries.record_error(
+                error_result.error_type, error_result.severity.value, error_result.timestamp
+            )
+            if self.writer is None:
+                self.summaries.persist()
                 
         except Exception as e:
             self.logger.error(f"Failed to log error detection: {e}")
     
-    def get_hook_logs(self, hook_type: HookType, hook_id: str, limit: int = 100) -> List[Dict[str, Any]]:
-        """Retrieve recent hook logs for a specific hook."""
-        try:
-            log_file = self._get_log_file_path(hook_type, hook_id)
+    def get_hook_logs(self, hook_type: HookType, hook_id: str, limit: int = 100,
+                      start_time: Optional[datetime] = None,
+                      end_time: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Retrieve recent hook logs for a specific hook.
+        
+        Without a time range, today's log is read backwards from EOF until
+        ``limit`` entries are found. With a time range, the daily logs in the
+        range (including size-rotated ones) are read newest first through
+        their sparse indexes, backwards within each file, until the most
+        recent ``limit`` matches are found; older logs are not opened.
+        
+        Args:
+            hook_type: Hook type
+            hook_id: Hook identifier
+            limit: Maximum number of entries to return
+            start_time: Inclusive lower timestamp bound
+            end_time: Inclusive upper timestamp bound
             
-            if not log_file.exists():
-                return []
+        Returns:
+            Log entries in chronological (file) order
+        """
+        try:
+            self.flush()
             
-            logs = []
-            with log_file.open("r", encoding="utf-8") as f:
-                for line in f:
-                    try:
-                        log_entry = json.loads(line.strip())
-                        logs.append(log_entry)
-                    except json.JSONDecodeError:
-                        continue
+            if start_time is None and end_time is None:
+                return read_tail(self._get_log_file_path(hook_type, hook_id), limit)
             
-            # Return most recent logs first
-            return logs[-limit:] if len(logs) > limit else logs
+            newest_first = []
+            found = 0
+            for log_file in reversed(self._log_files_for_range(hook_type, hook_id, start_time, end_time)):
+                if found >= limit:
+                    break
+                entries = read_range(log_file, start_time, end_time, limit=limit - found)
+                newest_first.append(entries)
+                found += len(entries)
+            return [entry for entries in reversed(newest_first) for entry in entries]
             
         except Exception as e:
             self.logger.error(f"Failed to retrieve logs for {hook_id}: {e}")
             return []
     
+    def _log_files_for_range(self, hook_type: HookType, hook_id: str,
+                             start_time: Optional[datetime],
+                             end_time: Optional[datetime]) -> List[Path]:
+        """Existing daily (and size-rotated) log files covering a time range, oldest first.
+        
+        Without ``start_time`` every log dated on or before ``end_time``'s day is included.
+        """
+        type_dir = self.logs_dir / hook_type.value
+        last_day = (end_time or datetime.now()).date()
+        
+        if start_time is None:
+            # Open-ended range: take the days that have logs rather than walking back day by day
+            name_pattern = re.compile(rf"{re.escape(hook_id)}_(\d{{8}})\.")
+            last_date_str = last_day.strftime("%Y%m%d")
+            date_strs = sorted({
+                match.group(1)
+                for match in (name_pattern.match(path.name) for path in type_dir.glob(f"{hook_id}_*.log"))
+                if match and match.group(1) <= last_date_str
+            })
+        else:
+            date_strs = []
+            day = start_time.date()
+            while day <= last_day:
+                date_strs.append(day.strftime("%Y%m%d"))
+                day += timedelta(days=1)
+        
+        log_files = []
+        for date_str in date_strs:
+            # Rotated files carry their rotation timestamp, so names sort chronologically
+            log_files.extend(sorted(type_dir.glob(f"{hook_id}_{date_str}.*.log")))
+            current = type_dir / f"{hook_id}_{date_str}.log"
+            if current.exists():
+                log_files.append(current)
+        return log_files
+    
+    def get_log_summary(self, day: Optional[date] = None) -> Dict[str, Any]:
+        """Counts, error totals and latency percentiles for a day (default today).
+        
+        Reads the incrementally maintained summary; logs are not parsed.
+        """
+        return self.summaries.get_day(day).report()
+    
+    def get_log_summary_range(self, start_day: date, end_day: date) -> Dict[str, Any]:
+        """Merged summary over an inclusive range of days, built from stored daily summaries."""
+        return self.summaries.get_range(start_day, end_day).report()
+    
+    def rebuild_log_summary(self, day: date) -> Dict[str, Any]:
+        """Backfill a day's summary by parsing its logs once (for logs written before summaries existed)."""
+        self.flush()
+        date_str = day.strftime("%Y%m%d")
+        
+        def entries():
+            for hook_type in HookType:
+                type_dir = self.logs_dir / hook_type.value
+                for log_file in type_dir.glob(f"*_{date_str}*.log"):
+                    with log_file.open("r", encoding="utf-8") as f:
+                        for line in f:
+                            try:
+                                yield json.loads(line)
+                            except json.JSONDecodeError:
+                                continue
+        
+        return self.summaries.rebuild_day(day, entries()).report()
+    
     def get_project_hook_summary(self) -> Dict[str, Any]:
         """Get summary of all hook activity for the project."""
         try:
+            self.flush()
             summary = {
                 "project_root": str(self.project_root),
                 "hooks_directory": str(self.hooks_dir),
                 "logs_directory": str(self.logs_dir),
                 "hook_types": {},
                 "total_log_files": 0,
-                "total_log_size_mb": 0.0
+                "total_log_size_mb": 0.0,
+                "today": self.get_log_summary()
             }
             
             for hook_type in HookType:
@@ -213,6 +599,7 @@ class ProjectBasedHookLogger:
     def cleanup_old_logs(self, days_old: int = 30):
         """Clean up log files older than specified days."""
         try:
+            self.flush()
             cutoff_date = datetime.now() - timedelta(days=days_old)
             cutoff_timestamp = cutoff_date.timestamp()
             
@@ -223,6 +610,7 @@ class ProjectBasedHookLogger:
                     for log_file in type_dir.glob("*.log*"):
                         if log_file.stat().st_mtime < cutoff_timestamp:
                             log_file.unlink()
+                            index_path_for(log_file).unlink(missing_ok=True)
                             cleaned_files += 1
                             
             self.logger.info(f"Cleaned up {cleaned_files} old log files older than {days_old} days")
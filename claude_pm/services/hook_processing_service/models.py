@@ -61,4 +61,5 @@ class HookConfiguration:
     retry_count: int = 3
     prefer_async: bool = True  # Default to async execution
     force_sync: bool = False   # Override to force sync execution
+    inline: bool = False       # Run cheap sync handlers directly on the event loop (no executor hop, no timeout)
     metadata: Dict[str, Any] = field(default_factory=dict)
\ No newline at end of file
@@ -1,13 +1,143 @@
 """
 System for monitoring hook performance and health.
+
+Execution and error records are kept in fixed-capacity ring buffers, and
+the statistics the reports need (windowed success/failure counts, severity
+distribution, per-error-type counts, per-hook count/mean/variance/quantiles)
+are maintained incrementally as records arrive. Memory stays bounded for
+long-running orchestrators and reports do not scan the history.
 """
 
 import logging
+import math
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Any, Dict, Generic, Iterator, List, Optional, TypeVar, Union
 
+from .log_summary import LatencySketch
 from .models import HookExecutionResult, ErrorDetectionResult, ErrorSeverity
 
+T = TypeVar('T')
+
+
+class RingBuffer(Generic[T]):
+    """Fixed-capacity buffer that overwrites its oldest item when full."""
+    
+    def __init__(self, capacity: int):
+        self.capacity = max(1, capacity)
+        self._items: List[Optional[T]] = [None] * self.capacity
+        self._start = 0
+        self._size = 0
+    
+    def append(self, item: T) -> Optional[T]:
+        """Append an item, returning the evicted oldest item if the buffer was full."""
+        evicted = None
+        if self._size < self.capacity:
+            self._items[(self._start + self._size) % self.capacity] = item
+            self._size += 1
+        else:
+            evicted = self._items[self._start]
+            self._items[self._start] = item
+            self._start = (self._start + 1) % self.capacity
+        return evicted
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def __bool__(self) -> bool:
+        return self._size > 0
+    
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._size))]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("ring buffer index out of range")
+        return self._items[(self._start + index) % self.capacity]
+    
+    def __iter__(self) -> Iterator[T]:
+        for i in range(self._size):
+            yield self._items[(self._start + i) % self.capacity]
+    
+    def recent(self, count: int) -> List[T]:
+        """The most recent ``count`` items, oldest first."""
+        return self[max(0, self._size - count):]
+    
+    def iter_newest_first(self) -> Iterator[T]:
+        for i in range(self._size - 1, -1, -1):
+            yield self._items[(self._start + i) % self.capacity]
+
+
+class _ExecutionWindow:
+    """Execution and failure counts over the last ``size`` executions."""
+    
+    def __init__(self, size: int):
+        self.size = size
+        self.count = 0
+        self.failures = 0
+    
+    def _apply(self, result: HookExecutionResult, sign: int):
+        self.count += sign
+        if not result.success:
+            self.failures += sign
+    
+    def update(self, history: RingBuffer, result: HookExecutionResult, evicted: Optional[HookExecutionResult]):
+        """Account for ``result`` just appended to ``history``."""
+        self._apply(result, 1)
+        if self.count > self.size:
+            leaving = evicted if self.size == history.capacity else history[-(self.size + 1)]
+            self._apply(leaving, -1)
+    
+    @property
+    def failure_rate(self) -> float:
+        return self.failures / self.count if self.count else 0.0
+
+
+@dataclass
+class HookStreamingStats:
+    """Streaming per-hook aggregates: count, Welford mean/variance, extremes, quantile sketch."""
+    count: int = 0
+    failures: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    min: float = math.inf
+    max: float = 0.0
+    sketch: LatencySketch = field(default_factory=LatencySketch)
+    last_execution: Optional[datetime] = None
+    
+    def add(self, execution_time: float, success: bool, timestamp: datetime):
+        self.count += 1
+        if not success:
+            self.failures += 1
+        delta = execution_time - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (execution_time - self.mean)
+        self.min = min(self.min, execution_time)
+        self.max = max(self.max, execution_time)
+        self.sketch.add(execution_time)
+        self.last_execution = timestamp
+    
+    @property
+    def variance(self) -> float:
+        """Sample variance of execution time."""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'failures': self.failures,
+            'success_rate': (self.count - self.failures) / self.count if self.count else 0.0,
+            'mean_execution_time': self.mean,
+            'stddev_execution_time': math.sqrt(self.variance),
+            'min_execution_time': self.min if self.count else None,
+            'max_execution_time': self.max if self.count else None,
+            'p50_execution_time': self.sketch.quantile(0.5),
+            'p95_execution_time': self.sketch.quantile(0.95),
+            'p99_execution_time': self.sketch.quantile(0.99),
+            'last_execution': self.last_execution.isoformat() if self.last_execution else None
+        }
+
 
 class HookMonitoringSystem:
     """System for monitoring hook performance and health."""
@@ -15,8 +145,18 @@ class HookMonitoringSystem:
     def __init__(self, max_history: int = 1000):
         self.logger = logging.getLogger(__name__)
         self.max_history = max_history
-        self.execution_history: List[HookExecutionResult] = []
-        self.error_history: List[ErrorDetectionResult] = []
+        self.execution_history: RingBuffer[HookExecutionResult] = RingBuffer(max_history)
+        self.error_history: RingBuffer[ErrorDetectionResult] = RingBuffer(max_history)
+        
+        # Incrementally maintained views over the ring buffers
+        capacity = self.execution_history.capacity
+        self._report_window = _ExecutionWindow(min(100, capacity))
+        self._alert_window = _ExecutionWindow(min(50, capacity))
+        self._active_alert_window = _ExecutionWindow(min(20, capacity))
+        self._recent_error_window = min(100, capacity)
+        self._recent_severity_counts: Dict[ErrorSeverity, int] = {severity: 0 for severity in ErrorSeverity}
+        self._error_type_counts: Dict[str, Dict[str, Any]] = {}
+        self.hook_stats: Dict[str, HookStreamingStats] = {}
         self.performance_metrics = {
             'total_hooks_executed': 0,
             'total_errors_detected': 0,
@@ -32,11 +172,14 @@ class HookMonitoringSystem:
     
     def record_execution(self, result: HookExecutionResult):
         """Record a hook execution result."""
-        self.execution_history.append(result)
+        evicted = self.execution_history.append(result)
+        for window in (self._report_window, self._alert_window, self._active_alert_window):
+            window.update(self.execution_history, result, evicted)
         
-        # Maintain history size
-        if len(self.execution_history) > self.max_history:
-            self.execution_history.pop(0)
+        stats = self.hook_stats.get(result.hook_id)
+        if stats is None:
+            stats = self.hook_stats[result.hook_id] = HookStreamingStats()
+        stats.add(result.execution_time, result.success, result.timestamp)
         
         # Update metrics
         self.performance_metrics['total_hooks_executed'] += 1
@@ -52,11 +195,27 @@ class HookMonitoringSystem:
     
     def record_error_detection(self, result: ErrorDetectionResult):
         """Record an error detection result."""
-        self.error_history.append(result)
+        evicted = self.error_history.append(result)
+        
+        # Severity distribution over the most recent errors
+        self._recent_severity_counts[result.severity] += 1
+        if len(self.error_history) > self._recent_error_window or evicted is not None:
+            leaving = evicted if self._recent_error_window == self.error_history.capacity \
+                else self.error_history[-(self._recent_error_window + 1)]
+            self._recent_severity_counts[leaving.severity] -= 1
         
-        # Maintain history size
-        if len(self.error_history) > self.max_history:
-            self.error_history.pop(0)
+        # Per-type counts over the whole buffer
+        entry = self._error_type_counts.get(result.error_type)
+        if entry is None:
+            entry = self._error_type_counts[result.error_type] = {'count': 0, 'latest': result}
+        entry['count'] += 1
+        if result.timestamp >= entry['latest'].timestamp:
+            entry['latest'] = result
+        if evicted is not None:
+            evicted_entry = self._error_type_counts[evicted.error_type]
+            evicted_entry['count'] -= 1
+            if evicted_entry['count'] == 0:
+                del self._error_type_counts[evicted.error_type]
         
         self.performance_metrics['total_errors_detected'] += 1
         self.performance_metrics['last_updated'] = datetime.now()
@@ -67,32 +226,29 @@ class HookMonitoringSystem:
     
     def get_performance_report(self) -> Dict[str, Any]:
         """Generate comprehensive performance report."""
-        recent_executions = self.execution_history[-100:]  # Last 100 executions
-        recent_errors = self.error_history[-100:]  # Last 100 errors
+        window = self._report_window  # Last 100 executions
+        recent_errors_count = min(len(self.error_history), self._recent_error_window)  # Last 100 errors
         
         # Calculate rates
         success_rate = 0.0
         failure_rate = 0.0
-        if recent_executions:
-            successful = sum(1 for r in recent_executions if r.success)
-            success_rate = successful / len(recent_executions)
-            failure_rate = (len(recent_executions) - successful) / len(recent_executions)
+        if window.count:
+            failure_rate = window.failure_rate
+            success_rate = 1.0 - failure_rate
         
         # Error severity distribution
-        error_severity_dist = {}
-        for severity in ErrorSeverity:
-            error_severity_dist[severity.value] = sum(
-                1 for r in recent_errors if r.severity == severity
-            )
+        error_severity_dist = {
+            severity.value: count for severity, count in self._recent_severity_counts.items()
+        }
         
         return {
             'performance_metrics': self.performance_metrics,
             'recent_statistics': {
                 'success_rate': success_rate,
                 'failure_rate': failure_rate,
-                'error_rate': len(recent_errors) / max(1, len(recent_executions)),
-                'executions_count': len(recent_executions),
-                'errors_count': len(recent_errors)
+                'error_rate': recent_errors_count / max(1, window.count),
+                'executions_count': window.count,
+                'errors_count': recent_errors_count
             },
             'error_severity_distribution': error_severity_dist,
             'top_errors': self._get_top_errors(),
@@ -121,10 +277,9 @@ class HookMonitoringSystem:
                 'severity': 'warning'
             })
         
-        # Calculate recent failure rate
-        recent_executions = self.execution_history[-50:]  # Last 50 executions
-        if len(recent_executions) >= 10:
-            failure_rate = sum(1 for r in recent_executions if not r.success) / len(recent_executions)
+        # Calculate recent failure rate over the last 50 executions
+        if self._alert_window.count >= 10:
+            failure_rate = self._alert_window.failure_rate
             if failure_rate > self.alert_thresholds['failure_rate']:
                 alerts.append({
                     'type': 'high_failure_rate',
@@ -141,17 +296,10 @@ class HookMonitoringSystem:
     
     def _get_top_errors(self) -> List[Dict[str, Any]]:
         """Get most common errors."""
-        error_counts = {}
-        for error in self.error_history:
-            key = error.error_type
-            if key not in error_counts:
-                error_counts[key] = {'count': 0, 'latest': error}
-            error_counts[key]['count'] += 1
-            if error.timestamp > error_counts[key]['latest'].timestamp:
-                error_counts[key]['latest'] = error
-        
         # Sort by count and return top 5
-        top_errors = sorted(error_counts.items(), key=lambda x: x[1]['count'], reverse=True)[:5]
+        top_errors = sorted(
+            self._error_type_counts.items(), key=lambda x: x[1]['count'], reverse=True
+        )[:5]
         
         return [
             {
@@ -169,7 +317,7 @@ class HookMonitoringSystem:
             return {'insufficient_data': True}
         
         # Calculate trends for last 50 executions
-        recent = self.execution_history[-50:]
+        recent = self.execution_history.recent(50)
         first_half = recent[:len(recent)//2]
         second_half = recent[len(recent)//2:]
         
@@ -188,9 +336,8 @@ class HookMonitoringSystem:
         alerts = []
         
         # Check current failure rate
-        recent_executions = self.execution_history[-20:]
-        if len(recent_executions) >= 5:
-            failure_rate = sum(1 for r in recent_executions if not r.success) / len(recent_executions)
+        if self._active_alert_window.count >= 5:
+            failure_rate = self._active_alert_window.failure_rate
             if failure_rate > self.alert_thresholds['failure_rate']:
                 alerts.append({
                     'type': 'high_failure_rate',
@@ -200,8 +347,12 @@ class HookMonitoringSystem:
                 })
         
         # Check recent error rate
-        recent_errors = len([e for e in self.error_history if 
-                           (datetime.now() - e.timestamp).total_seconds() < 300])  # Last 5 minutes
+        now = datetime.now()
+        recent_errors = 0
+        for error in self.error_history.iter_newest_first():  # Last 5 minutes
+            if (now - error.timestamp).total_seconds() >= 300:
+                break
+            recent_errors += 1
         if recent_errors > 5:
             alerts.append({
                 'type': 'high_error_rate',
@@ -210,4 +361,22 @@ class HookMonitoringSystem:
                 'threshold': 5
             })
         
-        return alerts
\ No newline at end of file
+        return alerts
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Constant-time snapshot of the incrementally maintained statistics."""
+        return {
+            'total_hooks_executed': self.performance_metrics['total_hooks_executed'],
+            'total_errors_detected': self.performance_metrics['total_errors_detected'],
+            'average_execution_time': self.performance_metrics['average_execution_time'],
+            'peak_execution_time': self.performance_metrics['peak_execution_time'],
+            'recent_failure_rate': self._report_window.failure_rate,
+            'history_size': len(self.execution_history),
+            'history_capacity': self.execution_history.capacity,
+            'hooks': {hook_id: stats.to_dict() for hook_id, stats in self.hook_stats.items()}
+        }
+    
+    def get_hook_stats(self, hook_id: str) -> Optional[Dict[str, Any]]:
+        """Streaming aggregates for a single hook, or None if it never ran."""
+        stats = self.hook_stats.get(hook_id)
+        return stats.to_dict() if stats else None
@@ -13,6 +13,8 @@ DEFAULT_CONFIG = {
     'max_history': 1000,
     'max_log_files': 10,
     'max_log_size_mb': 10,
+    'buffered_logging': True,  # Hook logs written by a background writer
+    'log_flush_interval': 0.5,
     'project_root': None,  # Defaults to current working directory
     'alert_thresholds': {
         'execution_time': 10.0,
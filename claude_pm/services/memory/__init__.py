@@ -19,8 +19,8 @@ Key Features:
 - Backward compatibility with existing integrations
 
 Supported Backends:
-- mem0AI: Advanced memory service with similarity search
-- SQLite: Lightweight file-based storage with FTS
+- mem0AI: Advanced memory service with similarity search (not bundled)
+- SQLite: Lightweight file-based storage with FTS5 (sqlite_backend.py)
 
 Usage:
     from claude_pm.services.memory import (
@@ -63,10 +63,15 @@ Usage:
         context = result.enriched_context.get_agent_context()
 """
 
-# Basic models and types - minimal implementation for import compatibility
+import logging
+from dataclasses import dataclass, field
 from enum import Enum
+from pathlib import Path
 from typing import Dict, List, Optional, Any
-from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MEMORY_DB_PATH = "~/.claude-pm/memory/memory.db"
 
 
 class MemoryCategory(Enum):
@@ -86,6 +91,39 @@ class MemoryItem:
     content: str
     category: MemoryCategory
     metadata: Dict[str, Any]
+    project_id: Optional[str] = None
+    tags: List[str] = field(default_factory=list)
+    created_at: Optional[float] = None  # epoch seconds
+    score: Optional[float] = None  # backend relevance score for search results
+
+
+@dataclass
+class RankingOptions:
+    """
+    Relevance ranking options for text search.
+    
+    The final score is the BM25 relevance multiplied by the category boost
+    and, when a half-life is set, by an exponential recency decay
+    (0.5 ** (age / half_life)). Memories whose decay would fall below
+    ``decay_floor`` are not considered at all.
+    """
+    recency_half_life_days: Optional[float] = None
+    category_boosts: Dict[MemoryCategory, float] = field(default_factory=dict)
+    decay_floor: float = 0.001
+    common_term_ratio: float = 0.5  # match-any queries drop terms in more than this share of memories
+    
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'RankingOptions':
+        """Build from a ``ranking`` config section."""
+        return cls(
+            recency_half_life_days=config.get("recency_half_life_days"),
+            category_boosts={
+                MemoryCategory(category): float(boost)
+                for category, boost in (config.get("category_boosts") or {}).items()
+            },
+            decay_floor=config.get("decay_floor", 0.001),
+            common_term_ratio=config.get("common_term_ratio", 0.5)
+        )
 
 
 @dataclass
@@ -94,6 +132,11 @@ class MemoryQuery:
     text: str
     categories: Optional[List[MemoryCategory]] = None
     limit: int = 10
+    tags: Optional[List[str]] = None  # all tags must be present
+    since: Optional[float] = None  # epoch seconds, inclusive
+    until: Optional[float] = None  # epoch seconds, inclusive
+    match_all: bool = True  # False: any query term may match (ranked by relevance)
+    ranking: Optional[RankingOptions] = None  # overrides the service's ranking options
 
 
 class HealthStatus(Enum):
@@ -111,41 +154,138 @@ class BackendHealth:
     metrics: Dict[str, Any]
 
 
-# Basic service interfaces for import compatibility
+# Service interfaces
 class MemoryBackend:
     """Base memory backend interface"""
     
+    backend_name = "base"
+    
     async def initialize(self) -> bool:
         """Initialize the backend"""
-        return True
+        raise NotImplementedError
     
-    async def add_memory(self, project_id: str, content: str, category: MemoryCategory) -> str:
+    async def add_memory(self, project_id: str, content: str, category: MemoryCategory,
+                         metadata: Optional[Dict[str, Any]] = None,
+                         tags: Optional[List[str]] = None) -> str:
         """Add a memory item"""
-        return "mock_id"
+        raise NotImplementedError
     
     async def search_memories(self, project_id: str, query: MemoryQuery) -> List[MemoryItem]:
         """Search memory items"""
-        return []
+        raise NotImplementedError
+    
+    async def cleanup(self) -> None:
+        """Release backend resources"""
 
 
 class FlexibleMemoryService:
-    """Main memory service - minimal implementation for import compatibility"""
+    """
+    Main memory service.
+    
+    Selects the first available backend from ``fallback_chain`` (default
+    ``["sqlite"]``). The local SQLite/FTS5 backend is always available; mem0AI
+    is not bundled, so a chain naming it falls through to SQLite.
+    
+    Config keys:
+        fallback_chain: Ordered backend names to try
+        sqlite_path: Database file (default ``~/.claude-pm/memory/memory.db``)
+        batch_size: Memories buffered per write transaction (default 1)
+        ranking: Default RankingOptions fields (recency_half_life_days,
+            category_boosts keyed by category value, decay_floor, common_term_ratio)
+    """
+    
+    SUPPORTED_BACKENDS = ("sqlite",)
     
     def __init__(self, config: Optional[Dict] = None):
         self.config = config or {}
-        self._backend = None
+        self._backend: Optional[MemoryBackend] = None
+    
+    def _create_backend(self, name: str) -> Optional[MemoryBackend]:
+        if name == "sqlite":
+            # Imported lazily: the backend module imports the models above
+            from claude_pm.services.memory.sqlite_backend import SQLiteMemoryBackend
+            
+            db_path = self.config.get("sqlite_path", DEFAULT_MEMORY_DB_PATH)
+            if str(db_path) != ":memory:":
+                db_path = Path(db_path).expanduser()
+            return SQLiteMemoryBackend(
+                db_path,
+                batch_size=self.config.get("batch_size", 1),
+                ranking=RankingOptions.from_config(self.config.get("ranking") or {})
+            )
+        logger.info(f"Memory backend '{name}' is not available; trying next backend")
+        return None
     
     async def initialize(self) -> bool:
         """Initialize the service"""
-        return True
+        if self._backend is not None:
+            return True
+        
+        chain = list(self.config.get("fallback_chain") or ["sqlite"])
+        if "sqlite" not in chain:
+            chain.append("sqlite")
+        for name in chain:
+            backend = self._create_backend(name)
+            if backend is None:
+                continue
+            try:
+                await backend.initialize()
+            except BackendError as e:
+                logger.error(f"Memory backend '{name}' failed to initialize: {e}")
+                continue
+            self._backend = backend
+            logger.info(f"Memory service using '{name}' backend")
+            return True
+        return False
+    
+    async def _get_backend(self) -> MemoryBackend:
+        if self._backend is None and not await self.initialize():
+            raise BackendError("No memory backend could be initialized")
+        return self._backend
     
-    async def add_memory(self, project_id: str, content: str, category: MemoryCategory) -> str:
+    @property
+    def backend(self) -> Optional[MemoryBackend]:
+        """The active backend (None before initialization)"""
+        return self._backend
+    
+    async def add_memory(self, project_id: str, content: str, category: MemoryCategory,
+                         metadata: Optional[Dict[str, Any]] = None,
+                         tags: Optional[List[str]] = None) -> str:
         """Add a memory item"""
-        return "mock_id"
+        backend = await self._get_backend()
+        return await backend.add_memory(project_id, content, category, metadata=metadata, tags=tags)
+    
+    async def add_memories(self, project_id: str, memories: List[Dict[str, Any]]) -> List[str]:
+        """Add many memory items in one batch"""
+        backend = await self._get_backend()
+        return await backend.add_memories(project_id, memories)
     
     async def search_memories(self, project_id: str, query: MemoryQuery) -> List[MemoryItem]:
         """Search memory items"""
-        return []
+        backend = await self._get_backend()
+        return await backend.search_memories(project_id, query)
+    
+    async def get_memory(self, project_id: str, memory_id: str) -> Optional[MemoryItem]:
+        """Get a memory item by ID"""
+        backend = await self._get_backend()
+        return await backend.get_memory(project_id, memory_id)
+    
+    async def delete_memory(self, project_id: str, memory_id: str) -> bool:
+        """Delete a memory item"""
+        backend = await self._get_backend()
+        return await backend.delete_memory(project_id, memory_id)
+    
+    async def get_health(self) -> BackendHealth:
+        """Health of the active backend"""
+        if self._backend is None:
+            return BackendHealth(HealthStatus.UNHEALTHY, "not initialized", {})
+        return await self._backend.health_check()
+    
+    async def cleanup(self) -> None:
+        """Flush pending writes and release the backend"""
+        if self._backend is not None:
+            await self._backend.cleanup()
+            self._backend = None
 
 
 # Exception classes for import compatibility
@@ -222,6 +362,7 @@ __all__ = [
     "MemoryCategory",
     "MemoryItem", 
     "MemoryQuery",
+    "RankingOptions",
     "HealthStatus",
     "BackendHealth",
     "MemoryBackend",
@@ -0,0 +1,624 @@
+"""
+SQLite Memory Backend
+=====================
+
+Local memory backend for FlexibleMemoryService built on SQLite with an FTS5
+full-text index. Needs no external services and keeps latency predictable.
+
+Key Features:
+- FTS5 (porter/unicode61) external-content index over memory content
+- Indexed metadata columns: project, category, timestamps; tags in a side table
+- Triggers keep the full-text index in sync with the memories table
+- Batched writes in single transactions through cached prepared statements
+- WAL journal so searches never block on writers
+- Filters (project, category, tags, time range) applied in SQL
+- Relevance ranking: bm25 x category boost x exponential recency decay,
+  selected with a bounded top-k sort so only k memories are materialized
+- Document frequencies read from FTS5's incrementally maintained index
+  (fts5vocab); very common terms are dropped from match-any queries
+
+Usage:
+    from claude_pm.services.memory.sqlite_backend import SQLiteMemoryBackend
+    
+    backend = SQLiteMemoryBackend(Path("~/.claude-pm/memory/memory.db").expanduser())
+    await backend.initialize()
+    memory_id = await backend.add_memory("my_project", "Chose SQLite for storage", MemoryCategory.DECISION)
+    results = await backend.search_memories("my_project", MemoryQuery("sqlite storage"))
+"""
+
+import atexit
+import json
+import logging
+import math
+import re
+import sqlite3
+import threading
+import time
+import uuid
+import weakref
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from claude_pm.services.memory import (
+    BackendError,
+    BackendHealth,
+    HealthStatus,
+    MemoryBackend,
+    MemoryCategory,
+    MemoryItem,
+    MemoryQuery,
+    RankingOptions,
+)
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS memories (
+    id INTEGER PRIMARY KEY,
+    memory_id TEXT NOT NULL UNIQUE,
+    project_id TEXT NOT NULL,
+    category TEXT NOT NULL,
+    content TEXT NOT NULL,
+    metadata TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_memories_project_time ON memories (project_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_memories_project_category_time ON memories (project_id, category, created_at);
+CREATE TABLE IF NOT EXISTS memory_tags (
+    tag TEXT NOT NULL,
+    memory_rowid INTEGER NOT NULL REFERENCES memories (id) ON DELETE CASCADE,
+    PRIMARY KEY (tag, memory_rowid)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_memory_tags_rowid ON memory_tags (memory_rowid);
+CREATE VIRTUAL TABLE IF NOT EXISTS memories_fts USING fts5(
+    content, content='memories', content_rowid='id', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS memories_ai AFTER INSERT ON memories BEGIN
+    INSERT INTO memories_fts (rowid, content) VALUES (new.id, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS memories_ad AFTER DELETE ON memories BEGIN
+    INSERT INTO memories_fts (memories_fts, rowid, content) VALUES ('delete', old.id, old.content);
+END;
+CREATE TRIGGER IF NOT EXISTS memories_au AFTER UPDATE OF content ON memories BEGIN
+    INSERT INTO memories_fts (memories_fts, rowid, content) VALUES ('delete', old.id, old.content);
+    INSERT INTO memories_fts (rowid, content) VALUES (new.id, new.content);
+END;
+CREATE TABLE IF NOT EXISTS store_metadata (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# OR IGNORE: re-inserting a caller-supplied memory_id (a retried batch) is a no-op
+_INSERT_MEMORY = (
+    "INSERT OR IGNORE INTO memories (memory_id, project_id, category, content, metadata, created_at, updated_at) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+_INSERT_TAG = (
+    "INSERT OR IGNORE INTO memory_tags (tag, memory_rowid) "
+    "SELECT ?, id FROM memories WHERE memory_id = ?"
+)
+
+# Per-connection helpers: document frequencies straight from the FTS5 index,
+# and a scratch table with the same tokenizer used to stem query terms.
+_VOCAB_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS temp.memories_vocab USING fts5vocab(main, memories_fts, 'row');
+CREATE VIRTUAL TABLE IF NOT EXISTS temp.query_terms USING fts5(term, tokenize = 'porter unicode61');
+CREATE VIRTUAL TABLE IF NOT EXISTS temp.query_terms_vocab USING fts5vocab(temp, query_terms, 'instance');
+"""
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+SECONDS_PER_DAY = 86400.0
+
+_open_backends: "weakref.WeakSet[SQLiteMemoryBackend]" = weakref.WeakSet()
+
+
+@atexit.register
+def _close_backends_at_exit():
+    """Flush buffered writes on interpreter shutdown."""
+    for backend in list(_open_backends):
+        backend.close()
+
+
+def query_terms(text: str) -> List[str]:
+    """Distinct lowercase words of a query, in order of first appearance."""
+    return list(dict.fromkeys(_TOKEN_RE.findall(text.lower())))
+
+
+def build_match_expression(text: str, match_all: bool = True) -> Optional[str]:
+    """
+    Turn free text into a safe FTS5 MATCH expression.
+    
+    Each word becomes a quoted term, so FTS5 operators and punctuation in user
+    text cannot produce syntax errors. With ``match_all`` every term must
+    match; otherwise any term may.
+    
+    Returns:
+        The MATCH expression, or None if the text has no searchable words
+    """
+    terms = query_terms(text)
+    if not terms:
+        return None
+    return (" " if match_all else " OR ").join(f'"{term}"' for term in terms)
+
+
+def recency_decay(age_seconds: float, half_life_seconds: float) -> float:
+    """Exponential decay factor 0.5 ** (age / half_life); future timestamps count as age 0."""
+    return 0.5 ** (max(age_seconds, 0.0) / half_life_seconds)
+
+
+class SQLiteMemoryBackend(MemoryBackend):
+    """
+    SQLite + FTS5 memory backend.
+    
+    One connection is shared behind a lock; the sqlite3 statement cache keeps
+    the insert and search statements prepared. Writes are buffered up to
+    ``batch_size`` memories and flushed in one transaction, before every read
+    and on close.
+    """
+    
+    backend_name = "sqlite"
+    
+    def __init__(self, db_path: Path, batch_size: int = 1, statement_cache_size: int = 256,
+                 ranking: Optional[RankingOptions] = None):
+        """
+        Args:
+            db_path: SQLite database file (``:memory:`` for an in-memory store)
+            batch_size: Memories buffered before a write transaction is issued
+            statement_cache_size: Prepared statements kept per connection
+            ranking: Default relevance ranking options for text searches
+        """
+        self.db_path = db_path if str(db_path) == ":memory:" else Path(db_path)
+        self.batch_size = max(1, batch_size)
+        self.statement_cache_size = statement_cache_size
+        self._lock = threading.RLock()
+        self._pending: List[Tuple[Tuple, Sequence[str]]] = []
+        self.ranking = ranking or RankingOptions()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._doc_count = 0
+        self._native_exp = False
+        self._stats = {"writes": 0, "write_batches": 0, "searches": 0, "search_time_ms": 0.0}
+    
+    async def initialize(self) -> bool:
+        """Open the database and create the schema."""
+        with self._lock:
+            if self._conn is not None:
+                return True
+            try:
+                if isinstance(self.db_path, Path):
+                    self.db_path.parent.mkdir(parents=True, exist_ok=True)
+                self._conn = sqlite3.connect(
+                    str(self.db_path),
+                    check_same_thread=False,
+                    isolation_level=None,
+                    cached_statements=self.statement_cache_size
+                )
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute("PRAGMA synchronous=NORMAL")
+                self._conn.execute("PRAGMA foreign_keys=ON")
+                self._conn.executescript(_SCHEMA)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO store_metadata (key, value) VALUES ('schema_version', ?)",
+                    (str(SCHEMA_VERSION),)
+                )
+                self._conn.executescript(_VOCAB_SCHEMA)
+                self._doc_count = self._conn.execute("SELECT COUNT(*) FROM memories").fetchone()[0]
+                self._native_exp = self._has_math_functions(self._conn)
+                if not self._native_exp:
+                    self._conn.create_function("memory_decay", 2, recency_decay, deterministic=True)
+            except sqlite3.Error as e:
+                self._conn = None
+                raise BackendError(f"Failed to open SQLite memory store {self.db_path}: {e}") from e
+        _open_backends.add(self)
+        logger.debug(f"SQLite memory backend ready at {self.db_path}")
+        return True
+    
+    @staticmethod
+    def _has_math_functions(conn: sqlite3.Connection) -> bool:
+        try:
+            conn.execute("SELECT exp(0)").fetchone()
+            return True
+        except sqlite3.OperationalError:
+            return False
+    
+    def _require_connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            raise BackendError("SQLite memory backend is not initialized")
+        return self._conn
+    
+    # Writes
+    
+    @staticmethod
+    def _normalize_tags(tags: Optional[Iterable[str]], metadata: Dict[str, Any]) -> List[str]:
+        collected = list(tags or []) + list(metadata.get("tags") or [])
+        return sorted({str(tag).strip().lower() for tag in collected if str(tag).strip()})
+    
+    def _prepare(self, project_id: str, content: str, category: MemoryCategory,
+                 metadata: Optional[Dict[str, Any]], tags: Optional[Iterable[str]],
+                 created_at: Optional[float], memory_id: Optional[str] = None) -> Tuple[str, Tuple, List[str]]:
+        metadata = dict(metadata or {})
+        normalized_tags = self._normalize_tags(tags, metadata)
+        if normalized_tags:
+            metadata["tags"] = normalized_tags
+        memory_id = memory_id or str(uuid.uuid4())
+        now = time.time()
+        timestamp = created_at if created_at is not None else now
+        row = (
+            memory_id,
+            project_id,
+            MemoryCategory(category).value,
+            content,
+            json.dumps(metadata, default=str) if metadata else None,
+            timestamp,
+            now
+        )
+        return memory_id, row, normalized_tags
+    
+    async def add_memory(
+        self,
+        project_id: str,
+        content: str,
+        category: MemoryCategory,
+        metadata: Optional[Dict[str, Any]] = None,
+        tags: Optional[Iterable[str]] = None,
+        created_at: Optional[float] = None
+    ) -> str:
+        """Add a memory (buffered until the write batch fills).
+        
+        Returns:
+            The new memory ID
+        """
+        memory_id, row, normalized_tags = self._prepare(project_id, content, category, metadata, tags, created_at)
+        with self._lock:
+            self._pending.append((row, normalized_tags))
+            if len(self._pending) >= self.batch_size:
+                self._flush_locked()
+        return memory_id
+    
+    async def add_memories(self, project_id: str, memories: Iterable[Dict[str, Any]]) -> List[str]:
+        """
+        Add many memories in a single transaction.
+        
+        Args:
+            project_id: Project the memories belong to
+            memories: Dicts with ``content``, ``category`` and optional ``metadata``,
+                ``tags``, ``created_at`` (epoch seconds) and ``memory_id``. A memory
+                whose ``memory_id`` is already stored is skipped, so retrying a
+                batch never duplicates it.
+        
+        Returns:
+            The memory IDs, in input order
+        """
+        return self.insert_batch(project_id, memories)
+    
+    def insert_batch(self, project_id: str, memories: Iterable[Dict[str, Any]]) -> List[str]:
+        """
+        Synchronous form of :meth:`add_memories`, safe to run in a worker thread.
+        
+        The batch is committed atomically: on failure nothing from it is
+        written or left buffered, so callers can retry the whole batch.
+        
+        Raises:
+            BackendError: If the transaction fails
+        """
+        memory_ids = []
+        prepared = []
+        for memory in memories:
+            memory_id, row, normalized_tags = self._prepare(
+                project_id,
+                memory["content"],
+                memory.get("category", MemoryCategory.PROJECT),
+                memory.get("metadata"),
+                memory.get("tags"),
+                memory.get("created_at"),
+                memory.get("memory_id")
+            )
+            memory_ids.append(memory_id)
+            prepared.append((row, normalized_tags))
+        with self._lock:
+            self._flush_locked()
+            self._write_locked(prepared)
+        return memory_ids
+    
+    async def flush(self) -> None:
+        """Write buffered memories."""
+        with self._lock:
+            self._flush_locked()
+    
+    def _flush_locked(self) -> None:
+        if not self._pending or self._conn is None:
+            return
+        batch, self._pending = self._pending, []
+        try:
+            self._write_locked(batch)
+        except BackendError:
+            self._pending = batch + self._pending
+            raise
+    
+    def _write_locked(self, batch: List[Tuple[Tuple, Sequence[str]]]) -> None:
+        if not batch:
+            return
+        conn = self._require_connection()
+        try:
+            conn.execute("BEGIN")
+            inserted = conn.executemany(_INSERT_MEMORY, [row for row, _ in batch]).rowcount
+            tag_rows = [(tag, row[0]) for row, tags in batch for tag in tags]
+            if tag_rows:
+                conn.executemany(_INSERT_TAG, tag_rows)
+            conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise BackendError(f"Failed to write {len(batch)} memories: {e}") from e
+        self._doc_count += inserted
+        self._stats["writes"] += inserted
+        self._stats["write_batches"] += 1
+    
+    async def delete_memory(self, project_id: str, memory_id: str) -> bool:
+        """Delete a memory; returns False if it did not exist."""
+        with self._lock:
+            self._flush_locked()
+            cursor = self._require_connection().execute(
+                "DELETE FROM memories WHERE project_id = ? AND memory_id = ?", (project_id, memory_id)
+            )
+            self._doc_count -= cursor.rowcount
+        return cursor.rowcount > 0
+    
+    async def delete_older_than(self, cutoff: float, project_id: Optional[str] = None) -> int:
+        """Delete memories created before ``cutoff`` (epoch seconds).
+        
+        Returns:
+            Number of memories removed
+        """
+        sql, params = "DELETE FROM memories WHERE created_at < ?", [cutoff]
+        if project_id is not None:
+            sql += " AND project_id = ?"
+            params.append(project_id)
+        with self._lock:
+            self._flush_locked()
+            cursor = self._require_connection().execute(sql, params)
+            self._doc_count -= cursor.rowcount
+        return cursor.rowcount
+    
+    # Reads
+    
+    @staticmethod
+    def _row_to_item(row: Sequence[Any], score: Optional[float] = None) -> MemoryItem:
+        memory_id, project_id, category, content, metadata, created_at = row[:6]
+        metadata = json.loads(metadata) if metadata else {}
+        return MemoryItem(
+            id=memory_id,
+            content=content,
+            category=MemoryCategory(category),
+            metadata=metadata,
+            project_id=project_id,
+            tags=metadata.get("tags", []),
+            created_at=created_at,
+            score=score
+        )
+    
+    @staticmethod
+    def _filter_clauses(project_id: str, query: MemoryQuery) -> Tuple[List[str], List[Any]]:
+        clauses, params = ["m.project_id = ?"], [project_id]
+        if query.categories:
+            clauses.append(f"m.category IN ({', '.join('?' * len(query.categories))})")
+            params.extend(MemoryCategory(category).value for category in query.categories)
+        if query.since is not None:
+            clauses.append("m.created_at >= ?")
+            params.append(query.since)
+        if query.until is not None:
+            clauses.append("m.created_at <= ?")
+            params.append(query.until)
+        for tag in query.tags or []:
+            clauses.append("m.id IN (SELECT memory_rowid FROM memory_tags WHERE tag = ?)")
+            params.append(str(tag).strip().lower())
+        return clauses, params
+    
+    def _document_frequencies(self, terms: List[str]) -> List[int]:
+        """
+        Number of memories containing each query term.
+        
+        Terms are stemmed by FTS5's own tokenizer (via a scratch table), then
+        looked up in the index vocabulary, which FTS5 keeps current on every
+        insert and delete; no corpus scan is needed.
+        """
+        conn = self._require_connection()
+        conn.execute("DELETE FROM temp.query_terms")
+        conn.executemany(
+            "INSERT INTO temp.query_terms (rowid, term) VALUES (?, ?)", enumerate(terms)
+        )
+        stems = dict(conn.execute("SELECT doc, term FROM temp.query_terms_vocab").fetchall())
+        frequencies = []
+        for index, term in enumerate(terms):
+            row = conn.execute(
+                "SELECT doc FROM temp.memories_vocab WHERE term = ?", (stems.get(index, term),)
+            ).fetchone()
+            frequencies.append(row[0] if row else 0)
+        return frequencies
+    
+    def _select_terms(self, terms: List[str], ranking: RankingOptions) -> List[str]:
+        """Drop near-ubiquitous terms from a match-any query; they barely move bm25."""
+        if len(terms) < 2 or not ranking.common_term_ratio or self._doc_count == 0:
+            return terms
+        limit = ranking.common_term_ratio * self._doc_count
+        frequencies = self._document_frequencies(terms)
+        kept = [term for term, df in zip(terms, frequencies) if df <= limit]
+        if kept:
+            return kept
+        return [min(zip(terms, frequencies), key=lambda pair: pair[1])[0]]
+    
+    def _ranked_query(self, project_id: str, query: MemoryQuery,
+                      ranking: RankingOptions) -> Optional[Tuple[str, List[Any]]]:
+        """
+        Build the top-k query: ``(rowid, score)`` pairs ordered by final score.
+        
+        Only rowids and scores pass through SQLite's bounded ORDER BY ... LIMIT
+        sorter; content and metadata are fetched for the k winners afterwards.
+        """
+        terms = query_terms(query.text or "")
+        if not terms:
+            return None
+        if not query.match_all:
+            terms = self._select_terms(terms, ranking)
+        match = build_match_expression(" ".join(terms), query.match_all)
+        
+        clauses, filter_params = self._filter_clauses(project_id, query)
+        # bm25() is negative (more negative = more relevant); positive factors scale it
+        score_sql, score_params = "bm25(memories_fts)", []
+        
+        boosts = {category: boost for category, boost in ranking.category_boosts.items() if boost != 1.0}
+        if boosts:
+            cases = " ".join("WHEN ? THEN ?" for _ in boosts)
+            score_sql += f" * (CASE m.category {cases} ELSE 1.0 END)"
+            for category, boost in boosts.items():
+                score_params.extend([MemoryCategory(category).value, float(boost)])
+        
+        if ranking.recency_half_life_days:
+            half_life = ranking.recency_half_life_days * SECONDS_PER_DAY
+            now = time.time()
+            if self._native_exp:
+                score_sql += " * exp(? * max(? - m.created_at, 0.0))"
+                score_params.extend([-math.log(2) / half_life, now])
+            else:
+                score_sql += " * memory_decay(? - m.created_at, ?)"
+                score_params.extend([now, half_life])
+            if ranking.decay_floor and 0 < ranking.decay_floor < 1:
+                # Memories older than this horizon would be scaled below decay_floor
+                clauses.append("m.created_at >= ?")
+                filter_params.append(now - half_life * math.log2(1 / ranking.decay_floor))
+        
+        sql = (
+            f"SELECT memories_fts.rowid, {score_sql} AS score FROM memories_fts "
+            f"JOIN memories m ON m.id = memories_fts.rowid "
+            f"WHERE memories_fts MATCH ? AND {' AND '.join(clauses)} "
+            f"ORDER BY score LIMIT ?"
+        )
+        return sql, score_params + [match] + filter_params + [max(0, int(query.limit))]
+    
+    async def search_memories(self, project_id: str, query: MemoryQuery) -> List[MemoryItem]:
+        """
+        Search memories in a project.
+        
+        Text queries are ranked by relevance: bm25 from the FTS5 index times
+        the category boost and recency decay from ``query.ranking`` (or the
+        backend default). ``score`` holds the final relevance, higher is
+        better. Queries without searchable text return the newest matching
+        memories.
+        
+        Args:
+            project_id: Project to search
+            query: Query text and filters
+        
+        Returns:
+            Up to ``query.limit`` matching memories, best first
+        """
+        started = time.perf_counter()
+        ranking = query.ranking or self.ranking
+        columns = "m.memory_id, m.project_id, m.category, m.content, m.metadata, m.created_at"
+        
+        with self._lock:
+            self._flush_locked()
+            conn = self._require_connection()
+            try:
+                ranked = self._ranked_query(project_id, query, ranking)
+                if ranked:
+                    sql, params = ranked
+                    top = conn.execute(sql, params).fetchall()
+                    rows_by_id = {}
+                    if top:
+                        placeholders = ", ".join("?" * len(top))
+                        for row in conn.execute(
+                            f"SELECT m.id, {columns} FROM memories m WHERE m.id IN ({placeholders})",
+                            [rowid for rowid, _ in top]
+                        ):
+                            rows_by_id[row[0]] = row[1:]
+                    items = [
+                        self._row_to_item(rows_by_id[rowid], -score)
+                        for rowid, score in top if rowid in rows_by_id
+                    ]
+                else:
+                    clauses, params = self._filter_clauses(project_id, query)
+                    sql = (
+                        f"SELECT {columns} FROM memories m WHERE {' AND '.join(clauses)} "
+                        f"ORDER BY m.created_at DESC LIMIT ?"
+                    )
+                    rows = conn.execute(sql, params + [max(0, int(query.limit))]).fetchall()
+                    items = [self._row_to_item(row) for row in rows]
+            except sqlite3.Error as e:
+                raise BackendError(f"Memory search failed: {e}") from e
+            self._stats["searches"] += 1
+            self._stats["search_time_ms"] += (time.perf_counter() - started) * 1000
+        
+        return items
+    
+    async def get_memory(self, project_id: str, memory_id: str) -> Optional[MemoryItem]:
+        """Look up a memory by ID."""
+        with self._lock:
+            self._flush_locked()
+            row = self._require_connection().execute(
+                "SELECT memory_id, project_id, category, content, metadata, created_at "
+                "FROM memories WHERE project_id = ? AND memory_id = ?", (project_id, memory_id)
+            ).fetchone()
+        return self._row_to_item(row) if row else None
+    
+    async def count_memories(self, project_id: Optional[str] = None) -> int:
+        """Number of stored memories, optionally for one project."""
+        sql, params = "SELECT COUNT(*) FROM memories", []
+        if project_id is not None:
+            sql += " WHERE project_id = ?"
+            params.append(project_id)
+        with self._lock:
+            self._flush_locked()
+            return self._require_connection().execute(sql, params).fetchone()[0]
+    
+    async def health_check(self) -> BackendHealth:
+        """Report backend health and counters."""
+        if self._conn is None:
+            return BackendHealth(HealthStatus.UNHEALTHY, "not initialized", {})
+        try:
+            with self._lock:
+                result = self._conn.execute("PRAGMA quick_check").fetchone()[0]
+                total = self._conn.execute("SELECT COUNT(*) FROM memories").fetchone()[0]
+        except sqlite3.Error as e:
+            return BackendHealth(HealthStatus.UNHEALTHY, str(e), {})
+        
+        searches = self._stats["searches"]
+        metrics = {
+            "backend": self.backend_name,
+            "db_path": str(self.db_path),
+            "total_memories": total,
+            "pending_writes": len(self._pending),
+            "average_search_ms": self._stats["search_time_ms"] / searches if searches else 0.0,
+            **self._stats
+        }
+        if result != "ok":
+            return BackendHealth(HealthStatus.DEGRADED, f"integrity check: {result}", metrics)
+        return BackendHealth(HealthStatus.HEALTHY, "ok", metrics)
+    
+    async def optimize(self) -> None:
+        """Merge FTS5 index segments and refresh planner statistics."""
+        with self._lock:
+            self._flush_locked()
+            conn = self._require_connection()
+            conn.execute("INSERT INTO memories_fts (memories_fts) VALUES ('optimize')")
+            conn.execute("PRAGMA optimize")
+    
+    def close(self) -> None:
+        """Flush buffered writes and close the connection."""
+        with self._lock:
+            if self._conn is None:
+                return
+            try:
+                self._flush_locked()
+            except BackendError as e:
+                logger.error(f"Failed to flush memories on close: {e}")
+            self._conn.close()
+            self._conn = None
+    
+    async def cleanup(self) -> None:
+        """Async alias for :meth:`close`."""
+        self.close()
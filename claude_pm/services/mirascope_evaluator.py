@@ -15,6 +15,7 @@ Key Features:
 - Performance optimization with caching
 - Async evaluation processing
 - Configurable evaluation criteria and providers
+- Append-only segmented result storage with per-segment agent/time index
 
 Implementation Notes:
 - Uses Mirascope as lightweight alternative to LangChain
@@ -37,6 +38,7 @@ import uuid
 
 from claude_pm.core.config import Config
 from claude_pm.services.correction_capture import CorrectionData, CorrectionType
+from claude_pm.services.segment_store import DEFAULT_SEGMENT_BYTES, SegmentedRecordStore
 
 logger = logging.getLogger(__name__)
 
@@ -194,6 +196,13 @@ class MirascopeEvaluator:
         self.storage_path = Path(self.config.get("evaluation_storage_path", "~/.claude-pm/training")).expanduser()
         self.evaluations_dir = self.storage_path / "evaluations"
         self.evaluations_dir.mkdir(parents=True, exist_ok=True)
+        self.evaluation_store = SegmentedRecordStore(
+            self.evaluations_dir,
+            "evaluations",
+            lookup_field="correction_id",
+            max_segment_bytes=self.config.get("evaluation_segment_bytes", DEFAULT_SEGMENT_BYTES)
+        )
+        self.evaluation_store.import_legacy_files("*_eval_*.json")
         
         # Initialize provider
         self.provider = self._initialize_provider()
@@ -535,24 +544,48 @@ Please provide a structured evaluation focusing on practical utility and accurac
         )
     
     async def _store_evaluation_result(self, result: EvaluationResult) -> None:
-        """Store evaluation result to file."""
+        """Append evaluation result to the segmented evaluation store."""
         try:
-            # Create filename
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"{result.agent_type}_eval_{timestamp}_{result.evaluation_id}.json"
-            
-            # Store in evaluations directory
-            eval_file = self.evaluations_dir / filename
-            
-            # Write evaluation data
-            with open(eval_file, 'w') as f:
-                json.dump(result.to_dict(), f, indent=2)
-            
-            logger.debug(f"Stored evaluation result to {eval_file}")
+            self.evaluation_store.append(result.to_dict())
+            logger.debug(f"Stored evaluation result {result.evaluation_id}")
             
         except Exception as e:
             logger.error(f"Failed to store evaluation result: {e}")
     
+    def get_stored_evaluations(
+        self,
+        agent_type: Optional[str] = None,
+        since: Optional[datetime] = None,
+        limit: Optional[int] = None
+    ) -> List[EvaluationResult]:
+        """
+        Load stored evaluation results, newest first.
+        
+        Only segments that can contain the agent type and time range are read.
+        
+        Args:
+            agent_type: Filter by agent type
+            since: Only results since this date
+            limit: Maximum number of results
+            
+        Returns:
+            List of evaluation results
+        """
+        if not self.enabled:
+            return []
+        
+        results = []
+        for data in self.evaluation_store.query(key=agent_type, since=since, limit=limit):
+            try:
+                results.append(EvaluationResult.from_dict(data))
+            except (KeyError, TypeError, ValueError) as e:
+                logger.error(f"Skipping unreadable evaluation record: {e}")
+        return results
+    
+    def has_evaluation(self, correction_id: str) -> bool:
+        """Check whether a correction already has a stored evaluation."""
+        return self.enabled and self.evaluation_store.contains(correction_id)
+    
     async def evaluate_correction(self, correction_data: CorrectionData) -> EvaluationResult:
         """
         Evaluate a correction from the correction capture system.
@@ -664,7 +697,7 @@ Please provide a structured evaluation focusing on practical utility and accurac
     
     async def cleanup_old_evaluations(self, days_to_keep: int = 30) -> Dict[str, Any]:
         """
-        Clean up old evaluation files.
+        Clean up old evaluation segments and legacy evaluation files.
         
         Args:
             days_to_keep: Number of days to keep evaluations
@@ -677,6 +710,8 @@ Please provide a structured evaluation focusing on practical utility and accurac
             
             removed_files = []
             total_size_removed = 0
+            segment_cleanup = self.evaluation_store.drop_before(cutoff_date)
+            total_size_removed += segment_cleanup["bytes_removed"]
             
             if self.evaluations_dir.exists():
                 for eval_file in self.evaluations_dir.glob("*.json"):
@@ -697,6 +732,8 @@ Please provide a structured evaluation focusing on practical utility and accurac
             
             return {
                 "removed_files": len(removed_files),
+                "removed_segments": segment_cleanup["removed_segments"],
+                "removed_evaluations": segment_cleanup["removed_records"],
                 "total_size_removed": total_size_removed,
                 "cutoff_date": cutoff_date.isoformat(),
                 "files_removed": removed_files if len(removed_files) < 20 else removed_files[:20] + ["..."]
@@ -12,6 +12,9 @@ Key Features:
 - Environment variable overrides
 - Model fallback and error handling
 - Configuration-based model mapping
+- Memoized decision table keyed on (agent type, selection criteria), rebuilt
+  when the configuration version stamp changes
+- Explain mode for selection diagnostics
 
 Selection Rules:
 - Opus: Orchestrator, Engineer agents (complex implementation tasks)
@@ -23,6 +26,8 @@ Created: 2025-07-16
 
 import os
 import logging
+import threading
+import time
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
@@ -69,6 +74,15 @@ class ModelConfiguration:
     reasoning_tier: str  # basic, advanced, expert
 
 
+@dataclass(frozen=True)
+class ModelSelectionDecision:
+    """A compiled model selection decision and why it was made"""
+    model_type: ModelType
+    source: str  # environment_override, criteria, agent_mapping, fallback
+    rule: str
+    config_version: int
+
+
 class ModelSelector:
     """
     Intelligent model selector for agent-based task execution.
@@ -77,14 +91,35 @@ class ModelSelector:
     and system configuration with intelligent fallback mechanisms.
     """
     
-    def __init__(self, config_path: Optional[Path] = None):
-        """Initialize ModelSelector with configuration."""
+    ENVIRONMENT_PREFIX = 'CLAUDE_PM_MODEL_'
+    MAX_DECISION_TABLE_SIZE = 4096
+    
+    def __init__(self, config_path: Optional[Path] = None, environment_check_interval: float = 1.0):
+        """
+        Initialize ModelSelector with configuration.
+        
+        Args:
+            config_path: Optional configuration path
+            environment_check_interval: Seconds between checks of the
+                CLAUDE_PM_MODEL_* environment for changed overrides
+        """
         self.config_path = config_path
+        self.environment_check_interval = environment_check_interval
         self.model_configurations = self._initialize_model_configurations()
         self.agent_model_mapping = self._initialize_agent_model_mapping()
         self.environment_overrides = self._load_environment_overrides()
         self.fallback_model = ModelType.SONNET_4
         
+        # Decision table: (agent_type, criteria key) -> decision, valid for one config version
+        self.config_version = 0
+        self._decision_table: Dict[Tuple[str, Optional[Tuple]], ModelSelectionDecision] = {}
+        self._table_lock = threading.Lock()
+        self._environment_stamp = self._compute_environment_stamp()
+        self._next_environment_check = time.monotonic() + environment_check_interval
+        self._table_hits = 0
+        self._table_misses = 0
+        self._compile_decision_table()
+        
         logger.info("ModelSelector initialized with agent-specific model mapping")
     
     def _initialize_model_configurations(self) -> Dict[ModelType, ModelConfiguration]:
@@ -309,33 +344,178 @@ class ModelSelector:
             Tuple of (selected_model_type, model_configuration)
         """
         try:
-            # Check for environment overrides first
-            if agent_type in self.environment_overrides:
-                selected_model = self.environment_overrides[agent_type]
-                logger.debug(f"Using environment override for {agent_type}: {selected_model.value}")
-                return selected_model, self.model_configurations[selected_model]
-            
-            # Apply criteria-based selection if provided
-            if criteria:
-                selected_model = self._select_model_by_criteria(agent_type, criteria)
-                if selected_model:
-                    logger.debug(f"Criteria-based selection for {agent_type}: {selected_model.value}")
-                    return selected_model, self.model_configurations[selected_model]
-            
-            # Use default agent type mapping
-            if agent_type in self.agent_model_mapping:
-                selected_model = self.agent_model_mapping[agent_type]
-                logger.debug(f"Default mapping for {agent_type}: {selected_model.value}")
-                return selected_model, self.model_configurations[selected_model]
-            
-            # Fallback to default model
-            logger.info(f"No mapping found for agent type '{agent_type}', using fallback: {self.fallback_model.value}")
-            return self.fallback_model, self.model_configurations[self.fallback_model]
+            decision = self._get_decision(agent_type, criteria)[0]
+            return decision.model_type, self.model_configurations[decision.model_type]
             
         except Exception as e:
             logger.error(f"Error selecting model for agent {agent_type}: {e}")
             return self.fallback_model, self.model_configurations[self.fallback_model]
     
+    def explain_model_selection(
+        self,
+        agent_type: str,
+        criteria: Optional[ModelSelectionCriteria] = None
+    ) -> Dict[str, Any]:
+        """
+        Explain the model selection for an agent without changing it.
+        
+        Args:
+            agent_type: Type of agent requiring model selection
+            criteria: Optional selection criteria
+            
+        Returns:
+            Dictionary with the selected model, the source and rule that chose it,
+            the configuration version and whether the decision table already held it
+        """
+        decision, cached = self._get_decision(agent_type, criteria)
+        return {
+            "agent_type": agent_type,
+            "selected_model": decision.model_type.value,
+            "source": decision.source,
+            "rule": decision.rule,
+            "criteria_key": self._criteria_key(criteria),
+            "config_version": decision.config_version,
+            "cached": cached
+        }
+    
+    def _get_decision(
+        self,
+        agent_type: str,
+        criteria: Optional[ModelSelectionCriteria]
+    ) -> Tuple[ModelSelectionDecision, bool]:
+        """Look up (or compile) the decision for the inputs. Returns (decision, was_cached)."""
+        if time.monotonic() >= self._next_environment_check:
+            self._check_environment()
+        
+        key = (agent_type, self._criteria_key(criteria))
+        decision = self._decision_table.get(key)
+        if decision is not None:
+            self._table_hits += 1
+            return decision, True
+        
+        self._table_misses += 1
+        decision = self._decide(agent_type, criteria)
+        logger.debug(f"Compiled model selection for {key}: {decision.model_type.value} ({decision.source}: {decision.rule})")
+        with self._table_lock:
+            if decision.config_version == self.config_version and len(self._decision_table) < self.MAX_DECISION_TABLE_SIZE:
+                self._decision_table[key] = decision
+        return decision, False
+    
+    @staticmethod
+    def _criteria_key(criteria: Optional[ModelSelectionCriteria]) -> Optional[Tuple]:
+        """
+        Decision table key for selection criteria.
+        
+        Must cover every criteria field _criteria_rule reads; context length
+        never decides on its own, so it is not part of the key.
+        """
+        if criteria is None:
+            return None
+        return (
+            criteria.task_complexity,
+            criteria.reasoning_depth_required,
+            criteria.creativity_required,
+            criteria.speed_priority
+        )
+    
+    def _decide(
+        self,
+        agent_type: str,
+        criteria: Optional[ModelSelectionCriteria]
+    ) -> ModelSelectionDecision:
+        """Evaluate overrides, criteria, mapping and fallback, in that order."""
+        version = self.config_version
+        
+        # Check for environment overrides first
+        if agent_type in self.environment_overrides:
+            env_var = f"{self.ENVIRONMENT_PREFIX}{agent_type.upper()}"
+            rule = env_var if os.getenv(env_var) else f"{self.ENVIRONMENT_PREFIX}OVERRIDE"
+            return ModelSelectionDecision(self.environment_overrides[agent_type], "environment_override", rule, version)
+        
+        # Apply criteria-based selection if provided
+        if criteria:
+            match = self._criteria_rule(agent_type, criteria)
+            if match:
+                return ModelSelectionDecision(match[0], "criteria", match[1], version)
+        
+        # Use default agent type mapping
+        if agent_type in self.agent_model_mapping:
+            return ModelSelectionDecision(
+                self.agent_model_mapping[agent_type], "agent_mapping", f"agent_model_mapping['{agent_type}']", version
+            )
+        
+        # Fallback to default model
+        logger.info(f"No mapping found for agent type '{agent_type}', using fallback: {self.fallback_model.value}")
+        return ModelSelectionDecision(self.fallback_model, "fallback", "no mapping for agent type", version)
+    
+    def _compile_decision_table(self) -> None:
+        """Precompile the default (no criteria) decision for every mapped agent type."""
+        with self._table_lock:
+            self._decision_table = {}
+        for agent_type in set(self.agent_model_mapping) | set(self.environment_overrides):
+            decision = self._decide(agent_type, None)
+            with self._table_lock:
+                if decision.config_version == self.config_version:
+                    self._decision_table[(agent_type, None)] = decision
+    
+    # Configuration version stamp
+    
+    def _compute_environment_stamp(self) -> Tuple[Tuple[str, str], ...]:
+        return tuple(sorted(
+            (name, value) for name, value in os.environ.items() if name.startswith(self.ENVIRONMENT_PREFIX)
+        ))
+    
+    def _check_environment(self) -> None:
+        """Reload overrides if the CLAUDE_PM_MODEL_* environment changed since the last check."""
+        self._next_environment_check = time.monotonic() + self.environment_check_interval
+        stamp = self._compute_environment_stamp()
+        if stamp != self._environment_stamp:
+            self._environment_stamp = stamp
+            self.environment_overrides = self._load_environment_overrides()
+            logger.info("Model override environment changed; rebuilding model selection table")
+            self.invalidate_selection_cache()
+    
+    def invalidate_selection_cache(self) -> None:
+        """
+        Bump the configuration version and rebuild the decision table.
+        
+        Call after changing agent_model_mapping, environment_overrides or
+        fallback_model directly; set_agent_model, set_environment_override
+        and reload_configuration do this themselves.
+        """
+        with self._table_lock:
+            self.config_version += 1
+        self._compile_decision_table()
+    
+    def reload_configuration(self) -> None:
+        """Re-read environment overrides and rebuild the decision table."""
+        self._environment_stamp = self._compute_environment_stamp()
+        self._next_environment_check = time.monotonic() + self.environment_check_interval
+        self.environment_overrides = self._load_environment_overrides()
+        self.invalidate_selection_cache()
+    
+    def set_agent_model(self, agent_type: str, model_type: ModelType) -> None:
+        """Map an agent type to a model."""
+        self.agent_model_mapping[agent_type] = model_type
+        self.invalidate_selection_cache()
+    
+    def set_environment_override(self, agent_type: str, model_type: Optional[ModelType]) -> None:
+        """Override (or with None, stop overriding) the model for an agent type."""
+        if model_type is None:
+            self.environment_overrides.pop(agent_type, None)
+        else:
+            self.environment_overrides[agent_type] = model_type
+        self.invalidate_selection_cache()
+    
+    def cache_info(self) -> Dict[str, int]:
+        """Decision table statistics."""
+        return {
+            "hits": self._table_hits,
+            "misses": self._table_misses,
+            "size": len(self._decision_table),
+            "config_version": self.config_version
+        }
+    
     def _select_model_by_criteria(
         self,
         agent_type: str,
@@ -351,44 +531,51 @@ class ModelSelector:
         Returns:
             Selected model type or None if no criteria match
         """
+        match = self._criteria_rule(agent_type, criteria)
+        return match[0] if match else None
+    
+    def _criteria_rule(
+        self,
+        agent_type: str,
+        criteria: ModelSelectionCriteria
+    ) -> Optional[Tuple[ModelType, str]]:
+        """Criteria-based selection with the rule that fired, or None if no criteria match."""
         # Priority 1: Speed requirements
         if criteria.speed_priority:
             # Use fastest model that meets minimum requirements
             if criteria.task_complexity == "low":
-                return ModelType.HAIKU
+                return ModelType.HAIKU, "speed_priority with low complexity"
             else:
-                return ModelType.SONNET
+                return ModelType.SONNET, "speed_priority"
         
         # Priority 2: Task complexity analysis
         if criteria.task_complexity == "expert":
             # Use most capable model for expert-level tasks
-            return ModelType.OPUS_4
+            return ModelType.OPUS_4, "expert task complexity"
         elif criteria.task_complexity == "high":
             # Use advanced model for high complexity
             if agent_type in ['engineer', 'architecture', 'machine_learning']:
-                return ModelType.OPUS_4
+                return ModelType.OPUS_4, f"high task complexity for {agent_type}"
             else:
-                return ModelType.SONNET_4
+                return ModelType.SONNET_4, "high task complexity"
         elif criteria.task_complexity == "low":
             # Use efficient model for simple tasks
-            return ModelType.HAIKU
+            return ModelType.HAIKU, "low task complexity"
         
         # Priority 3: Reasoning depth requirements
         if criteria.reasoning_depth_required == "expert":
-            return ModelType.OPUS_4
+            return ModelType.OPUS_4, "expert reasoning depth"
         elif criteria.reasoning_depth_required == "deep":
-            return ModelType.SONNET_4
+            return ModelType.SONNET_4, "deep reasoning depth"
         elif criteria.reasoning_depth_required == "simple":
-            return ModelType.HAIKU
+            return ModelType.HAIKU, "simple reasoning depth"
         
         # Priority 4: Creativity requirements
         if criteria.creativity_required:
-            return ModelType.OPUS_4
+            return ModelType.OPUS_4, "creativity required"
         
-        # Priority 5: Context length requirements
-        if criteria.context_length_required > 100000:
-            # All models handle large context, prefer based on other factors
-            return None  # Let other criteria decide
+        # Priority 5: Context length requirements (all models handle large
+        # context, so it never decides on its own)
         
         # No specific criteria matched
         return None
@@ -675,6 +862,8 @@ class ModelSelector:
     
     def get_agent_model_mapping(self) -> Dict[str, str]:
         """Get current agent type to model mapping."""
+        if time.monotonic() >= self._next_environment_check:
+            self._check_environment()
         mapping = {}
         for agent_type, model_type in self.agent_model_mapping.items():
             # Apply environment overrides
@@ -691,6 +880,7 @@ class ModelSelector:
             "model_distribution": {},
             "environment_overrides": len(self.environment_overrides),
             "available_models": len(self.model_configurations),
+            "selection_table": self.cache_info(),
             "configuration_summary": {}
         }
         
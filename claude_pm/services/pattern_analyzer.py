@@ -7,7 +7,7 @@ performance metrics.
 
 Key Features:
 - Statistical pattern detection
-- Semantic similarity analysis
+- Semantic similarity analysis (incremental clustering by default)
 - Trend analysis and forecasting
 - Multi-dimensional pattern classification
 - Performance correlation analysis
@@ -19,6 +19,7 @@ Version: 1.0.0
 
 import json
 import asyncio
+import hashlib
 import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Any, Set
@@ -40,6 +41,24 @@ try:
 except ImportError:
     HAS_ML = False
 
+from .pattern_clustering import IncrementalPatternClusterer
+from .series_analytics import linear_trends, zscores
+
+
+def pattern_id_for(agent_type: str, error_type: str) -> str:
+    """Stable pattern ID for an agent type / error type pair."""
+    digest = hashlib.sha1(f"{agent_type}_{error_type}".encode("utf-8")).hexdigest()
+    return f"pattern_{digest[:8]}"
+
+
+def correction_key(correction: Any) -> Any:
+    """Identity of a correction record, used to skip already-clustered corrections."""
+    correction_id = getattr(correction, 'correction_id', None)
+    if isinstance(correction_id, str):
+        return correction_id
+    return (correction.agent_type, correction.error_type, str(correction.timestamp),
+            getattr(correction, 'issue_description', ''))
+
 
 class PatternType(Enum):
     """Types of patterns that can be detected"""
@@ -113,7 +132,17 @@ class PatternAnalyzer:
         for path in [self.patterns_path, self.clusters_path, self.trends_path]:
             path.mkdir(parents=True, exist_ok=True)
         
-        # Initialize ML components if available
+        # Incremental clustering keeps vocabulary, vectors and centroids between analyses
+        self.incremental_clustering = self.config.get('incremental_clustering', True)
+        self.pattern_clusterer = IncrementalPatternClusterer(
+            max_clusters=self.config.get('max_clusters', 5),
+            drift_threshold=self.config.get('cluster_drift_threshold', 0.15),
+            recluster_fraction=self.config.get('recluster_fraction', 0.5)
+        )
+        self._clustered_corrections: Set[Any] = set()
+        self.pattern_cluster_map: Dict[str, PatternCluster] = {}
+        
+        # Initialize ML components if available (full re-fit clustering mode)
         self.vectorizer = None
         self.clusterer = None
         if HAS_ML:
@@ -231,7 +260,7 @@ class PatternAnalyzer:
             correlation_strength = self._calculate_correlation_strength(pattern_data['timestamps'])
             
             # Generate pattern ID
-            pattern_id = f"pattern_{hash(str(pattern_data))}"[:12]
+            pattern_id = pattern_id_for(pattern_data['agent_types'][0], pattern_data['error_types'][0])
             
             return PatternMetrics(
                 pattern_id=pattern_id,
@@ -345,84 +374,140 @@ class PatternAnalyzer:
         
         return min(1.0, correlation)
     
+    @staticmethod
+    def _group_by_pattern(corrections: List[Any]) -> Dict[str, List[Any]]:
+        """Map pattern ID -> its corrections in one pass."""
+        grouped = defaultdict(list)
+        for correction in corrections:
+            grouped[pattern_id_for(correction.agent_type, correction.error_type)].append(correction)
+        return grouped
+    
+    @staticmethod
+    def _correction_text(correction: Any) -> str:
+        return correction.issue_description + " " + correction.correction_applied
+    
     async def _cluster_patterns(self, 
                               patterns: List[PatternMetrics],
                               corrections: List[Any]) -> List[PatternCluster]:
         """Cluster similar patterns together"""
         try:
-            if not HAS_ML or len(patterns) < 2:
+            if len(patterns) < 2:
                 return []
-            
-            # Extract text features for clustering
-            pattern_texts = []
-            pattern_mapping = {}
-            
-            for pattern in patterns:
-                # Get pattern descriptions from corrections
-                pattern_corrections = [
-                    c for c in corrections 
-                    if f"pattern_{hash(str(c.agent_type + '_' + c.error_type))}"[:12] == pattern.pattern_id
-                ]
-                
-                if pattern_corrections:
-                    # Combine correction descriptions
-                    text = " ".join([
-                        c.issue_description + " " + c.correction_applied 
-                        for c in pattern_corrections
-                    ])
-                    pattern_texts.append(text)
-                    pattern_mapping[len(pattern_texts) - 1] = pattern.pattern_id
-            
-            if len(pattern_texts) < 2:
+            if self.incremental_clustering:
+                clusters = self._cluster_patterns_incremental(patterns, corrections)
+            elif HAS_ML:
+                clusters = self._cluster_patterns_full(patterns, corrections)
+            else:
                 return []
             
-            # Vectorize text
-            try:
-                vectors = self.vectorizer.fit_transform(pattern_texts)
+            self.pattern_cluster_map = {
+                pattern_id: cluster for cluster in clusters for pattern_id in cluster.patterns
+            }
+            return clusters
                 
-                # Cluster patterns
-                n_clusters = min(5, len(pattern_texts))
-                self.clusterer.n_clusters = n_clusters
-                cluster_labels = self.clusterer.fit_predict(vectors)
+        except Exception as e:
+            self.logger.error(f"Error clustering patterns: {e}")
+            return []
+    
+    def _cluster_patterns_incremental(self,
+                                      patterns: List[PatternMetrics],
+                                      corrections: List[Any]) -> List[PatternCluster]:
+        """Fold only unseen corrections into the persistent clusterer, then read clusters off it."""
+        new_corrections = []
+        for correction in corrections:
+            key = correction_key(correction)
+            if key not in self._clustered_corrections:
+                self._clustered_corrections.add(key)
+                new_corrections.append(correction)
+        
+        for pattern_id, pattern_corrections in self._group_by_pattern(new_corrections).items():
+            self.pattern_clusterer.add_texts(
+                pattern_id,
+                [self._correction_text(c) for c in pattern_corrections],
+                agent_type=pattern_corrections[0].agent_type
+            )
+        self.pattern_clusterer.update()
+        
+        clusters = []
+        members = self.pattern_clusterer.cluster_members(p.pattern_id for p in patterns)
+        for index in sorted(members):
+            cluster_patterns = members[index]
+            clusters.append(PatternCluster(
+                cluster_id=f"cluster_{index}",
+                patterns=cluster_patterns,
+                centroid_description=(
+                    f"Common themes: {', '.join(self.pattern_clusterer.top_terms(cluster_patterns))}"
+                ),
+                similarity_score=self.pattern_clusterer.cohesion(cluster_patterns),
+                cluster_size=len(cluster_patterns),
+                dominant_agent_type=self.pattern_clusterer.dominant_agent_type(cluster_patterns)
+            ))
+        return clusters
+    
+    def _cluster_patterns_full(self,
+                               patterns: List[PatternMetrics],
+                               corrections: List[Any]) -> List[PatternCluster]:
+        """Re-vectorize and re-cluster every pattern from scratch (scikit-learn)."""
+        corrections_by_pattern = self._group_by_pattern(corrections)
+        
+        # Extract text features for clustering
+        pattern_texts = []
+        pattern_mapping = {}
+        
+        for pattern in patterns:
+            pattern_corrections = corrections_by_pattern.get(pattern.pattern_id)
+            if pattern_corrections:
+                # Combine correction descriptions
+                text = " ".join(self._correction_text(c) for c in pattern_corrections)
+                pattern_texts.append(text)
+                pattern_mapping[len(pattern_texts) - 1] = pattern.pattern_id
+        
+        if len(pattern_texts) < 2:
+            return []
+        
+        # Vectorize text
+        try:
+            vectors = self.vectorizer.fit_transform(pattern_texts)
+            
+            # Cluster patterns
+            n_clusters = min(5, len(pattern_texts))
+            self.clusterer.n_clusters = n_clusters
+            cluster_labels = self.clusterer.fit_predict(vectors)
+            
+            # Create cluster objects
+            clusters = []
+            for cluster_id in range(n_clusters):
+                cluster_patterns = [
+                    pattern_mapping[i] for i, label in enumerate(cluster_labels) 
+                    if label == cluster_id
+                ]
                 
-                # Create cluster objects
-                clusters = []
-                for cluster_id in range(n_clusters):
-                    cluster_patterns = [
-                        pattern_mapping[i] for i, label in enumerate(cluster_labels) 
-                        if label == cluster_id
-                    ]
+                if cluster_patterns:
+                    # Calculate cluster metrics
+                    cluster_texts = [pattern_texts[i] for i, label in enumerate(cluster_labels) if label == cluster_id]
+                    centroid_description = self._generate_cluster_description(cluster_texts)
                     
-                    if cluster_patterns:
-                        # Calculate cluster metrics
-                        cluster_texts = [pattern_texts[i] for i, label in enumerate(cluster_labels) if label == cluster_id]
-                        centroid_description = self._generate_cluster_description(cluster_texts)
-                        
-                        # Calculate similarity score
-                        cluster_vectors = vectors[cluster_labels == cluster_id]
-                        similarity_score = self._calculate_cluster_similarity(cluster_vectors)
-                        
-                        # Find dominant agent type
-                        dominant_agent_type = self._find_dominant_agent_type(cluster_patterns, corrections)
-                        
-                        cluster = PatternCluster(
-                            cluster_id=f"cluster_{cluster_id}",
-                            patterns=cluster_patterns,
-                            centroid_description=centroid_description,
-                            similarity_score=similarity_score,
-                            cluster_size=len(cluster_patterns),
-                            dominant_agent_type=dominant_agent_type
-                        )
-                        clusters.append(cluster)
-                
-                return clusters
-                
-            except Exception as e:
-                self.logger.error(f"Error in ML clustering: {e}")
-                return []
-                
+                    # Calculate similarity score
+                    cluster_vectors = vectors[cluster_labels == cluster_id]
+                    similarity_score = self._calculate_cluster_similarity(cluster_vectors)
+                    
+                    # Find dominant agent type
+                    dominant_agent_type = self._find_dominant_agent_type(cluster_patterns, corrections_by_pattern)
+                    
+                    cluster = PatternCluster(
+                        cluster_id=f"cluster_{cluster_id}",
+                        patterns=cluster_patterns,
+                        centroid_description=centroid_description,
+                        similarity_score=similarity_score,
+                        cluster_size=len(cluster_patterns),
+                        dominant_agent_type=dominant_agent_type
+                    )
+                    clusters.append(cluster)
+            
+            return clusters
+            
         except Exception as e:
-            self.logger.error(f"Error clustering patterns: {e}")
+            self.logger.error(f"Error in ML clustering: {e}")
             return []
     
     def _generate_cluster_description(self, cluster_texts: List[str]) -> str:
@@ -460,18 +545,12 @@ class PatternAnalyzer:
             self.logger.error(f"Error calculating cluster similarity: {e}")
             return 0.0
     
-    def _find_dominant_agent_type(self, pattern_ids: List[str], corrections: List[Any]) -> str:
+    def _find_dominant_agent_type(self, pattern_ids: List[str], corrections_by_pattern: Dict[str, List[Any]]) -> str:
         """Find dominant agent type in cluster"""
         agent_counts = Counter()
         
         for pattern_id in pattern_ids:
-            # Find corrections for this pattern
-            pattern_corrections = [
-                c for c in corrections 
-                if f"pattern_{hash(str(c.agent_type + '_' + c.error_type))}"[:12] == pattern_id
-            ]
-            
-            for correction in pattern_corrections:
+            for correction in corrections_by_pattern.get(pattern_id, []):
                 agent_counts[correction.agent_type] += 1
         
         if agent_counts:
@@ -483,31 +562,39 @@ class PatternAnalyzer:
                                     patterns: List[PatternMetrics],
                                     corrections: List[Any]) -> List[PatternTrend]:
         """Analyze trends in patterns"""
-        trends = []
+        corrections_by_pattern = self._group_by_pattern(corrections)
         
+        # Build every pattern's daily series first, then fit all trends in one batch
+        series = []
         for pattern in patterns:
             try:
                 # Get pattern corrections
-                pattern_corrections = [
-                    c for c in corrections 
-                    if f"pattern_{hash(str(c.agent_type + '_' + c.error_type))}"[:12] == pattern.pattern_id
-                ]
+                pattern_corrections = corrections_by_pattern.get(pattern.pattern_id, [])
                 
                 if len(pattern_corrections) < 3:
                     continue
                 
                 # Create time series
-                timestamps = [c.timestamp for c in pattern_corrections]
-                trend = await self._calculate_trend_analysis(pattern.pattern_id, timestamps)
-                
-                if trend:
-                    trends.append(trend)
+                dates, counts = self._daily_counts(c.timestamp for c in pattern_corrections)
+                if len(dates) >= 2:
+                    series.append((pattern.pattern_id, dates, counts))
                     
             except Exception as e:
                 self.logger.error(f"Error analyzing trend for pattern {pattern.pattern_id}: {e}")
                 continue
         
-        return trends
+        fits = linear_trends([counts for _, _, counts in series])
+        return [
+            self._build_trend(pattern_id, dates, counts, slope, r_squared)
+            for (pattern_id, dates, counts), (slope, r_squared) in zip(series, fits)
+        ]
+    
+    @staticmethod
+    def _daily_counts(timestamps) -> Tuple[List[Any], List[int]]:
+        """Corrections per calendar day, in date order."""
+        date_counts = Counter(timestamp.date() for timestamp in timestamps)
+        dates = sorted(date_counts)
+        return dates, [date_counts[date] for date in dates]
     
     async def _calculate_trend_analysis(self, 
                                       pattern_id: str,
@@ -517,91 +604,59 @@ class PatternAnalyzer:
             if len(timestamps) < 3:
                 return None
             
-            # Sort timestamps
-            sorted_times = sorted(timestamps)
-            
             # Create time series (count per day)
-            date_counts = Counter()
-            for timestamp in sorted_times:
-                date_key = timestamp.date()
-                date_counts[date_key] += 1
-            
-            # Convert to arrays for regression
-            dates = sorted(date_counts.keys())
-            counts = [date_counts[date] for date in dates]
+            dates, counts = self._daily_counts(timestamps)
             
             if len(dates) < 2:
                 return None
             
-            # Simple linear regression
-            x = list(range(len(dates)))
-            y = counts
-            
             # Calculate slope and R-squared
-            slope, r_squared = self._linear_regression(x, y)
-            
-            # Generate forecast
-            forecast_points = []
-            base_date = dates[-1]
-            
-            for i in range(1, self.forecast_days + 1):
-                forecast_date = base_date + timedelta(days=i)
-                forecast_value = max(0, y[-1] + slope * i)
-                forecast_points.append((forecast_date, forecast_value))
-            
-            # Calculate confidence interval
-            confidence_interval = self._calculate_confidence_interval(y, slope, r_squared)
-            
-            # Determine trend type
-            if slope > 0.1:
-                trend_type = "increasing"
-            elif slope < -0.1:
-                trend_type = "decreasing"
-            else:
-                trend_type = "stable"
-            
-            return PatternTrend(
-                pattern_id=pattern_id,
-                trend_type=trend_type,
-                slope=slope,
-                r_squared=r_squared,
-                forecast_points=forecast_points,
-                confidence_interval=confidence_interval
-            )
+            slope, r_squared = self._linear_regression(list(range(len(dates))), counts)
+            return self._build_trend(pattern_id, dates, counts, slope, r_squared)
             
         except Exception as e:
             self.logger.error(f"Error calculating trend analysis: {e}")
             return None
     
+    def _build_trend(self,
+                     pattern_id: str,
+                     dates: List[Any],
+                     y: List[int],
+                     slope: float,
+                     r_squared: float) -> PatternTrend:
+        """Turn a fitted daily series into a PatternTrend with forecast and confidence interval"""
+        # Generate forecast
+        forecast_points = []
+        base_date = dates[-1]
+        
+        for i in range(1, self.forecast_days + 1):
+            forecast_date = base_date + timedelta(days=i)
+            forecast_value = max(0, y[-1] + slope * i)
+            forecast_points.append((forecast_date, forecast_value))
+        
+        # Calculate confidence interval
+        confidence_interval = self._calculate_confidence_interval(y, slope, r_squared)
+        
+        # Determine trend type
+        if slope > 0.1:
+            trend_type = "increasing"
+        elif slope < -0.1:
+            trend_type = "decreasing"
+        else:
+            trend_type = "stable"
+        
+        return PatternTrend(
+            pattern_id=pattern_id,
+            trend_type=trend_type,
+            slope=slope,
+            r_squared=r_squared,
+            forecast_points=forecast_points,
+            confidence_interval=confidence_interval
+        )
+    
     def _linear_regression(self, x: List[int], y: List[float]) -> Tuple[float, float]:
         """Calculate linear regression slope and R-squared"""
-        n = len(x)
-        if n < 2:
-            return 0.0, 0.0
-        
-        # Calculate means
-        x_mean = sum(x) / n
-        y_mean = sum(y) / n
-        
-        # Calculate slope
-        numerator = sum((x[i] - x_mean) * (y[i] - y_mean) for i in range(n))
-        denominator = sum((x[i] - x_mean) ** 2 for i in range(n))
-        
-        if denominator == 0:
-            return 0.0, 0.0
-        
-        slope = numerator / denominator
-        
-        # Calculate R-squared
-        ss_tot = sum((y[i] - y_mean) ** 2 for i in range(n))
-        ss_res = sum((y[i] - (y_mean + slope * (x[i] - x_mean))) ** 2 for i in range(n))
-        
-        if ss_tot == 0:
-            r_squared = 1.0
-        else:
-            r_squared = 1 - (ss_res / ss_tot)
-        
-        return slope, max(0.0, r_squared)
+        return linear_trends([y], [x])[0]
     
     def _calculate_confidence_interval(self, 
                                      y: List[float], 
@@ -636,29 +691,14 @@ class PatternAnalyzer:
             if len(patterns) < 3:
                 return []
             
-            # Extract metrics for anomaly detection
-            frequencies = [p.frequency for p in patterns]
-            severities = [p.severity_score for p in patterns]
-            impacts = [p.impact_score for p in patterns]
+            # Z-scores of frequency, severity and impact for all patterns at once
+            scores = zscores([[p.frequency, p.severity_score, p.impact_score] for p in patterns])
             
-            # Calculate Z-scores
-            anomalies = []
-            
-            for i, pattern in enumerate(patterns):
-                # Frequency anomaly
-                freq_zscore = self._calculate_zscore(frequencies[i], frequencies)
-                
-                # Severity anomaly
-                sev_zscore = self._calculate_zscore(severities[i], severities)
-                
-                # Impact anomaly
-                impact_zscore = self._calculate_zscore(impacts[i], impacts)
-                
-                # Check if any metric exceeds threshold
-                if (abs(freq_zscore) > threshold or 
-                    abs(sev_zscore) > threshold or 
-                    abs(impact_zscore) > threshold):
-                    anomalies.append(pattern)
+            # Check if any metric exceeds threshold
+            anomalies = [
+                pattern for pattern, pattern_scores in zip(patterns, scores)
+                if any(abs(score) > threshold for score in pattern_scores)
+            ]
             
             self.logger.info(f"Detected {len(anomalies)} anomalous patterns")
             return anomalies
@@ -667,19 +707,6 @@ class PatternAnalyzer:
             self.logger.error(f"Error detecting anomalies: {e}")
             return []
     
-    def _calculate_zscore(self, value: float, values: List[float]) -> float:
-        """Calculate Z-score for anomaly detection"""
-        if len(values) < 2:
-            return 0.0
-        
-        mean_val = statistics.mean(values)
-        std_val = statistics.stdev(values)
-        
-        if std_val == 0:
-            return 0.0
-        
-        return (value - mean_val) / std_val
-    
     async def generate_improvement_priorities(self, 
                                             patterns: List[PatternMetrics],
                                             clusters: List[PatternCluster],
@@ -697,24 +724,20 @@ class PatternAnalyzer:
         """
         try:
             priorities = []
+            cluster_by_pattern = {
+                pattern_id: cluster for cluster in clusters for pattern_id in cluster.patterns
+            }
+            trend_by_pattern = {}
+            for trend in trends:
+                trend_by_pattern.setdefault(trend.pattern_id, trend)
             
             # Create priority score for each pattern
             for pattern in patterns:
-                priority_score = self._calculate_priority_score(pattern, clusters, trends)
-                
-                # Find related cluster
-                related_cluster = None
-                for cluster in clusters:
-                    if pattern.pattern_id in cluster.patterns:
-                        related_cluster = cluster
-                        break
-                
-                # Find related trend
-                related_trend = None
-                for trend in trends:
-                    if trend.pattern_id == pattern.pattern_id:
-                        related_trend = trend
-                        break
+                related_cluster = cluster_by_pattern.get(pattern.pattern_id)
+                related_trend = trend_by_pattern.get(pattern.pattern_id)
+                priority_score = self._calculate_priority_score(
+                    pattern, clusters, trends, related_cluster=related_cluster, related_trend=related_trend
+                )
                 
                 priority = {
                     'pattern_id': pattern.pattern_id,
@@ -745,9 +768,16 @@ class PatternAnalyzer:
     def _calculate_priority_score(self, 
                                 pattern: PatternMetrics,
                                 clusters: List[PatternCluster],
-                                trends: List[PatternTrend]) -> float:
-        """Calculate priority score for pattern"""
+                                trends: List[PatternTrend],
+                                related_cluster: Optional[PatternCluster] = None,
+                                related_trend: Optional[PatternTrend] = None) -> float:
+        """Calculate priority score for pattern (pass the related cluster/trend to skip the lookups)"""
         try:
+            if related_trend is None:
+                related_trend = next((t for t in trends if t.pattern_id == pattern.pattern_id), None)
+            if related_cluster is None:
+                related_cluster = next((c for c in clusters if pattern.pattern_id in c.patterns), None)
+            
             # Base score from pattern metrics
             base_score = (
                 pattern.frequency * 0.2 +
@@ -758,20 +788,16 @@ class PatternAnalyzer:
             
             # Trend multiplier
             trend_multiplier = 1.0
-            for trend in trends:
-                if trend.pattern_id == pattern.pattern_id:
-                    if trend.trend_type == "increasing":
-                        trend_multiplier = 1.5
-                    elif trend.trend_type == "decreasing":
-                        trend_multiplier = 0.8
-                    break
+            if related_trend:
+                if related_trend.trend_type == "increasing":
+                    trend_multiplier = 1.5
+                elif related_trend.trend_type == "decreasing":
+                    trend_multiplier = 0.8
             
             # Cluster multiplier (larger clusters get higher priority)
             cluster_multiplier = 1.0
-            for cluster in clusters:
-                if pattern.pattern_id in cluster.patterns:
-                    cluster_multiplier = 1.0 + (cluster.cluster_size - 1) * 0.1
-                    break
+            if related_cluster:
+                cluster_multiplier = 1.0 + (related_cluster.cluster_size - 1) * 0.1
             
             return base_score * trend_multiplier * cluster_multiplier
             
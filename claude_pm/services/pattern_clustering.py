@@ -0,0 +1,286 @@
+"""
+Incremental Pattern Clustering for the Pattern Analyzer
+
+Keeps a TF-IDF vocabulary, per-pattern term vectors and cluster centroids
+alive between analyses, so each analysis only processes corrections it has
+not seen before.
+
+Key Features:
+- Incremental vocabulary: term and document frequencies updated per new text
+- Sparse L2-normalized TF-IDF vectors, recomputed only for changed patterns
+- Mini-batch assignment: changed patterns move to the nearest centroid,
+  which is nudged toward them with a per-centroid learning rate
+- Drift detection: a full spherical k-means refit runs only when new points
+  sit much further from their centroids than at the last fit, when enough
+  of the data changed, or when more clusters become possible
+- Direct pattern -> cluster map (no rescans to find a pattern's cluster)
+- Pure Python; no ML dependencies required
+
+Usage:
+    from claude_pm.services.pattern_clustering import IncrementalPatternClusterer
+    
+    clusterer = IncrementalPatternClusterer(max_clusters=5)
+    clusterer.add_texts("pattern_ab12cd34", ["missing docstring", "added docstring"], agent_type="Documentation")
+    clusterer.update()
+    cluster_index = clusterer.assignments["pattern_ab12cd34"]
+"""
+
+import logging
+import math
+import random
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"\b\w\w+\b")
+
+# Small English stop list; these words carry no signal for correction themes
+STOP_WORDS = frozenset("""
+a about after again all also an and any are as at be because been before being but by can could did
+do does doing done for from had has have having he her here him his how i if in into is it its just
+may me more most my no not now of on only or other our out over same she should so some such than
+that the their them then there these they this those to too under up very was we were what when
+where which while who why will with would you your
+""".split())
+
+SparseVector = Dict[str, float]
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens of two or more characters, minus stop words."""
+    return [token for token in _TOKEN_RE.findall(text.lower()) if token not in STOP_WORDS]
+
+
+def _dot(a: SparseVector, b: SparseVector) -> float:
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(term, 0.0) for term, weight in a.items())
+
+
+def _normalize(vector: SparseVector) -> SparseVector:
+    norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+    if norm == 0:
+        return {}
+    return {term: weight / norm for term, weight in vector.items()}
+
+
+class IncrementalPatternClusterer:
+    """
+    Spherical k-means over pattern texts with incremental updates.
+    
+    A pattern is one point: the bag of words of all its corrections. New
+    corrections add to their pattern's term counts; ``update()`` then
+    re-vectorizes and reassigns only the patterns that changed.
+    """
+    
+    def __init__(self,
+                 max_clusters: int = 5,
+                 drift_threshold: float = 0.15,
+                 recluster_fraction: float = 0.5,
+                 max_iterations: int = 25,
+                 seed: int = 42):
+        """
+        Args:
+            max_clusters: Upper bound on the number of clusters
+            drift_threshold: Refit when changed points are on average this much
+                further (in cosine distance) from their centroids than at the last fit
+            recluster_fraction: Refit once this fraction of points changed since the last fit
+            max_iterations: Iteration cap for a full k-means fit
+            seed: Seed for deterministic centroid initialization
+        """
+        self.max_clusters = max(1, max_clusters)
+        self.drift_threshold = drift_threshold
+        self.recluster_fraction = recluster_fraction
+        self.max_iterations = max_iterations
+        self.seed = seed
+        
+        self.term_counts: Dict[str, Counter] = {}
+        self.document_frequency: Counter = Counter()
+        self.agent_counts: Dict[str, Counter] = {}
+        self.vectors: Dict[str, SparseVector] = {}
+        self.centroids: List[SparseVector] = []
+        self.centroid_weights: List[int] = []
+        self.assignments: Dict[str, int] = {}
+        self.baseline_distance = 0.0
+        
+        self._dirty: Set[str] = set()
+        self._changed_since_fit = 0
+        self.stats = {"full_fits": 0, "incremental_updates": 0, "points_assigned": 0}
+    
+    # Vocabulary
+    
+    def add_texts(self, pattern_id: str, texts: Iterable[str], agent_type: Optional[str] = None) -> None:
+        """Add correction texts to a pattern's bag of words."""
+        counts = self.term_counts.get(pattern_id)
+        if counts is None:
+            counts = self.term_counts[pattern_id] = Counter()
+        new_terms = Counter()
+        added = 0
+        for text in texts:
+            new_terms.update(tokenize(text))
+            added += 1
+        for term in new_terms:
+            if term not in counts:
+                self.document_frequency[term] += 1
+        counts.update(new_terms)
+        if agent_type is not None:
+            self.agent_counts.setdefault(pattern_id, Counter())[agent_type] += added
+        self._dirty.add(pattern_id)
+    
+    def _idf(self, term: str) -> float:
+        # Smoothed IDF, as in scikit-learn's TfidfVectorizer
+        return math.log((1 + len(self.term_counts)) / (1 + self.document_frequency[term])) + 1
+    
+    def _vectorize(self, pattern_id: str) -> SparseVector:
+        counts = self.term_counts.get(pattern_id) or {}
+        return _normalize({term: count * self._idf(term) for term, count in counts.items()})
+    
+    # Clustering
+    
+    def _nearest(self, vector: SparseVector) -> Tuple[int, float]:
+        best_index, best_similarity = 0, -1.0
+        for index, centroid in enumerate(self.centroids):
+            similarity = _dot(vector, centroid)
+            if similarity > best_similarity:
+                best_index, best_similarity = index, similarity
+        return best_index, best_similarity
+    
+    def _needs_full_fit(self) -> bool:
+        if not self.centroids:
+            return True
+        if len(self.centroids) < min(self.max_clusters, len(self.term_counts)):
+            return True
+        return self._changed_since_fit >= self.recluster_fraction * len(self.term_counts)
+    
+    def update(self) -> bool:
+        """
+        Bring clusters up to date with the texts added since the last call.
+        
+        Returns:
+            True if a full refit ran, False if changes were folded in incrementally
+        """
+        dirty, self._dirty = self._dirty, set()
+        self._changed_since_fit += len(dirty)
+        for pattern_id in dirty:
+            self.vectors[pattern_id] = self._vectorize(pattern_id)
+        
+        if self._needs_full_fit():
+            self.fit()
+            return True
+        if not dirty:
+            return False
+        
+        distances = []
+        for pattern_id in sorted(dirty):
+            vector = self.vectors[pattern_id]
+            index, similarity = self._nearest(vector)
+            previous = self.assignments.get(pattern_id)
+            if previous is not None and previous != index:
+                self.centroid_weights[previous] = max(0, self.centroid_weights[previous] - 1)
+            if previous != index:
+                self.centroid_weights[index] += 1
+            self.assignments[pattern_id] = index
+            
+            # Mini-batch step: move the centroid toward the point, more slowly as it accumulates points
+            rate = 1.0 / max(1, self.centroid_weights[index])
+            centroid = {term: weight * (1 - rate) for term, weight in self.centroids[index].items()}
+            for term, weight in vector.items():
+                centroid[term] = centroid.get(term, 0.0) + rate * weight
+            self.centroids[index] = _normalize(centroid)
+            distances.append(1.0 - similarity)
+        
+        self.stats["incremental_updates"] += 1
+        self.stats["points_assigned"] += len(dirty)
+        if sum(distances) / len(distances) > self.baseline_distance + self.drift_threshold:
+            logger.debug("Pattern clusters drifted; running a full refit")
+            self.fit()
+            return True
+        return False
+    
+    def fit(self) -> None:
+        """Full spherical k-means over every pattern (vectors recomputed with the current IDF)."""
+        pattern_ids = sorted(self.term_counts)
+        self._dirty.clear()
+        self._changed_since_fit = 0
+        self.vectors = {pattern_id: self._vectorize(pattern_id) for pattern_id in pattern_ids}
+        k = min(self.max_clusters, len(pattern_ids))
+        if k == 0:
+            self.centroids, self.centroid_weights, self.assignments = [], [], {}
+            return
+        
+        self.centroids = self._initial_centroids(pattern_ids, k)
+        for _ in range(self.max_iterations):
+            assignments = {pattern_id: self._nearest(self.vectors[pattern_id])[0] for pattern_id in pattern_ids}
+            sums: List[SparseVector] = [{} for _ in range(k)]
+            for pattern_id, index in assignments.items():
+                for term, weight in self.vectors[pattern_id].items():
+                    sums[index][term] = sums[index].get(term, 0.0) + weight
+            centroids = [_normalize(total) if total else self.centroids[index] for index, total in enumerate(sums)]
+            converged = assignments == self.assignments
+            self.assignments, self.centroids = assignments, centroids
+            if converged:
+                break
+        
+        self.centroid_weights = [0] * k
+        distances = []
+        for pattern_id, index in self.assignments.items():
+            self.centroid_weights[index] += 1
+            distances.append(1.0 - _dot(self.vectors[pattern_id], self.centroids[index]))
+        self.baseline_distance = sum(distances) / len(distances)
+        self.stats["full_fits"] += 1
+    
+    def _initial_centroids(self, pattern_ids: List[str], k: int) -> List[SparseVector]:
+        """k-means++ seeding with a fixed seed."""
+        rng = random.Random(self.seed)
+        centroids = [self.vectors[rng.choice(pattern_ids)]]
+        while len(centroids) < k:
+            weights = [
+                max(0.0, 1.0 - max(_dot(self.vectors[pattern_id], centroid) for centroid in centroids)) ** 2
+                for pattern_id in pattern_ids
+            ]
+            if sum(weights) == 0:
+                remaining = [p for p in pattern_ids if self.vectors[p] not in centroids] or pattern_ids
+                centroids.append(self.vectors[rng.choice(remaining)])
+            else:
+                centroids.append(self.vectors[rng.choices(pattern_ids, weights=weights)[0]])
+        return centroids
+    
+    # Results
+    
+    def cluster_members(self, pattern_ids: Optional[Iterable[str]] = None) -> Dict[int, List[str]]:
+        """Group patterns (all by default) by cluster index."""
+        members: Dict[int, List[str]] = {}
+        for pattern_id in (self.assignments if pattern_ids is None else pattern_ids):
+            index = self.assignments.get(pattern_id)
+            if index is not None:
+                members.setdefault(index, []).append(pattern_id)
+        return members
+    
+    def cohesion(self, pattern_ids: List[str]) -> float:
+        """Mean pairwise cosine similarity of the patterns, from the norm of their vector sum."""
+        vectors = [self.vectors[p] for p in pattern_ids if self.vectors.get(p)]
+        if len(vectors) < 2:
+            return 1.0
+        total: SparseVector = {}
+        for vector in vectors:
+            for term, weight in vector.items():
+                total[term] = total.get(term, 0.0) + weight
+        n = len(vectors)
+        # Unit vectors: |sum|^2 = n + sum over ordered pairs of cosine similarities
+        return (_dot(total, total) - n) / (n * (n - 1))
+    
+    def top_terms(self, pattern_ids: List[str], count: int = 5) -> List[str]:
+        """Most frequent terms across the patterns."""
+        totals = Counter()
+        for pattern_id in pattern_ids:
+            totals.update(self.term_counts.get(pattern_id, {}))
+        return [term for term, _ in totals.most_common(count)]
+    
+    def dominant_agent_type(self, pattern_ids: List[str]) -> str:
+        """Agent type with the most corrections across the patterns."""
+        totals = Counter()
+        for pattern_id in pattern_ids:
+            totals.update(self.agent_counts.get(pattern_id, {}))
+        return totals.most_common(1)[0][0] if totals else "unknown"
@@ -58,9 +58,21 @@ class PromptValidator:
         
         # Initialize components
         self.executor = TestExecutor(self.max_concurrent_tests, self.default_timeout)
-        self.ab_tester = ABTester(self.significance_threshold, self.min_sample_size)
+        self.ab_tester = ABTester(
+            self.significance_threshold,
+            self.min_sample_size,
+            sequential=self.config.get('ab_sequential_testing', False),
+            batch_size=self.config.get('ab_batch_size', 5),
+            max_sample_size=self.config.get('ab_max_sample_size', 100),
+            spending_function=self.config.get('ab_spending_function', 'obrien_fleming'),
+            max_concurrency=self.max_concurrent_tests
+        )
         self.regression_tester = RegressionTester()
-        self.benchmarker = PerformanceBenchmarker()
+        self.benchmarker = PerformanceBenchmarker(
+            max_concurrency=self.config.get('benchmark_concurrency', 1),
+            warmup_iterations=self.config.get('benchmark_warmup_iterations', 0),
+            confidence_level=self.config.get('benchmark_confidence_level', 0.95)
+        )
         self.scenario_manager = ScenarioManager()
         self.analytics_engine = AnalyticsEngine()
         self.storage_manager = StorageManager(self.config.get('base_path', '.claude-pm/prompt_validation'))
@@ -218,7 +230,8 @@ class PromptValidator:
                         prompt_b_id: str,
                         prompt_b_content: str,
                         scenarios: List[str],
-                        sample_size: Optional[int] = None) -> ABTestResult:
+                        sample_size: Optional[int] = None,
+                        sequential: Optional[bool] = None) -> ABTestResult:
         """
         Run A/B test between two prompts
         
@@ -228,7 +241,8 @@ class PromptValidator:
             prompt_b_id: Second prompt identifier
             prompt_b_content: Second prompt content
             scenarios: List of scenario IDs to test
-            sample_size: Number of tests per prompt (optional)
+            sample_size: Number of tests per prompt (optional; the maximum in sequential mode)
+            sequential: Stop early at a group-sequential boundary (default: ab_sequential_testing config)
             
         Returns:
             A/B test result
@@ -247,7 +261,7 @@ class PromptValidator:
         ab_result = await self.ab_tester.run_ab_test(
             prompt_a_id, prompt_a_content,
             prompt_b_id, prompt_b_content,
-            test_scenarios, sample_size
+            test_scenarios, sample_size, sequential=sequential
         )
         
         # Save result
@@ -292,7 +306,10 @@ class PromptValidator:
                                       prompt_id: str,
                                       prompt_content: str,
                                       scenarios: List[str],
-                                      iterations: int = 10) -> Dict[str, Any]:
+                                      iterations: int = 10,
+                                      concurrency: Optional[int] = None,
+                                      warmup_iterations: Optional[int] = None,
+                                      target_precision: Optional[float] = None) -> Dict[str, Any]:
         """
         Run performance benchmark test
         
@@ -300,7 +317,11 @@ class PromptValidator:
             prompt_id: Prompt identifier
             prompt_content: Prompt content
             scenarios: List of scenario IDs to test
-            iterations: Number of iterations per scenario
+            iterations: Number of iterations per scenario (maximum with target_precision)
+            concurrency: Iterations in flight at once (default: benchmark_concurrency config)
+            warmup_iterations: Unmeasured iterations per scenario (default: benchmark_warmup_iterations config)
+            target_precision: Stop a scenario once its confidence interval half-width
+                is at most this fraction of the mean execution time
             
         Returns:
             Performance benchmark results
@@ -316,7 +337,9 @@ class PromptValidator:
             raise ValueError("No valid test scenarios found")
         
         results = await self.benchmarker.run_performance_benchmark(
-            prompt_id, prompt_content, test_scenarios, iterations
+            prompt_id, prompt_content, test_scenarios, iterations,
+            concurrency=concurrency, warmup_iterations=warmup_iterations,
+            target_precision=target_precision
         )
         
         # Save results
@@ -340,7 +363,7 @@ class PromptValidator:
         """
         # Load test results
         since_date = datetime.now() - timedelta(days=days_back)
-        all_results = await self.storage_manager.load_test_results_since(since_date)
+        all_results = await self.storage_manager.load_test_results_since(since_date, prompt_version=prompt_id)
         
         return await self.analytics_engine.get_test_analytics(
             all_results, prompt_id, days_back
@@ -3,17 +3,52 @@ A/B testing functionality for prompt comparison.
 
 This module provides comprehensive A/B testing capabilities for comparing
 two prompts, including statistical significance calculation and winner determination.
+
+Trials for both prompts run concurrently (bounded by max_concurrency), with
+both prompts tried on the same scenario sequence. In sequential mode the
+test is a group-sequential design: after every batch of trials a Welch
+t-test is compared against an alpha-spending boundary (O'Brien-Fleming or
+Pocock type), and the test stops as soon as the difference is decisive.
+The per-look alpha is the increment of the spending function, so the
+overall false positive rate stays within the significance threshold.
 """
 
+import asyncio
+import math
 import statistics
 import random
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 
 from .models import TestScenario, TestResult, ABTestResult
 from .test_execution import TestExecutor
-from .utils import generate_ab_test_id
+from .utils import generate_ab_test_id, two_sample_t_test
+
+SPENDING_FUNCTIONS = ('obrien_fleming', 'pocock')
+
+
+def alpha_spent(information_fraction: float, alpha: float, spending_function: str = 'obrien_fleming') -> float:
+    """
+    Cumulative two-sided alpha spent at an information fraction (Lan-DeMets).
+    
+    Args:
+        information_fraction: Share of the maximum sample size observed (0-1)
+        alpha: Overall significance level
+        spending_function: 'obrien_fleming' (spends little early) or 'pocock'
+        
+    Returns:
+        Alpha spent so far; equals alpha at information fraction 1
+    """
+    t = min(1.0, max(0.0, information_fraction))
+    if t == 0.0:
+        return 0.0
+    if spending_function == 'obrien_fleming':
+        normal = statistics.NormalDist()
+        return min(alpha, 2 * (1 - normal.cdf(normal.inv_cdf(1 - alpha / 2) / math.sqrt(t))))
+    if spending_function == 'pocock':
+        return alpha * math.log(1 + (math.e - 1) * t)
+    raise ValueError(f"Unknown spending function: {spending_function}")
 
 
 class ABTester:
@@ -21,9 +56,31 @@ class ABTester:
     
     def __init__(self, 
                  significance_threshold: float = 0.05,
-                 min_sample_size: int = 10):
+                 min_sample_size: int = 10,
+                 sequential: bool = False,
+                 batch_size: int = 5,
+                 max_sample_size: int = 100,
+                 spending_function: str = 'obrien_fleming',
+                 max_concurrency: int = 5):
+        """
+        Args:
+            significance_threshold: Overall false positive rate
+            min_sample_size: Default trials per prompt in fixed-size tests
+            sequential: Stop as soon as a group-sequential boundary is crossed
+            batch_size: Trials per prompt between sequential looks
+            max_sample_size: Default per-prompt trial budget in sequential tests
+            spending_function: Alpha-spending function for sequential boundaries
+            max_concurrency: Trials in flight at once, across both prompts
+        """
+        if spending_function not in SPENDING_FUNCTIONS:
+            raise ValueError(f"spending_function must be one of {SPENDING_FUNCTIONS}: {spending_function!r}")
         self.significance_threshold = significance_threshold
         self.min_sample_size = min_sample_size
+        self.sequential = sequential
+        self.batch_size = max(2, batch_size)
+        self.max_sample_size = max_sample_size
+        self.spending_function = spending_function
+        self.max_concurrency = max(1, max_concurrency)
         self.logger = logging.getLogger(__name__)
         self.executor = TestExecutor()
     
@@ -33,7 +90,8 @@ class ABTester:
                          prompt_b_id: str,
                          prompt_b_content: str,
                          scenarios: List[TestScenario],
-                         sample_size: Optional[int] = None) -> ABTestResult:
+                         sample_size: Optional[int] = None,
+                         sequential: Optional[bool] = None) -> ABTestResult:
         """
         Run A/B test between two prompts
         
@@ -43,7 +101,8 @@ class ABTester:
             prompt_b_id: Second prompt identifier
             prompt_b_content: Second prompt content
             scenarios: List of test scenarios
-            sample_size: Number of tests per prompt (optional)
+            sample_size: Number of tests per prompt (optional; the maximum in sequential mode)
+            sequential: Override for the sequential setting
             
         Returns:
             A/B test result
@@ -59,24 +118,32 @@ class ABTester:
                 'scenarios': [s.scenario_id for s in scenarios]
             })
             
-            # Determine sample size
-            if sample_size is None:
-                sample_size = max(self.min_sample_size, len(scenarios))
-            
-            # Run tests for both prompts
-            prompt_a_results = await self._run_prompt_tests(
-                prompt_a_content, scenarios, sample_size, f"{test_id}_a"
-            )
-            
-            prompt_b_results = await self._run_prompt_tests(
-                prompt_b_content, scenarios, sample_size, f"{test_id}_b"
-            )
-            
-            # Calculate statistical significance
-            significance = self._calculate_statistical_significance(prompt_a_results, prompt_b_results)
+            sequential = self.sequential if sequential is None else sequential
+            sequential_analysis = None
             
-            # Determine winner
-            winner = self._determine_winner(prompt_a_results, prompt_b_results, significance)
+            if sequential:
+                if sample_size is None:
+                    sample_size = max(self.max_sample_size, self.min_sample_size)
+                prompt_a_results, prompt_b_results, sequential_analysis = await self._run_sequential_test(
+                    prompt_a_content, prompt_b_content, scenarios, sample_size, test_id
+                )
+                significance = sequential_analysis['p_value']
+                winner = sequential_analysis['decision'] if sequential_analysis['decision'] != 'no_difference' else None
+            else:
+                # Determine sample size
+                if sample_size is None:
+                    sample_size = max(self.min_sample_size, len(scenarios))
+                
+                # Run tests for both prompts
+                prompt_a_results, prompt_b_results = await self._run_trials(
+                    prompt_a_content, prompt_b_content, self._draw_scenarios(scenarios, sample_size), 0, test_id
+                )
+                
+                # Calculate statistical significance
+                significance = self._calculate_statistical_significance(prompt_a_results, prompt_b_results)
+                
+                # Determine winner
+                winner = self._determine_winner(prompt_a_results, prompt_b_results, significance)
             
             # Calculate confidence level
             confidence_level = 1 - significance
@@ -96,7 +163,8 @@ class ABTester:
                 winner=winner,
                 confidence_level=confidence_level,
                 improvement_metrics=improvement_metrics,
-                timestamp=datetime.now()
+                timestamp=datetime.now(),
+                sequential_analysis=sequential_analysis
             )
             
             # Update test status
@@ -111,69 +179,119 @@ class ABTester:
                 self.executor.update_test_status(test_id, "failed", str(e))
             raise
     
-    async def _run_prompt_tests(self,
-                               prompt_content: str,
-                               scenarios: List[TestScenario],
-                               sample_size: int,
-                               test_id_prefix: str) -> List[TestResult]:
-        """Run tests for a single prompt"""
-        results = []
+    @staticmethod
+    def _draw_scenarios(scenarios: List[TestScenario], count: int) -> List[TestScenario]:
+        """Scenario sequence shared by both prompts, so they are compared on the same mix"""
+        return [random.choice(scenarios) for _ in range(count)]
+    
+    async def _run_trials(self,
+                          prompt_a_content: str,
+                          prompt_b_content: str,
+                          scenarios: List[TestScenario],
+                          first_index: int,
+                          test_id: str) -> Tuple[List[TestResult], List[TestResult]]:
+        """Run one trial per scenario for each prompt, concurrently within the pool"""
+        pool = asyncio.Semaphore(self.max_concurrency)
+        
+        async def run(prompt_content: str, scenario: TestScenario, trial_id: str) -> TestResult:
+            async with pool:
+                return await self.executor.run_single_test_async(prompt_content, scenario, trial_id)
+        
+        results = await asyncio.gather(*(
+            run(prompt_content, scenario, f"{test_id}_{arm}_{first_index + i}")
+            for arm, prompt_content in (('a', prompt_a_content), ('b', prompt_b_content))
+            for i, scenario in enumerate(scenarios)
+        ))
+        return list(results[:len(scenarios)]), list(results[len(scenarios):])
+    
+    async def _run_sequential_test(self,
+                                   prompt_a_content: str,
+                                   prompt_b_content: str,
+                                   scenarios: List[TestScenario],
+                                   max_sample_size: int,
+                                   test_id: str) -> Tuple[List[TestResult], List[TestResult], Dict[str, Any]]:
+        """
+        Group-sequential A/B test: look after every batch, stop at the first boundary crossing.
+        
+        Returns:
+            Tuple of (prompt A results, prompt B results, sequential analysis)
+        """
+        alpha = self.significance_threshold
+        results_a: List[TestResult] = []
+        results_b: List[TestResult] = []
+        looks: List[Dict[str, Any]] = []
+        spent = 0.0
+        decision = 'no_difference'
+        p_value = 1.0
         
-        for i in range(sample_size):
-            scenario = random.choice(scenarios)
-            result = await self.executor.run_single_test_async(
-                prompt_content, scenario, f"{test_id_prefix}_{i}"
+        while len(results_a) < max_sample_size:
+            count = min(self.batch_size, max_sample_size - len(results_a))
+            batch_a, batch_b = await self._run_trials(
+                prompt_a_content, prompt_b_content, self._draw_scenarios(scenarios, count), len(results_a), test_id
             )
-            results.append(result)
+            results_a.extend(batch_a)
+            results_b.extend(batch_b)
+            
+            # Boundary for this look: the alpha newly spent since the previous look
+            cumulative = alpha_spent(len(results_a) / max_sample_size, alpha, self.spending_function)
+            nominal_alpha = cumulative - spent
+            spent = cumulative
+            
+            t_statistic, df, p_value = two_sample_t_test(
+                self._scores(results_a), self._scores(results_b), equal_variance=False
+            )
+            looks.append({
+                'trials_per_prompt': len(results_a),
+                't_statistic': t_statistic,
+                'degrees_of_freedom': df,
+                'p_value': p_value,
+                'nominal_alpha': nominal_alpha,
+                'alpha_spent': cumulative
+            })
+            
+            if p_value < nominal_alpha:
+                decision = 'prompt_b' if t_statistic > 0 else 'prompt_a'
+                break
         
-        return results
+        analysis = {
+            'method': 'group_sequential',
+            'spending_function': self.spending_function,
+            'alpha': alpha,
+            'batch_size': self.batch_size,
+            'max_sample_size': max_sample_size,
+            'trials_per_prompt': len(results_a),
+            'stopped_early': len(results_a) < max_sample_size,
+            'decision': decision,
+            'p_value': p_value,
+            'looks': looks
+        }
+        self.logger.debug(
+            f"Sequential A/B test {test_id}: {decision} after {len(looks)} looks, "
+            f"{len(results_a)}/{max_sample_size} trials per prompt"
+        )
+        return results_a, results_b, analysis
+    
+    @staticmethod
+    def _scores(results: List[TestResult]) -> List[float]:
+        """Scores of the successful trials"""
+        return [r.score for r in results if r.success]
     
     def _calculate_statistical_significance(self, 
                                           results_a: List[TestResult],
                                           results_b: List[TestResult]) -> float:
-        """Calculate statistical significance between two result sets"""
+        """Calculate statistical significance (two-sided pooled t-test p-value) between two result sets"""
         try:
             # Extract scores for successful tests
-            scores_a = [r.score for r in results_a if r.success]
-            scores_b = [r.score for r in results_b if r.success]
+            scores_a = self._scores(results_a)
+            scores_b = self._scores(results_b)
             
             if not scores_a or not scores_b:
                 return 1.0  # No significance if no successful tests
             
-            # Simple t-test approximation
-            mean_a = statistics.mean(scores_a)
-            mean_b = statistics.mean(scores_b)
-            
-            if len(scores_a) > 1:
-                std_a = statistics.stdev(scores_a)
-            else:
-                std_a = 0.0
-                
-            if len(scores_b) > 1:
-                std_b = statistics.stdev(scores_b)
-            else:
-                std_b = 0.0
-            
-            # Pooled standard error
-            n_a = len(scores_a)
-            n_b = len(scores_b)
-            
-            if n_a + n_b < 4:
+            if len(scores_a) + len(scores_b) < 4:
                 return 1.0  # Not enough data
             
-            pooled_std = ((n_a - 1) * std_a**2 + (n_b - 1) * std_b**2) / (n_a + n_b - 2)
-            pooled_std = pooled_std**0.5
-            
-            if pooled_std == 0:
-                return 0.0 if mean_a != mean_b else 1.0
-            
-            # T-statistic
-            t_stat = (mean_a - mean_b) / (pooled_std * (1/n_a + 1/n_b)**0.5)
-            
-            # Approximate p-value (simplified)
-            p_value = 2 * (1 - min(0.999, abs(t_stat) / 3))
-            
-            return p_value
+            return two_sample_t_test(scores_a, scores_b)[2]
             
         except Exception as e:
             self.logger.error(f"Error calculating statistical significance: {e}")
@@ -74,6 +74,7 @@ class ABTestResult:
     confidence_level: float
     improvement_metrics: Dict[str, Any]
     timestamp: datetime
+    sequential_analysis: Optional[Dict[str, Any]] = None
 
 
 @dataclass
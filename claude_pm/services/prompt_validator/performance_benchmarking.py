@@ -3,30 +3,93 @@ Performance benchmarking functionality for prompt validation.
 
 This module provides performance benchmarking capabilities to measure
 and analyze prompt execution performance across multiple iterations.
+
+Iterations can run concurrently through a bounded worker pool (shared by
+all scenarios), warmup iterations are excluded from the statistics, and
+each iteration records wall time (time.perf_counter) and the CPU time its
+coroutine spent on the event loop thread. Scenario results carry Student's
+t confidence intervals; with a target precision, a scenario stops as soon
+as its interval is tight enough.
 """
 
+import asyncio
 import time
 import statistics
 import logging
-from typing import Dict, List, Any
+from typing import Any, Awaitable, Dict, List, Optional
 from datetime import datetime
 
 from .models import TestScenario
 from .test_execution import TestExecutor
+from .utils import mean_confidence_interval
+
+
+class _CpuTimed:
+    """
+    Awaitable wrapper that adds up the thread CPU time spent inside each
+    step of a coroutine, so concurrent iterations do not count each
+    other's work.
+    """
+    
+    def __init__(self, awaitable: Awaitable):
+        self._awaitable = awaitable
+        self.cpu_time = 0.0
+    
+    def __await__(self):
+        iterator = self._awaitable.__await__()
+        send_value, error = None, None
+        while True:
+            started = time.thread_time()
+            try:
+                if error is not None:
+                    yielded = iterator.throw(error)
+                else:
+                    yielded = iterator.send(send_value)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                self.cpu_time += time.thread_time() - started
+            
+            try:
+                send_value, error = (yield yielded), None
+            except GeneratorExit:
+                iterator.close()
+                raise
+            except BaseException as e:
+                send_value, error = None, e
 
 
 class PerformanceBenchmarker:
     """Handles performance benchmarking for prompts"""
     
-    def __init__(self):
+    def __init__(self,
+                 max_concurrency: int = 1,
+                 warmup_iterations: int = 0,
+                 confidence_level: float = 0.95,
+                 min_iterations: int = 5):
+        """
+        Args:
+            max_concurrency: Iterations allowed in flight at once, across all
+                scenarios (1 runs them sequentially)
+            warmup_iterations: Iterations run per scenario before measuring
+            confidence_level: Confidence level for the reported intervals
+            min_iterations: Iterations measured before a target precision can stop a scenario
+        """
         self.logger = logging.getLogger(__name__)
         self.executor = TestExecutor()
+        self.max_concurrency = max(1, max_concurrency)
+        self.warmup_iterations = max(0, warmup_iterations)
+        self.confidence_level = confidence_level
+        self.min_iterations = max(2, min_iterations)
     
     async def run_performance_benchmark(self, 
                                        prompt_id: str,
                                        prompt_content: str,
                                        scenarios: List[TestScenario],
-                                       iterations: int = 10) -> Dict[str, Any]:
+                                       iterations: int = 10,
+                                       concurrency: Optional[int] = None,
+                                       warmup_iterations: Optional[int] = None,
+                                       target_precision: Optional[float] = None) -> Dict[str, Any]:
         """
         Run performance benchmark test
         
@@ -34,30 +97,51 @@ class PerformanceBenchmarker:
             prompt_id: Prompt identifier
             prompt_content: Prompt content
             scenarios: List of test scenarios
-            iterations: Number of iterations per scenario
+            iterations: Number of iterations per scenario (the maximum when
+                target_precision is set)
+            concurrency: Override for max_concurrency
+            warmup_iterations: Override for warmup_iterations
+            target_precision: Stop a scenario once the confidence interval
+                half-width is at most this fraction of its mean execution time
             
         Returns:
             Performance benchmark results
         """
         try:
+            concurrency = self.max_concurrency if concurrency is None else max(1, concurrency)
+            warmup = self.warmup_iterations if warmup_iterations is None else max(0, warmup_iterations)
             benchmark_results = {
                 'prompt_id': prompt_id,
                 'scenarios_tested': len(scenarios),
                 'iterations_per_scenario': iterations,
+                'warmup_iterations': warmup,
+                'concurrency': concurrency,
+                'target_precision': target_precision,
                 'results': [],
                 'performance_metrics': {},
                 'timestamp': datetime.now().isoformat()
             }
             
-            for scenario in scenarios:
-                scenario_results = await self._benchmark_scenario(
-                    prompt_content, scenario, iterations, prompt_id
+            pool = asyncio.Semaphore(concurrency)
+            started = time.perf_counter()
+            all_scenario_results = await asyncio.gather(*(
+                self._benchmark_scenario(
+                    prompt_content, scenario, iterations, prompt_id,
+                    pool=pool, batch_size=concurrency, warmup_iterations=warmup,
+                    target_precision=target_precision
                 )
-                
+                for scenario in scenarios
+            ))
+            wall_clock_time = time.perf_counter() - started
+            
+            for scenario, scenario_results in zip(scenarios, all_scenario_results):
                 # Calculate scenario performance metrics
                 scenario_metrics = self._calculate_scenario_metrics(scenario_results)
                 scenario_metrics['scenario_id'] = scenario.scenario_id
                 scenario_metrics['results'] = scenario_results
+                if target_precision is not None:
+                    ci = scenario_metrics['execution_time_ci']
+                    scenario_metrics['precision_reached'] = ci is not None and ci['relative_margin'] <= target_precision
                 
                 benchmark_results['results'].append(scenario_metrics)
             
@@ -65,6 +149,7 @@ class PerformanceBenchmarker:
             benchmark_results['performance_metrics'] = self._calculate_overall_metrics(
                 benchmark_results['results']
             )
+            benchmark_results['performance_metrics']['wall_clock_time'] = wall_clock_time
             
             return benchmark_results
             
@@ -76,40 +161,79 @@ class PerformanceBenchmarker:
                                  prompt_content: str,
                                  scenario: TestScenario,
                                  iterations: int,
-                                 prompt_id: str) -> List[Dict[str, Any]]:
-        """Benchmark a single scenario"""
-        scenario_results = []
+                                 prompt_id: str,
+                                 pool: Optional[asyncio.Semaphore] = None,
+                                 batch_size: int = 1,
+                                 warmup_iterations: int = 0,
+                                 target_precision: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Benchmark a single scenario: warmups first, then measured iterations in pool-sized batches"""
+        pool = pool or asyncio.Semaphore(1)
         
-        for i in range(iterations):
-            start_time = time.time()
-            result = await self.executor.run_single_test_async(
-                prompt_content, 
-                scenario, 
-                f"{prompt_id}_perf_{scenario.scenario_id}_{i}"
+        for i in range(warmup_iterations):
+            await self._run_iteration(
+                prompt_content, scenario, f"{prompt_id}_warmup_{scenario.scenario_id}_{i}", i, pool
             )
-            end_time = time.time()
+        
+        # Without a precision target every iteration is queued at once; the pool bounds concurrency
+        batch_size = iterations if target_precision is None else max(1, batch_size)
+        scenario_results = []
+        while len(scenario_results) < iterations:
+            first = len(scenario_results)
+            batch = range(first, min(iterations, first + batch_size))
+            scenario_results.extend(await asyncio.gather(*(
+                self._run_iteration(
+                    prompt_content, scenario, f"{prompt_id}_perf_{scenario.scenario_id}_{i}", i, pool
+                )
+                for i in batch
+            )))
             
-            scenario_results.append({
-                'iteration': i,
-                'execution_time': end_time - start_time,
-                'success': result.success,
-                'score': result.score,
-                'memory_usage': result.metrics.get('memory_usage', 0),
-                'token_count': result.metrics.get('token_count', 0)
-            })
+            if target_precision is not None and len(scenario_results) >= self.min_iterations:
+                ci = mean_confidence_interval(
+                    [r['execution_time'] for r in scenario_results], self.confidence_level
+                )
+                if ci is not None and ci['relative_margin'] <= target_precision:
+                    break
         
         return scenario_results
     
+    async def _run_iteration(self,
+                             prompt_content: str,
+                             scenario: TestScenario,
+                             test_id: str,
+                             iteration: int,
+                             pool: asyncio.Semaphore) -> Dict[str, Any]:
+        """Run and time one iteration inside the worker pool"""
+        async with pool:
+            timed = _CpuTimed(self.executor.run_single_test_async(prompt_content, scenario, test_id))
+            start_time = time.perf_counter()
+            result = await timed
+            end_time = time.perf_counter()
+        
+        return {
+            'iteration': iteration,
+            'execution_time': end_time - start_time,
+            'cpu_time': timed.cpu_time,
+            'success': result.success,
+            'score': result.score,
+            'memory_usage': result.metrics.get('memory_usage', 0),
+            'token_count': result.metrics.get('token_count', 0)
+        }
+    
     def _calculate_scenario_metrics(self, scenario_results: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Calculate metrics for a single scenario"""
         execution_times = [r['execution_time'] for r in scenario_results]
+        cpu_times = [r.get('cpu_time', 0.0) for r in scenario_results]
         success_rate = len([r for r in scenario_results if r['success']]) / len(scenario_results)
         
         metrics = {
+            'iterations': len(scenario_results),
             'avg_execution_time': statistics.mean(execution_times),
             'min_execution_time': min(execution_times),
             'max_execution_time': max(execution_times),
             'std_execution_time': statistics.stdev(execution_times) if len(execution_times) > 1 else 0,
+            'execution_time_ci': mean_confidence_interval(execution_times, self.confidence_level),
+            'avg_cpu_time': statistics.mean(cpu_times),
+            'cpu_time_ci': mean_confidence_interval(cpu_times, self.confidence_level),
             'success_rate': success_rate,
             'throughput': 1.0 / statistics.mean(execution_times) if execution_times else 0,
         }
@@ -126,14 +250,18 @@ class PerformanceBenchmarker:
     def _calculate_overall_metrics(self, scenario_results: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Calculate overall performance metrics across all scenarios"""
         all_execution_times = []
+        all_cpu_times = []
         all_success_rates = []
         
         for scenario_result in scenario_results:
             all_execution_times.append(scenario_result['avg_execution_time'])
+            all_cpu_times.append(scenario_result.get('avg_cpu_time', 0.0))
             all_success_rates.append(scenario_result['success_rate'])
         
         overall_metrics = {
+            'total_iterations': sum(r.get('iterations', len(r.get('results', []))) for r in scenario_results),
             'overall_avg_execution_time': statistics.mean(all_execution_times) if all_execution_times else 0,
+            'overall_avg_cpu_time': statistics.mean(all_cpu_times) if all_cpu_times else 0,
             'overall_success_rate': statistics.mean(all_success_rates) if all_success_rates else 0,
             'overall_throughput': sum(1.0 / t for t in all_execution_times) if all_execution_times else 0,
             'consistency_score': self._calculate_consistency_score(all_execution_times)
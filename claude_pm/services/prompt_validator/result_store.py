@@ -0,0 +1,238 @@
+"""
+Indexed test result store for the prompt validation framework.
+
+This module keeps every stored TestResult in a single SQLite (WAL) table
+indexed by prompt, scenario and timestamp, so trend reports and A/B
+analyses read only the rows in their range instead of parsing every report
+and A/B test file.
+"""
+
+import atexit
+import json
+import logging
+import sqlite3
+import threading
+import weakref
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .models import TestResult
+
+SCHEMA_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS test_results (
+    id INTEGER PRIMARY KEY,
+    source_type TEXT NOT NULL,
+    source_id TEXT NOT NULL,
+    arm TEXT NOT NULL DEFAULT '',
+    test_id TEXT NOT NULL,
+    prompt_id TEXT NOT NULL,
+    prompt_version TEXT NOT NULL,
+    scenario_id TEXT NOT NULL,
+    success INTEGER NOT NULL,
+    score REAL NOT NULL,
+    execution_time REAL NOT NULL,
+    timestamp REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_results_source_arm ON test_results (source_id, source_type, arm);
+CREATE INDEX IF NOT EXISTS idx_results_time ON test_results (timestamp);
+CREATE INDEX IF NOT EXISTS idx_results_prompt_time ON test_results (prompt_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_results_version_time ON test_results (prompt_version, timestamp);
+CREATE INDEX IF NOT EXISTS idx_results_scenario_time ON test_results (scenario_id, timestamp);
+CREATE TABLE IF NOT EXISTS store_metadata (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+_INSERT = (
+    "INSERT INTO test_results "
+    "(source_type, source_id, arm, test_id, prompt_id, prompt_version, scenario_id, success, score, "
+    "execution_time, timestamp, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+_open_stores: "weakref.WeakSet[ResultStore]" = weakref.WeakSet()
+
+
+@atexit.register
+def _close_stores_at_exit():
+    """Close open result stores on interpreter shutdown."""
+    for store in list(_open_stores):
+        store.close()
+
+
+def result_to_dict(result: TestResult) -> Dict[str, Any]:
+    """Serialize a test result with an ISO timestamp (the on-disk JSON format)."""
+    return {**asdict(result), 'timestamp': result.timestamp.isoformat()}
+
+
+def result_from_dict(data: Dict[str, Any]) -> TestResult:
+    """Rebuild a test result from its serialized form."""
+    data = dict(data)
+    if isinstance(data['timestamp'], str):
+        data['timestamp'] = datetime.fromisoformat(data['timestamp'])
+    return TestResult(**data)
+
+
+class ResultStore:
+    """
+    SQLite-backed index of test results.
+    
+    Rows are grouped by their source (a validation report, or one arm of an
+    A/B test) so re-saving a report replaces its rows instead of duplicating
+    them. Both arms of an A/B test may test the same prompt, so the arm, not
+    the prompt, tells them apart.
+    """
+    
+    def __init__(self, db_path: Path):
+        self.logger = logging.getLogger(__name__)
+        self.db_path = Path(db_path)
+        self._lock = threading.RLock()
+        
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn: Optional[sqlite3.Connection] = sqlite3.connect(
+            str(self.db_path), check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._migrate()
+        self._conn.executescript(_SCHEMA)
+        self.set_metadata("schema_version", str(SCHEMA_VERSION))
+        _open_stores.add(self)
+    
+    def _migrate(self) -> None:
+        """Upgrade a version 1 table, whose A/B rows were keyed by prompt instead of arm."""
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(test_results)")]
+        if not columns or "arm" in columns:
+            return
+        self._conn.executescript("""
+            BEGIN;
+            ALTER TABLE test_results ADD COLUMN arm TEXT NOT NULL DEFAULT '';
+            DROP INDEX IF EXISTS idx_results_source;
+            DELETE FROM test_results WHERE source_type = 'ab_test';
+            DELETE FROM store_metadata WHERE key = 'files_indexed_at';
+            COMMIT;
+        """)
+        self.logger.info("Upgraded result store schema; A/B test results will be re-indexed")
+    
+    def add_results(self, source_type: str, source_id: str, prompt_id: str,
+                    results: Iterable[TestResult], arm: str = '') -> int:
+        """
+        Index the results of one report or one arm of an A/B test.
+        
+        Args:
+            source_type: 'report' or 'ab_test'
+            source_id: Report or A/B test ID
+            prompt_id: Prompt the results belong to
+            results: Test results to index
+            arm: A/B test arm ('a' or 'b'); empty for reports
+        
+        Returns:
+            Number of rows written
+        """
+        rows = [
+            (source_type, source_id, arm, result.test_id, prompt_id, result.prompt_version, result.scenario_id,
+             int(result.success), float(result.score), float(result.execution_time),
+             result.timestamp.timestamp(), json.dumps(result_to_dict(result), default=str))
+            for result in results
+        ]
+        self._write((source_type, source_id, arm), rows)
+        return len(rows)
+    
+    def _write(self, source: Tuple[str, str, str], rows: List[Tuple]) -> None:
+        with self._lock:
+            try:
+                self._conn.execute("BEGIN")
+                self._conn.execute(
+                    "DELETE FROM test_results WHERE source_type = ? AND source_id = ? AND arm = ?", source
+                )
+                self._conn.executemany(_INSERT, rows)
+                self._conn.execute("COMMIT")
+            except sqlite3.Error:
+                self._conn.execute("ROLLBACK")
+                raise
+    
+    def query(self,
+              since: Optional[datetime] = None,
+              until: Optional[datetime] = None,
+              prompt_id: Optional[str] = None,
+              prompt_version: Optional[str] = None,
+              scenario_id: Optional[str] = None,
+              limit: Optional[int] = None) -> List[TestResult]:
+        """
+        Return indexed test results matching the filters, oldest first.
+        
+        Args:
+            since: Only results at or after this time
+            until: Only results before this time
+            prompt_id: Filter by prompt ID
+            prompt_version: Filter by the result's prompt version
+            scenario_id: Filter by scenario
+            limit: Maximum number of results
+        
+        Returns:
+            List of test results
+        """
+        clauses, params = [], []
+        for column, value in (("prompt_id", prompt_id), ("prompt_version", prompt_version),
+                              ("scenario_id", scenario_id)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(since.timestamp())
+        if until is not None:
+            clauses.append("timestamp < ?")
+            params.append(until.timestamp())
+        
+        sql = "SELECT data FROM test_results"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY timestamp"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        
+        results = []
+        for (data,) in rows:
+            try:
+                results.append(result_from_dict(json.loads(data)))
+            except (ValueError, TypeError, KeyError) as e:
+                self.logger.error(f"Skipping unreadable test result row: {e}")
+        return results
+    
+    def count(self) -> int:
+        """Total number of indexed results."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM test_results").fetchone()[0]
+    
+    def delete_older_than(self, cutoff: datetime) -> int:
+        """Delete results older than ``cutoff``; returns the number removed."""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM test_results WHERE timestamp < ?", (cutoff.timestamp(),))
+            return cursor.rowcount
+    
+    def get_metadata(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM store_metadata WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+    
+    def set_metadata(self, key: str, value: str) -> None:
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO store_metadata (key, value) VALUES (?, ?)", (key, value))
+    
+    def close(self) -> None:
+        """Close the connection."""
+        with self._lock:
+            if self._conn is None:
+                return
+            self._conn.close()
+            self._conn = None
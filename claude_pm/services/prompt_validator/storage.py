@@ -3,6 +3,10 @@ Storage operations for prompt validation framework.
 
 This module handles all persistence operations including saving and loading
 test scenarios, results, reports, and analytics data.
+
+Reports and A/B tests are kept as JSON files; their individual test results
+are also indexed in a SQLite result store (see result_store.py) so analytics
+queries by time range, prompt or scenario read only the matching rows.
 """
 
 import json
@@ -16,6 +20,7 @@ from .models import (
     TestScenario, TestResult, ABTestResult, 
     ValidationReport
 )
+from .result_store import ResultStore, result_from_dict, result_to_dict
 
 
 class StorageManager:
@@ -34,6 +39,43 @@ class StorageManager:
         # Create directories
         for path in [self.scenarios_path, self.results_path, self.reports_path, self.ab_tests_path]:
             path.mkdir(parents=True, exist_ok=True)
+        
+        # Indexed test results
+        self.result_store = ResultStore(self.base_path / 'results.db')
+        self._index_existing_files()
+    
+    def _index_existing_files(self) -> None:
+        """Index results from report and A/B test files written before the result store existed."""
+        if self.result_store.get_metadata('files_indexed_at'):
+            return
+        
+        indexed = 0
+        for report_file in self.reports_path.glob("*.json"):
+            try:
+                with open(report_file, 'r') as f:
+                    data = json.load(f)
+                indexed += self.result_store.add_results(
+                    'report', data['report_id'], data['prompt_id'],
+                    [result_from_dict(r) for r in data['test_results']]
+                )
+            except Exception as e:
+                self.logger.error(f"Error indexing report {report_file}: {e}")
+        
+        for ab_file in self.ab_tests_path.glob("*.json"):
+            try:
+                with open(ab_file, 'r') as f:
+                    data = json.load(f)
+                for arm in ('a', 'b'):
+                    indexed += self.result_store.add_results(
+                        'ab_test', data['test_id'], data[f'prompt_{arm}_id'],
+                        [result_from_dict(r) for r in data[f'prompt_{arm}_results']], arm=arm
+                    )
+            except Exception as e:
+                self.logger.error(f"Error indexing A/B test {ab_file}: {e}")
+        
+        self.result_store.set_metadata('files_indexed_at', datetime.now().isoformat())
+        if indexed:
+            self.logger.info(f"Indexed {indexed} existing test results")
     
     # Scenario storage
     async def save_scenario(self, scenario: TestScenario):
@@ -79,14 +121,9 @@ class StorageManager:
                 report_dict = asdict(report)
                 report_dict['timestamp'] = report.timestamp.isoformat()
                 # Convert test results
-                report_dict['test_results'] = [
-                    {
-                        **asdict(result),
-                        'timestamp': result.timestamp.isoformat()
-                    }
-                    for result in report.test_results
-                ]
+                report_dict['test_results'] = [result_to_dict(result) for result in report.test_results]
                 json.dump(report_dict, f, indent=2)
+            self.result_store.add_results('report', report.report_id, report.prompt_id, report.test_results)
             self.logger.debug(f"Saved validation report: {report.report_id}")
         except Exception as e:
             self.logger.error(f"Error saving validation report: {e}")
@@ -124,21 +161,13 @@ class StorageManager:
                 ab_dict = asdict(ab_result)
                 ab_dict['timestamp'] = ab_result.timestamp.isoformat()
                 # Convert test results
-                ab_dict['prompt_a_results'] = [
-                    {
-                        **asdict(result),
-                        'timestamp': result.timestamp.isoformat()
-                    }
-                    for result in ab_result.prompt_a_results
-                ]
-                ab_dict['prompt_b_results'] = [
-                    {
-                        **asdict(result),
-                        'timestamp': result.timestamp.isoformat()
-                    }
-                    for result in ab_result.prompt_b_results
-                ]
+                ab_dict['prompt_a_results'] = [result_to_dict(result) for result in ab_result.prompt_a_results]
+                ab_dict['prompt_b_results'] = [result_to_dict(result) for result in ab_result.prompt_b_results]
                 json.dump(ab_dict, f, indent=2)
+            self.result_store.add_results('ab_test', ab_result.test_id, ab_result.prompt_a_id,
+                                          ab_result.prompt_a_results, arm='a')
+            self.result_store.add_results('ab_test', ab_result.test_id, ab_result.prompt_b_id,
+                                          ab_result.prompt_b_results, arm='b')
             self.logger.debug(f"Saved A/B test result: {ab_result.test_id}")
         except Exception as e:
             self.logger.error(f"Error saving A/B test result: {e}")
@@ -179,47 +208,36 @@ class StorageManager:
             self.logger.error(f"Error saving benchmark results: {e}")
     
     # Analytics data loading
-    async def load_test_results_since(self, since_date: datetime) -> List[TestResult]:
-        """Load test results since given date"""
-        results = []
+    async def load_test_results_since(self,
+                                      since_date: datetime,
+                                      until_date: Optional[datetime] = None,
+                                      prompt_id: Optional[str] = None,
+                                      prompt_version: Optional[str] = None,
+                                      scenario_id: Optional[str] = None) -> List[TestResult]:
+        """
+        Load test results since given date, oldest first.
         
-        try:
-            # Load from validation reports
-            for report_file in self.reports_path.glob("*.json"):
-                try:
-                    with open(report_file, 'r') as f:
-                        report_data = json.load(f)
-                    
-                    report_timestamp = datetime.fromisoformat(report_data['timestamp'])
-                    if report_timestamp >= since_date:
-                        for result_data in report_data['test_results']:
-                            result_data['timestamp'] = datetime.fromisoformat(result_data['timestamp'])
-                            results.append(TestResult(**result_data))
-                            
-                except Exception as e:
-                    self.logger.error(f"Error loading report {report_file}: {e}")
-                    continue
-            
-            # Load from A/B test results
-            for ab_file in self.ab_tests_path.glob("*.json"):
-                try:
-                    with open(ab_file, 'r') as f:
-                        ab_data = json.load(f)
-                    
-                    ab_timestamp = datetime.fromisoformat(ab_data['timestamp'])
-                    if ab_timestamp >= since_date:
-                        for result_data in ab_data['prompt_a_results'] + ab_data['prompt_b_results']:
-                            result_data['timestamp'] = datetime.fromisoformat(result_data['timestamp'])
-                            results.append(TestResult(**result_data))
-                            
-                except Exception as e:
-                    self.logger.error(f"Error loading A/B test {ab_file}: {e}")
-                    continue
+        Served from the result index, so only rows in the requested range
+        (and for the requested prompt/scenario) are read.
+        
+        Args:
+            since_date: Only results at or after this time
+            until_date: Only results before this time (optional)
+            prompt_id: Only results for this prompt (optional)
+            prompt_version: Only results with this prompt version (optional)
+            scenario_id: Only results for this scenario (optional)
             
+        Returns:
+            Matching test results
+        """
+        try:
+            return self.result_store.query(
+                since=since_date, until=until_date, prompt_id=prompt_id,
+                prompt_version=prompt_version, scenario_id=scenario_id
+            )
         except Exception as e:
             self.logger.error(f"Error loading test results since {since_date}: {e}")
-        
-        return results
+            return []
     
     # Cleanup operations
     async def cleanup_old_data(self, days_to_keep: int = 90):
@@ -234,6 +252,10 @@ class StorageManager:
                         file_path.unlink()
                         self.logger.info(f"Deleted old file: {file_path}")
             
+            removed = self.result_store.delete_older_than(datetime.fromtimestamp(cutoff_date))
+            if removed:
+                self.logger.info(f"Deleted {removed} old indexed test results")
+            
         except Exception as e:
             self.logger.error(f"Error cleaning up old data: {e}")
     
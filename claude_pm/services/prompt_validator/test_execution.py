@@ -31,13 +31,13 @@ class TestExecutor:
                        test_id: str) -> TestResult:
         """Run a single test (synchronous)"""
         try:
-            start_time = time.time()
+            start_time = time.perf_counter()
             
             # This would integrate with actual agent execution system
             # For now, simulate test execution
             success, score, outputs, metrics = self._simulate_test_execution(prompt_content, scenario)
             
-            execution_time = time.time() - start_time
+            execution_time = time.perf_counter() - start_time
             
             return TestResult(
                 test_id=test_id,
@@ -72,13 +72,13 @@ class TestExecutor:
                                    test_id: str) -> TestResult:
         """Run a single test (asynchronous)"""
         try:
-            start_time = time.time()
+            start_time = time.perf_counter()
             
             # Simulate async test execution
             await asyncio.sleep(0.1)  # Simulate some async work
             success, score, outputs, metrics = self._simulate_test_execution(prompt_content, scenario)
             
-            execution_time = time.time() - start_time
+            execution_time = time.perf_counter() - start_time
             
             return TestResult(
                 test_id=test_id,
@@ -6,8 +6,10 @@ the prompt validation system.
 """
 
 import hashlib
+import math
+import statistics
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 
 from .models import TestResult
 
@@ -100,4 +102,148 @@ def format_metrics_summary(metrics: Dict[str, Any]) -> str:
         else:
             parts.append(f"{key.replace('_', ' ').title()}: {value}")
     
-    return " | ".join(parts)
\ No newline at end of file
+    return " | ".join(parts)
+
+
+def t_critical_value(confidence_level: float, degrees_of_freedom: int) -> float:
+    """
+    Two-sided Student's t critical value.
+    
+    Closed form for 1 and 2 degrees of freedom. Otherwise a Cornish-Fisher
+    expansion around the normal quantile is refined by Newton's method on
+    the exact two-sided p-value (t_test_p_value) to about 1e-10 relative,
+    which the expansion alone misses at high confidence and low df (over
+    4% at 99.9% with 3 df).
+    """
+    if not 0.0 < confidence_level < 1.0:
+        raise ValueError(f"confidence_level must be in (0, 1): {confidence_level!r}")
+    if degrees_of_freedom < 1:
+        raise ValueError(f"degrees_of_freedom must be >= 1: {degrees_of_freedom!r}")
+    
+    p = 0.5 + confidence_level / 2
+    df = degrees_of_freedom
+    if df == 1:
+        return math.tan(math.pi * (p - 0.5))
+    if df == 2:
+        return (2 * p - 1) / math.sqrt(2 * p * (1 - p))
+    
+    z = statistics.NormalDist().inv_cdf(p)
+    g1 = (z ** 3 + z) / 4
+    g2 = (5 * z ** 5 + 16 * z ** 3 + 3 * z) / 96
+    g3 = (3 * z ** 7 + 19 * z ** 5 + 17 * z ** 3 - 15 * z) / 384
+    g4 = (79 * z ** 9 + 776 * z ** 7 + 1482 * z ** 5 - 1920 * z ** 3 - 945 * z) / 92160
+    t = z + g1 / df + g2 / df ** 2 + g3 / df ** 3 + g4 / df ** 4
+    
+    alpha = 1.0 - confidence_level
+    log_density_scale = math.lgamma((df + 1) / 2) - math.lgamma(df / 2) - 0.5 * math.log(df * math.pi)
+    for _ in range(50):
+        density = math.exp(log_density_scale - (df + 1) / 2 * math.log1p(t * t / df))
+        # The two-sided p-value falls at twice the density as t grows
+        step = (t_test_p_value(t, df) - alpha) / (2 * density)
+        t = t + step if t + step > 0 else t / 2
+        if abs(step) <= 1e-12 * t:
+            break
+    return t
+
+
+def mean_confidence_interval(values: Sequence[float],
+                             confidence_level: float = 0.95) -> Optional[Dict[str, float]]:
+    """
+    Student's t confidence interval for the mean of a sample.
+    
+    Returns:
+        Dict with mean, lower, upper, margin (half-width) and relative_margin
+        (half-width / mean), or None for fewer than two values
+    """
+    if len(values) < 2:
+        return None
+    
+    mean = statistics.mean(values)
+    margin = t_critical_value(confidence_level, len(values) - 1) * statistics.stdev(values) / math.sqrt(len(values))
+    return {
+        'mean': mean,
+        'lower': mean - margin,
+        'upper': mean + margin,
+        'margin': margin,
+        'relative_margin': margin / abs(mean) if mean else 0.0,
+        'confidence_level': confidence_level
+    }
+
+
+def _regularized_incomplete_beta(x: float, a: float, b: float) -> float:
+    """I_x(a, b), by Lentz's continued fraction"""
+    if x <= 0.0:
+        return 0.0
+    if x >= 1.0:
+        return 1.0
+    # The continued fraction converges quickly for x < (a + 1) / (a + b + 2)
+    if x > (a + 1) / (a + b + 2):
+        return 1.0 - _regularized_incomplete_beta(1.0 - x, b, a)
+    
+    log_front = math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b) + a * math.log(x) + b * math.log1p(-x)
+    tiny = 1e-300
+    c, d = 1.0, 1.0 - (a + b) * x / (a + 1)
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    fraction = d
+    for m in range(1, 300):
+        for numerator in (
+            m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m)),
+            -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1))
+        ):
+            d = 1.0 + numerator * d
+            d = 1.0 / (d if abs(d) > tiny else tiny)
+            c = 1.0 + numerator / c
+            c = c if abs(c) > tiny else tiny
+            fraction *= c * d
+        if abs(c * d - 1.0) < 1e-12:
+            break
+    return math.exp(log_front) * fraction / a
+
+
+def t_test_p_value(t_statistic: float, degrees_of_freedom: float) -> float:
+    """Two-sided p-value of a t statistic"""
+    if degrees_of_freedom <= 0:
+        return 1.0
+    if math.isinf(t_statistic):
+        return 0.0
+    x = degrees_of_freedom / (degrees_of_freedom + t_statistic ** 2)
+    return min(1.0, _regularized_incomplete_beta(x, degrees_of_freedom / 2, 0.5))
+
+
+def two_sample_t_test(sample_a: Sequence[float],
+                      sample_b: Sequence[float],
+                      equal_variance: bool = True) -> Tuple[float, float, float]:
+    """
+    Two-sided two-sample t-test of mean(b) - mean(a).
+    
+    Args:
+        sample_a: First sample
+        sample_b: Second sample
+        equal_variance: Pooled (Student) test if True, Welch's test otherwise
+        
+    Returns:
+        Tuple of (t statistic, degrees of freedom, p-value); (0.0, 0.0, 1.0)
+        when either sample has fewer than two values
+    """
+    n_a, n_b = len(sample_a), len(sample_b)
+    if n_a < 2 or n_b < 2:
+        return 0.0, 0.0, 1.0
+    
+    mean_a, mean_b = statistics.mean(sample_a), statistics.mean(sample_b)
+    var_a, var_b = statistics.variance(sample_a), statistics.variance(sample_b)
+    if equal_variance:
+        df = n_a + n_b - 2
+        pooled = ((n_a - 1) * var_a + (n_b - 1) * var_b) / df
+        standard_error = math.sqrt(pooled * (1 / n_a + 1 / n_b))
+    else:
+        se_a, se_b = var_a / n_a, var_b / n_b
+        standard_error = math.sqrt(se_a + se_b)
+        df = (se_a + se_b) ** 2 / (se_a ** 2 / (n_a - 1) + se_b ** 2 / (n_b - 1)) if standard_error else n_a + n_b - 2
+    
+    if standard_error == 0:
+        if mean_a == mean_b:
+            return 0.0, df, 1.0
+        return math.copysign(math.inf, mean_b - mean_a), df, 0.0
+    
+    t_statistic = (mean_b - mean_a) / standard_error
+    return t_statistic, df, t_test_p_value(t_statistic, df)
@@ -0,0 +1,577 @@
+"""
+Segmented Record Store
+======================
+
+Append-only JSONL segment storage for evaluation and integration records.
+Replaces the one-JSON-file-per-record layout, where every history query had
+to glob and parse the whole directory.
+
+Key Features:
+- Records appended to size-rotated segment files (``<prefix>-000001.jsonl``)
+- Sealed segments get a small ``.idx`` sidecar (time range, per-key counts)
+- In-memory per-segment index by key (e.g. agent type) and time
+- Queries read only segments whose key set and time range can match
+- Newest-first queries stop once no older segment can improve the result
+- Retention drops whole segments instead of individual files
+- One-time import of legacy ``*.json`` record files
+- Safe to share a directory: every store on the same directory and prefix
+  (in this or another process) serializes writes through one lock and
+  re-syncs with the files before reading or appending
+
+Usage:
+    from claude_pm.services.segment_store import SegmentedRecordStore
+    
+    store = SegmentedRecordStore(Path("~/.claude-pm/training/integration").expanduser(), "integration")
+    store.append({"agent_type": "engineer", "timestamp": datetime.now().isoformat(), ...})
+    recent = store.query(key="engineer", limit=50)
+"""
+
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SEGMENT_BYTES = 4 * 1024 * 1024
+
+
+class _DirectoryLock:
+    """
+    Write lock shared by every store on one directory and prefix.
+    
+    Threads in this process serialize on ``thread_lock``; other processes are
+    excluded by an ``flock`` on a lock file, taken once for the outermost
+    holder. Without ``fcntl`` (Windows) only in-process writers are excluded.
+    """
+    
+    def __init__(self, lock_file: Path):
+        self.lock_file = lock_file
+        self.thread_lock = threading.RLock()
+        self._depth = 0
+        self._handle = None
+    
+    @contextmanager
+    def exclusive(self) -> Iterator[None]:
+        with self.thread_lock:
+            if self._depth == 0 and fcntl is not None:
+                if self._handle is None:
+                    self._handle = open(self.lock_file, 'a')
+                fcntl.flock(self._handle.fileno(), fcntl.LOCK_EX)
+            self._depth += 1
+            try:
+                yield
+            finally:
+                self._depth -= 1
+                if self._depth == 0 and self._handle is not None:
+                    fcntl.flock(self._handle.fileno(), fcntl.LOCK_UN)
+
+
+_directory_locks: Dict[Path, _DirectoryLock] = {}
+_directory_locks_guard = threading.Lock()
+
+
+def _directory_lock(directory: Path, prefix: str) -> _DirectoryLock:
+    lock_file = directory.resolve() / f".{prefix}.lock"
+    with _directory_locks_guard:
+        if lock_file not in _directory_locks:
+            _directory_locks[lock_file] = _DirectoryLock(lock_file)
+        return _directory_locks[lock_file]
+
+
+def record_timestamp(record: Dict[str, Any], time_field: str = "timestamp") -> Optional[float]:
+    """Epoch seconds of a record's ISO timestamp field, if parseable."""
+    try:
+        return datetime.fromisoformat(record[time_field]).timestamp()
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+@dataclass
+class SegmentIndex:
+    """Summary of one segment file used to decide whether it must be read."""
+    path: Path
+    records: int = 0
+    size: int = 0
+    min_ts: float = float("inf")
+    max_ts: float = float("-inf")
+    key_counts: Dict[str, int] = field(default_factory=dict)
+    lookup_values: Set[str] = field(default_factory=set)
+    
+    def observe(self, record: Dict[str, Any], length: int, key_field: str,
+                time_field: str, lookup_field: Optional[str]) -> None:
+        """Account for a record of ``length`` bytes appended to the segment."""
+        self.records += 1
+        self.size += length
+        timestamp = record_timestamp(record, time_field)
+        if timestamp is not None:
+            self.min_ts = min(self.min_ts, timestamp)
+            self.max_ts = max(self.max_ts, timestamp)
+        key = record.get(key_field)
+        if key is not None:
+            self.key_counts[str(key)] = self.key_counts.get(str(key), 0) + 1
+        if lookup_field and record.get(lookup_field):
+            self.lookup_values.add(str(record[lookup_field]))
+    
+    def may_match(self, key: Optional[str], start_ts: float, end_ts: float) -> bool:
+        """Whether the segment can contain records for ``key`` within the time range."""
+        if self.records == 0:
+            return False
+        if key is not None and key not in self.key_counts:
+            return False
+        if self.min_ts > self.max_ts:
+            # No parseable timestamps; only unbounded queries can match
+            return start_ts == float("-inf") and end_ts == float("inf")
+        return self.max_ts >= start_ts and self.min_ts <= end_ts
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize for the ``.idx`` sidecar."""
+        return {
+            "records": self.records,
+            "size": self.size,
+            "min_ts": self.min_ts if self.records else None,
+            "max_ts": self.max_ts if self.records else None,
+            "key_counts": self.key_counts,
+            "lookup_values": sorted(self.lookup_values)
+        }
+    
+    @classmethod
+    def from_dict(cls, path: Path, data: Dict[str, Any]) -> 'SegmentIndex':
+        """Load from an ``.idx`` sidecar."""
+        min_ts, max_ts = data.get("min_ts"), data.get("max_ts")
+        return cls(
+            path=path,
+            records=data.get("records", 0),
+            size=data.get("size", 0),
+            min_ts=float("inf") if min_ts is None else min_ts,
+            max_ts=float("-inf") if max_ts is None else max_ts,
+            key_counts=dict(data.get("key_counts", {})),
+            lookup_values=set(data.get("lookup_values", []))
+        )
+
+
+class SegmentedRecordStore:
+    """
+    Append-only store of JSON records in size-rotated JSONL segments.
+    
+    Segments are numbered in write order; the highest-numbered one is the
+    active segment and the rest are sealed and immutable. Each sealed segment
+    has an ``.idx`` sidecar so opening the store never scans sealed data.
+    Records may carry timestamps slightly out of order (e.g. imported legacy
+    records); each segment's index keeps its own min/max, so queries stay exact.
+    
+    Several stores (including ones in other processes) may share a directory.
+    Appends, rotation and retention run under a shared directory lock, and
+    every operation first catches up with records, segments and deletions
+    made by the other stores. A partial final line left by a crashed writer
+    is never truncated; the next append terminates it and readers skip it.
+    """
+    
+    def __init__(
+        self,
+        directory: Path,
+        prefix: str,
+        key_field: str = "agent_type",
+        time_field: str = "timestamp",
+        lookup_field: Optional[str] = None,
+        max_segment_bytes: int = DEFAULT_SEGMENT_BYTES
+    ):
+        """
+        Open (and create if needed) a segmented store.
+        
+        Args:
+            directory: Directory holding the segment files
+            prefix: Segment file name prefix
+            key_field: Record field indexed per segment (queried with ``key=``)
+            time_field: Record field holding the ISO timestamp
+            lookup_field: Optional field whose values are kept for ``contains`` lookups
+            max_segment_bytes: Size at which the active segment is sealed
+        """
+        self.directory = Path(directory)
+        self.prefix = prefix
+        self.key_field = key_field
+        self.time_field = time_field
+        self.lookup_field = lookup_field
+        self.max_segment_bytes = max_segment_bytes
+        self._segments: List[SegmentIndex] = []
+        self._active_handle = None
+        self._directory_mtime = None
+        
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._directory_lock = _directory_lock(self.directory, prefix)
+        self._lock = self._directory_lock.thread_lock
+        with self._directory_lock.exclusive():
+            self._load_segments()
+    
+    # Segment bookkeeping
+    
+    def _segment_path(self, number: int) -> Path:
+        return self.directory / f"{self.prefix}-{number:06d}.jsonl"
+    
+    @staticmethod
+    def _index_path(segment: Path) -> Path:
+        return segment.with_suffix(".idx")
+    
+    def _segment_number(self, segment: Path) -> int:
+        return int(segment.stem[len(self.prefix) + 1:])
+    
+    def _segment_paths(self) -> List[Path]:
+        return sorted(
+            (p for p in self.directory.glob(f"{self.prefix}-*.jsonl")
+             if p.stem[len(self.prefix) + 1:].isdigit()),
+            key=self._segment_number
+        )
+    
+    def _load_segments(self) -> None:
+        """Build the segment list on open (called under the directory lock)."""
+        self._directory_mtime = self._stat_directory()
+        paths = self._segment_paths()
+        for position, path in enumerate(paths):
+            is_active = position == len(paths) - 1
+            index = None if is_active else self._read_sidecar(path)
+            if index is None:
+                index = self._scan_segment(SegmentIndex(path=path))
+                if not is_active:
+                    self._write_sidecar(index)
+            self._segments.append(index)
+    
+    def _stat_directory(self) -> Optional[int]:
+        try:
+            return self.directory.stat().st_mtime_ns
+        except OSError:
+            return None
+    
+    def _refresh(self) -> None:
+        """
+        Catch up with writes made through other stores on the same directory.
+        
+        Segments created or deleted elsewhere are picked up (a directory
+        listing is only taken when the directory changed), then the tail of
+        the newest known segment is indexed. Called with ``self._lock`` held.
+        """
+        directory_mtime = self._stat_directory()
+        if directory_mtime != self._directory_mtime:
+            self._directory_mtime = directory_mtime
+            self._adopt_segments(self._segment_paths())
+        else:
+            # Catches rotations within the directory's mtime granularity
+            new_paths = []
+            number = self._segment_number(self._segments[-1].path) + 1 if self._segments else 1
+            while self._segment_path(number).exists():
+                new_paths.append(self._segment_path(number))
+                number += 1
+            if new_paths:
+                self._adopt_segments([s.path for s in self._segments] + new_paths)
+        if self._segments:
+            self._scan_segment(self._segments[-1])
+    
+    def _adopt_segments(self, paths: List[Path]) -> None:
+        known = {segment.path: segment for segment in self._segments}
+        last_known = self._segments[-1].path if self._segments else None
+        segments = []
+        for position, path in enumerate(paths):
+            index = known.get(path)
+            if index is None:
+                is_active = position == len(paths) - 1
+                index = (None if is_active else self._read_sidecar(path)) or SegmentIndex(path=path)
+            if path == last_known and position < len(paths) - 1:
+                # Sealed by another store since we last looked
+                self._scan_segment(index)
+            elif index.size == 0 and index.records == 0:
+                self._scan_segment(index)
+            segments.append(index)
+        if self._active_handle is not None and (not segments or segments[-1].path != last_known):
+            self._active_handle.close()
+            self._active_handle = None
+        self._segments = segments
+    
+    def _read_sidecar(self, segment: Path) -> Optional[SegmentIndex]:
+        index_file = self._index_path(segment)
+        try:
+            with open(index_file, 'r') as f:
+                index = SegmentIndex.from_dict(segment, json.load(f))
+        except (OSError, ValueError):
+            return None
+        if index.size != segment.stat().st_size:
+            # Stale sidecar (segment changed after sealing); rebuild it
+            return None
+        return index
+    
+    def _write_sidecar(self, index: SegmentIndex) -> None:
+        index_file = self._index_path(index.path)
+        temp_file = index_file.with_suffix(".idx.tmp")
+        try:
+            with open(temp_file, 'w') as f:
+                json.dump(index.to_dict(), f)
+            temp_file.replace(index_file)
+        except OSError as e:
+            logger.error(f"Failed to write segment index {index_file}: {e}")
+    
+    def _scan_segment(self, index: SegmentIndex) -> SegmentIndex:
+        """Index the complete lines past ``index.size`` (the whole file for a new index)."""
+        try:
+            if index.path.stat().st_size <= index.size:
+                return index
+            with open(index.path, 'rb') as f:
+                f.seek(index.size)
+                for raw in f:
+                    if not raw.endswith(b"\n"):
+                        # In-progress or torn final write; left for a later scan
+                        break
+                    try:
+                        record = json.loads(raw)
+                    except (json.JSONDecodeError, UnicodeDecodeError):
+                        index.size += len(raw)
+                        continue
+                    index.observe(record, len(raw), self.key_field, self.time_field, self.lookup_field)
+        except OSError as e:
+            logger.error(f"Failed to scan segment {index.path}: {e}")
+        return index
+    
+    def _active(self) -> SegmentIndex:
+        if not self._segments or self._segments[-1].size >= self.max_segment_bytes:
+            self._seal_active()
+            number = self._segment_number(self._segments[-1].path) + 1 if self._segments else 1
+            self._segments.append(SegmentIndex(path=self._segment_path(number)))
+        return self._segments[-1]
+    
+    def _seal_active(self) -> None:
+        if self._active_handle is not None:
+            self._active_handle.close()
+            self._active_handle = None
+        if self._segments and self._segments[-1].records:
+            self._write_sidecar(self._segments[-1])
+    
+    # Writes
+    
+    def append(self, record: Dict[str, Any]) -> None:
+        """Append one record to the active segment."""
+        self.append_many([record])
+    
+    def append_many(self, records: Iterable[Dict[str, Any]]) -> int:
+        """Append records with a single flush per segment.
+        
+        Returns:
+            Number of records written
+        """
+        written = 0
+        checked = None
+        with self._directory_lock.exclusive():
+            self._refresh()
+            for record in records:
+                line = (json.dumps(record, default=str) + "\n").encode("utf-8")
+                segment = self._active()
+                if self._active_handle is None:
+                    self._active_handle = open(segment.path, 'ab')
+                if checked is not segment:
+                    checked = segment
+                    torn = os.fstat(self._active_handle.fileno()).st_size - segment.size
+                    if torn > 0:
+                        # Partial line from a crashed writer; end it so readers skip it
+                        self._active_handle.write(b"\n")
+                        segment.size += torn + 1
+                self._active_handle.write(line)
+                segment.observe(record, len(line), self.key_field, self.time_field, self.lookup_field)
+                written += 1
+                if segment.size >= self.max_segment_bytes:
+                    self._active_handle.flush()
+            if self._active_handle is not None:
+                self._active_handle.flush()
+        return written
+    
+    # Reads
+    
+    def _read_segment(self, index: SegmentIndex) -> List[Dict[str, Any]]:
+        records = []
+        try:
+            with open(index.path, 'rb') as f:
+                data = f.read(index.size)
+        except OSError as e:
+            logger.error(f"Failed to read segment {index.path}: {e}")
+            return records
+        for raw in data.splitlines():
+            try:
+                records.append(json.loads(raw))
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                continue
+        return records
+    
+    def query(
+        self,
+        key: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        predicate: Optional[Callable[[Dict[str, Any]], bool]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Return matching records, newest first.
+        
+        Args:
+            key: Only records whose ``key_field`` equals this value
+            since: Inclusive lower time bound
+            until: Inclusive upper time bound
+            limit: Maximum number of records to return
+            predicate: Extra record filter
+        
+        Returns:
+            Matching records ordered by timestamp, newest first
+        """
+        start_ts = since.timestamp() if since else float("-inf")
+        end_ts = until.timestamp() if until else float("inf")
+        
+        with self._lock:
+            if self._active_handle is not None:
+                self._active_handle.flush()
+            self._refresh()
+            candidates = [s for s in self._segments if s.may_match(key, start_ts, end_ts)]
+        
+        matches = []
+        # Newest segments first; once ``limit`` matches are held, an older
+        # segment can only contribute if its newest record beats the oldest kept
+        candidates.sort(key=lambda s: s.max_ts, reverse=True)
+        for index in candidates:
+            if limit and len(matches) >= limit and index.max_ts < matches[limit - 1][0]:
+                break
+            for record in self._read_segment(index):
+                if key is not None and str(record.get(self.key_field)) != key:
+                    continue
+                timestamp = record_timestamp(record, self.time_field)
+                if timestamp is None:
+                    if since or until:
+                        continue
+                    timestamp = float("-inf")
+                elif not start_ts <= timestamp <= end_ts:
+                    continue
+                if predicate and not predicate(record):
+                    continue
+                matches.append((timestamp, record))
+            matches.sort(key=lambda item: item[0], reverse=True)
+            if limit:
+                del matches[limit:]
+        return [record for _, record in matches]
+    
+    def contains(self, value: str) -> bool:
+        """Whether any record has ``lookup_field`` equal to ``value`` (answered from the index)."""
+        with self._lock:
+            self._refresh()
+            return any(value in segment.lookup_values for segment in self._segments)
+    
+    def count(self, key: Optional[str] = None) -> int:
+        """Number of stored records (optionally for one key), from the index."""
+        with self._lock:
+            self._refresh()
+            if key is None:
+                return sum(segment.records for segment in self._segments)
+            return sum(segment.key_counts.get(key, 0) for segment in self._segments)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Segment and record counts."""
+        with self._lock:
+            self._refresh()
+            key_counts: Dict[str, int] = {}
+            for segment in self._segments:
+                for key, count in segment.key_counts.items():
+                    key_counts[key] = key_counts.get(key, 0) + count
+            return {
+                "segments": len(self._segments),
+                "records": sum(segment.records for segment in self._segments),
+                "total_bytes": sum(segment.size for segment in self._segments),
+                "records_by_key": key_counts
+            }
+    
+    # Maintenance
+    
+    def drop_before(self, cutoff: datetime) -> Dict[str, Any]:
+        """
+        Delete sealed segments whose newest record is older than ``cutoff``.
+        
+        Retention is segment-granular: a segment is kept while any of its
+        records is still within the retention window.
+        
+        Returns:
+            Summary with ``removed_segments``, ``removed_records`` and ``bytes_removed``
+        """
+        cutoff_ts = cutoff.timestamp()
+        removed_segments = removed_records = bytes_removed = 0
+        with self._directory_lock.exclusive():
+            self._refresh()
+            kept = []
+            for position, segment in enumerate(self._segments):
+                is_active = position == len(self._segments) - 1
+                if not is_active and segment.records and segment.max_ts < cutoff_ts:
+                    try:
+                        segment.path.unlink()
+                        self._index_path(segment.path).unlink(missing_ok=True)
+                    except OSError as e:
+                        logger.error(f"Failed to remove segment {segment.path}: {e}")
+                        kept.append(segment)
+                        continue
+                    removed_segments += 1
+                    removed_records += segment.records
+                    bytes_removed += segment.size
+                else:
+                    kept.append(segment)
+            self._segments = kept
+            self._directory_mtime = self._stat_directory()
+        return {
+            "removed_segments": removed_segments,
+            "removed_records": removed_records,
+            "bytes_removed": bytes_removed
+        }
+    
+    def import_legacy_files(self, pattern: str, transform: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """
+        One-time import of legacy one-record-per-file JSON files.
+        
+        Imported files are left in place; a marker file records that the import
+        ran so later opens skip the directory scan.
+        
+        Args:
+            pattern: Glob pattern (relative to the store directory) of legacy files
+            transform: Optional conversion applied to each loaded record
+        
+        Returns:
+            Import summary
+        """
+        marker = self.directory / f".{self.prefix}.imported"
+        if marker.exists():
+            return {"imported": 0, "failed": 0, "skipped": True}
+        
+        with self._directory_lock.exclusive():
+            if marker.exists():
+                # Another store imported while we waited for the lock
+                return {"imported": 0, "failed": 0, "skipped": True}
+            records, failed = [], 0
+            for legacy_file in self.directory.glob(pattern):
+                try:
+                    with open(legacy_file, 'r') as f:
+                        record = json.load(f)
+                    records.append(transform(record) if transform else record)
+                except Exception as e:
+                    logger.error(f"Failed to import {legacy_file}: {e}")
+                    failed += 1
+            
+            records.sort(key=lambda r: record_timestamp(r, self.time_field) or 0.0)
+            imported = self.append_many(records)
+            marker.write_text(datetime.now().isoformat())
+        if imported:
+            logger.info(f"Imported {imported} legacy records into {self.prefix} segments ({failed} failed)")
+        return {"imported": imported, "failed": failed, "skipped": False}
+    
+    def close(self) -> None:
+        """Close the active segment handle."""
+        with self._lock:
+            if self._active_handle is not None:
+                self._active_handle.close()
+                self._active_handle = None
@@ -0,0 +1,339 @@
+"""
+Series Analytics Kernel
+=======================
+
+Vectorized trend and anomaly statistics for many metric series at once,
+shared by the pattern analyzer and the evaluation metrics system.
+
+Key Features:
+- Least-squares trends (slope, R-squared) for a batch of ragged series
+- Z-scores of a batch of values, and trailing rolling z-scores per series
+- EWMA baselines (mean and spread) for a batch of series
+- StreamingAnomalyDetector: O(1) per-point EWMA anomaly checks per key
+- Uses numpy when installed; falls back to pure Python with identical results
+
+Usage:
+    from claude_pm.services.series_analytics import linear_trends, StreamingAnomalyDetector
+    
+    slopes_and_r2 = linear_trends([[1, 2, 4], [5, 5, 4, 3]])
+    
+    detector = StreamingAnomalyDetector(alpha=0.1, threshold=3.0)
+    zscore = detector.update("engineer_response_time", 182.0)
+"""
+
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+Series = Sequence[float]
+
+
+def _padded(series_list: Sequence[Series], align_right: bool = False) -> Tuple["np.ndarray", "np.ndarray"]:
+    """Stack ragged series into a (series, max_length) matrix plus a validity mask."""
+    lengths = np.fromiter((len(s) for s in series_list), dtype=np.int64, count=len(series_list))
+    width = int(lengths.max()) if len(lengths) else 0
+    values = np.zeros((len(series_list), width))
+    for row, series in enumerate(series_list):
+        n = len(series)
+        if n:
+            if align_right:
+                values[row, width - n:] = series
+            else:
+                values[row, :n] = series
+    columns = np.arange(width)
+    if align_right:
+        mask = columns[None, :] >= (width - lengths)[:, None]
+    else:
+        mask = columns[None, :] < lengths[:, None]
+    return values, mask
+
+
+def linear_trends(series_list: Sequence[Series],
+                  x_list: Optional[Sequence[Series]] = None) -> List[Tuple[float, float]]:
+    """
+    Least-squares slope and R-squared of each series.
+    
+    Args:
+        series_list: Y values per series (may differ in length)
+        x_list: X values per series; defaults to 0, 1, 2, ...
+    
+    Returns:
+        (slope, r_squared) per series; (0.0, 0.0) for series with fewer than
+        two points or constant x, R-squared 1.0 for constant y
+    """
+    if not series_list:
+        return []
+    if not HAS_NUMPY:
+        return [_linear_trend(y, x_list[i] if x_list is not None else range(len(y)))
+                for i, y in enumerate(series_list)]
+    
+    y, mask = _padded(series_list)
+    if x_list is None:
+        x = np.broadcast_to(np.arange(y.shape[1], dtype=float), y.shape)
+    else:
+        x, _ = _padded(x_list)
+    n = mask.sum(axis=1)
+    safe_n = np.maximum(n, 1)
+    x_mean = (x * mask).sum(axis=1) / safe_n
+    y_mean = (y * mask).sum(axis=1) / safe_n
+    dx = (x - x_mean[:, None]) * mask
+    dy = (y - y_mean[:, None]) * mask
+    sxx = (dx * dx).sum(axis=1)
+    sxy = (dx * dy).sum(axis=1)
+    syy = (dy * dy).sum(axis=1)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = np.where(sxx > 0, sxy / sxx, 0.0)
+        r_squared = np.where(syy > 0, 1.0 - (syy - slope * sxy) / syy, 1.0)
+    degenerate = (n < 2) | (sxx == 0)
+    slope[degenerate] = 0.0
+    r_squared[degenerate] = 0.0
+    return list(zip(slope.tolist(), np.clip(r_squared, 0.0, None).tolist()))
+
+
+def _linear_trend(y: Series, x: Series) -> Tuple[float, float]:
+    n = len(y)
+    if n < 2:
+        return 0.0, 0.0
+    x = list(x)
+    x_mean = sum(x) / n
+    y_mean = sum(y) / n
+    sxx = sum((xi - x_mean) ** 2 for xi in x)
+    if sxx == 0:
+        return 0.0, 0.0
+    sxy = sum((xi - x_mean) * (yi - y_mean) for xi, yi in zip(x, y))
+    syy = sum((yi - y_mean) ** 2 for yi in y)
+    slope = sxy / sxx
+    r_squared = 1.0 - (syy - slope * sxy) / syy if syy > 0 else 1.0
+    return slope, max(0.0, r_squared)
+
+
+def zscores(values: Sequence[Sequence[float]]) -> List[List[float]]:
+    """
+    Column-wise z-scores (sample standard deviation) of a rows x features table.
+    
+    A feature with zero spread, or a table with fewer than two rows, scores 0.
+    """
+    if len(values) < 2:
+        return [[0.0] * len(row) for row in values]
+    if not HAS_NUMPY:
+        columns = list(zip(*values))
+        stats = []
+        for column in columns:
+            mean = sum(column) / len(column)
+            std = math.sqrt(sum((v - mean) ** 2 for v in column) / (len(column) - 1))
+            stats.append((mean, std))
+        return [[(v - mean) / std if std else 0.0 for v, (mean, std) in zip(row, stats)] for row in values]
+    
+    table = np.asarray(values, dtype=float)
+    std = table.std(axis=0, ddof=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scores = np.where(std > 0, (table - table.mean(axis=0)) / std, 0.0)
+    return scores.tolist()
+
+
+def rolling_zscores(series_list: Sequence[Series], window: int = 20) -> List[List[Optional[float]]]:
+    """
+    Z-score of every point against the ``window`` points before it.
+    
+    Points with fewer than two predecessors, or a flat trailing window,
+    score None.
+    """
+    if not series_list:
+        return []
+    if not HAS_NUMPY:
+        return [_rolling_zscores(series, window) for series in series_list]
+    
+    values, mask = _padded(series_list)
+    # Shift each series by its first value, as the fallback does
+    values = (values - values[:, :1]) * mask
+    valid = mask.astype(float)
+    width = values.shape[1]
+    lags = range(1, min(window, width - 1) + 1)
+    
+    # Accumulate each point's trailing window lag by lag: O(window) array passes, and
+    # deviations are taken from the window's own mean (running sums of squares
+    # cancel catastrophically and leave flat windows with spurious spread)
+    n = np.zeros_like(values)
+    total = np.zeros_like(values)
+    for lag in lags:
+        n[:, lag:] += valid[:, :-lag]
+        total[:, lag:] += values[:, :-lag]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = total / n
+        squared = np.zeros_like(values)
+        for lag in lags:
+            deviation = values[:, :-lag] - mean[:, lag:]
+            squared[:, lag:] += deviation * deviation * valid[:, :-lag]
+        variance = squared / (n - 1)
+        scores = (values - mean) / np.sqrt(variance)
+    usable = mask & (n >= 2) & (variance > 1e-12)
+    
+    result = []
+    for row, series in enumerate(series_list):
+        length = len(series)
+        row_scores = scores[row, :length].tolist()
+        row_usable = usable[row, :length].tolist()
+        result.append([score if ok else None for score, ok in zip(row_scores, row_usable)])
+    return result
+
+
+def _rolling_zscores(series: Series, window: int) -> List[Optional[float]]:
+    scores = []
+    series = [value - series[0] for value in series]
+    for i, value in enumerate(series):
+        previous = series[max(0, i - window):i]
+        n = len(previous)
+        if n < 2:
+            scores.append(None)
+            continue
+        mean = sum(previous) / n
+        variance = sum((v - mean) ** 2 for v in previous) / (n - 1)
+        if variance <= 1e-12:
+            scores.append(None)
+        else:
+            scores.append((value - mean) / math.sqrt(variance))
+    return scores
+
+
+def latest_zscores(series_list: Sequence[Series], window: int = 20) -> List[Optional[float]]:
+    """
+    Z-score of each series' last point against the ``window`` points before it.
+    
+    This is the last column of rolling_zscores() without computing the rest.
+    """
+    if not series_list:
+        return []
+    if not HAS_NUMPY:
+        return [_rolling_zscores(series[-(window + 1):], window)[-1] if len(series) else None
+                for series in series_list]
+    
+    tails = [series[-(window + 1):] for series in series_list]
+    values, mask = _padded(tails, align_right=True)
+    if values.shape[1] < 3:
+        return [None] * len(series_list)
+    last = values[:, -1]
+    lengths = mask.sum(axis=1)
+    first = values[np.arange(len(values)), np.minimum(values.shape[1] - lengths, values.shape[1] - 1)]
+    previous = (values[:, :-1] - first[:, None]) * mask[:, :-1]
+    n = lengths - 1
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = previous.sum(axis=1) / n
+        variance = ((previous - mean[:, None]) ** 2 * mask[:, :-1]).sum(axis=1) / (n - 1)
+        scores = (last - first - mean) / np.sqrt(variance)
+    usable = (n >= 2) & (variance > 1e-12)
+    return [score if ok else None for score, ok in zip(scores.tolist(), usable.tolist())]
+
+
+def ewma(series_list: Sequence[Series], alpha: float = 0.1) -> List[Tuple[float, float]]:
+    """
+    Final exponentially weighted mean and standard deviation of each series.
+    
+    The mean follows m = (1 - alpha) * m + alpha * y starting from the
+    first value; the spread is the same average applied to squared
+    deviations. Empty series give (0.0, 0.0).
+    """
+    if not series_list:
+        return []
+    if not HAS_NUMPY:
+        return [_ewma(series, alpha) for series in series_list]
+    
+    values, mask = _padded(series_list, align_right=True)
+    width = values.shape[1]
+    if width == 0:
+        return [(0.0, 0.0)] * len(series_list)
+    lengths = mask.sum(axis=1)
+    first = values[np.arange(len(values)), np.minimum(width - lengths, width - 1)]
+    # Shift each series by its first value so the squared terms stay small
+    shifted = (values - first[:, None]) * mask
+    
+    # Right-aligned, every series shares the per-column weights alpha * (1 - alpha) ** age;
+    # the first value carries the remaining (1 - alpha) ** (n - 1) weight, and its shifted value is 0
+    weights = alpha * (1.0 - alpha) ** np.arange(width - 1, -1, -1, dtype=float)
+    mean = shifted @ weights
+    mean_square = (shifted * shifted) @ weights
+    variance = np.maximum(mean_square - mean * mean, 0.0)
+    
+    result = list(zip((mean + first).tolist(), np.sqrt(variance).tolist()))
+    return [(0.0, 0.0) if n == 0 else pair for pair, n in zip(result, lengths.tolist())]
+
+
+def _ewma(series: Series, alpha: float) -> Tuple[float, float]:
+    if not len(series):
+        return 0.0, 0.0
+    first = series[0]
+    mean = mean_square = 0.0
+    for value in series[1:]:
+        shifted = value - first
+        mean = (1 - alpha) * mean + alpha * shifted
+        mean_square = (1 - alpha) * mean_square + alpha * shifted * shifted
+    return mean + first, math.sqrt(max(mean_square - mean * mean, 0.0))
+
+
+class StreamingAnomalyDetector:
+    """
+    Per-key EWMA baselines with constant-time anomaly checks.
+    
+    Each new value is scored against the baseline built from the values
+    before it, then folded into that baseline.
+    """
+    
+    def __init__(self, alpha: float = 0.1, threshold: float = 3.0, warmup: int = 10):
+        """
+        Args:
+            alpha: EWMA smoothing factor (higher adapts faster)
+            threshold: Absolute z-score above which a value is anomalous
+            warmup: Values a key needs before it is scored
+        """
+        self.alpha = alpha
+        self.threshold = threshold
+        self.warmup = warmup
+        # key -> [count, mean, variance]
+        self._baselines: Dict[str, List[float]] = {}
+    
+    def update(self, key: str, value: float) -> Optional[float]:
+        """
+        Score ``value`` against the key's baseline, then update the baseline.
+        
+        Returns:
+            The z-score, or None while the key is warming up or flat
+        """
+        baseline = self._baselines.get(key)
+        if baseline is None:
+            self._baselines[key] = [1, float(value), 0.0]
+            return None
+        
+        count, mean, variance = baseline
+        zscore = None
+        if count >= self.warmup and variance > 0:
+            zscore = (value - mean) / math.sqrt(variance)
+        
+        diff = value - mean
+        increment = self.alpha * diff
+        baseline[0] = count + 1
+        baseline[1] = mean + increment
+        baseline[2] = (1 - self.alpha) * (variance + diff * increment)
+        return zscore
+    
+    def is_anomaly(self, zscore: Optional[float]) -> bool:
+        """Whether a score returned by update() crosses the threshold."""
+        return zscore is not None and abs(zscore) > self.threshold
+    
+    def baseline(self, key: str) -> Optional[Tuple[float, float]]:
+        """Current (mean, standard deviation) for a key."""
+        baseline = self._baselines.get(key)
+        if baseline is None:
+            return None
+        return baseline[1], math.sqrt(baseline[2])
+    
+    def reset(self, key: Optional[str] = None) -> None:
+        """Forget one key's baseline, or all of them."""
+        if key is None:
+            self._baselines.clear()
+        else:
+            self._baselines.pop(key, None)
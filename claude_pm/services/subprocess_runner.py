@@ -12,6 +12,8 @@ Key Features:
 - Environment variable propagation
 - Error handling and logging
 - Support for both sync and async subprocess creation
+- Bounded streaming capture of agent output (ring buffer, spill-to-file,
+  line callbacks) so parent memory stays flat however much a child prints
 """
 
 import os
@@ -20,12 +22,233 @@ import subprocess
 import asyncio
 import json
 import tempfile
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple, Union
+from typing import Callable, Deque, Dict, List, Optional, Any, Tuple, Union
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Output retained in memory per stream before older lines are evicted
+DEFAULT_MAX_BUFFER_BYTES = 1024 * 1024
+STREAM_READ_CHUNK_SIZE = 64 * 1024
+
+
+@dataclass
+class StreamCaptureConfig:
+    """Configuration for bounded streaming capture of subprocess output."""
+    max_buffer_bytes: int = DEFAULT_MAX_BUFFER_BYTES
+    spill_to_file: bool = True
+    spill_dir: Optional[Path] = None
+    on_stdout_line: Optional[Callable[[str], None]] = None
+    on_stderr_line: Optional[Callable[[str], None]] = None
+
+
+@dataclass
+class AgentSubprocessResult:
+    """Result of a streamed agent subprocess run."""
+    returncode: int
+    stdout: str
+    stderr: str
+    duration: float
+    timed_out: bool = False
+    stdout_bytes: int = 0
+    stderr_bytes: int = 0
+    stdout_spill_path: Optional[Path] = None
+    stderr_spill_path: Optional[Path] = None
+    
+    def full_output(self, stream: str = 'stdout') -> str:
+        """
+        Complete output of a stream: the spill file if it spilled, else the retained text.
+        
+        Args:
+            stream: 'stdout' or 'stderr'
+        """
+        spill_path = getattr(self, f'{stream}_spill_path')
+        if spill_path is not None:
+            try:
+                return spill_path.read_text(encoding='utf-8')
+            except OSError as e:
+                logger.warning(f"Could not read {stream} spill file {spill_path}, using retained tail: {e}")
+        return getattr(self, stream)
+    
+    def cleanup(self) -> None:
+        """Delete the spill files; the retained tails in stdout/stderr stay valid."""
+        for attr in ('stdout_spill_path', 'stderr_spill_path'):
+            _unlink_quietly(getattr(self, attr))
+            setattr(self, attr, None)
+    
+    def __enter__(self) -> "AgentSubprocessResult":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.cleanup()
+
+
+def _unlink_quietly(path: Optional[Path]) -> None:
+    """Remove a file if it exists, logging rather than raising on failure."""
+    if path is None:
+        return
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning(f"Failed to remove spill file {path}: {e}")
+
+
+class BoundedStreamBuffer:
+    """
+    Ring buffer holding the most recent output lines of a single stream.
+    
+    Once more than ``max_bytes`` are buffered the oldest lines are evicted.
+    With spilling enabled, the complete output captured so far is written to
+    a file at that moment and every later line is appended to it, so memory
+    stays bounded without losing output. Line callbacks fire as soon as each
+    line is complete.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        max_bytes: int = DEFAULT_MAX_BUFFER_BYTES,
+        spill_to_file: bool = True,
+        spill_dir: Optional[Path] = None,
+        on_line: Optional[Callable[[str], None]] = None
+    ):
+        self.name = name
+        self.max_bytes = max(1, max_bytes)
+        self.spill_to_file = spill_to_file
+        self.spill_dir = spill_dir
+        self.on_line = on_line
+        self.total_bytes = 0
+        self.dropped_bytes = 0
+        self.spill_path: Optional[Path] = None
+        self._lines: Deque[Tuple[str, int]] = deque()
+        self._buffered_bytes = 0
+        self._partial = b""
+        self._spill_file = None
+        self._closed = False
+        self._lock = threading.Lock()
+    
+    @property
+    def truncated(self) -> bool:
+        """Whether output was evicted from the in-memory buffer."""
+        return self.dropped_bytes > 0
+    
+    def feed(self, data: bytes) -> None:
+        """Feed a raw chunk read from the pipe."""
+        if not data:
+            return
+        with self._lock:
+            self._partial += data
+            while True:
+                newline = self._partial.find(b"\n")
+                if newline == -1:
+                    break
+                line, self._partial = self._partial[:newline + 1], self._partial[newline + 1:]
+                self._append_line(line)
+            # Break runaway lines so a child that never prints a newline
+            # cannot grow the pending partial line without bound
+            while len(self._partial) >= self.max_bytes:
+                line, self._partial = self._partial[:self.max_bytes], self._partial[self.max_bytes:]
+                self._append_line(line)
+    
+    def close(self) -> None:
+        """Flush any trailing partial line and close the spill file."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._partial:
+                line, self._partial = self._partial, b""
+                self._append_line(line)
+            if self._spill_file is not None:
+                try:
+                    self._spill_file.close()
+                except OSError as e:
+                    logger.warning(f"Failed to close {self.name} spill file: {e}")
+                self._spill_file = None
+    
+    def discard(self) -> None:
+        """Close and delete the spill file when no result will reference it."""
+        with self._lock:
+            # Reader threads may still be feeding; stop them starting a new file
+            self.spill_to_file = False
+        self.close()
+        _unlink_quietly(self.spill_path)
+        self.spill_path = None
+    
+    def getvalue(self) -> str:
+        """Return the retained output, prefixed with a notice if truncated."""
+        with self._lock:
+            text = "".join(line for line, _ in self._lines)
+        if not self.truncated:
+            return text
+        location = f"; full output in {self.spill_path}" if self.spill_path else ""
+        return f"[... {self.dropped_bytes} bytes of {self.name} omitted{location} ...]\n" + text
+    
+    def _append_line(self, raw: bytes) -> None:
+        """Record one complete line. Caller must hold the lock."""
+        size = len(raw)
+        line = raw.decode('utf-8', errors='replace')
+        self.total_bytes += size
+        
+        if self.on_line:
+            try:
+                self.on_line(line.rstrip("\r\n"))
+            except Exception as e:
+                logger.warning(f"{self.name} line callback failed: {e}")
+        
+        self._lines.append((line, size))
+        self._buffered_bytes += size
+        
+        if self._spill_file is not None:
+            self._write_spill(line)
+        elif self._buffered_bytes > self.max_bytes and self.spill_to_file:
+            self._start_spill()
+        
+        while self._buffered_bytes > self.max_bytes and len(self._lines) > 1:
+            _, evicted = self._lines.popleft()
+            self._buffered_bytes -= evicted
+            self.dropped_bytes += evicted
+    
+    def _start_spill(self) -> None:
+        """Open the spill file and write everything captured so far."""
+        try:
+            self._spill_file = tempfile.NamedTemporaryFile(
+                mode='w',
+                encoding='utf-8',
+                prefix=f"claude-pm-{self.name}-",
+                suffix='.log',
+                dir=str(self.spill_dir) if self.spill_dir else None,
+                delete=False
+            )
+            self.spill_path = Path(self._spill_file.name)
+            self._spill_file.writelines(line for line, _ in self._lines)
+            logger.info(f"Subprocess {self.name} exceeded {self.max_bytes} bytes, spilling to {self.spill_path}")
+        except OSError as e:
+            logger.warning(f"Could not spill {self.name} to file, keeping tail only: {e}")
+            self.spill_to_file = False
+            self._spill_file = None
+    
+    def _write_spill(self, line: str) -> None:
+        """Append a line to the spill file."""
+        try:
+            self._spill_file.write(line)
+        except OSError as e:
+            logger.warning(f"Failed writing {self.name} spill file, keeping tail only: {e}")
+            try:
+                self._spill_file.close()
+            except OSError:
+                pass
+            self._spill_file = None
+            self.spill_path = None
+            self.spill_to_file = False
+
 
 class SubprocessRunner:
     """
@@ -114,12 +337,230 @@ class SubprocessRunner:
         
         return env
     
+    def _write_task_file(self, agent_type: str, task_data: Dict[str, Any]) -> str:
+        """Write task data to a temporary file for the agent runner."""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as tf:
+            json.dump({
+                'agent_type': agent_type,
+                'task_data': task_data
+            }, tf)
+            return tf.name
+    
+    def _build_agent_command(self, agent_type: str, task_file: str) -> List[str]:
+        """Build the agent runner command line."""
+        return [
+            self.python_executable,
+            '-m', 'claude_pm.services.agent_runner',
+            '--agent-type', agent_type,
+            '--task-file', task_file
+        ]
+    
+    def _create_stream_buffers(
+        self,
+        capture: StreamCaptureConfig
+    ) -> Tuple[BoundedStreamBuffer, BoundedStreamBuffer]:
+        """Create the stdout/stderr capture buffers for a run."""
+        stdout_buffer = BoundedStreamBuffer(
+            'stdout',
+            max_bytes=capture.max_buffer_bytes,
+            spill_to_file=capture.spill_to_file,
+            spill_dir=capture.spill_dir,
+            on_line=capture.on_stdout_line
+        )
+        stderr_buffer = BoundedStreamBuffer(
+            'stderr',
+            max_bytes=capture.max_buffer_bytes,
+            spill_to_file=capture.spill_to_file,
+            spill_dir=capture.spill_dir,
+            on_line=capture.on_stderr_line
+        )
+        return stdout_buffer, stderr_buffer
+    
+    @staticmethod
+    def _build_result(
+        returncode: int,
+        stdout_buffer: BoundedStreamBuffer,
+        stderr_buffer: BoundedStreamBuffer,
+        start_time: float,
+        timed_out: bool
+    ) -> AgentSubprocessResult:
+        """Assemble a result from the capture buffers."""
+        return AgentSubprocessResult(
+            returncode=returncode,
+            stdout=stdout_buffer.getvalue(),
+            stderr=stderr_buffer.getvalue(),
+            duration=time.monotonic() - start_time,
+            timed_out=timed_out,
+            stdout_bytes=stdout_buffer.total_bytes,
+            stderr_bytes=stderr_buffer.total_bytes,
+            stdout_spill_path=stdout_buffer.spill_path,
+            stderr_spill_path=stderr_buffer.spill_path
+        )
+    
+    @staticmethod
+    def _pump_pipe(pipe, buffer: BoundedStreamBuffer) -> None:
+        """Copy a blocking pipe into a capture buffer until EOF."""
+        try:
+            for chunk in iter(lambda: pipe.read1(STREAM_READ_CHUNK_SIZE), b''):
+                buffer.feed(chunk)
+        except (OSError, ValueError) as e:
+            logger.debug(f"Stopped reading subprocess {buffer.name}: {e}")
+        finally:
+            buffer.close()
+    
+    @staticmethod
+    async def _pump_stream(reader: asyncio.StreamReader, buffer: BoundedStreamBuffer) -> None:
+        """Copy an asyncio stream into a capture buffer until EOF."""
+        try:
+            while True:
+                chunk = await reader.read(STREAM_READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                buffer.feed(chunk)
+        finally:
+            buffer.close()
+    
+    def run_command_streaming(
+        self,
+        cmd: List[str],
+        env: Dict[str, str],
+        timeout: Optional[float] = None,
+        capture: Optional[StreamCaptureConfig] = None
+    ) -> AgentSubprocessResult:
+        """
+        Run a command with bounded streaming capture of its output.
+        
+        Output is read incrementally by one thread per stream, so the parent
+        never holds more than ``capture.max_buffer_bytes`` per stream.
+        Line callbacks run on the reader threads.
+        
+        Args:
+            cmd: Command to run
+            env: Environment for the child process
+            timeout: Timeout in seconds
+            capture: Capture configuration (defaults to StreamCaptureConfig())
+            
+        Returns:
+            AgentSubprocessResult with the retained output; the caller owns
+            any spill files and removes them with ``cleanup()``
+        """
+        capture = capture or StreamCaptureConfig()
+        stdout_buffer, stderr_buffer = self._create_stream_buffers(capture)
+        start_time = time.monotonic()
+        timed_out = False
+        
+        try:
+            proc = subprocess.Popen(
+                cmd,
+                env=env,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE
+            )
+            readers = [
+                threading.Thread(target=self._pump_pipe, args=(proc.stdout, stdout_buffer), daemon=True),
+                threading.Thread(target=self._pump_pipe, args=(proc.stderr, stderr_buffer), daemon=True)
+            ]
+            for reader in readers:
+                reader.start()
+            
+            try:
+                proc.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                timed_out = True
+                proc.kill()
+                proc.wait()
+            finally:
+                if proc.returncode is None:
+                    proc.kill()
+                    proc.wait()
+                for reader in readers:
+                    reader.join(timeout=5)
+        except BaseException:
+            # No result will point at the spill files, so nobody else can remove them
+            stdout_buffer.discard()
+            stderr_buffer.discard()
+            raise
+        
+        returncode = -1 if timed_out else proc.returncode
+        return self._build_result(returncode, stdout_buffer, stderr_buffer, start_time, timed_out)
+    
+    async def run_command_streaming_async(
+        self,
+        cmd: List[str],
+        env: Dict[str, str],
+        timeout: Optional[float] = None,
+        capture: Optional[StreamCaptureConfig] = None
+    ) -> AgentSubprocessResult:
+        """
+        Run a command asynchronously with bounded streaming capture.
+        
+        Both pipes are drained concurrently through asyncio, so line
+        callbacks fire while the child is still running and the parent
+        never holds more than ``capture.max_buffer_bytes`` per stream.
+        
+        Args:
+            cmd: Command to run
+            env: Environment for the child process
+            timeout: Timeout in seconds
+            capture: Capture configuration (defaults to StreamCaptureConfig())
+            
+        Returns:
+            AgentSubprocessResult with the retained output; the caller owns
+            any spill files and removes them with ``cleanup()``
+        """
+        capture = capture or StreamCaptureConfig()
+        stdout_buffer, stderr_buffer = self._create_stream_buffers(capture)
+        start_time = time.monotonic()
+        timed_out = False
+        
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                env=env,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            
+            try:
+                await asyncio.wait_for(
+                    asyncio.gather(
+                        self._pump_stream(proc.stdout, stdout_buffer),
+                        self._pump_stream(proc.stderr, stderr_buffer),
+                        proc.wait()
+                    ),
+                    timeout=timeout
+                )
+            except asyncio.TimeoutError:
+                timed_out = True
+            finally:
+                if proc.returncode is None:
+                    try:
+                        proc.terminate()
+                        try:
+                            await asyncio.wait_for(proc.wait(), timeout=0.5)
+                        except asyncio.TimeoutError:
+                            proc.kill()
+                            await proc.wait()
+                    except ProcessLookupError:
+                        pass
+                stdout_buffer.close()
+                stderr_buffer.close()
+        except BaseException:
+            # No result will point at the spill files, so nobody else can remove them
+            stdout_buffer.discard()
+            stderr_buffer.discard()
+            raise
+        
+        returncode = -1 if timed_out else (proc.returncode or 0)
+        return self._build_result(returncode, stdout_buffer, stderr_buffer, start_time, timed_out)
+    
     def run_agent_subprocess(
         self,
         agent_type: str,
         task_data: Dict[str, Any],
         timeout: Optional[int] = None,
-        env_override: Optional[Dict[str, str]] = None
+        env_override: Optional[Dict[str, str]] = None,
+        capture: Optional[StreamCaptureConfig] = None
     ) -> Tuple[int, str, str]:
         """
         Run an agent subprocess synchronously.
@@ -129,54 +570,40 @@ class SubprocessRunner:
             task_data: Task data to pass to agent
             timeout: Timeout in seconds
             env_override: Additional environment variables
+            capture: Output capture limits and line callbacks
             
         Returns:
             Tuple of (return_code, stdout, stderr)
         """
         # Prepare environment
         env = self._prepare_environment(env_override)
-        
-        # Create a temporary file for task data
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as tf:
-            json.dump({
-                'agent_type': agent_type,
-                'task_data': task_data
-            }, tf)
-            task_file = tf.name
+        task_file = self._write_task_file(agent_type, task_data)
+        result = None
         
         try:
-            # Build command
-            cmd = [
-                self.python_executable,
-                '-m', 'claude_pm.services.agent_runner',
-                '--agent-type', agent_type,
-                '--task-file', task_file
-            ]
+            cmd = self._build_agent_command(agent_type, task_file)
             
             logger.info(f"Running agent subprocess: {agent_type}")
             logger.debug(f"Command: {' '.join(cmd)}")
             
-            # Run subprocess
-            result = subprocess.run(
-                cmd,
-                env=env,
-                capture_output=True,
-                text=True,
-                timeout=timeout
-            )
+            result = self.run_command_streaming(cmd, env, timeout=timeout, capture=capture)
+            
+            if result.timed_out:
+                logger.error(f"Agent subprocess timed out after {timeout}s")
+                return -1, "", f"Timeout after {timeout} seconds"
             
             logger.info(f"Agent subprocess completed with return code: {result.returncode}")
             
-            return result.returncode, result.stdout, result.stderr
+            # Memory stayed bounded while the child ran; the caller still gets the whole output
+            return result.returncode, result.full_output('stdout'), result.full_output('stderr')
             
-        except subprocess.TimeoutExpired as e:
-            logger.error(f"Agent subprocess timed out after {timeout}s")
-            return -1, "", f"Timeout after {timeout} seconds"
         except Exception as e:
             logger.error(f"Error running agent subprocess: {e}")
             return -1, "", str(e)
         finally:
-            # Clean up temp file
+            # Clean up temp file and any spill files
+            if result is not None:
+                result.cleanup()
             try:
                 os.unlink(task_file)
             except:
@@ -187,7 +614,8 @@ class SubprocessRunner:
         agent_type: str,
         task_data: Dict[str, Any],
         timeout: Optional[int] = None,
-        env_override: Optional[Dict[str, str]] = None
+        env_override: Optional[Dict[str, str]] = None,
+        capture: Optional[StreamCaptureConfig] = None
     ) -> Tuple[int, str, str]:
         """
         Run an agent subprocess asynchronously.
@@ -197,71 +625,40 @@ class SubprocessRunner:
             task_data: Task data to pass to agent
             timeout: Timeout in seconds
             env_override: Additional environment variables
+            capture: Output capture limits and line callbacks
             
         Returns:
             Tuple of (return_code, stdout, stderr)
         """
         # Prepare environment
         env = self._prepare_environment(env_override)
-        
-        # Create a temporary file for task data
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as tf:
-            json.dump({
-                'agent_type': agent_type,
-                'task_data': task_data
-            }, tf)
-            task_file = tf.name
+        task_file = self._write_task_file(agent_type, task_data)
+        result = None
         
         try:
-            # Build command
-            cmd = [
-                self.python_executable,
-                '-m', 'claude_pm.services.agent_runner',
-                '--agent-type', agent_type,
-                '--task-file', task_file
-            ]
+            cmd = self._build_agent_command(agent_type, task_file)
             
             logger.info(f"Running agent subprocess async: {agent_type}")
             logger.debug(f"Command: {' '.join(cmd)}")
             
-            # Create subprocess
-            proc = await asyncio.create_subprocess_exec(
-                *cmd,
-                env=env,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
+            result = await self.run_command_streaming_async(cmd, env, timeout=timeout, capture=capture)
             
-            # Wait for completion with timeout
-            try:
-                stdout, stderr = await asyncio.wait_for(
-                    proc.communicate(),
-                    timeout=timeout
-                )
-                
-                stdout_str = stdout.decode('utf-8') if stdout else ""
-                stderr_str = stderr.decode('utf-8') if stderr else ""
-                
-                logger.info(f"Agent subprocess completed with return code: {proc.returncode}")
-                
-                return proc.returncode or 0, stdout_str, stderr_str
-                
-            except asyncio.TimeoutError:
+            if result.timed_out:
                 logger.error(f"Agent subprocess timed out after {timeout}s")
-                try:
-                    proc.terminate()
-                    await asyncio.sleep(0.5)
-                    if proc.returncode is None:
-                        proc.kill()
-                except:
-                    pass
                 return -1, "", f"Timeout after {timeout} seconds"
+            
+            logger.info(f"Agent subprocess completed with return code: {result.returncode}")
+            
+            # Memory stayed bounded while the child ran; the caller still gets the whole output
+            return result.returncode, result.full_output('stdout'), result.full_output('stderr')
                 
         except Exception as e:
             logger.error(f"Error running agent subprocess: {e}")
             return -1, "", str(e)
         finally:
-            # Clean up temp file
+            # Clean up temp file and any spill files
+            if result is not None:
+                result.cleanup()
             try:
                 os.unlink(task_file)
             except:
@@ -13,6 +13,7 @@ Key Features:
 - Model selection mapping based on complexity
 - Optimal prompt size recommendations
 - Integration with agent_loader workflow
+- Batch analysis and an LRU memo of description analysis for recurring task texts
 
 Usage:
     from claude_pm.services.task_complexity_analyzer import TaskComplexityAnalyzer
@@ -27,13 +28,22 @@ Usage:
     print(f"Complexity: {result.complexity_level}")
     print(f"Recommended model: {result.recommended_model}")
     print(f"Optimal prompt size: {result.optimal_prompt_size}")
+    
+    # Many subtasks at once (descriptions shared between tasks are analyzed once)
+    results = analyzer.analyze_tasks([
+        "Read the configuration file",
+        {"task_description": "Refactor the authentication module", "file_count": 3}
+    ])
 """
 
+import hashlib
 import logging
 import re
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
 from enum import Enum
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
 
 # Module-level logger
 logger = logging.getLogger(__name__)
@@ -64,6 +74,14 @@ class ComplexityAnalysisResult:
     analysis_details: Dict[str, any]
 
 
+class DescriptionFeatures(NamedTuple):
+    """Everything the analyzer derives from the task description text alone."""
+    description_score: int
+    verb_complexity: str
+    technical_indicators: Tuple[str, ...]
+    estimated_steps: int
+
+
 @dataclass
 class TaskComplexityFactors:
     """Factors contributing to task complexity."""
@@ -119,8 +137,48 @@ class TaskComplexityAnalyzer:
         ModelType.OPUS: (1200, 1500)
     }
     
-    def __init__(self):
-        """Initialize the task complexity analyzer."""
+    # Technical indicator patterns
+    TECHNICAL_PATTERNS = {
+        "architecture": r"architect|design|pattern|structure",
+        "performance": r"optimi|performance|speed|efficiency",
+        "refactoring": r"refactor|restructure|reorganize",
+        "integration": r"integrat|connect|interface|api",
+        "testing": r"test|qa|quality|validation",
+        "security": r"security|auth|encrypt|permission"
+    }
+    
+    STEP_WORDS = ["first", "second", "then", "next", "finally", "step"]
+    
+    # Precompiled matchers. Keyword tests stay plain substring checks: in
+    # CPython they beat a combined alternation regex, which has to be tried
+    # at every position of the description.
+    _STEP_INDICATOR_RE = re.compile(r'\d+\.|step|phase|stage|first|second|then|finally')
+    _NUMBERED_RE = re.compile(r'\d+\.')
+    _TECHNICAL_PATTERN_RES = tuple(
+        (indicator, re.compile(pattern)) for indicator, pattern in TECHNICAL_PATTERNS.items()
+    )
+    
+    DEFAULT_CACHE_SIZE = 2048
+    
+    def __init__(self, cache_size: int = DEFAULT_CACHE_SIZE):
+        """
+        Initialize the task complexity analyzer.
+        
+        Args:
+            cache_size: Number of analyzed descriptions to memoize (0 disables the memo)
+        """
+        self.cache_size = cache_size
+        self._feature_cache: "OrderedDict[bytes, DescriptionFeatures]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        
+        verb_categories = {}
+        for category, verbs in (("simple", self.SIMPLE_VERBS), ("medium", self.MEDIUM_VERBS),
+                                ("complex", self.COMPLEX_VERBS)):
+            for verb in verbs:
+                verb_categories.setdefault(verb, category)
+        self._verb_categories = verb_categories
         logger.debug("TaskComplexityAnalyzer initialized")
     
     def analyze_task(
@@ -161,8 +219,182 @@ class TaskComplexityAnalyzer:
             technical_depth=technical_depth
         )
         
+        result = self._build_result(factors, self.get_description_features(task_description))
+        
+        logger.info(
+            f"Task complexity analysis complete: "
+            f"score={result.complexity_score}, level={result.complexity_level.value}, "
+            f"model={result.recommended_model.value}"
+        )
+        
+        return result
+    
+    def analyze_tasks(
+        self,
+        tasks: Iterable[Union[str, Dict[str, Any]]]
+    ) -> List[ComplexityAnalysisResult]:
+        """
+        Analyze many tasks in one pass.
+        
+        Each distinct description is analyzed once (and memoized); the
+        per-task factors are then scored without rescanning any text.
+        
+        Args:
+            tasks: Task descriptions, or dicts of analyze_task() keyword arguments
+            
+        Returns:
+            One ComplexityAnalysisResult per task, in order
+        """
+        factors_list = [
+            TaskComplexityFactors(task_description=task) if isinstance(task, str)
+            else TaskComplexityFactors(**task)
+            for task in tasks
+        ]
+        
+        features = {}
+        for factors in factors_list:
+            description = factors.task_description
+            if description not in features:
+                features[description] = self.get_description_features(description)
+        
+        results = [self._build_result(factors, features[factors.task_description]) for factors in factors_list]
+        
+        logger.info(
+            f"Batch task complexity analysis complete: {len(results)} tasks, "
+            f"{len(features)} distinct descriptions"
+        )
+        
+        return results
+    
+    def get_description_features(self, description: str) -> DescriptionFeatures:
+        """
+        Description-derived features, memoized by a hash of the description.
+        
+        The exact text is hashed (length contributes to the score, so
+        whitespace is not collapsed).
+        
+        Args:
+            description: Task description text
+            
+        Returns:
+            DescriptionFeatures for the description
+        """
+        if not self.cache_size:
+            return self._extract_description_features(description)
+        
+        key = hashlib.blake2b(description.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+        with self._cache_lock:
+            features = self._feature_cache.get(key)
+            if features is not None:
+                self._feature_cache.move_to_end(key)
+                self._cache_hits += 1
+                return features
+            self._cache_misses += 1
+        
+        features = self._extract_description_features(description)
+        with self._cache_lock:
+            self._feature_cache[key] = features
+            if len(self._feature_cache) > self.cache_size:
+                self._feature_cache.popitem(last=False)
+        return features
+    
+    def cache_info(self) -> Dict[str, int]:
+        """Description memo statistics."""
+        with self._cache_lock:
+            return {
+                "hits": self._cache_hits,
+                "misses": self._cache_misses,
+                "size": len(self._feature_cache),
+                "max_size": self.cache_size
+            }
+    
+    def clear_cache(self) -> None:
+        """Drop all memoized descriptions."""
+        with self._cache_lock:
+            self._feature_cache.clear()
+            self._cache_hits = self._cache_misses = 0
+    
+    def _extract_description_features(self, description: str) -> DescriptionFeatures:
+        """
+        Analyze a description (the uncached path behind get_description_features).
+        
+        Args:
+            description: Task description text
+            
+        Returns:
+            DescriptionFeatures for the description
+        """
+        description_lower = description.lower()
+        
+        # Category of the first word that is a known verb
+        verb_complexity = "unknown"
+        verb_categories = self._verb_categories
+        for word in description_lower.split():
+            category = verb_categories.get(word)
+            if category is not None:
+                verb_complexity = category
+                break
+        
+        technical_indicators = tuple(
+            indicator for indicator, pattern in self._TECHNICAL_PATTERN_RES if pattern.search(description_lower)
+        )
+        
+        # Task description complexity (0-25 points)
+        score = {"simple": 2, "medium": 5, "complex": 10}.get(verb_complexity, 0)
+        
+        # Length complexity (0-5 points)
+        if len(description) > 200:
+            score += 5
+        elif len(description) > 100:
+            score += 3
+        elif len(description) > 50:
+            score += 1
+        
+        # Technical keyword analysis (0-5 points); levels are checked in declaration order
+        keyword_points = {"simple": 1, "medium": 3, "complex": 5}
+        for level, keywords in self.TECHNICAL_KEYWORDS.items():
+            if any(keyword in description_lower for keyword in keywords):
+                score += keyword_points[level]
+                break
+        
+        # Multi-step indicator (0-5 points)
+        if self._STEP_INDICATOR_RE.search(description_lower):
+            score += 5
+        
+        # Step estimate: numbered items, else distinct step words, else length
+        numbered_matches = len(self._NUMBERED_RE.findall(description))
+        step_word_count = sum(1 for word in self.STEP_WORDS if word in description_lower)
+        if numbered_matches > 0:
+            estimated_steps = numbered_matches
+        elif step_word_count > 0:
+            estimated_steps = max(2, step_word_count)
+        else:
+            estimated_steps = max(1, len(description) // 100)
+        
+        return DescriptionFeatures(
+            description_score=min(25, score),
+            verb_complexity=verb_complexity,
+            technical_indicators=technical_indicators,
+            estimated_steps=estimated_steps
+        )
+    
+    def _build_result(
+        self,
+        factors: TaskComplexityFactors,
+        features: DescriptionFeatures
+    ) -> ComplexityAnalysisResult:
+        """
+        Score task factors given the description's features.
+        
+        Args:
+            factors: Task complexity factors
+            features: Features of factors.task_description
+            
+        Returns:
+            ComplexityAnalysisResult with scoring and recommendations
+        """
         # Calculate complexity scores
-        scoring_breakdown = self._calculate_complexity_scores(factors)
+        scoring_breakdown = self._calculate_complexity_scores(factors, features)
         total_score = sum(scoring_breakdown.values())
         
         # Normalize score to 0-100 range
@@ -179,28 +411,22 @@ class TaskComplexityAnalyzer:
         
         # Compile analysis details
         analysis_details = {
-            "verb_complexity": self._analyze_verb_complexity(task_description),
-            "technical_indicators": self._analyze_technical_indicators(task_description),
-            "task_length": len(task_description),
-            "estimated_steps": self._estimate_task_steps(task_description),
+            "verb_complexity": features.verb_complexity,
+            "technical_indicators": list(features.technical_indicators),
+            "task_length": len(factors.task_description),
+            "estimated_steps": features.estimated_steps,
             "complexity_factors": {
-                "file_operations": file_count,
-                "context_weight": self._calculate_context_weight(context_size),
-                "integration_complexity": integration_points,
+                "file_operations": factors.file_count,
+                "context_weight": self._calculate_context_weight(factors.context_size),
+                "integration_complexity": factors.integration_points,
                 "additional_requirements": sum([
-                    requires_research,
-                    requires_testing,
-                    requires_documentation
+                    factors.requires_research,
+                    factors.requires_testing,
+                    factors.requires_documentation
                 ])
             }
         }
         
-        logger.info(
-            f"Task complexity analysis complete: "
-            f"score={normalized_score}, level={complexity_level.value}, "
-            f"model={recommended_model.value}"
-        )
-        
         return ComplexityAnalysisResult(
             complexity_score=normalized_score,
             complexity_level=complexity_level,
@@ -210,22 +436,27 @@ class TaskComplexityAnalyzer:
             analysis_details=analysis_details
         )
     
-    def _calculate_complexity_scores(self, factors: TaskComplexityFactors) -> Dict[str, int]:
+    def _calculate_complexity_scores(
+        self,
+        factors: TaskComplexityFactors,
+        features: Optional[DescriptionFeatures] = None
+    ) -> Dict[str, int]:
         """
         Calculate individual complexity scores for different factors.
         
         Args:
             factors: Task complexity factors
+            features: Precomputed description features (looked up if omitted)
             
         Returns:
             Dictionary of score breakdowns
         """
         scores = {}
+        if features is None:
+            features = self.get_description_features(factors.task_description)
         
         # Task description complexity (0-25 points)
-        scores["description_complexity"] = self._score_description_complexity(
-            factors.task_description
-        )
+        scores["description_complexity"] = features.description_score
         
         # File operation complexity (0-20 points)
         scores["file_complexity"] = self._score_file_complexity(factors.file_count)
@@ -269,47 +500,7 @@ class TaskComplexityAnalyzer:
         Returns:
             Complexity score (0-25)
         """
-        score = 0
-        description_lower = description.lower()
-        
-        # Verb complexity (0-10 points)
-        words = description_lower.split()
-        for word in words:
-            if word in self.SIMPLE_VERBS:
-                score += 2
-                break
-            elif word in self.MEDIUM_VERBS:
-                score += 5
-                break
-            elif word in self.COMPLEX_VERBS:
-                score += 10
-                break
-        
-        # Length complexity (0-5 points)
-        if len(description) > 200:
-            score += 5
-        elif len(description) > 100:
-            score += 3
-        elif len(description) > 50:
-            score += 1
-        
-        # Technical keyword analysis (0-5 points)
-        for level, keywords in self.TECHNICAL_KEYWORDS.items():
-            if any(keyword in description_lower for keyword in keywords):
-                if level == "complex":
-                    score += 5
-                elif level == "medium":
-                    score += 3
-                elif level == "simple":
-                    score += 1
-                break
-        
-        # Multi-step indicator (0-5 points)
-        step_indicators = r'\d+\.|step|phase|stage|first|second|then|finally'
-        if re.search(step_indicators, description_lower):
-            score += 5
-        
-        return min(25, score)
+        return self.get_description_features(description).description_score
     
     def _score_file_complexity(self, file_count: int) -> int:
         """
@@ -392,18 +583,7 @@ class TaskComplexityAnalyzer:
         Returns:
             Verb complexity category
         """
-        description_lower = description.lower()
-        words = description_lower.split()
-        
-        for word in words:
-            if word in self.COMPLEX_VERBS:
-                return "complex"
-            elif word in self.MEDIUM_VERBS:
-                return "medium"
-            elif word in self.SIMPLE_VERBS:
-                return "simple"
-        
-        return "unknown"
+        return self.get_description_features(description).verb_complexity
     
     def _analyze_technical_indicators(self, description: str) -> List[str]:
         """
@@ -415,24 +595,7 @@ class TaskComplexityAnalyzer:
         Returns:
             List of technical indicators found
         """
-        indicators = []
-        description_lower = description.lower()
-        
-        # Check for technical patterns
-        patterns = {
-            "architecture": r"architect|design|pattern|structure",
-            "performance": r"optimi|performance|speed|efficiency",
-            "refactoring": r"refactor|restructure|reorganize",
-            "integration": r"integrat|connect|interface|api",
-            "testing": r"test|qa|quality|validation",
-            "security": r"security|auth|encrypt|permission"
-        }
-        
-        for indicator, pattern in patterns.items():
-            if re.search(pattern, description_lower):
-                indicators.append(indicator)
-        
-        return indicators
+        return list(self.get_description_features(description).technical_indicators)
     
     def _estimate_task_steps(self, description: str) -> int:
         """
@@ -444,21 +607,7 @@ class TaskComplexityAnalyzer:
         Returns:
             Estimated number of steps
         """
-        # Look for numbered lists or step indicators
-        numbered_pattern = r'\d+\.'
-        step_words = ["first", "second", "then", "next", "finally", "step"]
-        
-        numbered_matches = len(re.findall(numbered_pattern, description))
-        step_word_count = sum(1 for word in step_words if word in description.lower())
-        
-        # Estimate based on findings
-        if numbered_matches > 0:
-            return numbered_matches
-        elif step_word_count > 0:
-            return max(2, step_word_count)
-        else:
-            # Default estimate based on description length
-            return max(1, len(description) // 100)
+        return self.get_description_features(description).estimated_steps
     
     def _calculate_context_weight(self, context_size: int) -> str:
         """
@@ -0,0 +1,325 @@
+"""
+Admission Scheduler - Concurrency and memory admission control for delegations
+===============================================================================
+
+Bursty delegation traffic used to launch every subprocess immediately after a
+single memory check, overshooting available memory and slowing every agent
+down together. This scheduler sits in front of subprocess creation and only
+admits work while there is capacity.
+
+Key Features:
+- Global concurrency limit and memory budget
+- Strict priorities (critical > high > medium > low)
+- Weighted fair queueing across agent types within a priority
+  (self-clocked fair queueing: finish tag = max(virtual time, last tag) + cost / weight)
+- Admission driven by a live available-memory sampler, with headroom reserved
+  for recently admitted work the sampler cannot see yet
+- Bounded queue depth and queue wait, so overload sheds work instead of collapsing
+- Queue wait reported per admission and aggregated per agent type
+
+Usage:
+    from claude_pm.utils.admission_scheduler import AdmissionScheduler
+
+    scheduler = AdmissionScheduler(max_concurrent=4, agent_weights={"engineer": 2.0})
+    ticket = await scheduler.acquire("engineer", priority="high")
+    try:
+        ...  # launch subprocess
+    finally:
+        scheduler.release(ticket)
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_LEVELS = {"critical": 0, "high": 1, "medium": 2, "low": 3}
+
+
+class AdmissionRejected(Exception):
+    """Raised when a delegation cannot be admitted (queue full or wait exceeded)."""
+
+
+def sample_available_memory_mb() -> float:
+    """Default memory sampler: system-wide available memory in MB."""
+    return psutil.virtual_memory().available / 1024 / 1024
+
+
+@dataclass
+class AdmissionTicket:
+    """A queued or admitted delegation."""
+    ticket_id: int
+    agent_type: str
+    priority: str
+    enqueued_at: float
+    admitted_at: Optional[float] = None
+    released: bool = False
+
+    @property
+    def queue_wait_seconds(self) -> float:
+        """Time spent waiting for admission."""
+        end = self.admitted_at if self.admitted_at is not None else time.monotonic()
+        return end - self.enqueued_at
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for reporting."""
+        return {
+            "ticket_id": self.ticket_id,
+            "agent_type": self.agent_type,
+            "priority": self.priority,
+            "queue_wait_seconds": round(self.queue_wait_seconds, 6),
+        }
+
+
+@dataclass
+class _AgentQueueStats:
+    """Per-agent admission statistics."""
+    admitted: int = 0
+    rejected: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+
+@dataclass(order=True)
+class _QueueEntry:
+    """Heap entry ordered by (priority, finish tag, arrival)."""
+    priority_rank: int
+    finish_tag: float
+    seq: int
+    ticket: AdmissionTicket = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+
+
+class AdmissionScheduler:
+    """
+    Weighted-fair, priority-aware admission control with a memory budget.
+
+    ``acquire`` waits until the delegation is admitted and returns a ticket;
+    ``release`` frees its slot. Both are safe to call from any thread; futures
+    are resolved on the loop that created them.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 4,
+        agent_weights: Optional[Dict[str, float]] = None,
+        min_available_mb: float = 1024.0,
+        estimated_subprocess_mb: float = 512.0,
+        memory_sampler: Optional[Callable[[], float]] = sample_available_memory_mb,
+        sample_interval: float = 0.25,
+        max_queue_depth: int = 256,
+        max_queue_wait: Optional[float] = 300.0
+    ):
+        self.max_concurrent = max(1, max_concurrent)
+        self.agent_weights = {k.lower(): v for k, v in (agent_weights or {}).items()}
+        self.min_available_mb = min_available_mb
+        self.estimated_subprocess_mb = estimated_subprocess_mb
+        self.memory_sampler = memory_sampler
+        self.sample_interval = sample_interval
+        self.max_queue_depth = max_queue_depth
+        self.max_queue_wait = max_queue_wait
+
+        self._lock = threading.Lock()
+        self._queue: List[_QueueEntry] = []
+        self._running: Dict[int, AdmissionTicket] = {}
+        self._ids = itertools.count(1)
+        self._virtual_time = 0.0
+        self._last_finish: Dict[str, float] = {}
+        self._sampled_mb: Optional[float] = None
+        self._sampled_at = 0.0
+        self._admitted_since_sample = 0
+        self._retry_handle: Optional[asyncio.TimerHandle] = None
+        self._agent_stats: Dict[str, _AgentQueueStats] = {}
+
+    def _weight(self, agent_type: str) -> float:
+        return max(self.agent_weights.get(agent_type, 1.0), 1e-6)
+
+    def _stats_for(self, agent_type: str) -> _AgentQueueStats:
+        stats = self._agent_stats.get(agent_type)
+        if stats is None:
+            stats = self._agent_stats[agent_type] = _AgentQueueStats()
+        return stats
+
+    def _available_mb(self) -> Optional[float]:
+        """Return sampled available memory, re-sampling at most every interval."""
+        if self.memory_sampler is None:
+            return None
+        now = time.monotonic()
+        if self._sampled_mb is None or now - self._sampled_at >= self.sample_interval:
+            try:
+                self._sampled_mb = float(self.memory_sampler())
+            except Exception as e:
+                logger.warning(f"Memory sampler failed, admitting on concurrency only: {e}")
+                return None
+            self._sampled_at = now
+            self._admitted_since_sample = 0
+        return self._sampled_mb
+
+    def _has_capacity(self) -> bool:
+        """Check the concurrency limit and the memory budget. Caller holds the lock."""
+        if len(self._running) >= self.max_concurrent:
+            return False
+        available = self._available_mb()
+        if available is None:
+            return True
+        # Children admitted since the last sample are not reflected in it yet
+        headroom = available - self._admitted_since_sample * self.estimated_subprocess_mb
+        return headroom - self.estimated_subprocess_mb >= self.min_available_mb
+
+    async def acquire(
+        self,
+        agent_type: str,
+        priority: str = "medium",
+        cost: float = 1.0,
+        lease_seconds: Optional[float] = None
+    ) -> AdmissionTicket:
+        """
+        Wait for admission of a delegation.
+
+        Args:
+            agent_type: Agent type, used for fair sharing
+            priority: One of critical, high, medium, low
+            cost: Relative cost of the delegation for fair sharing
+            lease_seconds: Release the slot automatically after this long
+
+        Returns:
+            The admitted ticket (carries queue wait)
+
+        Raises:
+            AdmissionRejected: If the queue is full or the wait exceeds max_queue_wait
+        """
+        agent_type = agent_type.lower()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        ticket = AdmissionTicket(
+            ticket_id=next(self._ids),
+            agent_type=agent_type,
+            priority=priority if priority in PRIORITY_LEVELS else "medium",
+            enqueued_at=time.monotonic()
+        )
+
+        with self._lock:
+            if len(self._queue) >= self.max_queue_depth:
+                self._stats_for(agent_type).rejected += 1
+                raise AdmissionRejected(f"Admission queue full ({self.max_queue_depth} waiting)")
+            start_tag = max(self._virtual_time, self._last_finish.get(agent_type, 0.0))
+            finish_tag = start_tag + cost / self._weight(agent_type)
+            self._last_finish[agent_type] = finish_tag
+            heapq.heappush(self._queue, _QueueEntry(
+                PRIORITY_LEVELS[ticket.priority], finish_tag, ticket.ticket_id, ticket, future
+            ))
+
+        self._dispatch()
+
+        try:
+            ticket = await asyncio.wait_for(asyncio.shield(future), timeout=self.max_queue_wait)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            with self._lock:
+                admitted = future.done() and not future.cancelled()
+                if not admitted:
+                    future.cancel()
+                    self._queue = [entry for entry in self._queue if entry.future is not future]
+                    heapq.heapify(self._queue)
+                    self._stats_for(agent_type).rejected += 1
+            if admitted:
+                # Admitted concurrently with the timeout/cancel; hand the slot back
+                self.release(future.result())
+            self._dispatch()
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            raise AdmissionRejected(
+                f"Not admitted within {self.max_queue_wait}s ({len(self._running)} running)"
+            ) from None
+
+        if lease_seconds:
+            loop.call_later(lease_seconds, self._expire_lease, ticket)
+        return ticket
+
+    def _expire_lease(self, ticket: AdmissionTicket) -> None:
+        if not ticket.released:
+            logger.warning(f"Admission lease expired for {ticket.agent_type} ticket {ticket.ticket_id}, releasing slot")
+            self.release(ticket)
+
+    def release(self, ticket: AdmissionTicket) -> None:
+        """Release an admitted ticket. Releasing twice is a no-op."""
+        with self._lock:
+            if ticket.released or self._running.pop(ticket.ticket_id, None) is None:
+                ticket.released = True
+                return
+            ticket.released = True
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Admit queued work while capacity allows."""
+        retry_loop = None
+        with self._lock:
+            while self._queue:
+                head = self._queue[0]
+                if head.future.done():
+                    heapq.heappop(self._queue)
+                    continue
+                if not self._has_capacity():
+                    if len(self._running) < self.max_concurrent:
+                        # Blocked on memory, which no release will signal, so poll
+                        retry_loop = head.future.get_loop()
+                    break
+                heapq.heappop(self._queue)
+                ticket = head.ticket
+                ticket.admitted_at = time.monotonic()
+                self._virtual_time = head.finish_tag
+                self._running[ticket.ticket_id] = ticket
+                self._admitted_since_sample += 1
+
+                stats = self._stats_for(ticket.agent_type)
+                stats.admitted += 1
+                wait = ticket.queue_wait_seconds
+                stats.total_wait += wait
+                stats.max_wait = max(stats.max_wait, wait)
+
+                head.future.get_loop().call_soon_threadsafe(self._resolve, head.future, ticket)
+
+        if retry_loop is not None:
+            retry_loop.call_soon_threadsafe(self._schedule_retry, retry_loop)
+
+    def _schedule_retry(self, loop: asyncio.AbstractEventLoop) -> None:
+        if self._retry_handle is None or self._retry_handle.cancelled():
+            self._retry_handle = loop.call_later(self.sample_interval, self._run_retry)
+
+    def _run_retry(self) -> None:
+        self._retry_handle = None
+        self._dispatch()
+
+    def _resolve(self, future: asyncio.Future, ticket: AdmissionTicket) -> None:
+        if not future.done():
+            future.set_result(ticket)
+        else:
+            # Waiter gave up before the result landed
+            self.release(ticket)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return admission statistics including queue waits per agent type."""
+        with self._lock:
+            per_agent = {
+                agent: {
+                    "admitted": stats.admitted,
+                    "rejected": stats.rejected,
+                    "avg_queue_wait_seconds": stats.total_wait / stats.admitted if stats.admitted else 0.0,
+                    "max_queue_wait_seconds": stats.max_wait,
+                }
+                for agent, stats in self._agent_stats.items()
+            }
+            return {
+                "running": len(self._running),
+                "queued": sum(1 for entry in self._queue if not entry.future.done()),
+                "max_concurrent": self.max_concurrent,
+                "available_mb": self._sampled_mb,
+                "agents": per_agent,
+            }
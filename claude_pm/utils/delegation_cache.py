@@ -0,0 +1,355 @@
+"""
+Delegation Result Cache - Idempotent Task Tool delegations
+==========================================================
+
+Retries and re-planning frequently re-issue the exact same delegation within
+minutes. This module provides an opt-in cache for delegation results keyed by
+a canonical hash of the delegation inputs plus the content hashes of any files
+the delegation depends on.
+
+Key Features:
+- Canonical delegation keys (normalized task text, sorted lists, context hash)
+- File content hashing memoized on (mtime, size) so unchanged files are not re-read
+- Per-agent TTLs (a TTL of 0 disables caching for that agent)
+- In-flight coalescing: concurrent identical delegations share one run; if
+  that run is cancelled or abandoned, a waiting caller takes it over
+- LRU bounds on cached results and memoized file hashes
+- Results are stored and returned as copies, so callers cannot alter the cache
+
+Usage:
+    from claude_pm.utils.delegation_cache import DelegationResultCache
+
+    cache = DelegationResultCache(default_ttl=300, agent_ttls={"research": 900})
+    key = cache.make_key("research", "Summarize the auth module", context_files=["auth.py"])
+    result = await cache.get_or_run(key, "research", lambda: run_delegation())
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+class DelegationAbandoned(Exception):
+    """The in-flight run a caller was waiting on ended without a result."""
+
+
+@dataclass
+class InFlightDelegation:
+    """A delegation that is running, and the futures its duplicates wait on."""
+    started: asyncio.Future
+    done: asyncio.Future
+    owner: Optional[str] = None
+
+
+@dataclass
+class DelegationCacheStats:
+    """Counters for delegation cache effectiveness."""
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    bypassed: int = 0
+    expired: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered without running the delegation."""
+        total = self.hits + self.coalesced + self.misses
+        return (self.hits + self.coalesced) / total if total else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for reporting."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "bypassed": self.bypassed,
+            "expired": self.expired,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+        }
+
+
+def normalize_task_description(task_description: str) -> str:
+    """Collapse whitespace and case so trivially different phrasings share a key."""
+    return _WHITESPACE_RE.sub(" ", task_description or "").strip().casefold()
+
+
+class DelegationResultCache:
+    """
+    TTL + LRU cache for delegation results with in-flight coalescing.
+
+    Results are only stored when ``is_cacheable`` accepts them (by default,
+    dictionaries whose ``success`` flag is true), so failures are always
+    retried. Every caller receives its own deep copy of a cached result.
+    """
+
+    def __init__(
+        self,
+        default_ttl: float = 300.0,
+        agent_ttls: Optional[Dict[str, float]] = None,
+        max_entries: int = 512,
+        is_cacheable: Optional[Callable[[Any], bool]] = None,
+        max_file_hashes: int = 4096
+    ):
+        self.default_ttl = default_ttl
+        self.agent_ttls = {agent_type.lower(): ttl for agent_type, ttl in (agent_ttls or {}).items()}
+        self.max_entries = max_entries
+        self.max_file_hashes = max_file_hashes
+        self.is_cacheable = is_cacheable or (lambda result: isinstance(result, dict) and bool(result.get("success")))
+        self.stats = DelegationCacheStats()
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._in_flight: Dict[str, InFlightDelegation] = {}
+        self._file_hashes: "OrderedDict[str, Tuple[int, int, str]]" = OrderedDict()
+
+    def ttl_for(self, agent_type: str) -> float:
+        """Return the TTL in seconds for an agent type (0 disables caching)."""
+        return self.agent_ttls.get(agent_type.lower(), self.default_ttl)
+
+    def file_content_hash(self, path: str) -> str:
+        """Hash a file's content, re-reading it only when mtime or size change."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return "missing"
+        cached = self._file_hashes.get(path)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            self._file_hashes.move_to_end(path)
+            return cached[2]
+        digest = hashlib.sha256()
+        try:
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(1024 * 1024), b""):
+                    digest.update(block)
+        except OSError:
+            return "unreadable"
+        content_hash = digest.hexdigest()
+        self._file_hashes[path] = (stat.st_mtime_ns, stat.st_size, content_hash)
+        self._file_hashes.move_to_end(path)
+        while len(self._file_hashes) > self.max_file_hashes:
+            self._file_hashes.popitem(last=False)
+        return content_hash
+
+    def make_key(
+        self,
+        agent_type: str,
+        task_description: str,
+        requirements: Optional[Iterable[str]] = None,
+        context_hash: Optional[str] = None,
+        context_files: Optional[Iterable[str]] = None,
+        **inputs: Any
+    ) -> str:
+        """
+        Build the canonical cache key for a delegation.
+
+        Args:
+            agent_type: Agent the task is delegated to
+            task_description: Task text (normalized before hashing)
+            requirements: Requirement list (order-insensitive)
+            context_hash: Caller-supplied hash of any additional context
+            context_files: Files whose content the result depends on
+            **inputs: Any further delegation inputs that affect the result
+
+        Returns:
+            Hex digest identifying the delegation
+        """
+        files = sorted(str(Path(p)) for p in (context_files or []))
+        canonical = {
+            "agent_type": agent_type.lower(),
+            "task": normalize_task_description(task_description),
+            "requirements": sorted(requirements or []),
+            "context_hash": context_hash,
+            "files": {path: self.file_content_hash(path) for path in files},
+            "inputs": inputs,
+        }
+        payload = json.dumps(canonical, sort_keys=True, default=str, separators=(",", ":"))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return a copy of a live cached result, or None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            self.stats.expired += 1
+            return None
+        self._entries.move_to_end(key)
+        return copy.deepcopy(result)
+
+    def lookup(self, key: str, bypass: bool = False) -> Optional[Any]:
+        """Like ``get``, but counted in the hit/miss/bypass statistics."""
+        if bypass:
+            self.stats.bypassed += 1
+            return None
+        cached = self.get(key)
+        if cached is not None:
+            self.stats.hits += 1
+        else:
+            self.stats.misses += 1
+        return cached
+
+    def put(self, key: str, agent_type: str, result: Any) -> bool:
+        """Store a result if it is cacheable and the agent has a positive TTL."""
+        ttl = self.ttl_for(agent_type)
+        if ttl <= 0 or not self.is_cacheable(result):
+            return False
+        self._entries[key] = (time.monotonic() + ttl, copy.deepcopy(result))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+        return True
+
+    def invalidate(self, key: Optional[str] = None) -> int:
+        """Drop one key, or every cached result when no key is given."""
+        if key is None:
+            count = len(self._entries)
+            self._entries.clear()
+            return count
+        return 1 if self._entries.pop(key, None) is not None else 0
+
+    # In-flight runs
+
+    def start(self, key: str) -> bool:
+        """Register a run for ``key``; False if an identical run is already in flight."""
+        if key in self._in_flight:
+            return False
+        loop = asyncio.get_running_loop()
+        self._in_flight[key] = InFlightDelegation(started=loop.create_future(), done=loop.create_future())
+        return True
+
+    def set_owner(self, key: str, owner: str) -> None:
+        """Record which subprocess is running ``key`` and release callers waiting for it."""
+        entry = self._in_flight.get(key)
+        if entry is not None:
+            entry.owner = owner
+            if not entry.started.done():
+                entry.started.set_result(owner)
+
+    def in_flight(self, key: str) -> Optional[InFlightDelegation]:
+        """The run in flight for ``key``, if any."""
+        return self._in_flight.get(key)
+
+    async def wait_for_owner(self, key: str) -> Optional[str]:
+        """Wait until the in-flight run for ``key`` has an owner; None if it was abandoned first."""
+        entry = self._in_flight.get(key)
+        if entry is None:
+            return None
+        return await asyncio.shield(entry.started)
+
+    async def wait(self, key: str) -> Any:
+        """
+        Wait for the in-flight run for ``key`` and return a copy of its result.
+
+        Raises:
+            DelegationAbandoned: the run ended without a result
+            KeyError: nothing is in flight for ``key``
+        """
+        entry = self._in_flight[key]
+        return copy.deepcopy(await asyncio.shield(entry.done))
+
+    def finish(self, key: str, agent_type: str, result: Any, owner: Optional[str] = None) -> bool:
+        """
+        Cache a completed result and hand it to callers waiting on the run.
+
+        With ``owner`` given, only that owner's run is resolved; any other run
+        in flight for the key (a later re-run) is left alone. Returns whether
+        the result was cached.
+        """
+        entry = self._in_flight.get(key)
+        if entry is not None and (owner is None or entry.owner == owner):
+            del self._in_flight[key]
+            if not entry.started.done():
+                entry.started.set_result(entry.owner)
+            entry.done.set_result(result)
+        return self.put(key, agent_type, result)
+
+    def abandon(self, key: str, error: Optional[BaseException] = None) -> None:
+        """
+        End the in-flight run for ``key`` without a result.
+
+        Waiters receive ``error``, or DelegationAbandoned, which tells them to
+        take over the run themselves.
+        """
+        entry = self._in_flight.pop(key, None)
+        if entry is None:
+            return
+        if not entry.started.done():
+            entry.started.set_result(None)
+        entry.done.set_exception(error or DelegationAbandoned(key))
+        # Mark retrieved so a failure nobody waited for is not reported as lost
+        entry.done.exception()
+
+    async def get_or_run(
+        self,
+        key: str,
+        agent_type: str,
+        run: Callable[[], Awaitable[Any]],
+        bypass: bool = False
+    ) -> Any:
+        """
+        Return the cached result for ``key`` or run the delegation once.
+
+        Concurrent callers with the same key await the first caller's run
+        instead of starting their own; if that run is cancelled, one waiter
+        runs the delegation in its place. ``bypass`` forces a fresh run whose
+        result still refreshes the cache.
+        """
+        if bypass:
+            self.stats.bypassed += 1
+            result = await run()
+            self.put(key, agent_type, result)
+            return result
+
+        counted = False
+        while True:
+            cached = self.get(key)
+            if cached is not None:
+                if not counted:
+                    self.stats.hits += 1
+                return cached
+            if self.start(key):
+                break
+            if not counted:
+                self.stats.coalesced += 1
+                counted = True
+            try:
+                return await self.wait(key)
+            except DelegationAbandoned:
+                continue
+        if not counted:
+            self.stats.misses += 1
+
+        try:
+            result = await run()
+        except asyncio.CancelledError:
+            self.abandon(key)
+            raise
+        except Exception as e:
+            self.abandon(key, e)
+            raise
+        self.finish(key, agent_type, result)
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return cache statistics."""
+        return {
+            **self.stats.to_dict(),
+            "entries": len(self._entries),
+            "in_flight": len(self._in_flight),
+        }
@@ -27,6 +27,8 @@ Usage Example:
     )
 """
 
+import asyncio
+import copy
 import os
 import sys
 import json
@@ -39,6 +41,8 @@ from enum import Enum
 
 # Import TaskToolResponse for standardized response format
 from claude_pm.core.response_types import TaskToolResponse
+from claude_pm.utils.admission_scheduler import AdmissionRejected, AdmissionScheduler
+from claude_pm.utils.delegation_cache import DelegationResultCache
 
 # Import PM orchestrator
 try:
@@ -159,6 +163,19 @@ class TaskToolConfiguration:
     memory_critical_mb: int = 2048  # 2GB critical
     memory_max_mb: int = 4096  # 4GB hard limit
     abort_on_memory_limit: bool = True
+    # Delegation result cache (opt-in)
+    enable_result_cache: bool = False
+    result_cache_ttl_seconds: float = 300.0
+    result_cache_agent_ttls: Dict[str, float] = field(default_factory=dict)  # 0 disables caching for an agent
+    result_cache_max_entries: int = 512
+    # Admission control (opt-in): global concurrency/memory budget with fair queueing
+    enable_admission_control: bool = False
+    admission_max_concurrent: int = 4
+    admission_agent_weights: Dict[str, float] = field(default_factory=dict)
+    admission_min_available_mb: int = 1024
+    admission_estimated_subprocess_mb: int = 512
+    admission_max_queue_depth: int = 256
+    admission_max_queue_wait_seconds: float = 300.0
 
 
 class TaskToolHelper:
@@ -246,6 +263,38 @@ class TaskToolHelper:
                 logger.error(f"Failed to initialize memory monitoring: {e}")
                 self.memory_monitor = None
         
+        # Initialize admission scheduler, sampling memory through the monitor when available
+        self.admission_scheduler = None
+        self._admission_tickets: Dict[str, List[Any]] = {}
+        if self.config.enable_admission_control:
+            scheduler_kwargs = {}
+            if self.memory_monitor is not None:
+                scheduler_kwargs["memory_sampler"] = lambda: self.memory_monitor.get_system_memory()["available_mb"]
+            self.admission_scheduler = AdmissionScheduler(
+                max_concurrent=self.config.admission_max_concurrent,
+                agent_weights=self.config.admission_agent_weights,
+                min_available_mb=self.config.admission_min_available_mb,
+                estimated_subprocess_mb=self.config.admission_estimated_subprocess_mb,
+                max_queue_depth=self.config.admission_max_queue_depth,
+                max_queue_wait=self.config.admission_max_queue_wait_seconds,
+                **scheduler_kwargs
+            )
+            logger.info(f"Admission control enabled (max {self.config.admission_max_concurrent} concurrent subprocesses)")
+        
+        # Initialize delegation result cache (stores completed results, see complete_subprocess)
+        self.result_cache = None
+        self._result_cache_keys: Dict[str, str] = {}
+        if self.config.enable_result_cache:
+            self.result_cache = DelegationResultCache(
+                default_ttl=self.config.result_cache_ttl_seconds,
+                agent_ttls=self.config.result_cache_agent_ttls,
+                max_entries=self.config.result_cache_max_entries,
+                is_cacheable=lambda results: (
+                    isinstance(results, dict) and results.get("success", True) is not False and not results.get("error")
+                )
+            )
+            logger.info("Delegation result cache enabled")
+        
         logger.info(f"TaskToolHelper initialized with working directory: {self.working_directory}")
     
     def _log_subprocess_prompt(self, subprocess_id: str, prompt: str, agent_type: str, 
@@ -330,7 +379,10 @@ class TaskToolHelper:
         escalation_triggers: Optional[List[str]] = None,
         integration_notes: str = "",
         model_override: Optional[str] = None,
-        performance_requirements: Optional[Dict[str, Any]] = None
+        performance_requirements: Optional[Dict[str, Any]] = None,
+        context_hash: Optional[str] = None,
+        context_files: Optional[List[str]] = None,
+        use_cache: bool = True
     ) -> Dict[str, Any]:
         """
         Create Task Tool subprocess with automatic prompt generation.
@@ -346,10 +398,170 @@ class TaskToolHelper:
             timeout_seconds: Subprocess timeout
             escalation_triggers: Conditions for escalation
             integration_notes: Additional integration context
+            context_hash: Hash of extra context the result depends on (result cache key)
+            context_files: Files whose content the result depends on (result cache key)
+            use_cache: Set False to bypass the result cache and force a fresh run
             
         Returns:
-            Dictionary containing subprocess information and generated prompt
+            Dictionary containing subprocess information and generated prompt.
+            With the result cache enabled, an identical delegation that already
+            completed is answered with ``cached: True`` and a copy of its
+            ``results`` instead, and one that is still running is answered with
+            ``coalesced: True`` and the running ``subprocess_id`` (see
+            ``await_delegation_results``). No subprocess is created in either case.
+        """
+        cache_key = None
+        if self.result_cache is not None:
+            cache_key = self.result_cache.make_key(
+                agent_type,
+                task_description,
+                requirements=requirements,
+                context_hash=context_hash,
+                context_files=context_files,
+                deliverables=deliverables or [],
+                dependencies=dependencies or [],
+                priority=priority,
+                memory_categories=memory_categories or [],
+                escalation_triggers=escalation_triggers or [],
+                integration_notes=integration_notes,
+                model_override=model_override or self.config.model_override,
+                performance_requirements=performance_requirements or {}
+            )
+            if use_cache:
+                reused = await self._join_identical_delegation(cache_key, agent_type, task_description)
+                if reused is not None:
+                    return reused
+            else:
+                self.result_cache.lookup(cache_key, bypass=True)
+        
+        try:
+            result = await self._create_agent_subprocess_uncached(
+                agent_type=agent_type,
+                task_description=task_description,
+                requirements=requirements,
+                deliverables=deliverables,
+                dependencies=dependencies,
+                priority=priority,
+                memory_categories=memory_categories,
+                timeout_seconds=timeout_seconds,
+                escalation_triggers=escalation_triggers,
+                integration_notes=integration_notes,
+                model_override=model_override,
+                performance_requirements=performance_requirements
+            )
+        except BaseException:
+            if cache_key is not None and use_cache:
+                self.result_cache.abandon(cache_key)
+            raise
+        if cache_key is not None and isinstance(result, dict):
+            result["cached"] = False
+            subprocess_id = result.get("subprocess_id")
+            if subprocess_id in self._active_subprocesses:
+                # Results are cached, and handed to coalesced duplicates, when the subprocess completes
+                self._result_cache_keys[subprocess_id] = cache_key
+                if use_cache:
+                    self.result_cache.set_owner(cache_key, subprocess_id)
+            elif use_cache:
+                self.result_cache.abandon(cache_key)
+        return result
+    
+    async def _join_identical_delegation(
+        self,
+        cache_key: str,
+        agent_type: str,
+        task_description: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Answer a delegation from the cache or from an identical one still running.
+        
+        Returns None when the caller must create the subprocess itself; the
+        key is then registered as in flight so later duplicates join it. A
+        running duplicate whose subprocess was aborted is taken over.
         """
+        counted = False
+        while True:
+            cached_results = self.result_cache.get(cache_key)
+            if cached_results is not None:
+                if not counted:
+                    self.result_cache.stats.hits += 1
+                logger.info(f"Reusing cached {agent_type} delegation results")
+                return {
+                    "success": True,
+                    "cached": True,
+                    "subprocess_id": None,
+                    "agent_type": agent_type,
+                    "task_description": task_description,
+                    "results": cached_results,
+                    "usage_instructions": "Results reused from an identical completed delegation; no subprocess was created."
+                }
+            if self.result_cache.start(cache_key):
+                if not counted:
+                    self.result_cache.stats.misses += 1
+                return None
+            
+            owner = await self.result_cache.wait_for_owner(cache_key)
+            info = self._active_subprocesses.get(owner) if owner else None
+            if info is not None and not str(info.get("status", "")).startswith("aborted"):
+                if not counted:
+                    self.result_cache.stats.coalesced += 1
+                logger.info(f"Joining identical in-flight {agent_type} delegation {owner}")
+                return {
+                    "success": True,
+                    "cached": False,
+                    "coalesced": True,
+                    "subprocess_id": owner,
+                    "agent_type": agent_type,
+                    "task_description": task_description,
+                    "usage_instructions": (
+                        f"An identical delegation is already running as {owner}; no subprocess was created. "
+                        f"await_delegation_results('{owner}') returns its results."
+                    )
+                }
+            if owner is not None:
+                # The running subprocess was aborted; this caller takes the delegation over
+                self._abandon_delegation(owner)
+            counted = True
+    
+    def _abandon_delegation(self, subprocess_id: str) -> None:
+        """Release duplicates waiting on a subprocess that will not complete."""
+        cache_key = self._result_cache_keys.get(subprocess_id)
+        in_flight = self.result_cache.in_flight(cache_key) if cache_key and self.result_cache else None
+        if in_flight is not None and in_flight.owner == subprocess_id:
+            self.result_cache.abandon(cache_key)
+    
+    async def await_delegation_results(self, subprocess_id: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Wait for a subprocess (possibly one a coalesced delegation joined) and return its results.
+        
+        Raises:
+            DelegationAbandoned: the subprocess was taken over or dropped before completing
+            KeyError: the subprocess is unknown to this helper
+        """
+        for entry in self._subprocess_history:
+            if entry["subprocess_id"] == subprocess_id and entry.get("status") == "completed":
+                return copy.deepcopy(entry["results"])
+        cache_key = self._result_cache_keys.get(subprocess_id)
+        in_flight = self.result_cache.in_flight(cache_key) if cache_key and self.result_cache else None
+        if in_flight is None or in_flight.owner != subprocess_id:
+            raise KeyError(subprocess_id)
+        return await asyncio.wait_for(self.result_cache.wait(cache_key), timeout)
+    
+    async def _create_agent_subprocess_uncached(
+        self,
+        agent_type: str,
+        task_description: str,
+        requirements: Optional[List[str]] = None,
+        deliverables: Optional[List[str]] = None,
+        dependencies: Optional[List[str]] = None,
+        priority: str = "medium",
+        memory_categories: Optional[List[str]] = None,
+        timeout_seconds: Optional[int] = None,
+        escalation_triggers: Optional[List[str]] = None,
+        integration_notes: str = "",
+        model_override: Optional[str] = None,
+        performance_requirements: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Create a Task Tool subprocess without consulting the result cache."""
         # Check if orchestration is enabled for integrated context filtering
         try:
             from claude_pm.orchestration.detection import OrchestrationDetector
@@ -381,9 +593,27 @@ class TaskToolHelper:
             logger.warning(f"Orchestration check failed, continuing with standard: {e}")
         
         # Standard implementation without orchestration
+        admission_ticket = None
         try:
+            if self.admission_scheduler is not None:
+                # Wait for a concurrency/memory slot; held until complete_subprocess
+                try:
+                    admission_ticket = await self.admission_scheduler.acquire(
+                        agent_type,
+                        priority=priority,
+                        lease_seconds=timeout_seconds or self.config.timeout_seconds
+                    )
+                except AdmissionRejected as e:
+                    logger.error(f"Cannot create subprocess: {e}")
+                    error_request_id = f"admission_error_{agent_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+                    return TaskToolResponse(
+                        request_id=error_request_id,
+                        success=False,
+                        error=str(e),
+                        enhanced_prompt=f"**{agent_type.title()}**: {task_description} [BLOCKED BY ADMISSION CONTROL]"
+                    )
             # Check memory availability before creating subprocess
-            if self.memory_monitor and self.config.enable_memory_monitoring:
+            elif self.memory_monitor and self.config.enable_memory_monitoring:
                 can_create, memory_status = self.memory_monitor.can_create_subprocess()
                 if not can_create:
                     logger.error(f"Cannot create subprocess: {memory_status}")
@@ -445,6 +675,10 @@ class TaskToolHelper:
                 "performance_requirements": performance_requirements or {}
             }
             
+            if admission_ticket is not None:
+                subprocess_info["admission"] = admission_ticket.to_dict()
+                self._admission_tickets.setdefault(subprocess_id, []).append(admission_ticket)
+            
             # Track active subprocess
             self._active_subprocesses[subprocess_id] = subprocess_info
             
@@ -524,11 +758,14 @@ class TaskToolHelper:
                 "prompt": prompt,
                 "usage_instructions": self._generate_usage_instructions(subprocess_info),
                 "correction_hook": correction_hook,
-                "memory_monitoring": memory_monitoring_status
+                "memory_monitoring": memory_monitoring_status,
+                "admission": admission_ticket.to_dict() if admission_ticket is not None else None
             }
             
         except Exception as e:
             logger.error(f"Error creating Task Tool subprocess: {e}")
+            if admission_ticket is not None:
+                self.admission_scheduler.release(admission_ticket)
             
             # Collect error memory
             if self.config.memory_collection_required:
@@ -939,8 +1176,17 @@ Correction Capture Usage:
             # Complete delegation in PM orchestrator
             self.pm_orchestrator.complete_delegation(subprocess_id, results)
             
-            # Remove from active tracking
+            # Cache the results for identical delegations
+            cache_key = self._result_cache_keys.pop(subprocess_id, None)
+            if cache_key is not None:
+                self.result_cache.finish(
+                    cache_key, self._active_subprocesses[subprocess_id]["agent_type"], results, owner=subprocess_id
+                )
+            
+            # Remove from active tracking and free the admission slot
             del self._active_subprocesses[subprocess_id]
+            for ticket in self._admission_tickets.pop(subprocess_id, []):
+                self.admission_scheduler.release(ticket)
             
             # Collect completion memory
             if self.config.memory_collection_required:
@@ -1078,6 +1324,7 @@ Correction Capture Usage:
                 if subprocess_id in self._active_subprocesses:
                     self._active_subprocesses[subprocess_id]["status"] = "aborted_memory"
                     self._active_subprocesses[subprocess_id]["abort_time"] = datetime.now().isoformat()
+                    self._abandon_delegation(subprocess_id)
                     
             elif status == "CRITICAL":
                 logger.warning(f"Subprocess {subprocess_id} memory critical: {memory_mb}MB")
@@ -1121,7 +1368,19 @@ Correction Capture Usage:
         except Exception as e:
             logger.error(f"Failed to generate memory report: {e}")
             return {"enabled": True, "error": str(e)}
-    
+
+    def get_admission_stats(self) -> Dict[str, Any]:
+        """Get admission control statistics, including queue waits per agent type."""
+        if self.admission_scheduler is None:
+            return {"enabled": False, "message": "Admission control not enabled"}
+        return {"enabled": True, **self.admission_scheduler.get_stats()}
+
+    def get_result_cache_stats(self) -> Dict[str, Any]:
+        """Get delegation result cache statistics."""
+        if self.result_cache is None:
+            return {"enabled": False, "message": "Delegation result cache not enabled"}
+        return {"enabled": True, **self.result_cache.get_stats()}
+
     def list_available_agents(self) -> Dict[str, List[str]]:
         """List all available agents for Task Tool subprocess creation."""
         return self.pm_orchestrator.list_available_agents()
@@ -201,6 +201,7 @@ class TestAsyncByDefaultHookProcessing(unittest.TestCase):
             
             # Log the execution manually to test logging
             self.service.project_logger.log_hook_execution(hook_config, result, test_context)
+            self.service.project_logger.flush()
             
             # Verify log file was created
             expected_log_file = self.service.project_logger._get_log_file_path(
@@ -271,6 +272,7 @@ class TestAsyncByDefaultHookProcessing(unittest.TestCase):
             
             context = {'test_data': f'large_data_entry_{i}' * 100}  # Make it large
             logger.log_hook_execution(hook_config, result, context)
+        logger.flush()
         
         # Check that log files were rotated
         log_dir = logger.logs_dir / HookType.ERROR_DETECTION.value
@@ -361,6 +363,7 @@ class TestAsyncByDefaultHookProcessing(unittest.TestCase):
             self.assertGreater(analysis_result['errors_detected'], 0, "Should detect errors in problematic transcript")
             
             # Check that error detection logs were created
+            self.service.project_logger.flush()
             error_log_file = self.service.project_logger._get_log_file_path(
                 HookType.ERROR_DETECTION,
                 'error_detection'
@@ -421,6 +424,7 @@ class TestAsyncByDefaultHookProcessing(unittest.TestCase):
                 self.assertGreater(len(results), 0, "Should execute performance monitoring hooks")
             
             # Check performance logs
+            self.service.project_logger.flush()
             perf_log_dir = self.service.project_logger.logs_dir / HookType.PERFORMANCE_MONITOR.value
             perf_log_files = list(perf_log_dir.glob("*.log"))
             
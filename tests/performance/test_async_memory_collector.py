@@ -27,9 +27,10 @@ class TestAsyncMemoryCollector:
     """Test suite for AsyncMemoryCollector."""
     
     @pytest.fixture
-    async def collector(self):
+    async def collector(self, tmp_path):
         """Create AsyncMemoryCollector instance for testing."""
         config = get_config("development")
+        config["storage"] = {"sqlite_path": str(tmp_path / "memory.db"), "project_id": "test"}
         collector = AsyncMemoryCollector(config)
         await collector.start()
         yield collector
@@ -86,9 +87,10 @@ class TestAsyncMemoryCollector:
         assert stats.success_rate() == 80.0
     
     @pytest.mark.asyncio
-    async def test_collector_initialization(self):
+    async def test_collector_initialization(self, tmp_path):
         """Test AsyncMemoryCollector initialization."""
         config = get_config("development")
+        config["storage"] = {"sqlite_path": str(tmp_path / "memory.db"), "project_id": "test"}
         collector = AsyncMemoryCollector(config)
         
         assert collector.batch_size == 5
@@ -266,7 +268,7 @@ class TestAsyncMemoryCollector:
     async def test_error_handling(self, collector):
         """Test error handling and recovery."""
         # Test with mock storage failure
-        with patch.object(collector, '_store_memory', side_effect=Exception("Storage failed")):
+        with patch.object(collector, '_store_batch', side_effect=Exception("Storage failed")) as store:
             # Submit operation
             op_id = await collector.collect_async(
                 category="error",
@@ -277,9 +279,12 @@ class TestAsyncMemoryCollector:
             # Wait for processing attempt
             await asyncio.sleep(0.5)
             
-            # Check that operation was queued but might have failed
+            # The failed batch was attempted and scheduled for retry, not counted as stored
             stats = await collector.get_stats()
             assert stats.total_operations >= 1
+            assert store.called
+            assert stats.retried_operations >= 1
+            assert stats.successful_operations == 0
     
     @pytest.mark.asyncio
     async def test_health_check(self, collector):
@@ -296,10 +301,11 @@ class TestAsyncMemoryCollector:
             assert "cache_operational" in health.checks
     
     @pytest.mark.asyncio
-    async def test_service_integration(self, integration, service_manager):
+    async def test_service_integration(self, integration, service_manager, tmp_path):
         """Test service integration functionality."""
         # Register collector
         config = get_config("development")
+        config["storage"] = {"sqlite_path": str(tmp_path / "memory.db"), "project_id": "test"}
         collector = await integration.register_async_memory_collector(config)
         
         assert collector is not None
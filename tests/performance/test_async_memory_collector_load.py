@@ -0,0 +1,173 @@
+"""
+Load test for AsyncMemoryCollector batch persistence.
+
+Drives the collector at full speed against a temporary SQLite memory store
+and reports sustained memories/sec together with the queue-depth and
+batch-size curve produced by adaptive batching.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from claude_pm.config.async_memory_config import get_config
+from claude_pm.services.async_memory_collector import AdaptiveBatchSizer, AsyncMemoryCollector
+from claude_pm.services.memory import MemoryCategory, MemoryQuery
+
+LOAD_OPERATIONS = 20_000
+CATEGORIES = ["bug", "feedback", "architecture", "performance", "integration", "qa", "error", "operation"]
+
+
+def make_collector(tmp_path, environment: str = "high_performance") -> AsyncMemoryCollector:
+    config = get_config(environment)
+    config["storage"] = {"sqlite_path": str(tmp_path / "memory.db"), "project_id": "load"}
+    config["enable_health_monitoring"] = False
+    return AsyncMemoryCollector(config)
+
+
+async def wait_for_persisted(collector: AsyncMemoryCollector, count: int, timeout: float = 60.0):
+    deadline = time.time() + timeout
+    while collector.stats.successful_operations < count and time.time() < deadline:
+        await asyncio.sleep(0.01)
+
+
+class TestAdaptiveBatchSizer:
+    """Test the batch size controller."""
+    
+    def test_grows_under_backlog_and_shrinks_on_slow_flush(self):
+        sizer = AdaptiveBatchSizer(initial=10, minimum=1, maximum=200, target_latency=0.05)
+        
+        sizes = [sizer.update(batch_len=sizer.size, flush_latency=0.005, queue_depth=1000) for _ in range(6)]
+        slow = sizer.update(batch_len=200, flush_latency=0.2, queue_depth=1000)
+        
+        assert sizes == [20, 40, 80, 160, 200, 200]
+        assert slow == 100
+    
+    def test_decays_to_baseline_when_idle(self):
+        sizer = AdaptiveBatchSizer(initial=10, minimum=1, maximum=200, target_latency=0.05)
+        sizer.size = 170
+        
+        for _ in range(10):
+            sizer.update(batch_len=1, flush_latency=0.001, queue_depth=0)
+        
+        assert sizer.size == 10
+
+
+class TestCollectorPersistence:
+    """Test that collected memories land in the memory store."""
+    
+    @pytest.mark.asyncio
+    async def test_batches_are_persisted_and_searchable(self, tmp_path):
+        collector = make_collector(tmp_path, "development")
+        await collector.start()
+        try:
+            for i in range(200):
+                await collector.collect_async(CATEGORIES[i % len(CATEGORIES)], f"load item {i} retry storm",
+                                              {"index": i}, priority="critical" if i % 50 == 0 else "medium")
+            await wait_for_persisted(collector, 200, timeout=10)
+            
+            results = await collector.memory_service.search_memories(
+                "load", MemoryQuery("retry storm", categories=[MemoryCategory.ERROR], tags=["bug"], limit=100))
+            
+            assert collector.stats.successful_operations == 200
+            assert collector.stats.batches_committed < 200
+            assert len(results) == 25
+            assert all(r.metadata["collector_category"] == "bug" for r in results)
+        finally:
+            await collector.stop()
+    
+    @pytest.mark.asyncio
+    async def test_failed_batch_is_retried(self, tmp_path):
+        collector = make_collector(tmp_path, "development")
+        collector.retry_delay = 0.01
+        await collector.start()
+        backend = collector.memory_service.backend
+        original = backend.insert_batch
+        calls = []
+        
+        def flaky_insert(project_id, records):
+            calls.append(len(records))
+            if len(calls) == 1:
+                raise RuntimeError("disk full")
+            return original(project_id, records)
+        
+        backend.insert_batch = flaky_insert
+        try:
+            await collector.collect_async("error", "transient failure", priority="high")
+            await wait_for_persisted(collector, 1, timeout=10)
+            
+            assert collector.stats.retried_operations == 1
+            assert await backend.count_memories("load") == 1
+        finally:
+            await collector.stop()
+    
+    @pytest.mark.asyncio
+    async def test_timed_out_batch_that_committed_is_not_duplicated(self, tmp_path):
+        """The worker thread outlives the timeout and commits; the retry writes nothing new."""
+        collector = make_collector(tmp_path, "development")
+        collector.retry_delay = 0.01
+        collector.operation_timeout = 0.05
+        await collector.start()
+        backend = collector.memory_service.backend
+        original = backend.insert_batch
+        calls = []
+        
+        def slow_insert(project_id, records):
+            calls.append(len(records))
+            if len(calls) == 1:
+                time.sleep(0.2)
+            return original(project_id, records)
+        
+        backend.insert_batch = slow_insert
+        try:
+            await collector.collect_async("error", "slow disk", priority="high")
+            await wait_for_persisted(collector, 1, timeout=10)
+            await asyncio.sleep(0.3)
+            
+            assert calls == [1, 1]
+            assert collector.stats.retried_operations == 1
+            assert await backend.count_memories("load") == 1
+        finally:
+            await collector.stop()
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_sustained_throughput_and_queue_depth(tmp_path):
+    """Report sustained memories/sec and the queue-depth curve under full load."""
+    collector = make_collector(tmp_path)
+    await collector.start()
+    samples = []
+    
+    async def sample_queue():
+        while True:
+            samples.append((time.perf_counter(), collector.operation_queue.qsize(), collector.batch_sizer.size))
+            await asyncio.sleep(0.05)
+    
+    sampler = asyncio.create_task(sample_queue())
+    started = time.perf_counter()
+    try:
+        for i in range(LOAD_OPERATIONS):
+            while collector.operation_queue.full():
+                await asyncio.sleep(0)
+            await collector.collect_async(CATEGORIES[i % len(CATEGORIES)], f"memory {i} under sustained load",
+                                          {"index": i})
+        await wait_for_persisted(collector, LOAD_OPERATIONS)
+        elapsed = time.perf_counter() - started
+        persisted = await collector.memory_service.backend.count_memories("load")
+    finally:
+        sampler.cancel()
+        await collector.stop()
+    
+    batch_sizes = [entry["batch_size"] for entry in collector.flush_history]
+    print(f"\nsustained: {persisted / elapsed:,.0f} memories/s ({persisted:,} in {elapsed:.2f}s, "
+          f"{collector.stats.batches_committed} transactions, max batch {max(batch_sizes)})")
+    print("t(s)   queue_depth  batch_size")
+    step = max(1, len(samples) // 20)
+    for timestamp, depth, size in samples[::step]:
+        print(f"{timestamp - started:5.2f}  {depth:11d}  {size:10d}")
+    
+    assert persisted == LOAD_OPERATIONS
+    assert persisted / elapsed > 2_000
+    assert max(batch_sizes) > collector.batch_size
@@ -0,0 +1,114 @@
+"""
+Benchmark for transcript error detection.
+
+Compares the single-pass combined scan in ErrorDetectionSystem against the
+previous per-pattern re.finditer approach on a synthetic ~5 MB transcript
+using the full built-in pattern set, and checks both produce identical
+findings.
+"""
+
+import asyncio
+import logging
+import random
+import re
+import time
+
+import pytest
+
+from claude_pm.services.hook_processing_service import ErrorDetectionSystem
+
+TRANSCRIPT_BYTES = 5 * 1024 * 1024
+
+FILLER_WORDS = (
+    "the agent processed request and returned output with data from the api call "
+    "while task runs normally on server connection pool memory usage file version"
+).split()
+
+ERROR_LINES = [
+    "Connection refused by server",
+    "Subprocess failed with exit code 1",
+    "Network timeout occurred",
+    "Traceback (most recent call last)",
+    "Out of memory error",
+    "Package version mismatch detected",
+]
+
+
+def build_transcript(size: int = TRANSCRIPT_BYTES, error_rate: float = 0.01, seed: int = 7) -> str:
+    """Build a deterministic transcript with sparse error lines."""
+    rng = random.Random(seed)
+    lines = []
+    total = 0
+    while total < size:
+        line = " ".join(rng.choice(FILLER_WORDS) for _ in range(12))
+        if rng.random() < error_rate:
+            line += " " + rng.choice(ERROR_LINES)
+        lines.append(line)
+        total += len(line) + 1
+    return "\n".join(lines)
+
+
+def per_pattern_scan(detector: ErrorDetectionSystem, transcript: str):
+    """The previous implementation: one IGNORECASE finditer per pattern."""
+    findings = []
+    for error_type, config in detector.error_patterns.items():
+        for pattern in config['patterns']:
+            for match in re.finditer(pattern, transcript, re.IGNORECASE | re.MULTILINE):
+                findings.append((error_type, pattern, match.start(), match.group()))
+    return findings
+
+
+@pytest.mark.slow
+class TestErrorDetectionBenchmark:
+    """Throughput benchmark for ErrorDetectionSystem.analyze_transcript."""
+    
+    def test_single_pass_scan_is_faster_and_equivalent(self):
+        """The combined scan matches per-pattern output and beats it on a 5 MB transcript."""
+        detector = ErrorDetectionSystem()
+        transcript = build_transcript()
+        logging.disable(logging.WARNING)
+        try:
+            start = time.perf_counter()
+            expected = per_pattern_scan(detector, transcript)
+            baseline_seconds = time.perf_counter() - start
+            
+            start = time.perf_counter()
+            results = asyncio.run(detector.analyze_transcript(transcript))
+            scan_seconds = time.perf_counter() - start
+        finally:
+            logging.disable(logging.NOTSET)
+        
+        actual = [
+            (r.error_type, r.details['matched_pattern'], r.details['position'], r.details['matched_text'])
+            for r in results
+        ]
+        mb_per_second = len(transcript) / (1024 * 1024) / scan_seconds
+        print(
+            f"\nper-pattern: {baseline_seconds:.3f}s  single-pass: {scan_seconds:.3f}s  "
+            f"({mb_per_second:.1f} MB/s, {len(results)} findings)"
+        )
+        
+        assert actual == expected
+        assert scan_seconds < baseline_seconds
+    
+    def test_incremental_scan_matches_full_scan(self):
+        """Streaming the transcript in random deltas finds the same errors."""
+        detector = ErrorDetectionSystem()
+        transcript = build_transcript(size=512 * 1024)
+        scanner = detector.create_incremental_scanner()
+        rng = random.Random(3)
+        logging.disable(logging.WARNING)
+        try:
+            full = asyncio.run(detector.analyze_transcript(transcript))
+            streamed = []
+            offset = 0
+            while offset < len(transcript):
+                step = rng.randint(1, 8192)
+                streamed.extend(scanner.feed(transcript[offset:offset + step]))
+                offset += step
+            streamed.extend(scanner.finish())
+        finally:
+            logging.disable(logging.NOTSET)
+        
+        key = lambda r: (r.error_type, r.details['matched_pattern'], r.details['position'])
+        assert sorted(map(key, streamed)) == sorted(map(key, full))
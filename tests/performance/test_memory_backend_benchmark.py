@@ -0,0 +1,136 @@
+"""
+Benchmark for the SQLite memory backend.
+
+Loads 100k synthetic memories through FlexibleMemoryService in batches and
+measures add throughput plus full-text, filtered and ranked search latency.
+"""
+
+import asyncio
+import random
+import statistics
+import time
+
+import pytest
+
+from claude_pm.services.memory import FlexibleMemoryService, MemoryCategory, MemoryQuery, RankingOptions
+
+MEMORY_COUNT = 100_000
+BATCH_SIZE = 1_000
+SEARCH_ROUNDS = 200
+
+VOCABULARY = (
+    "deploy rollback database migration cache latency timeout retry queue worker agent "
+    "config schema index service health monitor alert token budget prompt template test "
+    "coverage release version dependency package build pipeline docker kubernetes secret"
+).split()
+CATEGORIES = list(MemoryCategory)
+# Larger synthetic vocabulary for ranking runs, so postings lists have a realistic long tail
+WIDE_VOCABULARY = VOCABULARY + [f"term{k}" for k in range(5_000)]
+
+
+def build_memories(count: int, seed: int = 11, vocabulary=VOCABULARY, spacing: float = 1.0):
+    """Deterministic synthetic memories with Zipf-ish term frequencies."""
+    rng = random.Random(seed)
+    weights = [1.0 / (rank + 1) for rank in range(len(vocabulary))]
+    now = time.time()
+    for i in range(count):
+        words = rng.choices(vocabulary, weights=weights, k=rng.randint(8, 24))
+        yield {
+            "content": " ".join(words),
+            "category": CATEGORIES[i % len(CATEGORIES)],
+            "tags": [rng.choice(VOCABULARY)],
+            "created_at": now - (count - i) * spacing
+        }
+
+
+async def load_service(path, memories) -> FlexibleMemoryService:
+    service = FlexibleMemoryService({"sqlite_path": str(path)})
+    await service.initialize()
+    for offset in range(0, len(memories), BATCH_SIZE):
+        await service.add_memories("bench", memories[offset:offset + BATCH_SIZE])
+    return service
+
+
+async def time_queries(service, queries):
+    latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        results = await service.search_memories("bench", query)
+        latencies.append((time.perf_counter() - started) * 1000)
+        assert len(results) <= query.limit
+    return latencies
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+@pytest.mark.slow
+def test_memory_backend_throughput(tmp_path):
+    """Report add throughput and search latency at 100k memories."""
+    async def run():
+        memories = list(build_memories(MEMORY_COUNT))
+        started = time.perf_counter()
+        service = await load_service(tmp_path / "memory.db", memories)
+        add_seconds = time.perf_counter() - started
+        
+        rng = random.Random(3)
+        queries = [
+            MemoryQuery(" ".join(rng.sample(VOCABULARY, 2)), limit=10) for _ in range(SEARCH_ROUNDS)
+        ] + [
+            MemoryQuery(rng.choice(VOCABULARY), categories=[rng.choice(CATEGORIES)], limit=10)
+            for _ in range(SEARCH_ROUNDS)
+        ]
+        latencies = await time_queries(service, queries)
+        
+        await service.cleanup()
+        return add_seconds, latencies
+    
+    add_seconds, latencies = asyncio.run(run())
+    
+    print(f"\nadd: {MEMORY_COUNT / add_seconds:,.0f} memories/s ({add_seconds:.2f}s for {MEMORY_COUNT:,})")
+    print(f"search: median {statistics.median(latencies):.2f} ms, p95 {percentile(latencies, 0.95):.2f} ms, "
+          f"max {max(latencies):.2f} ms over {len(latencies)} queries")
+    
+    assert MEMORY_COUNT / add_seconds > 5_000
+    assert percentile(latencies, 0.95) < 250
+
+
+@pytest.mark.slow
+def test_ranked_search_latency(tmp_path):
+    """Report ranked search latency (boosts + recency decay) at 100k memories."""
+    ranking = RankingOptions(
+        recency_half_life_days=30.0,
+        category_boosts={MemoryCategory.ERROR: 1.5, MemoryCategory.DECISION: 1.2}
+    )
+    
+    async def run():
+        # One memory every 5 minutes: the corpus spans roughly a year
+        service = await load_service(
+            tmp_path / "memory.db", list(build_memories(MEMORY_COUNT, vocabulary=WIDE_VOCABULARY, spacing=300))
+        )
+        rng = random.Random(5)
+        weights = [1.0 / (rank + 1) for rank in range(len(WIDE_VOCABULARY))]
+        match_all = [
+            MemoryQuery(" ".join(rng.choices(WIDE_VOCABULARY, weights=weights, k=2)), limit=10, ranking=ranking)
+            for _ in range(SEARCH_ROUNDS)
+        ]
+        match_any = [
+            MemoryQuery(" ".join(rng.choices(WIDE_VOCABULARY, weights=weights, k=3)), limit=10,
+                        match_all=False, ranking=ranking)
+            for _ in range(SEARCH_ROUNDS)
+        ]
+        all_latencies = await time_queries(service, match_all)
+        any_latencies = await time_queries(service, match_any)
+        await service.cleanup()
+        return all_latencies, any_latencies
+    
+    all_latencies, any_latencies = asyncio.run(run())
+    
+    for label, latencies in (("all terms", all_latencies), ("any term", any_latencies)):
+        print(f"\nranked search ({label}): median {statistics.median(latencies):.2f} ms, "
+              f"p95 {percentile(latencies, 0.95):.2f} ms over {len(latencies)} queries")
+    
+    assert percentile(all_latencies, 0.95) < 250
+    assert percentile(any_latencies, 0.95) < 250
@@ -10,6 +10,7 @@ import pytest
 from unittest.mock import Mock, patch, MagicMock
 from pathlib import Path
 
+from claude_pm.agents import agent_loader
 from claude_pm.agents.agent_loader import (
     get_agent_prompt,
     get_agent_prompt_with_model_info,
@@ -26,6 +27,11 @@ from claude_pm.services.task_complexity_analyzer import ComplexityLevel, ModelTy
 class TestAgentLoaderModelSelection:
     """Test model selection functionality in agent_loader."""
     
+    @pytest.fixture(autouse=True)
+    def reset_complexity_analyzer(self, monkeypatch):
+        """Start each test without a cached analyzer so patched classes take effect."""
+        monkeypatch.setattr(agent_loader, '_complexity_analyzer', None)
+    
     @pytest.fixture
     def mock_prompt_content(self):
         """Mock agent prompt content."""
@@ -0,0 +1,103 @@
+"""
+Unit Tests for AgentKeywordParser
+=================================
+
+Tests the indexed fuzzy matching behind AgentKeywordParser: agreement with
+difflib.get_close_matches, the exact-match fast path, per-token memoization
+and parsing speed on paragraph-sized descriptions.
+"""
+
+import random
+import string
+import time
+from difflib import get_close_matches
+
+import pytest
+
+from claude_pm.core.agent_keyword_parser import AgentKeywordParser, FuzzyKeywordIndex
+
+PARAGRAPH = (
+    "We need to investigate why the nightly build started failing after the last dependency bump, "
+    "reproduce the problem locally, write a regression test that captures the failure, patch the "
+    "serializer so that timestamps keep their timezone information, and then update the changelog "
+    "and the release notes before we cut the next version and deploy it to the staging cluster."
+)
+
+
+def typo(word: str, rng: random.Random) -> str:
+    chars = list(word)
+    index = rng.randrange(len(chars))
+    if rng.random() < 0.5:
+        chars[index] = rng.choice(string.ascii_lowercase)
+    else:
+        chars.insert(index, rng.choice(string.ascii_lowercase))
+    return "".join(chars)
+
+
+class TestFuzzyKeywordIndex:
+    """Test the fuzzy keyword index on its own."""
+    
+    @pytest.mark.parametrize("cutoff", [0.0, 0.4, 0.6, 0.8, 1.0])
+    def test_matches_get_close_matches(self, cutoff):
+        """Same matches, in the same order, as difflib for typos and random tokens."""
+        rng = random.Random(11)
+        keywords = list(AgentKeywordParser().keyword_to_agent)
+        index = FuzzyKeywordIndex(keywords, cutoff=cutoff)
+        words = [typo(rng.choice(keywords), rng) for _ in range(150)]
+        words += ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(1, 10))) for _ in range(50)]
+        
+        for word in words:
+            for n in (1, 3):
+                assert index.close_matches(word, n=n) == get_close_matches(word, keywords, n=n, cutoff=cutoff)
+    
+    def test_memoizes_tokens(self):
+        """Repeated tokens are answered from the memo, which is bounded."""
+        index = FuzzyKeywordIndex(["deploy", "docker", "database"], cache_size=2)
+        
+        assert index.close_matches("deplyo") == ["deploy"]
+        assert index.close_matches("deplyo", n=1) == ["deploy"]
+        index.close_matches("dokcer")
+        index.close_matches("databse")
+        
+        assert index.cache_info() == {"hits": 1, "misses": 3, "size": 2, "max_size": 2}
+        index.clear_cache()
+        assert index.cache_info()["size"] == 0
+    
+    def test_rejects_invalid_cutoff(self):
+        with pytest.raises(ValueError):
+            FuzzyKeywordIndex(["deploy"], cutoff=1.5)
+
+
+class TestAgentKeywordParser:
+    """Test parsing with the indexed matcher."""
+    
+    @pytest.fixture
+    def parser(self):
+        return AgentKeywordParser()
+    
+    def test_parses_descriptions(self, parser):
+        assert parser.parse_task_description("implement user authentication") == "engineer"
+        assert parser.parse_task_description("run tests for the new feature") == "qa"
+        assert parser.parse_task_description("@security scan the codebase") == "security"
+        assert parser.parse_task_description("dokcer kuberntes deploymnt") == "ops"
+        assert parser.parse_task_description("") is None
+    
+    def test_exact_matches_skip_the_fuzzy_index(self, parser):
+        """Words that are keywords never reach the fuzzy index."""
+        parser.suggest_agent_type("deploy docker container to kubernetes")
+        
+        assert parser.fuzzy_index.cache_info()["misses"] == 1  # only "to"
+    
+    def test_repeated_words_count_each_occurrence(self, parser):
+        assert parser.suggest_agent_type("test test deploy") == [("qa", 4), ("ops", 2)]
+    
+    def test_paragraph_parsing_is_fast(self, parser):
+        """Once the paragraph's tokens are memoized, parsing it takes well under a millisecond."""
+        parser.parse_task_description(PARAGRAPH)
+        
+        started = time.perf_counter()
+        for _ in range(100):
+            parser.parse_task_description(PARAGRAPH)
+        elapsed = (time.perf_counter() - started) / 100
+        
+        assert elapsed < 0.001
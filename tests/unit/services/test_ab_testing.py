@@ -0,0 +1,155 @@
+"""
+Unit Tests for ABTester
+=======================
+
+Tests sequential A/B testing on synthetic scorers with known effect sizes:
+alpha-spending boundaries, early stopping, the false positive rate, and
+concurrent trial execution across prompts.
+"""
+
+import asyncio
+import random
+from datetime import datetime
+
+import pytest
+
+from claude_pm.services.prompt_validator import models
+from claude_pm.services.prompt_validator.ab_testing import ABTester, alpha_spent
+from claude_pm.services.prompt_validator.utils import t_test_p_value, two_sample_t_test
+
+SCENARIOS = [
+    models.TestScenario(
+        scenario_id=f"scenario_{i}", name=f"scenario {i}", description="synthetic", agent_type="qa",
+        task_description="synthetic task", expected_outputs=[], evaluation_criteria={}, test_data={}
+    )
+    for i in range(3)
+]
+
+
+class SyntheticExecutor:
+    """Scores each prompt from a normal distribution with a known mean."""
+    
+    def __init__(self, means, sd=0.1, seed=0, sleep=0.0):
+        self.means = means
+        self.sd = sd
+        self.rng = random.Random(seed)
+        self.sleep = sleep
+        self.in_flight = 0
+        self.max_in_flight = 0
+    
+    async def run_single_test_async(self, prompt_content, scenario, test_id):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.sleep)
+        finally:
+            self.in_flight -= 1
+        return models.TestResult(
+            test_id=test_id, scenario_id=scenario.scenario_id, prompt_version=prompt_content,
+            execution_time=self.sleep, success=True, score=self.rng.gauss(self.means[prompt_content], self.sd),
+            outputs={}, errors=[], metrics={}, timestamp=datetime.now()
+        )
+    
+    def track_active_test(self, test_id, test_info):
+        pass
+    
+    def update_test_status(self, test_id, status, error=None):
+        pass
+
+
+def make_tester(means, seed=0, sleep=0.0, **kwargs) -> ABTester:
+    tester = ABTester(**kwargs)
+    tester.executor = SyntheticExecutor(means, seed=seed, sleep=sleep)
+    return tester
+
+
+async def run(tester: ABTester, **kwargs) -> models.ABTestResult:
+    return await tester.run_ab_test("prompt_a", "A", "prompt_b", "B", SCENARIOS, **kwargs)
+
+
+class TestStatistics:
+    """Test the t-test and spending functions."""
+    
+    def test_two_sample_t_test(self):
+        t_statistic, df, p_value = two_sample_t_test([1, 2, 3, 4], [2, 3, 4, 5.5])
+        
+        assert (t_statistic, df) == (pytest.approx(1.13994, abs=1e-4), 6)
+        assert p_value == pytest.approx(0.29776, abs=1e-4)
+        assert t_test_p_value(2.228, 10) == pytest.approx(0.05, abs=1e-4)
+        assert two_sample_t_test([1, 1], [2, 2])[2] == 0.0
+    
+    @pytest.mark.parametrize("spending_function", ["obrien_fleming", "pocock"])
+    def test_alpha_spending(self, spending_function):
+        spent = [alpha_spent(k / 10, 0.05, spending_function) for k in range(11)]
+        
+        assert spent[0] == 0.0
+        assert spent[-1] == pytest.approx(0.05)
+        assert spent == sorted(spent)
+    
+    def test_obrien_fleming_spends_less_early(self):
+        assert alpha_spent(0.2, 0.05, "obrien_fleming") < alpha_spent(0.2, 0.05, "pocock")
+        with pytest.raises(ValueError):
+            ABTester(spending_function="bonferroni")
+
+
+class TestSequentialABTesting:
+    """Test group-sequential stopping on synthetic scorers."""
+    
+    @pytest.mark.asyncio
+    async def test_large_effect_stops_early(self):
+        tester = make_tester({"A": 0.6, "B": 0.75}, sequential=True, batch_size=5, max_sample_size=100)
+        
+        result = await run(tester)
+        
+        assert result.winner == "prompt_b"
+        assert result.sequential_analysis["stopped_early"]
+        assert len(result.prompt_a_results) == len(result.prompt_b_results) < 30
+        assert 0.0 <= result.confidence_level <= 1.0
+    
+    @pytest.mark.asyncio
+    async def test_losing_variant_is_detected(self):
+        tester = make_tester({"A": 0.8, "B": 0.6}, sequential=True, spending_function="pocock")
+        
+        result = await run(tester)
+        
+        assert result.winner == "prompt_a"
+        assert result.sequential_analysis["trials_per_prompt"] < 100
+    
+    @pytest.mark.asyncio
+    async def test_false_positive_rate_within_alpha(self):
+        """Without an effect, repeated looks still keep false positives under the significance threshold."""
+        false_positives = 0
+        random.seed(3)
+        for seed in range(200):
+            tester = make_tester({"A": 0.7, "B": 0.7}, seed=seed, sequential=True, batch_size=5, max_sample_size=50)
+            result = await run(tester)
+            false_positives += result.winner is not None
+            assert len(result.prompt_a_results) == 50 or result.winner is not None
+        
+        assert false_positives / 200 <= 0.05
+    
+    @pytest.mark.asyncio
+    async def test_sample_size_caps_sequential_budget(self):
+        tester = make_tester({"A": 0.7, "B": 0.7}, sequential=True, batch_size=4)
+        
+        result = await run(tester, sample_size=10)
+        
+        assert len(result.prompt_a_results) == 10
+        assert [look["trials_per_prompt"] for look in result.sequential_analysis["looks"]] == [4, 8, 10]
+
+
+class TestFixedABTesting:
+    """Test fixed-size tests."""
+    
+    @pytest.mark.asyncio
+    async def test_fixed_sample_size_runs_arms_concurrently(self):
+        tester = make_tester({"A": 0.7, "B": 0.7}, sleep=0.01, max_concurrency=4)
+        
+        result = await run(tester, sample_size=6)
+        
+        assert len(result.prompt_a_results) == len(result.prompt_b_results) == 6
+        assert result.sequential_analysis is None
+        assert tester.executor.max_in_flight == 4
+        assert [r.scenario_id for r in result.prompt_a_results] == [r.scenario_id for r in result.prompt_b_results]
+        assert 0.0 <= result.statistical_significance <= 1.0
+        assert 0.0 <= result.confidence_level <= 1.0
@@ -0,0 +1,152 @@
+"""
+Unit Tests for the SQLite Correction Store
+
+Tests indexed queries, batched inserts, statistics, cleanup, migration from
+the legacy JSON file layout and CorrectionCapture integration.
+"""
+
+import json
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from claude_pm.core.config import Config
+from claude_pm.services.correction_capture import CorrectionCapture, CorrectionData, CorrectionType
+from claude_pm.services.correction_store import SQLiteCorrectionStore
+
+
+def make_correction(index: int, agent_type: str = "engineer", severity: str = "medium",
+                    timestamp: datetime = None) -> CorrectionData:
+    timestamp = timestamp or datetime(2026, 1, 1) + timedelta(minutes=index)
+    return CorrectionData(
+        correction_id=f"corr_{index:06d}",
+        agent_type=agent_type,
+        original_response=f"response {index}",
+        user_correction=f"correction {index}",
+        context={"index": index},
+        correction_type=CorrectionType.CONTENT_CORRECTION,
+        timestamp=timestamp.isoformat(),
+        severity=severity
+    )
+
+
+class TestSQLiteCorrectionStore:
+    """Test SQLiteCorrectionStore behaviour."""
+    
+    @pytest.fixture
+    def store(self, tmp_path):
+        store = SQLiteCorrectionStore(tmp_path / "corrections.db")
+        yield store
+        store.close()
+    
+    def test_filtered_query_newest_first(self, store):
+        """Filters, ordering and limit are applied in SQL."""
+        agents = ["engineer", "qa", "documentation"]
+        store.add_many(
+            make_correction(i, agent_type=agents[i % 3], severity="high" if i % 5 == 0 else "low")
+            for i in range(300)
+        )
+        
+        results = store.query(agent_type="qa", severity="high", limit=5)
+        
+        assert [c.correction_id for c in results] == ["corr_000295", "corr_000280", "corr_000265",
+                                                      "corr_000250", "corr_000235"]
+        since = datetime(2026, 1, 1) + timedelta(minutes=290)
+        assert len(store.query(since=since)) == 10
+    
+    def test_queries_use_indexes(self, store):
+        """Agent-type and time filters are served by indexes, not table scans."""
+        plan = store._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT data FROM corrections WHERE agent_type = ? "
+            "AND timestamp >= ? ORDER BY timestamp DESC", ("qa", "2026")
+        ).fetchall()
+        
+        assert any("idx_corrections_agent_time" in row[-1] for row in plan)
+    
+    def test_buffered_inserts_flush_before_reads(self, tmp_path):
+        """Buffered corrections are written in batches and visible to queries."""
+        store = SQLiteCorrectionStore(tmp_path / "corrections.db", batch_size=100)
+        for i in range(150):
+            store.add(make_correction(i))
+        
+        assert len(store._pending) == 50
+        assert store.count() == 150
+        assert store._pending == []
+        store.close()
+    
+    def test_stats_and_cleanup(self, store):
+        """Aggregates come from GROUP BY queries; cleanup deletes by timestamp."""
+        store.add_many([make_correction(i, agent_type="qa" if i < 3 else "engineer") for i in range(10)])
+        
+        stats = store.get_stats()
+        removed = store.delete_older_than(datetime(2026, 1, 1) + timedelta(minutes=5))
+        
+        assert stats["agent_correction_counts"] == {"qa": 3, "engineer": 7}
+        assert removed == 5
+        assert store.count() == 5
+    
+    def test_migration_from_legacy_files(self, store, tmp_path):
+        """Legacy session files are imported once; hook files and corrupt files are skipped."""
+        session_dir = tmp_path / "corrections" / "session_abcd1234"
+        session_dir.mkdir(parents=True)
+        for i in range(4):
+            (session_dir / f"engineer_{i}.json").write_text(json.dumps(make_correction(i).to_dict()))
+        (session_dir / "hook_hook_x.json").write_text(json.dumps({"hook_id": "x"}))
+        (session_dir / "broken.json").write_text("{not json")
+        
+        first = store.migrate_from_files(tmp_path / "corrections")
+        second = store.migrate_from_files(tmp_path / "corrections")
+        
+        assert first == {"migrated": 4, "failed": 1, "skipped": False}
+        assert second["skipped"] is True
+        assert store.count() == 4
+    
+    def test_filtered_query_is_fast_at_scale(self, store):
+        """Filtered queries over tens of thousands of corrections stay in milliseconds."""
+        agents = [f"agent_{k}" for k in range(20)]
+        store.add_many(make_correction(i, agent_type=agents[i % 20]) for i in range(20000))
+        
+        start = time.perf_counter()
+        results = store.query(agent_type="agent_7", limit=20)
+        elapsed = time.perf_counter() - start
+        
+        assert len(results) == 20
+        assert elapsed < 0.05
+
+
+class TestCorrectionCaptureSQLiteBackend:
+    """Test CorrectionCapture on the SQLite backend."""
+    
+    def test_capture_migrates_and_queries(self, tmp_path):
+        """Existing JSON corrections are migrated and queried alongside new ones."""
+        legacy_dir = tmp_path / "corrections" / "session_legacy0"
+        legacy_dir.mkdir(parents=True)
+        legacy = make_correction(1, agent_type="qa", timestamp=datetime.now() - timedelta(days=1))
+        (legacy_dir / "qa_legacy.json").write_text(json.dumps(legacy.to_dict()))
+        
+        capture = CorrectionCapture(Config({
+            "correction_capture_enabled": True,
+            "evaluation_storage_path": str(tmp_path)
+        }))
+        new_id = capture.capture_correction(
+            agent_type="qa", original_response="a", user_correction="b", context={}
+        )
+        
+        assert capture.store is not None
+        assert [c.correction_id for c in capture.get_corrections(agent_type="qa")] == [new_id, legacy.correction_id]
+        assert capture.get_correction_stats()["total_corrections"] == 2
+        capture.store.close()
+    
+    def test_json_backend_still_available(self, tmp_path):
+        """correction_storage_backend='json' keeps the file-per-correction layout."""
+        capture = CorrectionCapture(Config({
+            "correction_capture_enabled": True,
+            "evaluation_storage_path": str(tmp_path),
+            "correction_storage_backend": "json"
+        }))
+        capture.capture_correction(agent_type="qa", original_response="a", user_correction="b", context={})
+        
+        assert capture.store is None
+        assert not (tmp_path / "corrections.db").exists()
+        assert len(list((tmp_path / "corrections").glob("session_*/*.json"))) == 1
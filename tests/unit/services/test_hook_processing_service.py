@@ -7,8 +7,10 @@ import pytest
 import pytest_asyncio
 import asyncio
 import json
+import random
+import re
 import time
-from datetime import datetime
+from datetime import datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 from typing import Dict, Any
 
@@ -18,6 +20,9 @@ from claude_pm.services.hook_processing_service import (
     HookMonitoringSystem, HookExecutionResult, ErrorDetectionResult,
     create_hook_processing_service
 )
+from claude_pm.services.hook_processing_service.log_index import _candidate_ranges, read_index, read_tail
+from claude_pm.services.hook_processing_service.log_summary import LatencySketch
+from claude_pm.services.hook_processing_service.logging import ProjectBasedHookLogger
 from claude_pm.services.hook_examples import (
     AgentIntegrationHooks, HookProcessingDemo, quick_error_analysis
 )
@@ -123,6 +128,86 @@ class TestErrorDetectionSystem:
         
         assert len(results) == 0
     
+    @pytest.mark.asyncio
+    async def test_single_pass_scan_matches_per_pattern_scan(self, error_detection_system):
+        """Test that the combined scan reports exactly what per-pattern scans would."""
+        transcript = """
+        Connection refused by server, then connection timeout
+        SUBPROCESS FAILED while Agent process terminated
+        Out of memory error; memory exhausted
+        Package version mismatch detected
+        """
+        
+        expected = []
+        for error_type, config in error_detection_system.error_patterns.items():
+            for pattern in config['patterns']:
+                for match in re.finditer(pattern, transcript, re.IGNORECASE | re.MULTILINE):
+                    expected.append((error_type, pattern, match.start(), match.group()))
+        
+        results = await error_detection_system.analyze_transcript(transcript)
+        actual = [
+            (r.error_type, r.details['matched_pattern'], r.details['position'], r.details['matched_text'])
+            for r in results
+        ]
+        
+        assert actual == expected
+    
+    @pytest.mark.asyncio
+    async def test_incremental_delta_across_boundary(self, error_detection_system):
+        """Test that streamed deltas detect errors split across chunks exactly once."""
+        chunks = ["Agent starting...\nConnection re", "fused by server\n", "all good\n", "Out of mem", "ory\n"]
+        
+        results = []
+        for chunk in chunks:
+            results.extend(await error_detection_system.analyze_transcript_delta('stream-1', chunk))
+        
+        full = await error_detection_system.analyze_transcript(''.join(chunks))
+        key = lambda r: (r.error_type, r.details['position'], r.details['matched_text'])
+        assert sorted(map(key, results)) == sorted(map(key, full))
+        assert any(r.details['matched_text'].lower() == 'connection refused' for r in results)
+        
+        error_detection_system.reset_transcript_stream('stream-1')
+        assert await error_detection_system.analyze_transcript_delta('stream-1', 'clean output') == []
+    
+    def test_incremental_greedy_patterns_match_full_scan(self, error_detection_system):
+        """Test that greedy patterns are not reported until the text they could extend is complete."""
+        rng = random.Random(11)
+        lines = [
+            "timeout waiting for agent, retrying agent later; agent gone",
+            "requires version 2.0 but found 1.0 but found nothing else",
+            "operation timed out before the agent replied to the agent",
+            "plain progress line without problems",
+        ]
+        transcript = "\n".join(rng.choice(lines) for _ in range(200)) + " timeout on agent"
+        full = asyncio.run(error_detection_system.analyze_transcript(transcript))
+        
+        for seed in range(5):
+            chunk_rng = random.Random(seed)
+            scanner = error_detection_system.create_incremental_scanner(max_lookback=200)
+            streamed = []
+            offset = 0
+            while offset < len(transcript):
+                step = chunk_rng.randint(1, 40)
+                streamed.extend(scanner.feed(transcript[offset:offset + step]))
+                offset += step
+            streamed.extend(scanner.finish())
+            
+            key = lambda r: (r.error_type, r.details['position'], r.details['matched_text'])
+            assert sorted(map(key, streamed)) == sorted(map(key, full))
+    
+    @pytest.mark.asyncio
+    async def test_transcript_streams_are_bounded(self, error_detection_system):
+        """Test that ending a stream flushes its last line and idle streams are evicted."""
+        assert await error_detection_system.analyze_transcript_delta('s', 'Out of memory') == []
+        results = await error_detection_system.end_transcript_stream('s')
+        assert [r.details['matched_text'] for r in results] == ['Out of memory']
+        assert 's' not in error_detection_system._incremental_scanners
+        
+        error_detection_system.MAX_TRANSCRIPT_STREAMS = 3
+        for stream_id in ['a', 'b', 'c', 'a', 'd']:
+            await error_detection_system.analyze_transcript_delta(stream_id, 'ok\n')
+        assert list(error_detection_system._incremental_scanners) == ['c', 'a', 'd']
+    
     @pytest.mark.asyncio
     async def test_agent_specific_errors(self, error_detection_system):
         """Test agent-specific error detection."""
@@ -267,6 +352,29 @@ class TestHookExecutionEngine:
         assert results[1].hook_id == 'hook2'  # Priority 2
         assert results[2].hook_id == 'hook3'  # Priority 1
     
+    @pytest.mark.asyncio
+    async def test_inline_hook_skips_executor(self, execution_engine):
+        """Test that inline sync hooks run on the event loop thread."""
+        import threading
+        loop_thread = threading.get_ident()
+        
+        def cheap_hook(context):
+            return threading.get_ident()
+        
+        hooks = [
+            HookConfiguration('inline_hook', HookType.PRE_TOOL_USE, cheap_hook, priority=2, inline=True),
+            HookConfiguration('offloaded_hook', HookType.PRE_TOOL_USE, cheap_hook, priority=1),
+        ]
+        
+        results = await execution_engine.execute_hooks_batch(hooks, {})
+        
+        assert [r.hook_id for r in results] == ['inline_hook', 'offloaded_hook']
+        assert results[0].result == loop_thread
+        assert results[0].metadata['dispatch_mode'] == 'inline'
+        assert results[1].result != loop_thread
+        assert results[1].metadata['dispatch_mode'] == 'executor'
+        assert execution_engine.get_execution_stats()['inline_executions'] == 1
+    
     def test_execution_stats(self, execution_engine):
         """Test execution statistics tracking."""
         stats = execution_engine.get_execution_stats()
@@ -375,6 +483,26 @@ class TestHookConfigurationSystem:
         enabled_hooks = config_system.get_hooks_by_type(HookType.ERROR_DETECTION)
         assert len([h for h in enabled_hooks if h.hook_id == 'status_test_hook']) == 0
     
+    def test_dispatch_plan_rebuilt_on_registration_change(self, config_system):
+        """Test that dispatch plans are cached and recompiled only on changes."""
+        async def async_handler(context):
+            return 'async'
+        
+        def sync_handler(context):
+            return 'sync'
+        
+        config_system.register_hook(HookConfiguration('low', HookType.PRE_TOOL_USE, sync_handler, priority=1))
+        config_system.register_hook(HookConfiguration('high', HookType.PRE_TOOL_USE, async_handler, priority=5))
+        
+        plan = config_system.get_dispatch_plan(HookType.PRE_TOOL_USE)
+        assert [(hook.hook_id, mode) for hook, mode in plan.entries] == [('high', 'async'), ('low', 'executor')]
+        assert config_system.get_dispatch_plan(HookType.PRE_TOOL_USE) is plan
+        
+        config_system.update_hook_status('low', False)
+        rebuilt = config_system.get_dispatch_plan(HookType.PRE_TOOL_USE)
+        assert rebuilt is not plan
+        assert [hook.hook_id for hook in rebuilt.hooks] == ['high']
+    
     def test_configuration_stats(self, config_system):
         """Test configuration statistics."""
         def test_handler(context):
@@ -479,6 +607,278 @@ class TestHookMonitoringSystem:
         assert len(monitoring_system.execution_history) == 50  # Should be limited
         # Should have most recent results
         assert monitoring_system.execution_history[-1].hook_id == 'hook_59'
+    
+    def test_incremental_statistics_match_history(self):
+        """Test that windowed statistics equal a rescan of the ring buffer."""
+        monitoring_system = HookMonitoringSystem(max_history=30)
+        severities = list(ErrorSeverity)
+        for i in range(200):
+            monitoring_system.record_execution(HookExecutionResult(
+                hook_id=f'hook_{i % 3}', success=(i * 7) % 5 != 0, execution_time=0.01 * (i % 11)
+            ))
+            monitoring_system.record_error_detection(ErrorDetectionResult(
+                error_detected=True, error_type=f'error_{i % 4}',
+                severity=severities[i % len(severities)], details={}
+            ))
+        
+        history = list(monitoring_system.execution_history)
+        errors = list(monitoring_system.error_history)
+        report = monitoring_system.get_performance_report()
+        
+        assert len(history) == 30
+        assert report['recent_statistics']['failure_rate'] == pytest.approx(
+            sum(not r.success for r in history) / len(history)
+        )
+        assert report['error_severity_distribution'] == {
+            severity.value: sum(e.severity == severity for e in errors) for severity in ErrorSeverity
+        }
+        assert {e['error_type']: e['count'] for e in report['top_errors']} == {
+            f'error_{k}': sum(e.error_type == f'error_{k}' for e in errors) for k in range(4)
+        }
+    
+    def test_per_hook_streaming_aggregates(self, monitoring_system):
+        """Test Welford mean/variance and quantiles per hook, independent of history size."""
+        import statistics
+        times = [0.05 * (i % 17) + 0.01 for i in range(500)]
+        for t in times:
+            monitoring_system.record_execution(HookExecutionResult(hook_id='streamed', success=True, execution_time=t))
+        
+        stats = monitoring_system.get_hook_stats('streamed')
+        
+        assert stats['count'] == 500
+        assert stats['mean_execution_time'] == pytest.approx(statistics.mean(times))
+        assert stats['stddev_execution_time'] == pytest.approx(statistics.stdev(times))
+        assert stats['p50_execution_time'] == pytest.approx(statistics.median(times), rel=0.02)
+        assert monitoring_system.get_stats()['history_size'] == 50
+
+
+class TestProjectBasedHookLogger:
+    """Test suite for buffered project-based hook logging."""
+    
+    @staticmethod
+    def _log(logger, count, hook_id='buffered_hook'):
+        hook_config = HookConfiguration(
+            hook_id=hook_id,
+            hook_type=HookType.PRE_TOOL_USE,
+            handler=lambda context: None
+        )
+        for i in range(count):
+            result = HookExecutionResult(hook_id=hook_id, success=True, execution_time=0.01, result=i)
+            logger.log_hook_execution(hook_config, result, {'iteration': i})
+        return logger._get_log_file_path(HookType.PRE_TOOL_USE, hook_id)
+    
+    def test_writes_are_deferred_and_batched(self, tmp_path):
+        """Test that logging returns before disk I/O and flush writes one batch."""
+        logger = ProjectBasedHookLogger(project_root=str(tmp_path), flush_interval=60)
+        log_file = self._log(logger, 50)
+        
+        assert not log_file.exists()
+        
+        assert logger.flush() is True
+        assert len(log_file.read_text().splitlines()) == 50
+        assert logger.writer.stats['batches_written'] == 1
+        assert len(logger.get_hook_logs(HookType.PRE_TOOL_USE, 'buffered_hook')) == 50
+        logger.close()
+    
+    def test_close_is_durable(self, tmp_path):
+        """Test that close writes every pending line and stops the writer."""
+        logger = ProjectBasedHookLogger(project_root=str(tmp_path), flush_interval=60)
+        log_file = self._log(logger, 200)
+        
+        logger.close()
+        
+        assert len(log_file.read_text().splitlines()) == 200
+        assert logger.writer._thread is None
+        
+        # Logging after close restarts the writer
+        self._log(logger, 1)
+        logger.flush()
+        assert len(log_file.read_text().splitlines()) == 201
+        logger.close()
+    
+    def test_size_threshold_flushes_without_request(self, tmp_path):
+        """Test that reaching flush_bytes writes without an explicit flush."""
+        logger = ProjectBasedHookLogger(project_root=str(tmp_path), flush_interval=60, flush_bytes=1)
+        log_file = self._log(logger, 1)
+        
+        deadline = time.monotonic() + 5
+        while not log_file.exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        
+        assert log_file.exists()
+        logger.close()
+    
+    def test_tail_read_returns_most_recent_entries(self, tmp_path):
+        """Test that recent-entry reads walk back from EOF across block boundaries."""
+        logger = ProjectBasedHookLogger(project_root=str(tmp_path), buffered=False)
+        log_file = self._log(logger, 300)
+        with log_file.open("a") as f:
+            f.write('{"partial": ')  # write in progress
+        
+        entries = read_tail(log_file, 25, block_size=256)
+        
+        all_entries = [json.loads(line) for line in log_file.read_text().splitlines()[:-1]]
+        assert entries == all_entries[-25:]
+        assert len(logger.get_hook_logs(HookType.PRE_TOOL_USE, 'buffered_hook', limit=1000)) == 300
+    
+    def test_time_range_query_uses_sparse_index(self, tmp_path):
+        """Test that range queries only read indexed blocks overlapping the range."""
+        logger = ProjectBasedHookLogger(project_root=str(tmp_path), flush_interval=60)
+        logger.writer.index.interval_bytes = 1024
+        hook_config = HookConfiguration(
+            hook_id='ranged_hook', hook_type=HookType.POST_TOOL_USE, handler=lambda context: None
+        )
+        base = datetime.combine(datetime.now().date(), datetime.min.time())
+        for minute in range(240):
+            result = HookExecutionResult(
+                hook_id='ranged_hook', success=True, execution_time=0.01,
+                timestamp=base + timedelta(minutes=minute)
+            )
+            logger.log_hook_execution(hook_config, result, {})
+        logger.close()
+        
+        log_file = logger._get_log_file_path(HookType.POST_TOOL_USE, 'ranged_hook')
+        start, end = base + timedelta(minutes=100), base + timedelta(minutes=109)
+        index = read_index(log_file)
+        ranges = _candidate_ranges(log_file, log_file.stat().st_size, start.timestamp(), end.timestamp())
+        
+        assert len(index) > 10
+        assert sum(finish - begin for begin, finish in ranges) < log_file.stat().st_size / 5
+        
+        entries = logger.get_hook_logs(HookType.POST_TOOL_USE, 'ranged_hook', start_time=start, end_time=end)
+        assert [e['timestamp'] for e in entries] == [
+            (base + timedelta(minutes=m)).isoformat() for m in range(100, 110)
+        ]
+    
+    def test_end_only_range_includes_earlier_days(self, tmp_path):
+        """Test that a range with only end_time reads every log dated up to that day."""
+        logger = ProjectBasedHookLogger(project_root=str(tmp_path), buffered=False)
+        hook_config = HookConfiguration(
+            hook_id='ranged_hook', hook_type=HookType.POST_TOOL_USE, handler=lambda context: None
+        )
+        today = datetime.now()
+        type_dir = logger.logs_dir / HookType.POST_TOOL_USE.value
+        for days_ago in (3, 1):
+            stamp = today - timedelta(days=days_ago)
+            entry = {'timestamp': stamp.isoformat(), 'hook_id': 'ranged_hook'}
+            (type_dir / f"ranged_hook_{stamp:%Y%m%d}.log").write_text(json.dumps(entry) + "\n")
+        (type_dir / f"ranged_hook_extra_{today:%Y%m%d}.log").write_text("{}\n")
+        logger.log_hook_execution(
+            hook_config, HookExecutionResult(hook_id='ranged_hook', success=True, execution_time=0.01), {}
+        )
+        
+        entries = logger.get_hook_logs(HookType.POST_TOOL_USE, 'ranged_hook', end_time=today - timedelta(days=1))
+        assert [e['timestamp'][:10] for e in entries] == [
+            (today - timedelta(days=days_ago)).date().isoformat() for days_ago in (3, 1)
+        ]
+        assert len(logger.get_hook_logs(HookType.POST_TOOL_USE, 'ranged_hook', end_time=datetime.now())) == 3
+    
+    def test_limited_range_query_stops_at_newest_files(self, tmp_path):
+        """Test that a limited range query reads logs newest first and never opens older ones."""
+        from claude_pm.services.hook_processing_service import logging as hook_logging
+        from claude_pm.services.hook_processing_service.log_index import read_range
+        
+        logger = ProjectBasedHookLogger(project_root=str(tmp_path), buffered=False)
+        today = datetime.now()
+        type_dir = logger.logs_dir / HookType.POST_TOOL_USE.value
+        for days_ago in (3, 2, 1):
+            stamp = today - timedelta(days=days_ago)
+            lines = [
+                json.dumps({'timestamp': (stamp + timedelta(seconds=i)).isoformat(), 'seq': i, 'pad': 'x' * 100})
+                for i in range(1000)
+            ]
+            (type_dir / f"paged_hook_{stamp:%Y%m%d}.log").write_text("\n".join(lines) + "\n")
+        newest = type_dir / f"paged_hook_{today - timedelta(days=1):%Y%m%d}.log"
+        
+        opened = []
+        def spy(log_file, *args, **kwargs):
+            opened.append(log_file.name)
+            return read_range(log_file, *args, **kwargs)
+        
+        with patch.object(hook_logging, 'read_range', side_effect=spy):
+            entries = logger.get_hook_logs(HookType.POST_TOOL_USE, 'paged_hook', end_time=today, limit=5)
+        assert opened == [newest.name]
+        assert [e['seq'] for e in entries] == [995, 996, 997, 998, 999]
+        
+        # Spanning files keeps chronological order; backwards block reads match a full scan
+        entries = logger.get_hook_logs(HookType.POST_TOOL_USE, 'paged_hook', end_time=today, limit=1500)
+        assert [e['seq'] for e in entries] == list(range(500, 1000)) + list(range(1000))
+        assert read_range(newest, limit=700) == read_range(newest)[-700:]
+    
+    def test_summary_maintained_and_resumed(self, tmp_path):
+        """Test that daily summaries update on write and survive a restart without log rescans."""
+        logger = ProjectBasedHookLogger(project_root=str(tmp_path), flush_interval=60)
+        self._log(logger, 8, hook_id='summary_hook')
+        failure = HookExecutionResult(hook_id='summary_hook', success=False, execution_time=0.5, error='boom')
+        logger.log_hook_execution(
+            HookConfiguration(hook_id='summary_hook', hook_type=HookType.PRE_TOOL_USE, handler=lambda c: None),
+            failure, {}
+        )
+        logger.log_error_detection(ErrorDetectionResult(
+            error_detected=True, error_type='network_issues', details={}, severity=ErrorSeverity.MEDIUM
+        ), {})
+        
+        summary = logger.get_log_summary()
+        assert summary['total_events'] == 9
+        assert summary['by_hook']['summary_hook']['failure'] == 1
+        assert summary['by_type']['pre_tool_use']['success'] == 8
+        assert summary['errors']['by_type'] == {'network_issues': 1}
+        logger.close()
+        
+        restarted = ProjectBasedHookLogger(project_root=str(tmp_path), flush_interval=60)
+        with patch('claude_pm.services.hook_processing_service.logging.read_tail') as read_tail_mock:
+            self._log(restarted, 1, hook_id='summary_hook')
+            resumed = restarted.get_log_summary()
+        read_tail_mock.assert_not_called()
+        assert resumed['by_hook']['summary_hook']['count'] == 10
+        assert resumed['latency']['max'] == 0.5
+        restarted.close()
+    
+    def test_summary_persist_is_current_and_serialized(self, tmp_path):
+        """Test that unbuffered writes persist the event just logged and concurrent persists keep the newest."""
+        import threading
+        logger = ProjectBasedHookLogger(project_root=str(tmp_path), buffered=False)
+        logger.summaries.persist_interval = 0
+        self._log(logger, 1, hook_id='summary_hook')
+        
+        summary_file = logger.summaries._path(datetime.now().strftime('%Y%m%d'))
+        assert json.loads(summary_file.read_text())['by_hook']['summary_hook']['count'] == 1
+        
+        def log_and_persist():
+            for _ in range(20):
+                self._log(logger, 1, hook_id='summary_hook')
+                logger.summaries.persist(force=True)
+        threads = [threading.Thread(target=log_and_persist) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert json.loads(summary_file.read_text())['by_hook']['summary_hook']['count'] == 81
+        assert list(summary_file.parent.glob('*.tmp')) == []
+    
+    def test_latency_sketch_quantiles(self):
+        """Test that the latency sketch stays within its relative error and merges."""
+        first, second = LatencySketch(), LatencySketch()
+        values = [i / 1000 for i in range(1, 2001)]
+        for value in values[:1000]:
+            first.add(value)
+        for value in values[1000:]:
+            second.add(value)
+        first.merge(LatencySketch.from_dict(json.loads(json.dumps(second.to_dict()))))
+        
+        assert first.count == 2000
+        for q in (0.5, 0.95, 0.99):
+            exact = values[int(q * (len(values) - 1))]
+            assert abs(first.quantile(q) - exact) / exact < 0.02
+    
+    def test_unbuffered_mode_writes_immediately(self, tmp_path):
+        """Test that buffered=False keeps synchronous writes."""
+        logger = ProjectBasedHookLogger(project_root=str(tmp_path), buffered=False)
+        log_file = self._log(logger, 3)
+        
+        assert logger.writer is None
+        assert len(log_file.read_text().splitlines()) == 3
 
 
 class TestHookProcessingService:
@@ -0,0 +1,183 @@
+"""
+Unit Tests for the SQLite Memory Backend
+
+Tests FlexibleMemoryService on the SQLite/FTS5 backend: persistence, ranked
+full-text search, metadata filters, batched writes and deletes.
+"""
+
+import time
+
+import pytest
+import pytest_asyncio
+
+from claude_pm.services.memory import (
+    FlexibleMemoryService, HealthStatus, MemoryCategory, MemoryQuery, RankingOptions
+)
+from claude_pm.services.memory.sqlite_backend import build_match_expression
+
+
+@pytest_asyncio.fixture
+async def memory_service(tmp_path):
+    service = FlexibleMemoryService({"sqlite_path": str(tmp_path / "memory.db")})
+    assert await service.initialize()
+    yield service
+    await service.cleanup()
+
+
+class TestSQLiteMemoryBackend:
+    """Test the SQLite memory backend through FlexibleMemoryService."""
+    
+    @pytest.mark.asyncio
+    async def test_add_and_search_ranked(self, memory_service):
+        """Text search uses FTS5 with stemming and ranks the best match first."""
+        await memory_service.add_memory("proj", "Deployment failed because the database migration timed out",
+                                        MemoryCategory.ERROR)
+        await memory_service.add_memory("proj", "Database migrations should run before deploying; database "
+                                        "migration scripts live in ops/", MemoryCategory.KNOWLEDGE)
+        await memory_service.add_memory("proj", "Chose pytest for the test suite", MemoryCategory.DECISION)
+        await memory_service.add_memory("other", "database migration notes", MemoryCategory.KNOWLEDGE)
+        
+        results = await memory_service.search_memories("proj", MemoryQuery("database migrations"))
+        
+        assert len(results) == 2
+        assert results[0].category == MemoryCategory.KNOWLEDGE
+        assert all(r.project_id == "proj" for r in results)
+        assert results[0].score >= results[1].score > 0
+    
+    @pytest.mark.asyncio
+    async def test_metadata_filters(self, memory_service):
+        """Category, tag and time filters are applied alongside text search."""
+        now = time.time()
+        await memory_service.add_memories("proj", [
+            {"content": "cache invalidation bug", "category": MemoryCategory.ERROR, "tags": ["Cache", "bug"],
+             "created_at": now - 7200},
+            {"content": "cache warmup decision", "category": MemoryCategory.DECISION, "tags": ["cache"],
+             "created_at": now - 60},
+            {"content": "cache sizing notes", "category": MemoryCategory.KNOWLEDGE, "metadata": {"tags": ["cache"]},
+             "created_at": now}
+        ])
+        
+        by_category = await memory_service.search_memories(
+            "proj", MemoryQuery("cache", categories=[MemoryCategory.ERROR, MemoryCategory.DECISION]))
+        by_tags = await memory_service.search_memories("proj", MemoryQuery("cache", tags=["cache", "bug"]))
+        recent = await memory_service.search_memories("proj", MemoryQuery("", since=now - 3600))
+        
+        assert {m.category for m in by_category} == {MemoryCategory.ERROR, MemoryCategory.DECISION}
+        assert [m.content for m in by_tags] == ["cache invalidation bug"]
+        assert by_tags[0].tags == ["bug", "cache"]
+        assert [m.content for m in recent] == ["cache sizing notes", "cache warmup decision"]
+    
+    @pytest.mark.asyncio
+    async def test_batched_writes_visible_to_reads_and_persisted(self, tmp_path):
+        """Buffered writes are flushed before searches and survive reopening."""
+        service = FlexibleMemoryService({"sqlite_path": str(tmp_path / "memory.db"), "batch_size": 50})
+        await service.initialize()
+        for i in range(60):
+            await service.add_memory("proj", f"note number {i} about retries", MemoryCategory.WORKFLOW)
+        
+        assert len(service.backend._pending) == 10
+        assert len(await service.search_memories("proj", MemoryQuery("retries", limit=100))) == 60
+        await service.add_memory("proj", "final retries note", MemoryCategory.WORKFLOW)
+        await service.cleanup()
+        
+        reopened = FlexibleMemoryService({"sqlite_path": str(tmp_path / "memory.db")})
+        await reopened.initialize()
+        assert await reopened.backend.count_memories("proj") == 61
+        await reopened.cleanup()
+    
+    @pytest.mark.asyncio
+    async def test_delete_removes_from_index(self, memory_service):
+        """Deleted memories disappear from full-text results."""
+        memory_id = await memory_service.add_memory("proj", "obsolete rollback procedure", MemoryCategory.WORKFLOW)
+        
+        assert (await memory_service.get_memory("proj", memory_id)).content == "obsolete rollback procedure"
+        assert await memory_service.delete_memory("proj", memory_id)
+        assert await memory_service.search_memories("proj", MemoryQuery("rollback")) == []
+        assert await memory_service.get_memory("proj", memory_id) is None
+    
+    @pytest.mark.asyncio
+    async def test_health_and_unavailable_backends(self, tmp_path):
+        """Unavailable backends in the chain fall through to SQLite."""
+        service = FlexibleMemoryService({"fallback_chain": ["mem0ai", "sqlite"],
+                                         "sqlite_path": str(tmp_path / "memory.db")})
+        await service.initialize()
+        await service.add_memory("proj", "health check", MemoryCategory.PROJECT)
+        
+        health = await service.get_health()
+        
+        assert service.backend.backend_name == "sqlite"
+        assert health.status == HealthStatus.HEALTHY
+        assert health.metrics["total_memories"] == 1
+        await service.cleanup()
+    
+    def test_match_expression_is_injection_safe(self):
+        """User text with FTS5 operators is quoted term by term."""
+        assert build_match_expression('deploy AND "prod" OR NEAR(x*') == '"deploy" "and" "prod" "or" "near" "x"'
+        assert build_match_expression("  ?!  ") is None
+        assert build_match_expression("deploy prod", match_all=False) == '"deploy" OR "prod"'
+
+
+class TestRankedSearch:
+    """Test bm25 ranking with category boosts, recency decay and match-any queries."""
+    
+    @pytest.mark.asyncio
+    async def test_category_boost_reorders_results(self, memory_service):
+        """A boosted category outranks an otherwise equally relevant memory."""
+        await memory_service.add_memory("proj", "flaky network timeout", MemoryCategory.KNOWLEDGE)
+        await memory_service.add_memory("proj", "flaky network timeout", MemoryCategory.ERROR)
+        
+        plain = await memory_service.search_memories("proj", MemoryQuery("timeout"))
+        boosted = await memory_service.search_memories("proj", MemoryQuery(
+            "timeout", ranking=RankingOptions(category_boosts={MemoryCategory.ERROR: 3.0})))
+        
+        assert plain[0].score == pytest.approx(plain[1].score)
+        assert boosted[0].category == MemoryCategory.ERROR
+        assert boosted[0].score == pytest.approx(3 * boosted[1].score)
+    
+    @pytest.mark.asyncio
+    async def test_recency_decay_and_horizon(self, memory_service):
+        """Scores halve every half-life; memories past the decay floor are skipped."""
+        now = time.time()
+        await memory_service.add_memories("proj", [
+            {"content": "cache eviction policy", "category": MemoryCategory.KNOWLEDGE, "created_at": now - age}
+            for age in (86400 * 30, 86400, 0)
+        ])
+        ranking = RankingOptions(recency_half_life_days=1.0, decay_floor=0.01)
+        
+        results = await memory_service.search_memories("proj", MemoryQuery("cache", ranking=ranking))
+        
+        assert [round(now - r.created_at) for r in results] == [0, 86400]
+        assert results[1].score == pytest.approx(results[0].score / 2, rel=1e-3)
+    
+    @pytest.mark.asyncio
+    async def test_match_any_drops_common_terms(self, memory_service):
+        """Match-any queries ignore terms present in most memories."""
+        await memory_service.add_memories("proj", [
+            {"content": f"project note {i} about builds", "category": MemoryCategory.PROJECT} for i in range(20)
+        ] + [{"content": "project rollback runbook", "category": MemoryCategory.WORKFLOW}])
+        
+        any_terms = await memory_service.search_memories(
+            "proj", MemoryQuery("projects rollback", match_all=False, limit=50))
+        all_terms = await memory_service.search_memories("proj", MemoryQuery("project builds", limit=50))
+        only_common = await memory_service.search_memories(
+            "proj", MemoryQuery("project projects", match_all=False, limit=50))
+        
+        assert [m.content for m in any_terms] == ["project rollback runbook"]
+        assert len(all_terms) == 20
+        assert len(only_common) == 21
+    
+    @pytest.mark.asyncio
+    async def test_top_k_matches_full_ranking(self, memory_service):
+        """The bounded top-k selection returns the head of the full ranking."""
+        await memory_service.add_memories("proj", [
+            {"content": "retry " * (1 + i % 7) + f"entry {i}", "category": MemoryCategory.WORKFLOW,
+             "created_at": time.time() - i * 3600}
+            for i in range(200)
+        ])
+        ranking = RankingOptions(recency_half_life_days=2.0)
+        
+        full = await memory_service.search_memories("proj", MemoryQuery("retry", limit=200, ranking=ranking))
+        top = await memory_service.search_memories("proj", MemoryQuery("retry", limit=5, ranking=ranking))
+        
+        assert [m.id for m in top] == [m.id for m in full[:5]]
+        assert [m.score for m in full] == sorted((m.score for m in full), reverse=True)
@@ -0,0 +1,102 @@
+"""
+Unit Tests for MetricSeries
+
+Tests the ring-buffer metric series behind EvaluationMetricsSystem: eviction,
+time-window queries, prefix-sum statistics and cleanup.
+"""
+
+import statistics
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from claude_pm.services.evaluation_metrics import MetricSeries, MetricType, TrendDirection
+
+
+def make_series(max_points: int = 1000) -> MetricSeries:
+    return MetricSeries(metric_name="overall_score", metric_type=MetricType.RESPONSE_QUALITY, max_points=max_points)
+
+
+class TestMetricSeries:
+    """Test MetricSeries storage and queries."""
+    
+    def test_ring_buffer_evicts_oldest(self):
+        """Only the newest max_points points are kept, oldest first."""
+        series = make_series(max_points=10)
+        for i in range(25):
+            series.add_point(float(i), {"index": i})
+        
+        assert len(series) == 10
+        assert [p.value for p in series.points] == [float(i) for i in range(15, 25)]
+        assert series.points[0].metadata == {"index": 15}
+    
+    def test_window_statistics_match_statistics_module(self):
+        """Window stats agree with a full recomputation, across wrap-around."""
+        series = make_series(max_points=40)
+        now = datetime.now()
+        kept = []
+        for i in range(130):
+            value = 1000.0 + (i * 37) % 23
+            timestamp = now - timedelta(minutes=130 - i)
+            series.add_point(value, timestamp=timestamp)
+            kept = (kept + [(timestamp, value)])[-40:]
+        
+        for hours in (0.25, 0.5, 1, 24):
+            cutoff = datetime.now() - timedelta(hours=hours)
+            expected = [v for t, v in kept if t >= cutoff]
+            stats = series.get_statistics(hours)
+            
+            assert stats["count"] == len(expected)
+            assert stats["mean"] == pytest.approx(statistics.mean(expected))
+            assert stats["median"] == statistics.median(expected)
+            assert stats["std_dev"] == pytest.approx(statistics.stdev(expected))
+            assert (stats["min"], stats["max"]) == (min(expected), max(expected))
+            assert len(series.get_recent_points(hours)) == len(expected)
+    
+    def test_trend(self):
+        """Trend compares first- and second-half window means."""
+        series = make_series()
+        for i in range(10):
+            series.add_point(50.0 + 5 * i)
+        
+        assert series.get_trend() == TrendDirection.IMPROVING
+        assert make_series().get_trend() == TrendDirection.UNKNOWN
+        assert make_series().get_statistics()["count"] == 0
+    
+    def test_discard_before(self):
+        """Cleanup drops old points without disturbing window sums."""
+        series = make_series(max_points=20)
+        now = datetime.now()
+        for i in range(30):
+            series.add_point(float(i), timestamp=now - timedelta(hours=30 - i))
+        
+        removed = series.discard_before(now - timedelta(hours=5, minutes=30))
+        
+        assert removed == 15
+        assert [p.value for p in series.points] == [25.0, 26.0, 27.0, 28.0, 29.0]
+        assert series.get_statistics(48)["mean"] == pytest.approx(27.0)
+    
+    def test_out_of_order_timestamps_stay_sorted(self):
+        """A point older than the newest is stored at the newest timestamp."""
+        series = make_series()
+        now = datetime.now()
+        series.add_point(1.0, timestamp=now)
+        series.add_point(2.0, timestamp=now - timedelta(hours=2))
+        
+        assert [p.value for p in series.get_recent_points(1)] == [1.0, 2.0]
+    
+    def test_polling_cost_independent_of_series_length(self):
+        """Adding points and polling a short window stays cheap on a full buffer."""
+        series = make_series(max_points=100_000)
+        start = datetime.now() - timedelta(days=7)
+        for i in range(100_000):
+            series.add_point(float(i % 100), timestamp=start + timedelta(seconds=6 * i))
+        
+        started = time.perf_counter()
+        for i in range(1_000):
+            series.add_point(50.0)
+            series.get_trend(1)
+        elapsed = time.perf_counter() - started
+        
+        assert elapsed < 0.5
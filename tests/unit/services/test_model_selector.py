@@ -0,0 +1,98 @@
+"""
+Unit Tests for ModelSelector
+============================
+
+Tests the memoized model selection decision table: cached lookups, rebuilds
+on configuration and environment changes, and explain mode.
+"""
+
+import pytest
+
+from claude_pm.services.model_selector import ModelSelectionCriteria, ModelSelector, ModelType
+
+
+@pytest.fixture
+def selector(monkeypatch):
+    for name in ("CLAUDE_PM_MODEL_OVERRIDE", "CLAUDE_PM_MODEL_ENGINEER", "CLAUDE_PM_MODEL_QA"):
+        monkeypatch.delenv(name, raising=False)
+    return ModelSelector(environment_check_interval=0.0)
+
+
+class TestModelSelectionTable:
+    """Test decision table lookups and invalidation."""
+    
+    def test_repeated_selection_hits_table(self, selector):
+        criteria = ModelSelectionCriteria(agent_type="qa", task_complexity="low")
+        
+        assert selector.select_model_for_agent("qa", criteria)[0] == ModelType.HAIKU
+        assert selector.select_model_for_agent("qa", criteria)[0] == ModelType.HAIKU
+        assert selector.select_model_for_agent("engineer")[0] == ModelType.OPUS_4
+        
+        info = selector.cache_info()
+        assert (info["hits"], info["misses"]) == (2, 1)
+    
+    def test_criteria_with_same_inputs_share_an_entry(self, selector):
+        """Fields that never decide (e.g. context length) do not split the table."""
+        first = ModelSelectionCriteria(agent_type="qa", reasoning_depth_required="deep")
+        second = ModelSelectionCriteria(agent_type="qa", reasoning_depth_required="deep", context_length_required=150000)
+        
+        selector.select_model_for_agent("qa", first)
+        
+        assert selector.explain_model_selection("qa", second)["cached"]
+    
+    def test_configuration_change_rebuilds_table(self, selector):
+        version = selector.config_version
+        selector.select_model_for_agent("qa")
+        
+        selector.set_agent_model("qa", ModelType.OPUS_4)
+        
+        assert selector.config_version == version + 1
+        assert selector.select_model_for_agent("qa")[0] == ModelType.OPUS_4
+        selector.set_environment_override("qa", ModelType.HAIKU)
+        assert selector.select_model_for_agent("qa")[0] == ModelType.HAIKU
+        selector.set_environment_override("qa", None)
+        assert selector.select_model_for_agent("qa")[0] == ModelType.OPUS_4
+    
+    def test_environment_change_is_detected(self, selector, monkeypatch):
+        version = selector.config_version
+        monkeypatch.setenv("CLAUDE_PM_MODEL_ENGINEER", ModelType.SONNET.value)
+        
+        assert selector.select_model_for_agent("engineer")[0] == ModelType.SONNET
+        assert selector.config_version == version + 1
+        
+        monkeypatch.delenv("CLAUDE_PM_MODEL_ENGINEER")
+        assert selector.select_model_for_agent("engineer")[0] == ModelType.OPUS_4
+    
+    def test_environment_checks_are_rate_limited(self, monkeypatch):
+        monkeypatch.delenv("CLAUDE_PM_MODEL_ENGINEER", raising=False)
+        selector = ModelSelector(environment_check_interval=3600)
+        monkeypatch.setenv("CLAUDE_PM_MODEL_ENGINEER", ModelType.SONNET.value)
+        
+        assert selector.select_model_for_agent("engineer")[0] == ModelType.OPUS_4
+        selector.reload_configuration()
+        assert selector.select_model_for_agent("engineer")[0] == ModelType.SONNET
+
+
+class TestExplainModelSelection:
+    """Test explain mode diagnostics."""
+    
+    def test_explains_each_source(self, selector, monkeypatch):
+        criteria = ModelSelectionCriteria(agent_type="qa", speed_priority=True)
+        
+        assert selector.explain_model_selection("engineer")["source"] == "agent_mapping"
+        assert selector.explain_model_selection("unknown_agent")["source"] == "fallback"
+        explanation = selector.explain_model_selection("qa", criteria)
+        assert explanation["source"] == "criteria"
+        assert explanation["rule"] == "speed_priority"
+        assert explanation["selected_model"] == ModelType.SONNET.value
+        
+        monkeypatch.setenv("CLAUDE_PM_MODEL_QA", ModelType.OPUS_4.value)
+        explanation = selector.explain_model_selection("qa", criteria)
+        assert (explanation["source"], explanation["rule"]) == ("environment_override", "CLAUDE_PM_MODEL_QA")
+    
+    def test_explain_matches_selection(self, selector):
+        for complexity in ("low", "medium", "high", "expert"):
+            criteria = ModelSelectionCriteria(agent_type="research", task_complexity=complexity)
+            model_type, _ = selector.select_model_for_agent("research", criteria)
+            
+            assert selector.explain_model_selection("research", criteria)["selected_model"] == model_type.value
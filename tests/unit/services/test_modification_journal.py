@@ -0,0 +1,190 @@
+"""
+Unit Tests for the Agent Modification Journal
+
+Tests the append-only journal behind PersistenceManager: per-record appends,
+replay on startup, torn-tail recovery, snapshot compaction and migration from
+the legacy modification_history.json layout.
+"""
+
+import json
+import time
+
+import pytest
+
+from claude_pm.services.agent_modification_tracker.models import (
+    AgentModification, ModificationHistory, ModificationTier, ModificationType
+)
+from claude_pm.services.agent_modification_tracker.persistence import PersistenceManager
+
+
+def make_modification(index: int, agent_name: str = "engineer") -> AgentModification:
+    return AgentModification(
+        modification_id=f"mod_{index:05d}",
+        agent_name=agent_name,
+        modification_type=ModificationType.MODIFY,
+        tier=ModificationTier.PROJECT,
+        file_path=f"/agents/{agent_name}.md",
+        timestamp=1_700_000_000.0 + index
+    )
+
+
+async def track(manager, history, active, modification):
+    """Mirror AgentModificationTracker.track_modification's bookkeeping."""
+    active[modification.modification_id] = modification
+    history.setdefault(modification.agent_name, ModificationHistory(modification.agent_name)).add_modification(
+        modification)
+    await manager.record_modification(modification)
+
+
+class TestModificationJournal:
+    """Test PersistenceManager's journal and snapshots."""
+    
+    @pytest.mark.asyncio
+    async def test_records_append_and_replay(self, tmp_path):
+        """Each modification is one journal line; reopening replays them."""
+        manager = PersistenceManager(tmp_path, fsync_batch_size=4)
+        history, active = {}, {}
+        for i in range(10):
+            await track(manager, history, active, make_modification(i, "qa" if i % 2 else "engineer"))
+        await manager.record_expired(["mod_00000"])
+        manager.close()
+        
+        lines = manager.journal_path().read_text().splitlines()
+        reloaded = PersistenceManager(tmp_path)
+        loaded_history, loaded_active = await reloaded.load_modification_history()
+        
+        assert len(lines) == 11
+        assert not manager.snapshot_file.exists()
+        assert loaded_history["qa"].total_modifications == 5
+        assert [m.modification_id for m in loaded_history["engineer"].modifications][:2] == ["mod_00000", "mod_00002"]
+        assert "mod_00000" not in loaded_active and len(loaded_active) == 9
+        assert reloaded.journal_records == 11
+    
+    @pytest.mark.asyncio
+    async def test_batched_fsync(self, tmp_path, monkeypatch):
+        """Journal records are fsynced in batches, not per record."""
+        synced = []
+        monkeypatch.setattr("claude_pm.services.agent_modification_tracker.persistence.os.fsync", synced.append)
+        manager = PersistenceManager(tmp_path, fsync_batch_size=8, fsync_interval=3600)
+        history, active = {}, {}
+        for i in range(20):
+            await track(manager, history, active, make_modification(i))
+        
+        assert len(synced) == 2
+        manager.close()
+        assert len(synced) == 3
+    
+    @pytest.mark.asyncio
+    async def test_unsynced_records_reach_the_file_and_sync_on_interval(self, tmp_path, monkeypatch):
+        """Every record is flushed to the file at once; a quiet journal is fsynced by the interval tick."""
+        synced = []
+        monkeypatch.setattr("claude_pm.services.agent_modification_tracker.persistence.os.fsync", synced.append)
+        manager = PersistenceManager(tmp_path, fsync_batch_size=100, fsync_interval=0.05)
+        history, active = {}, {}
+        await track(manager, history, active, make_modification(0))
+        
+        assert manager.journal_path().read_text().count("\n") == 1
+        manager.sync_if_due()
+        assert synced == []
+        
+        time.sleep(0.06)
+        manager.sync_if_due()
+        assert len(synced) == 1
+        manager.close()
+    
+    @pytest.mark.asyncio
+    async def test_torn_tail_is_discarded(self, tmp_path):
+        """A partially written last record is dropped and truncated on load."""
+        manager = PersistenceManager(tmp_path)
+        history, active = {}, {}
+        for i in range(3):
+            await track(manager, history, active, make_modification(i))
+        manager.close()
+        with open(manager.journal_path(), "a") as f:
+            f.write('{"op": "add", "modification": {"modif')
+        
+        reloaded = PersistenceManager(tmp_path)
+        loaded_history, _ = await reloaded.load_modification_history()
+        
+        assert loaded_history["engineer"].total_modifications == 3
+        assert reloaded.journal_path().read_text().count("\n") == 3
+        assert reloaded.journal_path().read_text().endswith("\n")
+    
+    @pytest.mark.asyncio
+    async def test_compaction_bounds_replay(self, tmp_path):
+        """Compaction folds the journal into a snapshot; loading replays only the tail."""
+        manager = PersistenceManager(tmp_path, compact_after=50)
+        history, active = {}, {}
+        for i in range(60):
+            await track(manager, history, active, make_modification(i))
+        
+        assert await manager.compact_if_needed(history, active)
+        for i in range(60, 65):
+            await track(manager, history, active, make_modification(i))
+        manager.close()
+        
+        reloaded = PersistenceManager(tmp_path)
+        loaded_history, loaded_active = await reloaded.load_modification_history()
+        
+        assert not manager.journal_path(0).exists()
+        assert reloaded.generation == 1
+        assert reloaded.journal_records == 5
+        assert loaded_history["engineer"].total_modifications == 65
+        assert len(loaded_active) == 65
+    
+    @pytest.mark.asyncio
+    async def test_interrupted_compaction_recovers(self, tmp_path):
+        """If the old journal outlives a new snapshot, it is ignored and removed."""
+        manager = PersistenceManager(tmp_path)
+        history, active = {}, {}
+        for i in range(5):
+            await track(manager, history, active, make_modification(i))
+        manager.close()
+        stale = manager.journal_path().read_bytes()
+        await manager.save_modification_history(history, active)
+        manager.journal_path(0).write_bytes(stale)
+        
+        reloaded = PersistenceManager(tmp_path)
+        loaded_history, _ = await reloaded.load_modification_history()
+        
+        assert loaded_history["engineer"].total_modifications == 5
+        assert not manager.journal_path(0).exists()
+    
+    @pytest.mark.asyncio
+    async def test_legacy_history_is_migrated(self, tmp_path):
+        """The old full-rewrite JSON files seed the first snapshot."""
+        (tmp_path / "history").mkdir(parents=True)
+        modification = make_modification(1, "qa")
+        (tmp_path / "history" / "modification_history.json").write_text(json.dumps({"qa": {
+            "agent_name": "qa", "total_modifications": 1, "first_seen": modification.timestamp,
+            "last_modified": modification.timestamp, "current_version": None,
+            "modifications": [modification.to_dict()]
+        }}))
+        (tmp_path / "active_modifications.json").write_text(
+            json.dumps({"mod_00001": make_modification(1, "qa").to_dict()}))
+        
+        manager = PersistenceManager(tmp_path)
+        history, active = await manager.load_modification_history()
+        
+        assert history["qa"].modifications[0].modification_id == "mod_00001"
+        assert list(active) == ["mod_00001"]
+        assert json.loads(manager.snapshot_file.read_text())["generation"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_append_cost_independent_of_history_size(self, tmp_path):
+        """Recording a modification costs the same with a large history on disk."""
+        manager = PersistenceManager(tmp_path, fsync_batch_size=1000, fsync_interval=3600, compact_after=10**6)
+        history, active = {}, {}
+        for i in range(5000):
+            await track(manager, history, active, make_modification(i))
+        await manager.save_modification_history(history, active)
+        snapshot_size = manager.snapshot_file.stat().st_size
+        
+        started = time.perf_counter()
+        for i in range(5000, 5200):
+            await manager.record_modification(make_modification(i))
+        elapsed = time.perf_counter() - started
+        manager.close()
+        
+        assert manager.snapshot_file.stat().st_size == snapshot_size
+        assert elapsed < 0.5
@@ -0,0 +1,160 @@
+"""
+Unit Tests for Incremental Pattern Clustering
+
+Tests IncrementalPatternClusterer (incremental assignment, drift-triggered
+refits) and PatternAnalyzer's use of it: clustering without scikit-learn,
+stable pattern IDs, and processing only corrections not seen before.
+"""
+
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from claude_pm.services.pattern_analyzer import PatternAnalyzer, pattern_id_for
+from claude_pm.services.pattern_clustering import IncrementalPatternClusterer
+
+THEMES = {
+    "format": "markdown formatting heading indentation",
+    "tests": "pytest assertion fixture coverage",
+    "deploy": "docker deployment container registry",
+}
+
+
+def make_correction(index: int, agent_type: str, error_type: str, theme: str):
+    return SimpleNamespace(
+        correction_id=f"corr_{index:05d}",
+        agent_type=agent_type,
+        error_type=error_type,
+        timestamp=datetime(2026, 1, 1) + timedelta(hours=index),
+        issue_description=f"{THEMES[theme]} problem {index % 3}",
+        correction_applied=f"fixed {THEMES[theme]}",
+        severity="high"
+    )
+
+
+def seed_clusterer(clusterer, patterns_per_theme: int = 4):
+    for theme, text in THEMES.items():
+        for i in range(patterns_per_theme):
+            clusterer.add_texts(f"{theme}_{i}", [f"{text} variant{i}"], agent_type=theme)
+
+
+class TestIncrementalPatternClusterer:
+    """Test the incremental clusterer on its own."""
+    
+    def test_new_pattern_joins_existing_cluster_without_refit(self):
+        """A point close to an existing theme is assigned incrementally."""
+        clusterer = IncrementalPatternClusterer(max_clusters=3)
+        seed_clusterer(clusterer)
+        assert clusterer.update()
+        
+        clusterer.add_texts("format_new", ["markdown heading formatting"], agent_type="format")
+        refit = clusterer.update()
+        
+        assert not refit
+        assert clusterer.stats == {"full_fits": 1, "incremental_updates": 1, "points_assigned": 1}
+        assert clusterer.assignments["format_new"] == clusterer.assignments["format_0"]
+        assert len(set(clusterer.assignments[f"{theme}_0"] for theme in THEMES)) == 3
+        assert clusterer.dominant_agent_type(clusterer.cluster_members()[clusterer.assignments["format_0"]]) == "format"
+    
+    def test_drift_triggers_full_refit(self):
+        """Points far from every centroid force a refit."""
+        clusterer = IncrementalPatternClusterer(max_clusters=3, drift_threshold=0.1)
+        seed_clusterer(clusterer)
+        clusterer.update()
+        
+        clusterer.add_texts("novel", ["kubernetes helm chart rollback"])
+        
+        assert clusterer.update()
+        assert clusterer.stats["full_fits"] == 2
+    
+    def test_large_change_triggers_full_refit(self):
+        """Once enough of the points changed, the clusters are refit."""
+        clusterer = IncrementalPatternClusterer(max_clusters=3, drift_threshold=10, recluster_fraction=0.5)
+        seed_clusterer(clusterer)
+        clusterer.update()
+        
+        for i in range(8):
+            clusterer.add_texts(f"tests_{i}", [THEMES["tests"]])
+        
+        assert clusterer.update()
+    
+    def test_cohesion(self):
+        """Cohesion is the mean pairwise cosine similarity."""
+        clusterer = IncrementalPatternClusterer()
+        clusterer.add_texts("a", ["alpha beta"])
+        clusterer.add_texts("b", ["alpha beta"])
+        clusterer.add_texts("c", ["gamma delta"])
+        clusterer.update()
+        
+        assert clusterer.cohesion(["a", "b"]) == pytest.approx(1.0)
+        assert clusterer.cohesion(["a", "c"]) == pytest.approx(0.0)
+
+
+class TestPatternAnalyzerClustering:
+    """Test PatternAnalyzer's incremental clustering path."""
+    
+    @pytest.fixture
+    def analyzer(self, tmp_path):
+        return PatternAnalyzer({"base_path": str(tmp_path / "pattern_analysis"), "min_pattern_frequency": 1,
+                                "max_clusters": 3})
+    
+    def make_corrections(self, count: int, start: int = 0):
+        kinds = [("Documentation", "format_error", "format"), ("QA", "test_failure", "tests"),
+                 ("Ops", "deploy_error", "deploy"), ("Documentation", "heading_error", "format")]
+        return [make_correction(i, *kinds[i % len(kinds)]) for i in range(start, start + count)]
+    
+    @pytest.mark.asyncio
+    async def test_clusters_without_sklearn(self, analyzer):
+        """Patterns with the same theme share a cluster; each pattern maps directly to its cluster."""
+        corrections = self.make_corrections(40)
+        patterns = await analyzer.analyze_correction_patterns(corrections)
+        clusters = await analyzer._cluster_patterns(patterns, corrections)
+        
+        format_ids = [pattern_id_for("Documentation", "format_error"), pattern_id_for("Documentation", "heading_error")]
+        
+        assert len(patterns) == 4
+        assert {p.pattern_id for p in patterns} == set(analyzer.pattern_cluster_map)
+        assert analyzer.pattern_cluster_map[format_ids[0]] is analyzer.pattern_cluster_map[format_ids[1]]
+        assert analyzer.pattern_cluster_map[format_ids[0]].dominant_agent_type == "Documentation"
+        assert sum(c.cluster_size for c in clusters) == 4
+    
+    @pytest.mark.asyncio
+    async def test_only_new_corrections_are_processed(self, analyzer):
+        """Re-analyzing a growing correction list only adds the new corrections."""
+        corrections = self.make_corrections(40)
+        await analyzer.analyze_correction_patterns(corrections)
+        counts = {p: sum(c.values()) for p, c in analyzer.pattern_clusterer.agent_counts.items()}
+        
+        await analyzer.analyze_correction_patterns(corrections + self.make_corrections(4, start=40))
+        
+        new_counts = {p: sum(c.values()) for p, c in analyzer.pattern_clusterer.agent_counts.items()}
+        assert sum(counts.values()) == 40
+        assert sum(new_counts.values()) == 44
+    
+    @pytest.mark.asyncio
+    async def test_corrections_match_their_patterns(self, analyzer):
+        """Trends and priorities find each pattern's corrections and cluster."""
+        corrections = self.make_corrections(40)
+        patterns = await analyzer.analyze_correction_patterns(corrections)
+        clusters = await analyzer._cluster_patterns(patterns, corrections)
+        trends = await analyzer._analyze_pattern_trends(patterns, corrections)
+        priorities = await analyzer.generate_improvement_priorities(patterns, clusters, trends)
+        
+        assert len(trends) == 4
+        assert all(p["cluster_id"] is not None for p in priorities)
+    
+    @pytest.mark.asyncio
+    async def test_incremental_analysis_is_fast(self, analyzer):
+        """Adding a handful of corrections to a large history stays cheap."""
+        corrections = self.make_corrections(4000)
+        patterns = await analyzer.analyze_correction_patterns(corrections)
+        await analyzer._cluster_patterns(patterns, corrections)
+        corrections += self.make_corrections(10, start=4000)
+        
+        started = time.perf_counter()
+        await analyzer._cluster_patterns(patterns, corrections)
+        elapsed = time.perf_counter() - started
+        
+        assert elapsed < 0.5
@@ -0,0 +1,158 @@
+"""
+Unit Tests for PerformanceBenchmarker
+=====================================
+
+Tests the concurrent benchmark mode: the bounded worker pool, warmup
+iterations, per-iteration wall and CPU time, confidence intervals and
+stopping once a target precision is reached.
+"""
+
+import asyncio
+import time
+from datetime import datetime
+
+import pytest
+
+from claude_pm.services.prompt_validator import models
+from claude_pm.services.prompt_validator.performance_benchmarking import PerformanceBenchmarker
+from claude_pm.services.prompt_validator.utils import mean_confidence_interval, t_critical_value, t_test_p_value
+
+
+def make_scenario(scenario_id: str) -> models.TestScenario:
+    return models.TestScenario(
+        scenario_id=scenario_id,
+        name=scenario_id,
+        description="benchmark scenario",
+        agent_type="Documentation",
+        task_description="benchmark task",
+        expected_outputs=[],
+        evaluation_criteria={},
+        test_data={}
+    )
+
+
+class FakeExecutor:
+    """Executor stand-in that sleeps (I/O) and optionally burns CPU."""
+    
+    def __init__(self, sleep: float = 0.05, busy: float = 0.0):
+        self.sleep = sleep
+        self.busy = busy
+        self.test_ids = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+    
+    async def run_single_test_async(self, prompt_content, scenario, test_id):
+        self.test_ids.append(test_id)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            deadline = time.thread_time() + self.busy
+            while time.thread_time() < deadline:
+                pass
+            await asyncio.sleep(self.sleep)
+        finally:
+            self.in_flight -= 1
+        return models.TestResult(
+            test_id=test_id, scenario_id=scenario.scenario_id, prompt_version=prompt_content[:50],
+            execution_time=0.0, success=True, score=0.9, outputs={}, errors=[],
+            metrics={"token_count": 100, "memory_usage": 50}, timestamp=datetime.now()
+        )
+
+
+def make_benchmarker(executor: FakeExecutor, **kwargs) -> PerformanceBenchmarker:
+    benchmarker = PerformanceBenchmarker(**kwargs)
+    benchmarker.executor = executor
+    return benchmarker
+
+
+class TestConfidenceIntervals:
+    """Test the t-interval helpers."""
+    
+    def test_t_critical_values(self):
+        assert t_critical_value(0.95, 1) == pytest.approx(12.706, abs=1e-3)
+        assert t_critical_value(0.95, 2) == pytest.approx(4.303, abs=1e-3)
+        assert t_critical_value(0.95, 5) == pytest.approx(2.571, abs=2e-3)
+        assert t_critical_value(0.95, 30) == pytest.approx(2.042, abs=1e-3)
+        assert t_critical_value(0.99, 10) == pytest.approx(3.169, abs=2e-3)
+    
+    def test_t_critical_values_at_high_confidence(self):
+        assert t_critical_value(0.999, 3) == pytest.approx(12.924, abs=1e-3)
+        assert t_critical_value(0.999, 5) == pytest.approx(6.869, abs=1e-3)
+        for df in (3, 7, 40):
+            assert t_test_p_value(t_critical_value(0.999, df), df) == pytest.approx(0.001, rel=1e-8)
+    
+    def test_mean_confidence_interval(self):
+        ci = mean_confidence_interval([1.0, 2.0, 3.0, 4.0, 5.0])
+        
+        assert ci["mean"] == 3.0
+        assert ci["margin"] == pytest.approx(1.963, abs=2e-3)
+        assert ci["lower"] < 3.0 < ci["upper"]
+        assert mean_confidence_interval([1.0]) is None
+
+
+class TestPerformanceBenchmarker:
+    """Test benchmark execution."""
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_iterations_are_bounded(self):
+        executor = FakeExecutor(sleep=0.05)
+        benchmarker = make_benchmarker(executor, max_concurrency=4)
+        
+        results = await benchmarker.run_performance_benchmark(
+            "perf", "prompt", [make_scenario("a"), make_scenario("b")], iterations=8
+        )
+        
+        assert executor.max_in_flight == 4
+        assert results["performance_metrics"]["total_iterations"] == 16
+        assert results["performance_metrics"]["wall_clock_time"] < 16 * 0.05 / 2
+        assert [r["iteration"] for r in results["results"][0]["results"]] == list(range(8))
+    
+    @pytest.mark.asyncio
+    async def test_sequential_by_default(self):
+        executor = FakeExecutor(sleep=0.01)
+        results = await make_benchmarker(executor).run_performance_benchmark(
+            "perf", "prompt", [make_scenario("a")], iterations=3
+        )
+        
+        assert executor.max_in_flight == 1
+        assert results["iterations_per_scenario"] == 3
+        assert results["results"][0]["avg_execution_time"] >= 0.01
+    
+    @pytest.mark.asyncio
+    async def test_warmups_excluded_from_stats(self):
+        executor = FakeExecutor(sleep=0.01)
+        benchmarker = make_benchmarker(executor, warmup_iterations=2)
+        
+        results = await benchmarker.run_performance_benchmark("perf", "prompt", [make_scenario("a")], iterations=4)
+        
+        assert len(executor.test_ids) == 6
+        assert all("_warmup_" in test_id for test_id in executor.test_ids[:2])
+        assert results["results"][0]["iterations"] == 4
+        assert results["warmup_iterations"] == 2
+    
+    @pytest.mark.asyncio
+    async def test_cpu_time_is_per_iteration(self):
+        """Concurrent iterations do not count each other's CPU time."""
+        executor = FakeExecutor(sleep=0.05, busy=0.02)
+        benchmarker = make_benchmarker(executor, max_concurrency=4)
+        
+        results = await benchmarker.run_performance_benchmark("perf", "prompt", [make_scenario("a")], iterations=4)
+        
+        for iteration in results["results"][0]["results"]:
+            assert 0.015 < iteration["cpu_time"] < 0.04
+            assert iteration["execution_time"] > iteration["cpu_time"]
+        assert results["results"][0]["cpu_time_ci"] is not None
+    
+    @pytest.mark.asyncio
+    async def test_stops_at_target_precision(self):
+        executor = FakeExecutor(sleep=0.02)
+        benchmarker = make_benchmarker(executor, max_concurrency=5, min_iterations=5)
+        
+        results = await benchmarker.run_performance_benchmark(
+            "perf", "prompt", [make_scenario("a")], iterations=100, target_precision=0.25
+        )
+        scenario = results["results"][0]
+        
+        assert scenario["precision_reached"]
+        assert scenario["iterations"] < 100
+        assert scenario["execution_time_ci"]["relative_margin"] <= 0.25
@@ -0,0 +1,198 @@
+"""
+Unit Tests for the Prompt Validator Result Store
+
+Tests the indexed test result store behind StorageManager: incremental
+indexing of reports and A/B tests, range and per-prompt queries, indexing of
+pre-existing result files and cleanup.
+"""
+
+import json
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from claude_pm.services.prompt_validator.models import ABTestResult, TestResult, ValidationReport
+from claude_pm.services.prompt_validator.result_store import ResultStore
+from claude_pm.services.prompt_validator.storage import StorageManager
+
+START = datetime(2026, 3, 1)
+
+
+def make_result(index: int, prompt_version: str = "prompt_a", scenario_id: str = "scenario_1",
+                timestamp: datetime = None) -> TestResult:
+    return TestResult(
+        test_id=f"test_{index}",
+        scenario_id=scenario_id,
+        prompt_version=prompt_version,
+        execution_time=0.1 * (index % 10 + 1),
+        success=index % 4 != 0,
+        score=50.0 + index % 50,
+        outputs={"index": index},
+        errors=[],
+        metrics={},
+        timestamp=timestamp or START + timedelta(hours=index)
+    )
+
+
+def make_report(report_id: str, prompt_id: str, results) -> ValidationReport:
+    return ValidationReport(
+        report_id=report_id, prompt_id=prompt_id, prompt_version=prompt_id, validation_type="validation",
+        total_tests=len(results), passed_tests=0, failed_tests=0, overall_score=0.0,
+        test_results=list(results), recommendations=[], timestamp=results[-1].timestamp
+    )
+
+
+class TestPromptResultStore:
+    """Test StorageManager's indexed result queries."""
+    
+    @pytest.fixture
+    def storage(self, tmp_path):
+        manager = StorageManager(str(tmp_path / "prompt_validation"))
+        yield manager
+        manager.result_store.close()
+    
+    @pytest.mark.asyncio
+    async def test_range_and_prompt_queries(self, storage):
+        """Reports and both A/B sides are indexed; queries filter by time, prompt and scenario."""
+        await storage.save_validation_report(make_report("report_1", "prompt_a", [
+            make_result(i, scenario_id=f"scenario_{i % 2}") for i in range(10)
+        ]))
+        await storage.save_ab_test_result(ABTestResult(
+            test_id="ab_1", prompt_a_id="prompt_a", prompt_b_id="prompt_b", scenarios_tested=1,
+            prompt_a_results=[make_result(20)], prompt_b_results=[make_result(21, "prompt_b")],
+            statistical_significance=0.0, winner=None, confidence_level=0.0, improvement_metrics={},
+            timestamp=START + timedelta(hours=21)
+        ))
+        
+        recent = await storage.load_test_results_since(START + timedelta(hours=8))
+        window = await storage.load_test_results_since(START + timedelta(hours=2), START + timedelta(hours=5))
+        prompt_b = await storage.load_test_results_since(START, prompt_id="prompt_b")
+        scenario = await storage.load_test_results_since(START, prompt_id="prompt_a", scenario_id="scenario_1")
+        
+        assert [r.test_id for r in recent] == ["test_8", "test_9", "test_20", "test_21"]
+        assert [r.test_id for r in window] == ["test_2", "test_3", "test_4"]
+        assert [r.prompt_version for r in prompt_b] == ["prompt_b"]
+        assert [r.test_id for r in scenario] == ["test_1", "test_3", "test_5", "test_7", "test_9", "test_20"]
+        assert isinstance(recent[0].timestamp, datetime)
+    
+    @pytest.mark.asyncio
+    async def test_resaving_report_replaces_rows(self, storage):
+        """Saving a report again does not duplicate its indexed results."""
+        await storage.save_validation_report(make_report("report_1", "prompt_a", [make_result(i) for i in range(5)]))
+        await storage.save_validation_report(make_report("report_1", "prompt_a", [make_result(i) for i in range(3)]))
+        
+        assert storage.result_store.count() == 3
+    
+    @pytest.mark.asyncio
+    async def test_ab_test_of_one_prompt_keeps_both_arms(self, storage):
+        """Both arms are indexed, and re-saved without duplicates, when they test the same prompt."""
+        ab_result = ABTestResult(
+            test_id="ab_same", prompt_a_id="prompt_a", prompt_b_id="prompt_a", scenarios_tested=1,
+            prompt_a_results=[make_result(1), make_result(2)], prompt_b_results=[make_result(3)],
+            statistical_significance=0.0, winner=None, confidence_level=0.0, improvement_metrics={},
+            timestamp=START + timedelta(hours=3)
+        )
+        await storage.save_ab_test_result(ab_result)
+        await storage.save_ab_test_result(ab_result)
+        
+        results = await storage.load_test_results_since(START, prompt_id="prompt_a")
+        assert [r.test_id for r in results] == ["test_1", "test_2", "test_3"]
+    
+    def test_version_1_store_is_upgraded(self, tmp_path):
+        """A store created before the arm column gains it and re-indexes A/B test files."""
+        import sqlite3
+        base = tmp_path / "prompt_validation"
+        base.mkdir()
+        conn = sqlite3.connect(str(base / "results.db"))
+        conn.executescript("""
+            CREATE TABLE test_results (
+                id INTEGER PRIMARY KEY, source_type TEXT NOT NULL, source_id TEXT NOT NULL,
+                test_id TEXT NOT NULL, prompt_id TEXT NOT NULL, prompt_version TEXT NOT NULL,
+                scenario_id TEXT NOT NULL, success INTEGER NOT NULL, score REAL NOT NULL,
+                execution_time REAL NOT NULL, timestamp REAL NOT NULL, data TEXT NOT NULL
+            );
+            CREATE INDEX idx_results_source ON test_results (source_id, source_type, prompt_id);
+            CREATE TABLE store_metadata (key TEXT PRIMARY KEY, value TEXT);
+            INSERT INTO store_metadata VALUES ('files_indexed_at', '2026-03-01T00:00:00');
+            INSERT INTO test_results VALUES (1, 'ab_test', 'ab_old', 'stale', 'prompt_a', 'prompt_a',
+                                             'scenario_1', 1, 1.0, 0.1, 0, '{}');
+        """)
+        conn.close()
+        (base / "ab_tests").mkdir()
+        (base / "ab_tests" / "ab_old.json").write_text(json.dumps({
+            "test_id": "ab_old", "prompt_a_id": "prompt_a", "prompt_b_id": "prompt_a",
+            "prompt_a_results": [{**make_result(1).__dict__, "timestamp": START.isoformat()}],
+            "prompt_b_results": [{**make_result(2).__dict__, "timestamp": START.isoformat()}]
+        }))
+        
+        storage = StorageManager(str(base))
+        rows = storage.result_store._conn.execute("SELECT arm, test_id FROM test_results ORDER BY arm").fetchall()
+        storage.result_store.close()
+        
+        assert rows == [("a", "test_1"), ("b", "test_2")]
+    
+    def test_existing_files_are_indexed_once(self, tmp_path):
+        """Reports written before the index existed are picked up on first open."""
+        reports = tmp_path / "prompt_validation" / "reports"
+        reports.mkdir(parents=True)
+        results = [make_result(i) for i in range(4)]
+        report = make_report("legacy", "prompt_a", results)
+        (reports / "legacy.json").write_text(json.dumps({
+            "report_id": report.report_id, "prompt_id": report.prompt_id,
+            "timestamp": report.timestamp.isoformat(),
+            "test_results": [{**r.__dict__, "timestamp": r.timestamp.isoformat()} for r in results]
+        }))
+        
+        first = StorageManager(str(tmp_path / "prompt_validation"))
+        count = first.result_store.count()
+        first.result_store.close()
+        second = StorageManager(str(tmp_path / "prompt_validation"))
+        
+        assert count == 4
+        assert second.result_store.count() == 4
+        second.result_store.close()
+    
+    def test_queries_use_indexes(self, tmp_path):
+        """Per-prompt range queries are served by the (prompt_id, timestamp) index."""
+        store = ResultStore(tmp_path / "results.db")
+        plan = store._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT data FROM test_results WHERE prompt_id = ? AND timestamp >= ? "
+            "ORDER BY timestamp", ("prompt_a", 0)
+        ).fetchall()
+        store.close()
+        
+        assert any("idx_results_prompt_time" in row[-1] for row in plan)
+    
+    def test_range_query_is_fast_over_months_of_history(self, tmp_path):
+        """A one-week, one-prompt query over six months of results reads only its rows."""
+        store = ResultStore(tmp_path / "results.db")
+        prompts = [f"prompt_{k}" for k in range(10)]
+        for day in range(180):
+            for k, prompt in enumerate(prompts):
+                store.add_results("report", f"report_{day}_{k}", prompt, [
+                    make_result(i, prompt, timestamp=START + timedelta(days=day, minutes=i)) for i in range(20)
+                ])
+        
+        started = time.perf_counter()
+        results = store.query(since=START + timedelta(days=100), until=START + timedelta(days=107),
+                              prompt_id="prompt_3")
+        elapsed = time.perf_counter() - started
+        
+        assert store.count() == 36000
+        assert len(results) == 140
+        assert elapsed < 0.05
+        store.close()
+    
+    @pytest.mark.asyncio
+    async def test_cleanup_removes_old_rows(self, storage):
+        """cleanup_old_data also prunes the result index."""
+        await storage.save_validation_report(make_report("old", "prompt_a", [
+            make_result(1, timestamp=datetime.now() - timedelta(days=200)),
+            make_result(2, timestamp=datetime.now())
+        ]))
+        
+        await storage.cleanup_old_data(days_to_keep=90)
+        
+        assert [r.test_id for r in await storage.load_test_results_since(datetime.now() - timedelta(days=365))] == [
+            "test_2"]
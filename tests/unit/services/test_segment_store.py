@@ -0,0 +1,199 @@
+"""
+Unit Tests for the Segmented Record Store
+
+Tests segment rotation, index-pruned queries, sidecar reuse, torn-write
+recovery, retention, legacy file import and stores sharing a directory.
+"""
+
+import json
+import subprocess
+import sys
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from claude_pm.services.segment_store import SegmentedRecordStore
+
+BASE_TIME = datetime(2026, 3, 1, 12, 0, 0)
+
+
+def make_record(index: int, agent_type: str = "engineer", minutes: int = None) -> dict:
+    timestamp = BASE_TIME + timedelta(minutes=index if minutes is None else minutes)
+    return {
+        "evaluation_id": f"eval_{index:06d}",
+        "correction_id": f"corr_{index:06d}" if index % 2 == 0 else None,
+        "agent_type": agent_type,
+        "overall_score": float(index % 100),
+        "timestamp": timestamp.isoformat()
+    }
+
+
+class TestSegmentedRecordStore:
+    """Test SegmentedRecordStore behaviour."""
+    
+    @pytest.fixture
+    def store(self, tmp_path):
+        store = SegmentedRecordStore(tmp_path, "integration", lookup_field="correction_id",
+                                     max_segment_bytes=4096)
+        yield store
+        store.close()
+    
+    def test_rotation_and_newest_first_query(self, store, tmp_path):
+        """Records rotate into sealed segments and queries return newest first."""
+        agents = ["engineer", "qa", "ops"]
+        store.append_many(make_record(i, agents[i % 3]) for i in range(300))
+        
+        results = store.query(key="qa", limit=3)
+        
+        assert len(list(tmp_path.glob("integration-*.jsonl"))) > 5
+        assert len(list(tmp_path.glob("integration-*.idx"))) == len(list(tmp_path.glob("integration-*.jsonl"))) - 1
+        assert [r["evaluation_id"] for r in results] == ["eval_000298", "eval_000295", "eval_000292"]
+        assert len(store.query(since=BASE_TIME + timedelta(minutes=290))) == 10
+        assert store.count() == 300
+        assert store.count("ops") == 100
+    
+    def test_queries_read_only_matching_segments(self, store):
+        """Segments without the key or outside the time range are never opened."""
+        store.append_many(make_record(i, "engineer") for i in range(200))
+        store.append_many(make_record(200 + i, "documentation") for i in range(5))
+        
+        with patch.object(store, "_read_segment", wraps=store._read_segment) as reader:
+            results = store.query(key="documentation")
+        
+        assert len(results) == 5
+        assert reader.call_count == sum(1 for s in store._segments if "documentation" in s.key_counts)
+        assert reader.call_count < len(store._segments) // 2
+        
+        with patch.object(store, "_read_segment", wraps=store._read_segment) as reader:
+            store.query(key="engineer", limit=5)
+        
+        assert reader.call_count == 1
+    
+    def test_out_of_order_records_are_found(self, store):
+        """Late-arriving older records are still returned in timestamp order."""
+        store.append_many(make_record(i) for i in range(100))
+        store.append(make_record(1000, minutes=-5))
+        
+        oldest = store.query(until=BASE_TIME)
+        
+        assert [r["evaluation_id"] for r in oldest] == ["eval_000000", "eval_001000"]
+    
+    def test_reopen_uses_sidecars_and_recovers_torn_write(self, store, tmp_path):
+        """Reopening loads sealed indexes without scanning and skips a torn final line."""
+        store.append_many(make_record(i) for i in range(100))
+        store.close()
+        active = sorted(tmp_path.glob("integration-*.jsonl"))[-1]
+        with open(active, "ab") as f:
+            f.write(b'{"agent_type": "engineer", "timest')
+        
+        with patch.object(SegmentedRecordStore, "_scan_segment", autospec=True,
+                          side_effect=SegmentedRecordStore._scan_segment) as scanner:
+            reopened = SegmentedRecordStore(tmp_path, "integration", lookup_field="correction_id",
+                                            max_segment_bytes=4096)
+        reopened.append(make_record(100))
+        
+        assert scanner.call_count == 1
+        assert reopened.count() == 101
+        assert reopened.query(limit=1)[0]["evaluation_id"] == "eval_000100"
+        assert reopened.contains("corr_000042")
+        assert not reopened.contains("corr_000043")
+        reopened.close()
+    
+    def test_drop_before_removes_whole_segments(self, store):
+        """Retention removes sealed segments entirely older than the cutoff."""
+        store.append_many(make_record(i) for i in range(300))
+        before = store.get_stats()["segments"]
+        
+        summary = store.drop_before(BASE_TIME + timedelta(minutes=150))
+        
+        assert summary["removed_segments"] > 0
+        assert store.get_stats()["segments"] == before - summary["removed_segments"]
+        assert store.count() == 300 - summary["removed_records"]
+        assert all(r["timestamp"] >= (BASE_TIME + timedelta(minutes=100)).isoformat()
+                   for r in store.query(since=BASE_TIME - timedelta(days=1)))
+        assert len(store.query(since=BASE_TIME + timedelta(minutes=150))) == 150
+    
+    def test_legacy_import_runs_once(self, tmp_path):
+        """Legacy one-file-per-record data is imported once and then ignored."""
+        for i in range(5):
+            (tmp_path / f"integration_20260301_{i}.json").write_text(json.dumps(make_record(i)))
+        (tmp_path / "integration_20260301_bad.json").write_text("{broken")
+        store = SegmentedRecordStore(tmp_path, "integration")
+        
+        first = store.import_legacy_files("integration_*.json")
+        second = store.import_legacy_files("integration_*.json")
+        
+        assert first == {"imported": 5, "failed": 1, "skipped": False}
+        assert second["skipped"] is True
+        assert [r["evaluation_id"] for r in store.query(limit=2)] == ["eval_000004", "eval_000003"]
+        store.close()
+
+
+class TestSharedDirectory:
+    """Test several stores on one directory."""
+    
+    def test_two_instances_see_each_others_records(self, tmp_path):
+        """Interleaved appends and rotations from two stores lose nothing."""
+        first = SegmentedRecordStore(tmp_path, "integration", max_segment_bytes=2048)
+        second = SegmentedRecordStore(tmp_path, "integration", max_segment_bytes=2048)
+        
+        for i in range(200):
+            (first if i % 3 else second).append(make_record(i, ["engineer", "qa"][i % 2]))
+        
+        for store in (first, second):
+            assert store.count() == 200
+            assert [r["evaluation_id"] for r in store.query(key="qa", limit=2)] == ["eval_000199", "eval_000197"]
+            assert len(store.query()) == 200
+        segments = sorted(tmp_path.glob("integration-*.jsonl"))
+        assert len(segments) > 5
+        assert sum(1 for path in segments for _ in open(path)) == 200
+        
+        first.drop_before(BASE_TIME + timedelta(minutes=100))
+        assert second.count() == len(second.query()) == first.count()
+        first.close()
+        second.close()
+    
+    def test_in_progress_line_is_not_truncated(self, tmp_path):
+        """A partial line written by another writer is left alone by readers and opens."""
+        writer = SegmentedRecordStore(tmp_path, "integration")
+        writer.append(make_record(0))
+        active = sorted(tmp_path.glob("integration-*.jsonl"))[-1]
+        partial = json.dumps(make_record(1)) + "\n"
+        with open(active, "ab") as f:
+            f.write(partial[:20].encode())
+            f.flush()
+            
+            reader = SegmentedRecordStore(tmp_path, "integration")
+            assert reader.count() == 1
+            
+            f.write(partial[20:].encode())
+        
+        assert reader.count() == 2
+        assert [r["evaluation_id"] for r in reader.query()] == ["eval_000001", "eval_000000"]
+        writer.append(make_record(2))
+        assert reader.count() == 3
+        writer.close()
+        reader.close()
+    
+    def test_concurrent_processes(self, tmp_path):
+        """Stores in separate processes append to one directory without loss."""
+        script = (
+            "import sys; from pathlib import Path\n"
+            "from claude_pm.services.segment_store import SegmentedRecordStore\n"
+            "store = SegmentedRecordStore(Path(sys.argv[1]), 'integration', max_segment_bytes=4096)\n"
+            "for i in range(300):\n"
+            "    store.append({'evaluation_id': f'{sys.argv[2]}_{i}', 'agent_type': 'qa',\n"
+            "                  'timestamp': '2026-03-01T12:00:00'})\n"
+        )
+        workers = [subprocess.Popen([sys.executable, "-c", script, str(tmp_path), name]) for name in ("a", "b", "c")]
+        assert [worker.wait(timeout=60) for worker in workers] == [0, 0, 0]
+        
+        store = SegmentedRecordStore(tmp_path, "integration", max_segment_bytes=4096)
+        ids = [r["evaluation_id"] for r in store.query()]
+        
+        assert len(ids) == len(set(ids)) == 900
+        for index_file in tmp_path.glob("integration-*.idx"):
+            sidecar = json.loads(index_file.read_text())
+            assert sidecar["size"] == index_file.with_suffix(".jsonl").stat().st_size
+        store.close()
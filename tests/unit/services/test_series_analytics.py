@@ -0,0 +1,154 @@
+"""
+Unit Tests for the Series Analytics Kernel
+
+Tests batch trends, z-scores, rolling z-scores and EWMA baselines (numpy and
+pure-Python paths), the streaming anomaly detector, and their use in
+EvaluationMetricsSystem.
+"""
+
+import random
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from claude_pm.core.config import Config
+from claude_pm.services import series_analytics
+from claude_pm.services.evaluation_metrics import EvaluationMetricsSystem, MetricSeries, MetricType
+from claude_pm.services.series_analytics import (
+    StreamingAnomalyDetector, ewma, latest_zscores, linear_trends, rolling_zscores, zscores
+)
+
+
+def make_series(count: int = 40, seed: int = 7):
+    rng = random.Random(seed)
+    series = [[1000 + rng.gauss(0, 5) + 0.5 * i for i in range(rng.randint(0, 60))] for _ in range(count)]
+    return series + [[], [4.0], [5.0, 5.0, 5.0]]
+
+
+def run_kernel(series):
+    return (
+        linear_trends(series),
+        linear_trends(series, [[2.0 * i for i in range(len(s))] for s in series]),
+        rolling_zscores(series, window=7),
+        latest_zscores(series, window=7),
+        ewma(series, alpha=0.2),
+        zscores([[1, 2, 3], [2, 2, 5], [3, 2, 10]])
+    )
+
+
+def assert_close(a, b):
+    if isinstance(a, (list, tuple)):
+        assert len(a) == len(b)
+        for x, y in zip(a, b):
+            assert_close(x, y)
+    elif a is None or b is None:
+        assert a is b
+    else:
+        assert a == pytest.approx(b, rel=1e-6, abs=1e-9)
+
+
+class TestSeriesAnalytics:
+    """Test the analytics kernel functions."""
+    
+    def test_linear_trends(self):
+        """Slope and R-squared match a direct fit; degenerate series score zero."""
+        trends = linear_trends([[1, 3, 5, 7], [2, 2, 2], [1, 2, 1, 2], [9]])
+        
+        assert trends[0] == pytest.approx((2.0, 1.0))
+        assert trends[1] == pytest.approx((0.0, 1.0))
+        assert trends[2] == pytest.approx((0.2, 0.2))
+        assert trends[3] == (0.0, 0.0)
+    
+    def test_ewma_and_rolling_zscores(self):
+        """EWMA follows the recursive definition; a spike scores high against its window."""
+        values = [10.0, 12.0, 11.0, 13.0, 12.0, 11.0, 12.0, 40.0]
+        mean = values[0]
+        for value in values[1:]:
+            mean = 0.8 * mean + 0.2 * value
+        
+        assert ewma([values], alpha=0.2)[0][0] == pytest.approx(mean)
+        assert rolling_zscores([values], window=5)[0][:2] == [None, None]
+        assert latest_zscores([values], window=5)[0] > 10
+    
+    def test_pure_python_fallback_matches_numpy(self, monkeypatch):
+        """Both code paths give the same results."""
+        series = make_series()
+        vectorized = run_kernel(series)
+        monkeypatch.setattr(series_analytics, "HAS_NUMPY", False)
+        
+        assert_close(vectorized, run_kernel(series))
+    
+    def test_rolling_zscores_flat_window_after_large_values(self, monkeypatch):
+        """A flat window following large swings scores None on both code paths."""
+        rng = random.Random(1)
+        series = [[rng.uniform(-1e7, 1e7) for _ in range(20)] + [rng.uniform(-1e3, 1e3)] * 25
+                  for _ in range(20)]
+        vectorized = rolling_zscores(series, window=20)
+        monkeypatch.setattr(series_analytics, "HAS_NUMPY", False)
+        
+        assert all(scores[-1] is None for scores in vectorized)
+        assert_close(vectorized, rolling_zscores(series, window=20))
+    
+    def test_fleet_analysis_is_fast(self):
+        """Trends, EWMA and latest z-scores for thousands of series take milliseconds."""
+        rng = random.Random(1)
+        series = [[rng.random() for _ in range(100)] for _ in range(2000)]
+        
+        started = time.perf_counter()
+        linear_trends(series)
+        ewma(series)
+        latest_zscores(series)
+        elapsed = time.perf_counter() - started
+        
+        assert elapsed < 0.25
+
+
+class TestStreamingAnomalyDetector:
+    """Test per-point anomaly checks."""
+    
+    def test_flags_spike_after_warmup(self):
+        detector = StreamingAnomalyDetector(alpha=0.1, threshold=3.0, warmup=10)
+        scores = [detector.update("latency", 100.0 + (i % 5)) for i in range(30)]
+        spike = detector.update("latency", 160.0)
+        
+        assert scores[:10] == [None] * 10
+        assert not any(detector.is_anomaly(score) for score in scores)
+        assert detector.is_anomaly(spike)
+        assert detector.update("other", 160.0) is None
+
+
+class TestMetricsSystemAnalytics:
+    """Test EvaluationMetricsSystem's streaming and fleet-wide analytics."""
+    
+    @pytest.fixture
+    def metrics_system(self, tmp_path):
+        return EvaluationMetricsSystem(Config({
+            "enable_evaluation_metrics": True,
+            "evaluation_storage_path": str(tmp_path)
+        }))
+    
+    def test_anomalies_recorded_incrementally(self, metrics_system):
+        for i in range(30):
+            metrics_system._record_metric("overall_score", MetricType.RESPONSE_QUALITY, 85.0 + i % 3, "engineer")
+        metrics_system._record_metric("overall_score", MetricType.RESPONSE_QUALITY, 20.0, "engineer")
+        
+        anomalies = metrics_system.get_recent_anomalies()
+        
+        assert {a["series"] for a in anomalies} == {"global_overall_score", "engineer_overall_score"}
+        assert all(a["value"] == 20.0 for a in anomalies)
+    
+    def test_analyze_metric_trends(self, metrics_system):
+        start = datetime.now() - timedelta(hours=10)
+        for agent, slope in (("engineer", 2.0), ("qa", -1.0)):
+            series = MetricSeries("overall_score", MetricType.RESPONSE_QUALITY, agent_type=agent)
+            for hour in range(10):
+                series.add_point(50.0 + slope * hour, timestamp=start + timedelta(hours=hour))
+            metrics_system.agent_metrics[agent][f"{agent}_overall_score"] = series
+        
+        analysis = metrics_system.analyze_metric_trends(hours=24)
+        
+        assert analysis["engineer_overall_score"]["slope_per_hour"] == pytest.approx(2.0)
+        assert analysis["qa_overall_score"]["slope_per_hour"] == pytest.approx(-1.0)
+        assert analysis["qa_overall_score"]["r_squared"] == pytest.approx(1.0)
+        assert analysis["engineer_overall_score"]["count"] == 10
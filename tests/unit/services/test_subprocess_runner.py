@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Unit tests for SubprocessRunner streaming capture
+=================================================
+
+Tests bounded output capture including:
+- Ring buffer eviction
+- Spill-to-file beyond the buffer limit
+- Line callbacks while the child runs
+- Timeout handling for sync and async runs
+"""
+
+import json
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from claude_pm.services.subprocess_runner import (
+    BoundedStreamBuffer,
+    StreamCaptureConfig,
+    SubprocessRunner
+)
+
+
+class TestBoundedStreamBuffer:
+    """Test suite for BoundedStreamBuffer."""
+
+    def test_small_output_is_kept_verbatim(self):
+        """Output under the limit is returned unchanged."""
+        buffer = BoundedStreamBuffer('stdout', max_bytes=1024, spill_to_file=False)
+        buffer.feed(b"hello\nwor")
+        buffer.feed(b"ld\n")
+        buffer.close()
+
+        assert buffer.getvalue() == "hello\nworld\n"
+        assert buffer.total_bytes == 12
+        assert not buffer.truncated
+
+    def test_eviction_keeps_tail(self):
+        """Oldest lines are evicted once the limit is exceeded."""
+        buffer = BoundedStreamBuffer('stdout', max_bytes=20, spill_to_file=False)
+        for i in range(10):
+            buffer.feed(f"line-{i}\n".encode())
+        buffer.close()
+
+        value = buffer.getvalue()
+        assert buffer.truncated
+        assert "line-9\n" in value
+        assert "line-0\n" not in value
+        assert value.startswith("[... ")
+
+    def test_spill_preserves_full_output(self, tmp_path):
+        """Spilled output contains every line, memory holds only the tail."""
+        buffer = BoundedStreamBuffer('stdout', max_bytes=50, spill_dir=tmp_path)
+        expected = "".join(f"line-{i}\n" for i in range(100))
+        buffer.feed(expected.encode())
+        buffer.close()
+
+        assert buffer.spill_path is not None
+        assert buffer.spill_path.read_text() == expected
+        assert str(buffer.spill_path) in buffer.getvalue()
+        assert buffer.total_bytes == len(expected)
+
+    def test_line_callback_and_runaway_line(self):
+        """Callbacks see complete lines; lines without newlines are bounded."""
+        lines = []
+        buffer = BoundedStreamBuffer('stdout', max_bytes=8, spill_to_file=False, on_line=lines.append)
+        buffer.feed(b"ab\ncd")
+        assert lines == ["ab"]
+        buffer.feed(b"x" * 30)
+        buffer.close()
+
+        assert all(len(line) <= 8 for line in lines)
+        assert buffer.total_bytes == 35
+
+
+class TestSubprocessRunnerStreaming:
+    """Test suite for streamed subprocess runs."""
+
+    @pytest.fixture
+    def runner(self, tmp_path):
+        """Create a SubprocessRunner instance."""
+        return SubprocessRunner(framework_path=tmp_path)
+
+    def test_sync_streaming_bounds_output(self, runner, tmp_path):
+        """Large output is spilled and only the tail stays in memory."""
+        script = "import sys\nfor i in range(5000): print('x' * 100, i)"
+        capture = StreamCaptureConfig(max_buffer_bytes=4096, spill_dir=tmp_path)
+        result = runner.run_command_streaming(
+            [sys.executable, '-c', script], dict(os.environ), timeout=30, capture=capture
+        )
+
+        assert result.returncode == 0
+        assert result.stdout_bytes > 4096 * 10
+        assert len(result.stdout) < 4096 + 512
+        assert result.stdout.rstrip().endswith(" 4999")
+        assert result.stdout_spill_path.stat().st_size == result.stdout_bytes
+
+    def test_result_cleanup_removes_spill_files(self, runner, tmp_path):
+        """Spill files belong to the result and are removed by cleanup."""
+        script = "for i in range(2000): print('x' * 100, i)"
+        capture = StreamCaptureConfig(max_buffer_bytes=1024, spill_dir=tmp_path)
+        with runner.run_command_streaming(
+            [sys.executable, '-c', script], dict(os.environ), timeout=30, capture=capture
+        ) as result:
+            spill_path = result.stdout_spill_path
+            assert spill_path.exists()
+
+        assert not spill_path.exists()
+        assert result.stdout_spill_path is None
+
+    def test_tuple_wrapper_returns_full_output_and_removes_spill(self, runner, tmp_path):
+        """Agent output beyond the buffer reaches tuple callers intact; the spill file is removed."""
+        script = "import json\nprint(json.dumps({'items': ['x' * 100] * 20000}))"
+        capture = StreamCaptureConfig(spill_dir=tmp_path)
+        with patch.object(runner, '_build_agent_command', return_value=[sys.executable, '-c', script]):
+            returncode, stdout, _ = runner.run_agent_subprocess('engineer', {}, timeout=30, capture=capture)
+
+        assert returncode == 0
+        assert len(stdout) > 2_000_000
+        assert len(json.loads(stdout)['items']) == 20000
+        assert list(tmp_path.glob('claude-pm-*')) == []
+
+    @pytest.mark.asyncio
+    async def test_async_tuple_wrapper_returns_full_output(self, runner, tmp_path):
+        """The async tuple wrapper also returns spilled output intact."""
+        script = "import json\nprint(json.dumps({'items': ['x' * 100] * 20000}))"
+        capture = StreamCaptureConfig(spill_dir=tmp_path)
+        with patch.object(runner, '_build_agent_command', return_value=[sys.executable, '-c', script]):
+            returncode, stdout, _ = await runner.run_agent_subprocess_async('engineer', {}, timeout=30, capture=capture)
+
+        assert returncode == 0
+        assert len(json.loads(stdout)['items']) == 20000
+        assert list(tmp_path.glob('claude-pm-*')) == []
+
+    def test_sync_timeout(self, runner):
+        """Timed out runs are reported and killed."""
+        result = runner.run_command_streaming(
+            [sys.executable, '-c', 'import time; time.sleep(10)'], dict(os.environ), timeout=0.5
+        )
+
+        assert result.timed_out
+        assert result.returncode == -1
+
+    @pytest.mark.asyncio
+    async def test_async_streaming_callbacks(self, runner):
+        """Line callbacks fire for both streams in async runs."""
+        stdout_lines, stderr_lines = [], []
+        capture = StreamCaptureConfig(
+            on_stdout_line=stdout_lines.append,
+            on_stderr_line=stderr_lines.append
+        )
+        script = "import sys\nprint('one')\nprint('two')\nprint('err', file=sys.stderr)"
+        result = await runner.run_command_streaming_async(
+            [sys.executable, '-c', script], dict(os.environ), timeout=30, capture=capture
+        )
+
+        assert result.returncode == 0
+        assert stdout_lines == ["one", "two"]
+        assert stderr_lines == ["err"]
+        assert result.stdout == "one\ntwo\n"
+
+    @pytest.mark.asyncio
+    async def test_async_timeout(self, runner):
+        """Async runs past the timeout are terminated."""
+        result = await runner.run_command_streaming_async(
+            [sys.executable, '-c', 'import time; time.sleep(10)'], dict(os.environ), timeout=0.5
+        )
+
+        assert result.timed_out
+        assert result.returncode == -1
@@ -327,6 +327,45 @@ class TestTaskComplexityAnalyzer:
         info_call = mock_logger.info.call_args[0][0]
         assert "Task complexity analysis complete" in info_call
 
+    
+    def test_batch_analysis_matches_single(self, analyzer):
+        """analyze_tasks gives the same results as analyze_task, in order."""
+        tasks = [
+            "Read the configuration file",
+            {"task_description": "Refactor the authentication module", "file_count": 6, "requires_testing": True},
+            "Read the configuration file",
+            {"task_description": "1. Setup database 2. Create schema", "context_size": 6000}
+        ]
+        
+        results = analyzer.analyze_tasks(tasks)
+        expected = [
+            analyzer.analyze_task(task) if isinstance(task, str) else analyzer.analyze_task(**task)
+            for task in tasks
+        ]
+        
+        assert results == expected
+        assert analyzer.cache_info()["misses"] == 3
+    
+    def test_description_memo(self, analyzer):
+        """Recurring descriptions are analyzed once; the memo is bounded."""
+        analyzer = TaskComplexityAnalyzer(cache_size=2)
+        for description in ["Create a user", "Create a user", "List users", "Design a system", "Create a user"]:
+            analyzer.analyze_task(description)
+        
+        info = analyzer.cache_info()
+        assert (info["hits"], info["misses"], info["size"]) == (1, 4, 2)
+        
+        analyzer.clear_cache()
+        assert analyzer.cache_info()["size"] == 0
+    
+    def test_memoized_results_are_independent(self, analyzer):
+        """Callers can mutate a result without affecting later ones."""
+        first = analyzer.analyze_task("Optimize database performance")
+        first.analysis_details["technical_indicators"].append("mutated")
+        second = analyzer.analyze_task("Optimize database performance")
+        
+        assert second.analysis_details["technical_indicators"] == ["performance"]
+
 
 class TestComplexityAnalysisResult:
     """Test the ComplexityAnalysisResult dataclass."""
@@ -0,0 +1,125 @@
+"""
+Unit tests for security event tracking.
+
+Covers the sliding-window counters behind SecurityEventLogger, the bounded
+event buffer, and buffered JSONL output.
+"""
+
+import json
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from claude_pm.integrations.security import (
+    AuthenticationEvent,
+    SecurityEventLogger,
+    SlidingWindowCounter,
+)
+
+
+def failure(
+    host: str = "https://mem0.local", ip: str = None, age_seconds: float = 0
+) -> AuthenticationEvent:
+    return AuthenticationEvent(
+        timestamp=datetime.now() - timedelta(seconds=age_seconds),
+        event_type="auth_failure",
+        service_host=host,
+        ip_address=ip,
+    )
+
+
+@pytest.fixture
+def event_logger(tmp_path):
+    return SecurityEventLogger(tmp_path / "security_events.jsonl", max_events=100, flush_every=10)
+
+
+class TestSlidingWindowCounter:
+    """Test the bucketed time wheel."""
+
+    def test_counts_within_window(self):
+        counter = SlidingWindowCounter(horizon_seconds=600, bucket_seconds=60)
+        now = 10_000.0
+        for offset in (0, 30, 90, 400, 700):
+            counter.add(now - offset)
+
+        assert counter.count(now) == 4
+        assert counter.count(now, window_seconds=120) == 3
+        assert counter.count(now + 600) == 0
+
+    def test_events_older_than_horizon_are_ignored(self):
+        counter = SlidingWindowCounter(horizon_seconds=60, bucket_seconds=10)
+        counter.add(1_000.0)
+        counter.add(1_000.0 - 60)
+
+        assert counter.count(1_000.0) == 1
+
+
+class TestSecurityEventLogger:
+    """Test SecurityEventLogger's windows, buffer and log output."""
+
+    def test_lockout_after_recent_failures(self, event_logger):
+        for _ in range(4):
+            event_logger.log_event(failure())
+        event_logger.log_event(failure(age_seconds=3600))
+        event_logger.log_event(failure(host="https://other.local"))
+
+        assert event_logger.get_recent_failures("https://mem0.local", 15) == 4
+        assert not event_logger.is_host_locked_out("https://mem0.local")
+        event_logger.log_event(failure())
+        assert event_logger.is_host_locked_out("https://mem0.local")
+
+    def test_counts_per_ip_and_event_type(self, event_logger):
+        for i in range(6):
+            event_logger.log_event(failure(host=f"https://host{i % 2}.local", ip="10.0.0.9"))
+
+        assert event_logger.get_event_count("auth_failure", 5, principal="10.0.0.9") == 6
+        assert event_logger.get_event_count("auth_failure", 5) == 6
+        assert event_logger.get_event_count("auth_success", 5) == 0
+        assert event_logger.get_event_rate("auth_failure", 60) == pytest.approx(0.1)
+
+    def test_event_buffer_and_principals_are_bounded(self, tmp_path):
+        event_logger = SecurityEventLogger(
+            tmp_path / "events.jsonl", max_events=50, max_principals=20
+        )
+        for i in range(500):
+            event_logger.log_event(failure(host=f"https://attacker{i}.local"))
+
+        assert len(event_logger.events) == 50
+        assert len(event_logger._principal_counters) == 20
+        assert event_logger.get_event_count("auth_failure", 60) == 500
+
+    def test_jsonl_output_is_buffered(self, event_logger):
+        for _ in range(9):
+            event_logger.log_event(failure(ip="10.0.0.1"))
+        assert (
+            not event_logger.log_file_path.exists() or event_logger.log_file_path.read_text() == ""
+        )
+
+        event_logger.log_event(failure(ip="10.0.0.1"))
+        lines = event_logger.log_file_path.read_text().splitlines()
+
+        assert len(lines) == 10
+        assert json.loads(lines[0])["ip_address"] == "10.0.0.1"
+
+    def test_lockout_events_flush_immediately(self, event_logger):
+        event_logger.log_event(
+            AuthenticationEvent(
+                timestamp=datetime.now(), event_type="auth_lockout", service_host="h"
+            )
+        )
+
+        assert json.loads(event_logger.log_file_path.read_text())["event_type"] == "auth_lockout"
+
+    def test_checks_stay_constant_time_under_load(self, tmp_path):
+        event_logger = SecurityEventLogger(tmp_path / "events.jsonl", flush_every=1000)
+        for _ in range(20_000):
+            event_logger.log_event(failure())
+
+        started = time.perf_counter()
+        for _ in range(1_000):
+            event_logger.is_host_locked_out("https://mem0.local")
+        elapsed = time.perf_counter() - started
+
+        assert event_logger.get_recent_failures("https://mem0.local", 15) == 20_000
+        assert elapsed < 0.5
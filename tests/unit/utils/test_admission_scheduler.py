@@ -0,0 +1,135 @@
+"""
+Unit Tests for the Admission Scheduler
+
+Tests concurrency limits, priorities, weighted fairness, memory gating and
+TaskToolHelper integration.
+"""
+
+import asyncio
+import pytest
+from unittest.mock import Mock, patch
+
+from claude_pm.utils.admission_scheduler import AdmissionRejected, AdmissionScheduler
+from claude_pm.utils.task_tool_helper import TaskToolHelper, TaskToolConfiguration
+
+
+async def _admission_order(scheduler, requests):
+    """Queue requests behind a held slot and return the order they are admitted in."""
+    blocker = await scheduler.acquire("blocker")
+    order = []
+
+    async def run(agent_type, priority):
+        ticket = await scheduler.acquire(agent_type, priority=priority)
+        order.append(agent_type)
+        scheduler.release(ticket)
+
+    tasks = [asyncio.create_task(run(agent, priority)) for agent, priority in requests]
+    await asyncio.sleep(0)
+    scheduler.release(blocker)
+    await asyncio.gather(*tasks)
+    return order
+
+
+class TestAdmissionScheduler:
+    """Test AdmissionScheduler behaviour."""
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit(self):
+        """No more than max_concurrent tickets are admitted at once."""
+        scheduler = AdmissionScheduler(max_concurrent=2, memory_sampler=None)
+        running = peak = 0
+
+        async def work():
+            nonlocal running, peak
+            ticket = await scheduler.acquire("engineer")
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            scheduler.release(ticket)
+
+        await asyncio.gather(*(work() for _ in range(8)))
+
+        assert peak == 2
+        assert scheduler.get_stats()["agents"]["engineer"]["admitted"] == 8
+
+    @pytest.mark.asyncio
+    async def test_priority_order(self):
+        """Higher priorities are admitted first."""
+        scheduler = AdmissionScheduler(max_concurrent=1, memory_sampler=None)
+        order = await _admission_order(scheduler, [("low", "low"), ("critical", "critical"), ("medium", "medium")])
+
+        assert order == ["critical", "medium", "low"]
+
+    @pytest.mark.asyncio
+    async def test_weighted_fairness(self):
+        """A heavier weighted agent type gets proportionally more early slots."""
+        scheduler = AdmissionScheduler(max_concurrent=1, memory_sampler=None, agent_weights={"engineer": 2.0})
+        order = await _admission_order(scheduler, [("qa", "medium")] * 6 + [("engineer", "medium")] * 6)
+
+        assert order[:6].count("engineer") == 4
+        assert order[:6].count("qa") == 2
+
+    @pytest.mark.asyncio
+    async def test_memory_budget_blocks_until_recovered(self):
+        """Admission waits for the memory sampler to report headroom."""
+        available = {"mb": 500.0}
+        scheduler = AdmissionScheduler(
+            min_available_mb=1000, estimated_subprocess_mb=100,
+            memory_sampler=lambda: available["mb"], sample_interval=0.01
+        )
+        pending = asyncio.create_task(scheduler.acquire("research"))
+        await asyncio.sleep(0.05)
+        assert not pending.done()
+
+        available["mb"] = 4000.0
+        ticket = await asyncio.wait_for(pending, timeout=1)
+
+        assert ticket.queue_wait_seconds > 0
+        scheduler.release(ticket)
+
+    @pytest.mark.asyncio
+    async def test_overload_is_rejected(self):
+        """A full queue or an exceeded wait rejects instead of piling up."""
+        scheduler = AdmissionScheduler(max_concurrent=1, memory_sampler=None, max_queue_depth=1, max_queue_wait=0.05)
+        held = await scheduler.acquire("engineer")
+        waiting = asyncio.create_task(scheduler.acquire("engineer"))
+        await asyncio.sleep(0)
+
+        with pytest.raises(AdmissionRejected):
+            await scheduler.acquire("engineer")
+        with pytest.raises(AdmissionRejected):
+            await waiting
+
+        scheduler.release(held)
+        assert scheduler.get_stats()["running"] == 0
+
+    @pytest.mark.asyncio
+    async def test_lease_expiry_releases_slot(self):
+        """Slots that are never released are reclaimed after the lease."""
+        scheduler = AdmissionScheduler(max_concurrent=1, memory_sampler=None)
+        await scheduler.acquire("engineer", lease_seconds=0.02)
+        ticket = await asyncio.wait_for(scheduler.acquire("engineer"), timeout=1)
+
+        assert ticket.queue_wait_seconds >= 0.01
+
+
+class TestTaskToolHelperAdmission:
+    """Test admission control integration in TaskToolHelper."""
+
+    @pytest.mark.asyncio
+    async def test_slot_held_until_completion(self):
+        """The admission slot is held from creation until complete_subprocess."""
+        with patch('claude_pm.utils.task_tool_helper.PMOrchestrator') as mock_pm:
+            mock_pm.return_value = Mock(generate_agent_prompt=Mock(return_value="Test prompt"))
+            helper = TaskToolHelper(config=TaskToolConfiguration(
+                enable_admission_control=True, admission_max_concurrent=1, enable_memory_monitoring=False
+            ))
+            result = await helper.create_agent_subprocess(agent_type="engineer", task_description="Task")
+
+            assert result["success"] is True
+            assert result["admission"]["queue_wait_seconds"] >= 0
+            assert helper.get_admission_stats()["running"] == 1
+
+            helper.complete_subprocess(result["subprocess_id"], {"summary": "done"})
+            assert helper.get_admission_stats()["running"] == 0
@@ -0,0 +1,230 @@
+"""
+Unit Tests for the Delegation Result Cache
+
+Tests canonical keys, TTLs, in-flight coalescing, result copies and
+TaskToolHelper integration.
+"""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+
+from claude_pm.utils.delegation_cache import DelegationAbandoned, DelegationResultCache
+from claude_pm.utils.task_tool_helper import TaskToolHelper, TaskToolConfiguration
+
+
+class TestDelegationResultCache:
+    """Test DelegationResultCache behaviour."""
+
+    def test_key_is_canonical(self):
+        """Whitespace, case and requirement order do not change the key."""
+        cache = DelegationResultCache()
+        key_a = cache.make_key("Research", "Find  the auth\nflow", requirements=["b", "a"])
+        key_b = cache.make_key("research", "find the auth flow", requirements=["a", "b"])
+        key_c = cache.make_key("research", "find the auth flow", requirements=["a"])
+
+        assert key_a == key_b
+        assert key_a != key_c
+
+    def test_key_tracks_file_content(self, tmp_path):
+        """Changing a context file changes the key."""
+        cache = DelegationResultCache()
+        context_file = tmp_path / "module.py"
+        context_file.write_text("print('v1')")
+        key_v1 = cache.make_key("research", "Summarize", context_files=[str(context_file)])
+        context_file.write_text("print('version 2')")
+        key_v2 = cache.make_key("research", "Summarize", context_files=[str(context_file)])
+
+        assert key_v1 != key_v2
+
+    def test_file_hash_memo_is_bounded(self, tmp_path):
+        """Only the most recently used file hashes are kept."""
+        cache = DelegationResultCache(max_file_hashes=2)
+        for name in ("a.py", "b.py", "c.py"):
+            (tmp_path / name).write_text(name)
+            cache.file_content_hash(str(tmp_path / name))
+
+        assert list(cache._file_hashes) == [str(tmp_path / "b.py"), str(tmp_path / "c.py")]
+
+    @pytest.mark.asyncio
+    async def test_hit_and_per_agent_ttl(self):
+        """Successful results are reused; a zero TTL disables caching."""
+        cache = DelegationResultCache(agent_ttls={"Engineer": 0})
+        run = AsyncMock(return_value={"success": True, "value": 1})
+
+        await cache.get_or_run("k1", "research", run)
+        await cache.get_or_run("k1", "research", run)
+        await cache.get_or_run("k2", "engineer", run)
+        await cache.get_or_run("k2", "engineer", run)
+
+        assert run.await_count == 3
+        assert cache.stats.hits == 1
+        assert cache.ttl_for("ENGINEER") == 0
+
+    @pytest.mark.asyncio
+    async def test_failures_are_not_cached(self):
+        """Unsuccessful results are always re-run."""
+        cache = DelegationResultCache()
+        run = AsyncMock(return_value={"success": False})
+
+        await cache.get_or_run("k", "research", run)
+        await cache.get_or_run("k", "research", run)
+
+        assert run.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_duplicates_are_coalesced(self):
+        """Concurrent identical delegations share a single run."""
+        cache = DelegationResultCache()
+        calls = 0
+
+        async def run():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return {"success": True}
+
+        results = await asyncio.gather(*(cache.get_or_run("k", "research", run) for _ in range(5)))
+
+        assert calls == 1
+        assert all(result == results[0] for result in results)
+        assert len({id(result) for result in results}) == 5
+        assert cache.stats.coalesced == 4
+
+    @pytest.mark.asyncio
+    async def test_cancelled_run_is_handed_to_a_waiter(self):
+        """Cancelling the first caller does not cancel callers waiting on its run."""
+        cache = DelegationResultCache()
+        calls = 0
+
+        async def run():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return {"success": True, "run": calls}
+
+        first = asyncio.create_task(cache.get_or_run("k", "research", run))
+        await asyncio.sleep(0)
+        waiters = [asyncio.create_task(cache.get_or_run("k", "research", run)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        first.cancel()
+        results = await asyncio.gather(*waiters)
+
+        assert first.cancelled()
+        assert calls == 2
+        assert [result["run"] for result in results] == [2, 2, 2]
+        assert cache.get_stats()["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_callers_get_copies(self):
+        """Mutating a returned result does not change the cached one."""
+        cache = DelegationResultCache()
+        result = {"success": True, "items": [1]}
+
+        await cache.get_or_run("k", "research", AsyncMock(return_value=result))
+        result["items"].append(2)
+        cache.get("k")["items"].append(3)
+
+        assert cache.get("k")["items"] == [1]
+
+    @pytest.mark.asyncio
+    async def test_bypass_forces_fresh_run(self):
+        """Bypass skips the lookup but refreshes the stored result."""
+        cache = DelegationResultCache()
+        run = AsyncMock(side_effect=[{"success": True, "n": 1}, {"success": True, "n": 2}])
+
+        await cache.get_or_run("k", "research", run)
+        fresh = await cache.get_or_run("k", "research", run, bypass=True)
+
+        assert fresh["n"] == 2
+        assert cache.get("k")["n"] == 2
+
+
+class TestTaskToolHelperResultCache:
+    """Test result cache integration in TaskToolHelper."""
+
+    @pytest.mark.asyncio
+    async def test_cache_disabled_by_default(self):
+        """The cache is opt-in."""
+        helper = TaskToolHelper()
+
+        assert helper.result_cache is None
+        assert helper.get_result_cache_stats()["enabled"] is False
+
+    @pytest.fixture
+    def helper(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        return TaskToolHelper(working_directory=tmp_path, config=TaskToolConfiguration(
+            enable_result_cache=True,
+            enable_admission_control=True,
+            admission_max_concurrent=1,
+            memory_collection_required=False
+        ))
+
+    @pytest.mark.asyncio
+    async def test_completed_results_are_reused(self, helper):
+        """A completed delegation's results answer identical ones without a subprocess."""
+        created = await helper.create_agent_subprocess("research", "Look up the API docs")
+
+        assert created["cached"] is False
+        assert helper.get_result_cache_stats()["entries"] == 0
+        assert helper.complete_subprocess(created["subprocess_id"], {"summary": "done", "links": ["a"]})
+
+        first = await helper.create_agent_subprocess("research", "look up the  API docs")
+        first["results"]["links"].append("b")
+        second = await helper.create_agent_subprocess("research", "Look up the API docs")
+
+        assert (first["cached"], first["subprocess_id"]) == (True, None)
+        assert second["results"] == {"summary": "done", "links": ["a"]}
+        assert helper.get_admission_stats()["agents"]["research"]["admitted"] == 1
+        assert helper.get_result_cache_stats()["hits"] == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_duplicates_join_the_running_subprocess(self, helper):
+        """An identical delegation issued before the first completes joins it instead of creating one."""
+        first, duplicate = await asyncio.gather(
+            helper.create_agent_subprocess("research", "Look up the API docs"),
+            helper.create_agent_subprocess("research", "Look up the API docs")
+        )
+        waiting = asyncio.create_task(helper.await_delegation_results(duplicate["subprocess_id"]))
+        await asyncio.sleep(0)
+
+        assert first["cached"] is False and "coalesced" not in first
+        assert duplicate["coalesced"] is True
+        assert duplicate["subprocess_id"] == first["subprocess_id"]
+        assert helper.get_admission_stats()["agents"]["research"]["admitted"] == 1
+
+        helper.complete_subprocess(first["subprocess_id"], {"summary": "done"})
+
+        assert await waiting == {"summary": "done"}
+        assert await helper.await_delegation_results(first["subprocess_id"]) == {"summary": "done"}
+        assert helper.get_result_cache_stats()["coalesced"] == 1
+
+    @pytest.mark.asyncio
+    async def test_aborted_subprocess_releases_joined_duplicates(self, helper):
+        """Duplicates waiting on an aborted subprocess are told to re-delegate."""
+        first = await helper.create_agent_subprocess("research", "Profile the importer")
+        duplicate = await helper.create_agent_subprocess("research", "Profile the importer")
+        waiting = asyncio.create_task(helper.await_delegation_results(duplicate["subprocess_id"]))
+        await asyncio.sleep(0)
+
+        helper._active_subprocesses[first["subprocess_id"]]["status"] = "aborted_memory"
+        helper._abandon_delegation(first["subprocess_id"])
+
+        with pytest.raises(DelegationAbandoned):
+            await waiting
+        assert helper.get_result_cache_stats()["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_results_and_bypass_create_subprocesses(self, helper):
+        """Failed completions are not cached and use_cache=False always creates a subprocess."""
+        created = await helper.create_agent_subprocess("qa", "Run the suite")
+        helper.complete_subprocess(created["subprocess_id"], {"success": False, "error": "tests failed"})
+
+        retried = await helper.create_agent_subprocess("qa", "Run the suite")
+        helper.complete_subprocess(retried["subprocess_id"], {"summary": "green"})
+        fresh = await helper.create_agent_subprocess("qa", "Run the suite", use_cache=False)
+
+        assert retried["cached"] is False
+        assert fresh["cached"] is False and fresh["subprocess_id"]
+        assert helper.get_result_cache_stats()["bypassed"] == 1